@@ -0,0 +1,105 @@
+import importlib
+import statistics
+import sys
+import time
+from typing import Callable
+
+
+def time_calls(function: Callable[[], list], repeat: int) -> tuple[list, list[float]]:
+    """
+    Calls the function `repeat` times,
+    returns the result of the last call and the duration of every call, in seconds.
+    """
+    durations = []
+    result = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        durations.append(time.perf_counter() - start)
+    return result, durations
+
+
+def main(repository: str, page_size: int, repeat: int) -> int:
+    # The API modules are loaded first, they define all the repositories
+    importlib.import_module("clinical_mdr_api.main")
+    # pylint: disable=import-outside-toplevel
+    from clinical_mdr_api.config import config as neomodel_config
+    from clinical_mdr_api.domain_repositories.models._utils import (
+        _plan_model_rows,
+        to_models,
+        to_relation_trees,
+    )
+    from clinical_mdr_api.domain_repositories.neomodel_ext_item_repository import (
+        NeomodelExtBaseRepository,
+    )
+
+    def subclasses(cls):
+        for subclass in cls.__subclasses__():
+            yield subclass
+            yield from subclasses(subclass)
+
+    repositories = {cls.__name__: cls for cls in subclasses(NeomodelExtBaseRepository)}
+    if repository not in repositories:
+        sys.stderr.write(
+            f"Unknown repository {repository}, choose one of: {', '.join(sorted(repositories))}\n"
+        )
+        return 2
+    repository_instance = repositories[repository]()
+    model = repository_instance.return_model
+
+    def page():
+        return repository_instance.get_neomodel_extension_query().order_by("uid")[
+            :page_size
+        ]
+
+    qbuilder = page().query_cls(page()).build_ast()
+    if _plan_model_rows(qbuilder, model) is None:
+        print(
+            f"{model.__name__} is built from relation trees, the rows are not projected"
+        )
+
+    objects, object_durations = time_calls(
+        lambda: [model.from_orm(node) for node in to_relation_trees(page())], repeat
+    )
+    rows, row_durations = time_calls(lambda: to_models(page(), model), repeat)
+
+    print(
+        f"{len(objects)} {model.__name__} items from {neomodel_config.DATABASE_URL}, {repeat} runs (ms):"
+    )
+    for name, durations in (
+        ("neomodel objects", object_durations),
+        ("projected rows", row_durations),
+    ):
+        print(
+            f"{name:>18}  median {statistics.median(durations) * 1000:8.1f}"
+            f"  min {min(durations) * 1000:8.1f}  max {max(durations) * 1000:8.1f}"
+        )
+
+    if [item.dict() for item in objects] != [item.dict() for item in rows]:
+        print("\nThe projected rows do not build the same items")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compares the time spent reading a page of items of a repository, "
+        "with models built from neomodel objects or from the rows of projected properties. "
+        "The database is configured as for the API, with the NEO4J_DSN environment variable"
+    )
+    parser.add_argument(
+        "repository",
+        type=str,
+        nargs="?",
+        help="name of the NeomodelExtBaseRepository subclass to read",
+        default="SponsorModelDatasetVariableRepository",
+    )
+    parser.add_argument(
+        "--page-size", type=int, help="number of items read", default=1000
+    )
+    parser.add_argument("--repeat", type=int, help="number of runs", default=10)
+
+    args = parser.parse_args()
+    sys.exit(main(**vars(args)))
@@ -1,5 +1,6 @@
 """Configuration parameters."""
 import os
+import tempfile
 import urllib.parse
 from os import environ
 
@@ -33,10 +34,20 @@ NUMBER_OF_UID_DIGITS = 6
 
 CACHE_MAX_SIZE = 1000
 CACHE_TTL = 3600
+COUNT_CACHE_TTL = 30
+# Channel used to propagate repository cache invalidations between the API workers:
+# "local" for a single worker, "unix" for several workers on the same host
+CACHE_INVALIDATION_BUS = environ.get("CACHE_INVALIDATION_BUS", "local").lower().strip()
+CACHE_INVALIDATION_SOCKET_DIR = environ.get(
+    "CACHE_INVALIDATION_SOCKET_DIR",
+    os.path.join(tempfile.gettempdir(), "clinical-mdr-api-cache-invalidation"),
+)
 
 MAX_INT_NEO4J = 9223372036854775807
 DEFAULT_PAGE_SIZE = 10
 MAX_PAGE_SIZE = 1000
+# Number of items fetched at once when exporting all items of a list endpoint
+EXPORT_BATCH_SIZE = 1000
 NON_VISIT_NUMBER = 29500
 UNSCHEDULED_VISIT_NUMBER = 29999
 FIXED_WEEK_PERIOD = 7
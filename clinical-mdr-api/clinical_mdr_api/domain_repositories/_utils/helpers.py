@@ -1,9 +1,20 @@
 """Database related helper functions."""
 
+import datetime
+
+import neo4j
 from neomodel import db
 
+from clinical_mdr_api import exceptions
+from clinical_mdr_api.domain_repositories.models._utils import (
+    convert_to_tz_aware_datetime,
+)
 from clinical_mdr_api.domains.versioned_object_aggregate import LibraryItemStatus
 from clinical_mdr_api.models.concepts.concept import VersionProperties
+from clinical_mdr_api.repositories._utils import decode_page_token, encode_page_token
+
+# Sort key of the page tokens of the audit trails paged by the dates of their actions, newest first
+STUDY_ACTION_PAGE_SORT_KEYS = [["date", False]]
 
 
 def db_result_to_list(result) -> list[dict]:
@@ -36,6 +47,170 @@ def acquire_write_lock_study_value(uid: str) -> None:
     )
 
 
+def study_action_filter(
+    alias: str,
+    start_date: datetime.datetime | None = None,
+    end_date: datetime.datetime | None = None,
+    user_initials: str | None = None,
+    before_date: datetime.datetime | None = None,
+) -> tuple[str, dict]:
+    """
+    Builds a WHERE clause selecting the StudyAction nodes bound to `alias` by date and author.
+
+    Only the requested conditions are written, so that the range on the indexed `StudyAction.date`
+    can be used to find the actions.
+
+    Args:
+        alias (str): The variable the StudyAction nodes are bound to.
+        start_date (datetime.datetime | None): Earliest date of the actions, included.
+        end_date (datetime.datetime | None): Latest date of the actions, included.
+        user_initials (str | None): Author of the actions.
+        before_date (datetime.datetime | None): Date the actions are strictly older than, used for keyset pagination.
+
+    Returns:
+        tuple[str, dict]: The WHERE clause, empty if there are no conditions, and its query parameters.
+    """
+    conditions = []
+    params = {}
+    for name, value, operator in (
+        ("start_date", start_date, ">="),
+        ("end_date", end_date, "<="),
+        ("before_date", before_date, "<"),
+    ):
+        if value is not None:
+            conditions.append(f"{alias}.date {operator} ${alias}_{name}")
+            params[f"{alias}_{name}"] = convert_to_tz_aware_datetime(value)
+    if user_initials is not None:
+        conditions.append(f"{alias}.user_initials = ${alias}_user_initials")
+        params[f"{alias}_user_initials"] = user_initials
+    if not conditions:
+        return "", params
+    return "WHERE " + " AND ".join(conditions), params
+
+
+def study_action_page_filter(
+    match: str,
+    alias: str,
+    params: dict,
+    page_size: int,
+    page_token: str | None = None,
+    start_date: datetime.datetime | None = None,
+    end_date: datetime.datetime | None = None,
+    user_initials: str | None = None,
+) -> tuple[str | None, dict, str | None]:
+    """
+    Builds a WHERE clause selecting the StudyAction nodes bound to `alias` of a page of an audit trail, newest first.
+
+    A page holds the actions of `page_size` distinct dates. The dates are found by `match` and the indexed
+    `StudyAction.date` alone, before anything the actions changed is expanded.
+    The token of the next page holds the date of the last action, so deep pages cost the same as the first.
+
+    Args:
+        match (str): The MATCH clause binding the actions of the audit trail to `alias`.
+        alias (str): The variable the StudyAction nodes are bound to.
+        params (dict): The query parameters of `match`.
+        page_size (int): Number of distinct action dates in a page.
+        page_token (str | None): The token of the requested page, None for the first page.
+        start_date (datetime.datetime | None): Earliest date of the actions, included.
+        end_date (datetime.datetime | None): Latest date of the actions, included.
+        user_initials (str | None): Author of the actions.
+
+    Returns:
+        tuple[str | None, dict, str | None]: The WHERE clause, None if the page is empty,
+            its query parameters, and the token of the next page, None if it's the last page.
+    """
+    before_date = None
+    if page_token:
+        token = decode_page_token(page_token)
+        if (
+            token["s"] != STUDY_ACTION_PAGE_SORT_KEYS
+            or len(token["v"]) != 1
+            or not isinstance(token["v"][0], dict)
+            or "datetime" not in token["v"][0]
+        ):
+            raise exceptions.ValidationException(f"Invalid page_token '{page_token}'")
+        before_date = neo4j.time.DateTime.from_iso_format(token["v"][0]["datetime"])
+    action_filter, action_params = study_action_filter(
+        alias, start_date, end_date, user_initials, before_date
+    )
+    result, _ = db.cypher_query(
+        f"""
+        {match}
+        {action_filter}
+        RETURN DISTINCT {alias}.date AS date
+        ORDER BY date DESC
+        LIMIT $page_size
+        """,
+        {**params, "page_size": page_size, **action_params},
+    )
+    page_dates = [row[0] for row in result]
+    if not page_dates:
+        return None, {}, None
+
+    next_page_token = None
+    if len(page_dates) == page_size:
+        next_page_token = encode_page_token(
+            STUDY_ACTION_PAGE_SORT_KEYS, [page_dates[-1]]
+        )
+    action_filter, action_params = study_action_filter(
+        alias, user_initials=user_initials
+    )
+    action_filter = (
+        f"{action_filter} AND" if action_filter else "WHERE"
+    ) + f" {alias}.date IN $page_dates"
+    action_params["page_dates"] = page_dates
+    return action_filter, action_params, next_page_token
+
+
+def study_selection_action_filter(
+    selection_label: str,
+    study_uid: str,
+    start_date: datetime.datetime | None = None,
+    end_date: datetime.datetime | None = None,
+    user_initials: str | None = None,
+    page_size: int = 0,
+    page_token: str | None = None,
+) -> tuple[str | None, dict, str | None]:
+    """
+    Builds a WHERE clause selecting the `asa` StudyAction nodes which created the versions of the selections
+    labelled `selection_label` of a study, restricted to the actions of a page if `page_size` is given.
+
+    Returns:
+        tuple[str | None, dict, str | None]: The WHERE clause, None if the page is empty,
+            its query parameters, and the token of the next page, None if it's the last page.
+    """
+    if page_size > 0:
+        return study_action_page_filter(
+            f"MATCH (:StudyRoot {{uid: $study_uid}})-[:AUDIT_TRAIL]->(asa:StudyAction)-[:AFTER]->(:{selection_label})",
+            "asa",
+            {"study_uid": study_uid},
+            page_size,
+            page_token,
+            start_date,
+            end_date,
+            user_initials,
+        )
+    if page_token:
+        raise exceptions.ValidationException(
+            "page_token can only be used together with page_size"
+        )
+    action_filter, action_params = study_action_filter(
+        "asa", start_date, end_date, user_initials
+    )
+    return action_filter, action_params, None
+
+
+def study_selection_audit_trail_relationship(action_filter: str) -> str:
+    """
+    Returns the relationship types from the `asa` StudyAction nodes to the versions of the selections
+    in the audit trail of all the selections of a study.
+
+    When the actions are filtered, each version is matched by the action which created it.
+    Otherwise, the versions only linked to the action which ended them are matched as well.
+    """
+    return ":AFTER" if action_filter else ":BEFORE|AFTER"
+
+
 # Helper to get the version properties of the latest version of a versioned item.
 def get_latest_version_properties(item) -> VersionProperties | None:
     latest = item.has_latest_value.get_or_none()
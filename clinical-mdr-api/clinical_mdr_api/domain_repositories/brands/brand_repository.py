@@ -1,4 +1,4 @@
-from cachetools import TTLCache, cached
+from cachetools import cached
 from cachetools.keys import hashkey
 
 from clinical_mdr_api import config
@@ -7,12 +7,15 @@ from clinical_mdr_api.domain_repositories.generic_repository import (
 )
 from clinical_mdr_api.domain_repositories.models.brand import Brand
 from clinical_mdr_api.domains.brands.brand import BrandAR
+from clinical_mdr_api.repositories._cache import SharedTTLCache
 from clinical_mdr_api.repositories._utils import sb_clear_cache
 
 
 class BrandRepository:
-    cache_store_item_by_uid = TTLCache(
-        maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    cache_store_item_by_uid = SharedTTLCache(
+        name="brand_repository.cache_store_item_by_uid",
+        maxsize=config.CACHE_MAX_SIZE,
+        ttl=config.CACHE_TTL,
     )
 
     def generate_uid(self) -> str:
@@ -31,7 +34,11 @@ class BrandRepository:
             uid,
         )
 
-    @cached(cache=cache_store_item_by_uid, key=get_hashkey)
+    @cached(
+        cache=cache_store_item_by_uid,
+        key=get_hashkey,
+        lock=cache_store_item_by_uid.lock,
+    )
     def find_by_uid(self, uid: str) -> BrandAR | None:
         brand = Brand.nodes.get_or_none(uid=uid, is_deleted=False)
         if brand is not None:
@@ -52,7 +59,9 @@ class BrandRepository:
             return brand
         return None
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"], uids=lambda self, brand: [brand.uid]
+    )
     def save(self, brand: BrandAR) -> None:
         repository_closure_data = brand.repository_closure_data
 
@@ -92,7 +101,7 @@ class BrandRepository:
 
         return brand_ars
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid"], uids=lambda self, uid: [uid])
     def delete(self, uid: str):
         brand = Brand.nodes.first_or_none(uid=uid)
         if brand is not None:
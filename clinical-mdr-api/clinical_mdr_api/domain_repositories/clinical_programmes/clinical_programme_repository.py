@@ -1,6 +1,6 @@
 from typing import Collection
 
-from cachetools import TTLCache, cached
+from cachetools import cached
 from cachetools.keys import hashkey
 
 from clinical_mdr_api import config
@@ -13,12 +13,15 @@ from clinical_mdr_api.domain_repositories.models.clinical_programme import (
 from clinical_mdr_api.domains.clinical_programmes.clinical_programme import (
     ClinicalProgrammeAR,
 )
+from clinical_mdr_api.repositories._cache import SharedTTLCache
 from clinical_mdr_api.repositories._utils import sb_clear_cache
 
 
 class ClinicalProgrammeRepository:
-    cache_store_item_by_uid = TTLCache(
-        maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    cache_store_item_by_uid = SharedTTLCache(
+        name="clinical_programme_repository.cache_store_item_by_uid",
+        maxsize=config.CACHE_MAX_SIZE,
+        ttl=config.CACHE_TTL,
     )
 
     def generate_uid(self) -> str:
@@ -43,7 +46,11 @@ class ClinicalProgrammeRepository:
             uid,
         )
 
-    @cached(cache=cache_store_item_by_uid, key=get_hashkey)
+    @cached(
+        cache=cache_store_item_by_uid,
+        key=get_hashkey,
+        lock=cache_store_item_by_uid.lock,
+    )
     def find_by_uid(self, uid: str) -> ClinicalProgrammeAR | None:
         clinical_programme = ClinicalProgramme.nodes.get_or_none(uid=uid)
         if clinical_programme is not None:
@@ -54,7 +61,10 @@ class ClinicalProgrammeRepository:
             return clinical_programme
         return None
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        uids=lambda self, clinical_programme: [clinical_programme.uid],
+    )
     def save(self, clinical_programme: ClinicalProgrammeAR) -> None:
         """
         Public repository method for persisting a (possibly modified) state of the Clinical Programme instance into the underlying
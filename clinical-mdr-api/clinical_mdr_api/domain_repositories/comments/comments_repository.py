@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Collection
 
-from cachetools import TTLCache, cached
+from cachetools import cached
 from cachetools.keys import hashkey
 from neo4j.exceptions import CypherSyntaxError
 from neomodel import db
@@ -24,6 +24,7 @@ from clinical_mdr_api.domains.comments.comments import (
     CommentThreadStatus,
     CommentTopicAR,
 )
+from clinical_mdr_api.repositories._cache import SharedTTLCache
 from clinical_mdr_api.repositories._utils import (
     sb_clear_cache,
     validate_max_skip_clause,
@@ -31,8 +32,10 @@ from clinical_mdr_api.repositories._utils import (
 
 
 class CommentsRepository:
-    cache_store_item_by_uid = TTLCache(
-        maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    cache_store_item_by_uid = SharedTTLCache(
+        name="comments_repository.cache_store_item_by_uid",
+        maxsize=config.CACHE_MAX_SIZE,
+        ttl=config.CACHE_TTL,
     )
 
     def generate_topic_uid(self) -> str:
@@ -57,7 +60,11 @@ class CommentsRepository:
             uid,
         )
 
-    @cached(cache=cache_store_item_by_uid, key=get_hashkey)
+    @cached(
+        cache=cache_store_item_by_uid,
+        key=get_hashkey,
+        lock=cache_store_item_by_uid.lock,
+    )
     def find_comment_thread_by_uid(self, uid: str) -> CommentThreadAR | None:
         node: CommentThread = CommentThread.nodes.get_or_none(uid=uid, is_deleted=False)
         if node is not None:
@@ -77,7 +84,11 @@ class CommentsRepository:
             return item
         return None
 
-    @cached(cache=cache_store_item_by_uid, key=get_hashkey)
+    @cached(
+        cache=cache_store_item_by_uid,
+        key=get_hashkey,
+        lock=cache_store_item_by_uid.lock,
+    )
     def find_comment_reply_by_uid(self, uid: str) -> CommentReplyAR | None:
         nodes = CommentReply.nodes.get_or_none(
             uid=uid, is_deleted=False, reply_to__is_deleted=False
@@ -31,6 +31,7 @@ from clinical_mdr_api.repositories._utils import (
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
+    ItemsPage,
     sb_clear_cache,
 )
 
@@ -213,8 +214,9 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
         return_all_versions: bool = False,
+        page_token: str | None = None,
         **kwargs,
-    ) -> tuple[list[_AggregateRootType], int]:
+    ) -> ItemsPage:
         """
         Method runs a cypher query to fetch all needed data to create objects of type AggregateRootType.
         In the case of the following repository it will be some Concept aggregates.
@@ -230,7 +232,8 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
         :param filter_operator:
         :param total_count:
         :param return_all_versions:
-        :return GenericFilteringReturn[_AggregateRootType]:
+        :param page_token: token returned by a previous call, to retrieve the next page with keyset pagination
+        :return ItemsPage[_AggregateRootType]:
         """
         match_clause = (
             self.generic_match_clause()
@@ -253,8 +256,12 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
             match_clause=match_clause,
             alias_clause=alias_clause,
             sort_by=sort_by,
+            implicit_sort_by="uid",
+            # All the versions of a concept share its uid
+            unique_sort_by=["start_date"] if return_all_versions else None,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
             filter_by=FilterDict(elements=filter_by),
             filter_operator=filter_operator,
             total_count=total_count,
@@ -269,14 +276,13 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
             result_array, attributes_names
         )
 
-        count_result, _ = db.cypher_query(
-            query=query.count_query, params=query.parameters
-        )
-        total_amount = (
-            count_result[0][0] if len(count_result) > 0 and total_count else 0
-        )
+        total_amount = query.get_total_count() if total_count else 0
 
-        return extracted_items, total_amount
+        return ItemsPage(
+            extracted_items,
+            total_amount,
+            next_page_token=query.get_next_page_token(result_array, attributes_names),
+        )
 
     def _retrieve_concepts_from_cypher_res(
         self, result_array, attribute_names
@@ -370,7 +376,9 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
             else []
         )
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"], uids=lambda self, item: [item.uid]
+    )
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
             self._create(item)
@@ -0,0 +1,34 @@
+import json
+
+from neomodel import db
+
+
+class ImportCheckpointRepository:
+    """
+    Stores the progress of the ODM XML imports done in batches.
+
+    A checkpoint is saved in the same transaction as the batch it records, so it always matches the stored data,
+    and it is shared by all the workers, so that any of them can resume an import.
+    """
+
+    def find(self, key: str) -> dict | None:
+        rs, _ = db.cypher_query(
+            "MATCH (checkpoint:OdmImportCheckpoint {key: $key}) RETURN checkpoint.state",
+            {"key": key},
+        )
+        return json.loads(rs[0][0]) if rs else None
+
+    def save(self, key: str, state: dict) -> None:
+        db.cypher_query(
+            """
+            MERGE (checkpoint:OdmImportCheckpoint {key: $key})
+            SET checkpoint.state = $state, checkpoint.updated_at = datetime()
+            """,
+            {"key": key, "state": json.dumps(state)},
+        )
+
+    def delete(self, key: str) -> None:
+        db.cypher_query(
+            "MATCH (checkpoint:OdmImportCheckpoint {key: $key}) DELETE checkpoint",
+            {"key": key},
+        )
@@ -1,5 +1,6 @@
 from neomodel import db
 
+from clinical_mdr_api.domains.concepts.utils import TargetType
 from clinical_mdr_api.exceptions import NotFoundException
 
 
@@ -285,3 +286,43 @@ class MetadataRepository:
             raise NotFoundException(f"ODM Item with uid {target_uid} does not exist.")
 
         return result[0][0]
+
+    # Root label and relationship to the parent level of each level of the ODM tree
+    ODM_TREE_LEVELS = {
+        TargetType.STUDY_EVENT: ("OdmStudyEventRoot", None),
+        TargetType.FORM: ("OdmFormRoot", "FORM_REF"),
+        TargetType.ITEM_GROUP: ("OdmItemGroupRoot", "ITEM_GROUP_REF"),
+        TargetType.ITEM: ("OdmItemRoot", "ITEM_REF"),
+    }
+
+    def get_odm_tree_uids(
+        self, target_uid: str, target_type: TargetType, status: str
+    ) -> dict[TargetType, list[str]]:
+        """
+        Returns the uids of the ODM elements of each level of the tree under the given target, including the target itself,
+        in a single query. Only the descendants having a version in the given status are followed.
+        """
+        levels = list(self.ODM_TREE_LEVELS)
+        levels = levels[levels.index(target_type) :]
+
+        root_label, _ = self.ODM_TREE_LEVELS[target_type]
+        query = f"""
+            MATCH (root:{root_label} {{uid: $target_uid}})
+            WITH [root] AS level_0
+            """
+        for index, level in enumerate(levels[1:], start=1):
+            root_label, relationship_type = self.ODM_TREE_LEVELS[level]
+            carried_levels = ", ".join(f"level_{i}" for i in range(index))
+            query += f"""
+            UNWIND CASE WHEN level_{index - 1} = [] THEN [null] ELSE level_{index - 1} END AS parent
+            OPTIONAL MATCH (parent)-[:{relationship_type}]->(child:{root_label})-[:{status}]->()
+            WITH {carried_levels}, collect(DISTINCT child) AS level_{index}
+            """
+        query += "RETURN " + ", ".join(
+            f"[node IN level_{index} | node.uid]" for index in range(len(levels))
+        )
+
+        rs, _ = db.cypher_query(query, {"target_uid": target_uid})
+        if not rs:
+            return {level: [] for level in levels}
+        return dict(zip(levels, rs[0]))
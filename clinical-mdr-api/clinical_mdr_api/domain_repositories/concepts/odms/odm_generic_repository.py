@@ -1,7 +1,7 @@
 from abc import ABC
 from typing import Any
 
-from neomodel import db
+from neomodel import OUTGOING, db
 
 from clinical_mdr_api.domain_repositories._generic_repository_interface import (
     _AggregateRootType,
@@ -35,6 +35,7 @@ from clinical_mdr_api.repositories._utils import (
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
+    ItemsPage,
     sb_clear_cache,
 )
 
@@ -51,8 +52,9 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
         total_count: bool = False,
         return_all_versions: bool = False,
         only_specific_status: str = ObjectStatus.LATEST.name,
+        page_token: str | None = None,
         **kwargs,
-    ) -> tuple[list[_AggregateRootType], int]:
+    ) -> ItemsPage:
         """
         Method runs a cypher query to fetch all needed data to create objects of type AggregateRootType.
         In the case of the following repository it will be some Concept aggregates.
@@ -69,7 +71,8 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
         :param total_count:
         :param return_all_versions:
         :param only_specific_status:
-        :return GenericFilteringReturn[_AggregateRootType]:
+        :param page_token: token returned by a previous call, to retrieve the next page with keyset pagination
+        :return ItemsPage[_AggregateRootType]:
         """
         match_clause = self.generic_match_clause(only_specific_status)
 
@@ -85,8 +88,10 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
             match_clause=match_clause,
             alias_clause=alias_clause,
             sort_by=sort_by,
+            implicit_sort_by="uid",
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
             filter_by=FilterDict(elements=filter_by),
             filter_operator=filter_operator,
             total_count=total_count,
@@ -106,14 +111,43 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
             count_result[0][0] if len(count_result) > 0 and total_count else 0
         )
 
-        return extracted_items, total_amount
-
-    @classmethod
-    def _get_origin_and_relation_node(
-        cls, uid: str, relation_uid: str | None, relationship_type: RelationType
-    ):
-        root_class_node = cls.root_class.nodes.get_or_none(uid=uid)
+        return ItemsPage(
+            extracted_items,
+            total_amount,
+            next_page_token=query.get_next_page_token(result_array, attributes_names),
+        )
 
+    def create_query_filter_statement(
+        self,
+        library: str | None = None,
+        uids: list[str] | None = None,
+        oids: list[str] | None = None,
+        **kwargs,
+    ) -> tuple[str, dict]:
+        """
+        Besides the library, allows to restrict the concepts to the given uids or OIDs.
+        Unlike `filter_by`, these filters apply before the concepts are projected, so only the matching concepts are loaded.
+        """
+        (
+            filter_statements,
+            filter_query_parameters,
+        ) = super().create_query_filter_statement(library=library, **kwargs)
+        filter_parameters = []
+        if uids is not None:
+            filter_parameters.append("concept_root.uid IN $uids")
+            filter_query_parameters["uids"] = list(uids)
+        if oids is not None:
+            filter_parameters.append("concept_value.oid IN $oids")
+            filter_query_parameters["oids"] = list(oids)
+
+        if filter_parameters:
+            filter_statements = (
+                f"{filter_statements} AND " if filter_statements else "WHERE "
+            ) + " AND ".join(filter_parameters)
+        return filter_statements, filter_query_parameters
+
+    @staticmethod
+    def _get_relation_definition(relationship_type: RelationType):
         relation_mapping = {
             RelationType.ACTIVITY_GROUP: (ActivityGroupRoot, "has_activity_group"),
             RelationType.ACTIVITY_SUB_GROUP: (
@@ -140,7 +174,17 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
         if relationship_type not in relation_mapping:
             raise BusinessLogicException("Invalid relation type.")
 
-        relation_node_cls, origin_label = relation_mapping[relationship_type]
+        return relation_mapping[relationship_type]
+
+    @classmethod
+    def _get_origin_and_relation_node(
+        cls, uid: str, relation_uid: str | None, relationship_type: RelationType
+    ):
+        root_class_node = cls.root_class.nodes.get_or_none(uid=uid)
+
+        relation_node_cls, origin_label = cls._get_relation_definition(
+            relationship_type
+        )
         relation_node = relation_node_cls.nodes.get_or_none(uid=relation_uid)
 
         if not relation_node and relation_uid:
@@ -150,7 +194,10 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
 
         return getattr(root_class_node, origin_label), relation_node
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        uids=lambda self, uid, relation_uid, *args, **kwargs: [uid, relation_uid],
+    )
     def add_relation(
         self,
         uid: str,
@@ -169,7 +216,77 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
         else:
             origin.connect(relation_node)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        uids=lambda self, uid, relations, *args, **kwargs: [uid]
+        + [relation_uid for relation_uid, _ in relations],
+    )
+    def add_relations(
+        self,
+        uid: str,
+        relations: list[tuple[str, dict | None]],
+        relationship_type: RelationType,
+    ) -> None:
+        """
+        Same as `add_relation` for several related nodes, with one query for all of them instead of several queries each.
+
+        :param uid: The uid of the node to add the relationships to.
+        :param relations: The uids of the related nodes, with the parameters of their relationship.
+        :param relationship_type: The type of the relationships.
+        """
+        if not relations:
+            return
+
+        relation_node_cls, origin_label = self._get_relation_definition(
+            relationship_type
+        )
+        definition = getattr(self.root_class, origin_label).definition
+        if definition["direction"] == OUTGOING:
+            pattern = "(origin)-[{}:{}]->(target)"
+        else:
+            pattern = "(origin)<-[{}:{}]-(target)"
+        relation_type = definition["relation_type"]
+
+        # Same as adding the relationship several times, the last parameters win
+        parameters_by_relation_uid = dict(relations)
+        rs, _ = db.cypher_query(
+            f"""
+            MATCH (origin:{self.root_class.__label__} {{uid: $uid}})
+            MATCH (target:{relation_node_cls.__label__})
+            WHERE target.uid IN $relation_uids
+            OPTIONAL MATCH {pattern.format("relation", relation_type)}
+            DELETE relation
+            RETURN DISTINCT target.uid
+            """,
+            {"uid": uid, "relation_uids": list(parameters_by_relation_uid)},
+        )
+        missing_uids = parameters_by_relation_uid.keys() - {row[0] for row in rs}
+        if missing_uids:
+            raise BusinessLogicException(
+                f"The object with uid ({sorted(missing_uids)[0]}) does not exist."
+            )
+
+        db.cypher_query(
+            f"""
+            MATCH (origin:{self.root_class.__label__} {{uid: $uid}})
+            UNWIND $relations AS relation
+            MATCH (target:{relation_node_cls.__label__} {{uid: relation.uid}})
+            CREATE {pattern.format("new_relation", relation_type)}
+            SET new_relation = relation.parameters
+            """,
+            {
+                "uid": uid,
+                "relations": [
+                    {"uid": relation_uid, "parameters": parameters or {}}
+                    for relation_uid, parameters in parameters_by_relation_uid.items()
+                ],
+            },
+        )
+
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        uids=lambda self, uid, relation_uid, *args, **kwargs: [uid, relation_uid],
+    )
     def remove_relation(
         self,
         uid: str,
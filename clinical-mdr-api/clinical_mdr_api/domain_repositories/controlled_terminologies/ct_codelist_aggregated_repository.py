@@ -23,6 +23,7 @@ from clinical_mdr_api.models.controlled_terminologies.ct_stats import CodelistCo
 from clinical_mdr_api.models.utils import GenericFilteringReturn
 from clinical_mdr_api.repositories._utils import (
     ComparisonOperator,
+    CountStrategy,
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
@@ -119,7 +120,9 @@ class CTCodelistAggregatedRepository:
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
         term_filter: dict | None = None,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[tuple[CTCodelistNameAR, CTCodelistAttributesAR]]:
         """
         Method runs a cypher query to fetch all data related to the CTCodelistName* and CTCodelistttributes*.
@@ -138,6 +141,8 @@ class CTCodelistAggregatedRepository:
         :param filter_by:
         :param filter_operator:
         :param total_count:
+        :param page_token: token returned by a previous call, to retrieve the next page with keyset pagination
+        :param count_strategy: how the total count is computed when total_count is requested
         :return GenericFilteringReturn[tuple[CTCodelistNameAR, CTCodelistAttributesAR]]:
         """
         # Build match_clause
@@ -159,8 +164,14 @@ class CTCodelistAggregatedRepository:
             match_clause=match_clause,
             alias_clause=alias_clause,
             sort_by=sort_by,
+            implicit_sort_by="codelist_uid",
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            count_strategy=count_strategy,
+            count_pattern="(:CTCodelistRoot)"
+            if not (catalogue_name or library or package or term_filter)
+            else None,
             filter_by=FilterDict(elements=filter_by),
             filter_operator=filter_operator,
             total_count=total_count,
@@ -182,15 +193,14 @@ class CTCodelistAggregatedRepository:
                 )
             )
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.get_total_count() if total_count else 0
 
-        return GenericFilteringReturn.create(items=codelists_ars, total=total)
+        return GenericFilteringReturn.create(
+            items=codelists_ars,
+            total=total,
+            next_page_token=query.get_next_page_token(result_array, attributes_names),
+            count_strategy=query.used_count_strategy,
+        )
 
     def get_distinct_headers(
         self,
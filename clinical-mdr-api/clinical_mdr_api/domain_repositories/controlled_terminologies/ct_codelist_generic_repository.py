@@ -385,7 +385,9 @@ class CTCodelistGenericRepository(
             return versions
         return None
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"], uids=lambda self, item: [item.uid]
+    )
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
             self._create(item)
@@ -406,7 +408,13 @@ class CTCodelistGenericRepository(
             return True
         return False
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        uids=lambda self, codelist_uid, term_uid, *args, **kwargs: [
+            codelist_uid,
+            term_uid,
+        ],
+    )
     def add_term(
         self, codelist_uid: str, term_uid: str, author: str, order: int
     ) -> None:
@@ -474,7 +482,13 @@ class CTCodelistGenericRepository(
         db.cypher_query(query, {"codelist_uid": codelist_uid, "term_uid": term_uid})
         TemplateParameterTermRoot.generate_node_uids_if_not_present()
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        uids=lambda self, codelist_uid, term_uid, *args, **kwargs: [
+            codelist_uid,
+            term_uid,
+        ],
+    )
     def remove_term(self, codelist_uid: str, term_uid: str, author: str) -> None:
         """
         Method removes term identified by term_uid from the codelist identified by codelist_uid.
@@ -20,6 +20,7 @@ from clinical_mdr_api.models.controlled_terminologies.ct_stats import TermCount
 from clinical_mdr_api.models.utils import GenericFilteringReturn
 from clinical_mdr_api.repositories._utils import (
     ComparisonOperator,
+    CountStrategy,
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
@@ -119,6 +120,8 @@ class CTTermAggregatedRepository:
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[tuple[CTTermNameAR, CTTermAttributesAR]]:
         """
         Method runs a cypher query to fetch all data related to the CTTermName* and CTTermAttributes*.
@@ -138,6 +141,8 @@ class CTTermAggregatedRepository:
         :param filter_by:
         :param filter_operator:
         :param total_count:
+        :param page_token: token returned by a previous call, to retrieve the next page with keyset pagination
+        :param count_strategy: how the total count is computed when total_count is requested
         :return GenericFilteringReturn[tuple[CTTermNameAR, CTTermAttributesAR]]:
         """
         # Build match_clause
@@ -156,8 +161,15 @@ class CTTermAggregatedRepository:
             alias_clause=alias_clause,
             sort_by=sort_by,
             implicit_sort_by="term_uid",
+            # The same term can be returned once per codelist it belongs to
+            unique_sort_by=["codelist_uid"],
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            count_strategy=count_strategy,
+            count_pattern="(:CTCodelistRoot)-[:HAS_TERM]->()"
+            if not (codelist_uid or codelist_name or library or package)
+            else None,
             filter_by=FilterDict(elements=filter_by),
             filter_operator=filter_operator,
             total_count=total_count,
@@ -179,15 +191,14 @@ class CTTermAggregatedRepository:
                 )
             )
 
-        total = 0
-        if total_count:
-            count_result, _ = db.cypher_query(
-                query=query.count_query, params=query.parameters
-            )
-            if len(count_result) > 0:
-                total = count_result[0][0]
+        total = query.get_total_count() if total_count else 0
 
-        return GenericFilteringReturn.create(items=terms_ars, total=total)
+        return GenericFilteringReturn.create(
+            items=terms_ars,
+            total=total,
+            next_page_token=query.get_next_page_token(result_array, attributes_names),
+            count_strategy=query.used_count_strategy,
+        )
 
     def get_distinct_headers(
         self,
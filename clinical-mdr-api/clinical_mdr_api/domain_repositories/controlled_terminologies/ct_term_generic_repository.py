@@ -376,7 +376,9 @@ class CTTermGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType],
         )
 
     @cached(
-        cache=LibraryItemRepositoryImplBase.cache_store_item_by_uid, key=hashkey_ct_term
+        cache=LibraryItemRepositoryImplBase.cache_store_item_by_uid,
+        key=hashkey_ct_term,
+        lock=LibraryItemRepositoryImplBase.cache_store_item_by_uid.lock,
     )
     def find_by_uid(
         self,
@@ -414,7 +416,9 @@ class CTTermGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType],
             return versions
         return None
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"], uids=lambda self, item: [item.uid]
+    )
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
             self._create(item)
@@ -427,7 +431,10 @@ class CTTermGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType],
     def _is_repository_related_to_ct(self) -> bool:
         return True
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        uids=lambda self, term_uid, parent_uid, *args, **kwargs: [term_uid, parent_uid],
+    )
     def add_parent(
         self, term_uid: str, parent_uid: str, relationship_type: TermParentType
     ) -> None:
@@ -467,7 +474,10 @@ class CTTermGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType],
         else:
             ct_term_root_node.has_parent_subtype.connect(ct_term_root_parent_node)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        uids=lambda self, term_uid, parent_uid, *args, **kwargs: [term_uid, parent_uid],
+    )
     def remove_parent(
         self, term_uid: str, parent_uid: str, relationship_type: TermParentType
     ) -> None:
@@ -49,6 +49,7 @@ from clinical_mdr_api.repositories._utils import (
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
+    ItemsPage,
     sb_clear_cache,
 )
 
@@ -200,8 +201,9 @@ class DictionaryTermGenericRepository(
         page_number: int = 1,
         page_size: int = 0,
         total_count: bool = False,
+        page_token: str | None = None,
         **_kwargs,
-    ) -> tuple[list[DictionaryTermAR], int]:
+    ) -> ItemsPage:
         """
         Method runs a cypher query to fetch all needed data to create objects of type AggregateRootType.
         In the case of the following repository it will be some Terms aggregates.
@@ -216,7 +218,8 @@ class DictionaryTermGenericRepository(
         :param filter_by:
         :param filter_operator:
         :param total_count:
-        :return GenericFilteringReturn[_AggregateRootType]:
+        :param page_token: token returned by a previous call, to retrieve the next page with keyset pagination
+        :return ItemsPage[_AggregateRootType]:
         """
         match_clause = self.generic_match_clause()
 
@@ -225,8 +228,10 @@ class DictionaryTermGenericRepository(
             match_clause=match_clause,
             alias_clause=alias_clause,
             sort_by=sort_by,
+            implicit_sort_by="term_uid",
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
             filter_by=FilterDict(elements=filter_by),
             filter_operator=filter_operator,
             total_count=total_count,
@@ -246,7 +251,11 @@ class DictionaryTermGenericRepository(
             count_result[0][0] if len(count_result) > 0 and total_count else 0
         )
 
-        return extracted_items, total_amount
+        return ItemsPage(
+            extracted_items,
+            total_amount,
+            next_page_token=query.get_next_page_token(result_array, attributes_names),
+        )
 
     def _retrieve_terms_from_cypher_res(
         self, result_array, attribute_names
@@ -324,7 +333,9 @@ class DictionaryTermGenericRepository(
         """
         return self.find_by_uid_2(uid=term_uid, for_update=for_update)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"], uids=lambda self, item: [item.uid]
+    )
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
             self._create(item)
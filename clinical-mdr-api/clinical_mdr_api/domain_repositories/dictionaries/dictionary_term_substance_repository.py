@@ -28,6 +28,7 @@ from clinical_mdr_api.repositories._utils import (
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
+    ItemsPage,
 )
 
 
@@ -134,7 +135,8 @@ class DictionaryTermSubstanceRepository(
         page_size: int = 0,
         total_count: bool = False,
         codelist_name: str | None = None,
-    ) -> tuple[list[DictionaryTermSubstanceAR], int]:
+        page_token: str | None = None,
+    ) -> ItemsPage:
         """
         Method runs a cypher query to fetch all needed data to create objects of type AggregateRootType.
         In the case of the following repository it will be some Terms aggregates.
@@ -149,7 +151,8 @@ class DictionaryTermSubstanceRepository(
         :param filter_by:
         :param filter_operator:
         :param total_count:
-        :return GenericFilteringReturn[_AggregateRootType]:
+        :param page_token: token returned by a previous call, to retrieve the next page with keyset pagination
+        :return ItemsPage[_AggregateRootType]:
         """
         match_clause = self.generic_match_clause()
 
@@ -158,8 +161,12 @@ class DictionaryTermSubstanceRepository(
             match_clause=match_clause,
             alias_clause=alias_clause,
             sort_by=sort_by,
+            implicit_sort_by="term_uid",
+            # The same term can belong to several codelists with this name
+            unique_sort_by=["codelist_uid"],
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
             filter_by=FilterDict(elements=filter_by),
             filter_operator=filter_operator,
             total_count=total_count,
@@ -179,7 +186,11 @@ class DictionaryTermSubstanceRepository(
             count_result[0][0] if len(count_result) > 0 and total_count else 0
         )
 
-        return extracted_items, total_amount
+        return ItemsPage(
+            extracted_items,
+            total_amount,
+            next_page_token=query.get_next_page_token(result_array, attributes_names),
+        )
 
     def _has_data_changed(self, ar: DictionaryTermSubstanceAR, value: VersionValue):
         parent_data_modified = super()._has_data_changed(ar=ar, value=value)
@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 from typing import Any, Mapping, Type
 
-from cachetools import TTLCache
 from neomodel import RelationshipDefinition, RelationshipManager
 
 from clinical_mdr_api import config, exceptions
@@ -16,6 +15,7 @@ from clinical_mdr_api.domain_repositories.models.study_selections import (
     StudySelection,
     StudySelectionMetadata,
 )
+from clinical_mdr_api.repositories._cache import SharedTTLCache
 from clinical_mdr_api.repositories._utils import sb_clear_cache
 
 
@@ -40,8 +40,10 @@ class RepositoryImpl:
     Results from a repository should be used to build aggregate root (AR) objects.
     """
 
-    cache_store_item_by_uid = TTLCache(
-        maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    cache_store_item_by_uid = SharedTTLCache(
+        name="generic_repository.cache_store_item_by_uid",
+        maxsize=config.CACHE_MAX_SIZE,
+        ttl=config.CACHE_TTL,
     )
 
     value_class: type
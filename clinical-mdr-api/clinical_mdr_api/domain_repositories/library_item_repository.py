@@ -3,7 +3,7 @@ import copy
 from datetime import datetime
 from typing import Any, Iterable, Mapping, TypeVar
 
-from cachetools import TTLCache, cached
+from cachetools import cached
 from cachetools.keys import hashkey
 from neomodel import (
     OUTGOING,
@@ -38,6 +38,7 @@ from clinical_mdr_api.domains.versioned_object_aggregate import (
     VersioningException,
 )
 from clinical_mdr_api.exceptions import BusinessLogicException, NotFoundException
+from clinical_mdr_api.repositories._cache import SharedTTLCache
 from clinical_mdr_api.repositories._utils import (
     sb_clear_cache,
     validate_max_skip_clause,
@@ -48,11 +49,18 @@ RETRIEVED_READ_ONLY_MARK = object()
 MATCH_NODE_BY_ID = "MATCH (node) WHERE elementId(node)=$id RETURN node"
 
 
+def _version_root_uid(root: VersionRoot) -> str:
+    # CT version roots have no uid and are cached by element id
+    return getattr(root, "uid", None) or str(root.element_id)
+
+
 class LibraryItemRepositoryImplBase(
     RepositoryImpl, GenericRepository[_AggregateRootType], abc.ABC
 ):
-    cache_store_item_by_uid = TTLCache(
-        maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    cache_store_item_by_uid = SharedTTLCache(
+        name="library_item_repository.cache_store_item_by_uid",
+        maxsize=config.CACHE_MAX_SIZE,
+        ttl=config.CACHE_TTL,
     )
     has_library = True
 
@@ -156,7 +164,10 @@ class LibraryItemRepositoryImplBase(
             itm.__WRITE_LOCK__ = None
             itm.save()
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        uids=lambda self, root, *args, **kwargs: [_version_root_uid(root)],
+    )
     def _get_or_create_value(
         self, root: VersionRoot, ar: _AggregateRootType
     ) -> VersionValue:
@@ -298,7 +309,10 @@ class LibraryItemRepositoryImplBase(
 
         return versioned_object
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        uids=lambda self, root, *args, **kwargs: [_version_root_uid(root)],
+    )
     def _recreate_relationship(
         self,
         root: VersionRoot,
@@ -326,7 +340,10 @@ class LibraryItemRepositoryImplBase(
         has_version_rel.connect(value, parameters)
         self._db_create_relationship(relation, value)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        uids=lambda self, root, *args, **kwargs: [_version_root_uid(root)],
+    )
     def _close_previous_versions(
         self,
         root: VersionRoot,
@@ -751,7 +768,11 @@ class LibraryItemRepositoryImplBase(
                     latest_matching_value = matching_value
         return latest_matching_value, latest_matching_relationship
 
-    @cached(cache=cache_store_item_by_uid, key=hashkey_library_item)
+    @cached(
+        cache=cache_store_item_by_uid,
+        key=hashkey_library_item,
+        lock=cache_store_item_by_uid.lock,
+    )
     def find_by_uid_2(
         self,
         uid: str,
@@ -1010,7 +1031,9 @@ class LibraryItemRepositoryImplBase(
             minor_version=int(minor),
         )
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"], uids=lambda self, item: [item.uid]
+    )
     def save(self, item: _AggregateRootType) -> None:
         if item.repository_closure_data is RETRIEVED_READ_ONLY_MARK:
             raise NotImplementedError(
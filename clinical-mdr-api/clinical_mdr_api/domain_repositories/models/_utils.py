@@ -1,3 +1,4 @@
+import copy
 import datetime
 import re
 from typing import Any
@@ -13,6 +14,7 @@ from neomodel import (
 )
 from neomodel.core import db
 from opencensus.trace import execution_context
+from pydantic import BaseModel as PydanticBaseModel
 
 from clinical_mdr_api import exceptions
 
@@ -652,7 +654,7 @@ class CustomQueryBuilder(match.QueryBuilder):
             return f" LIMIT {self._ast.limit}"
         return ""
 
-    def build_query(self):
+    def build_query(self, projections: dict[str, str] | None = None):
         query = self._build_lookup_clause()
         query += self._build_match_clause()
         query += self._build_optional_match_clause()
@@ -664,12 +666,21 @@ class CustomQueryBuilder(match.QueryBuilder):
 
         query += self._build_query_relationships()
 
-        query += " RETURN DISTINCT "
+        if projections is None:
+            query += " RETURN DISTINCT "
+        else:
+            # The page is selected on the same variables, only the projections are returned
+            query += " WITH DISTINCT "
         query += self._build_return_clause()
         query += self._build_collect_clause()
         query += self._build_order_by_clause()
         query += self._build_skip_clause()
         query += self._build_limit_clause()
+        if projections is not None:
+            query += " RETURN " + ", ".join(
+                f"{expression} AS `{alias}`"
+                for alias, expression in projections.items()
+            )
 
         return query
 
@@ -753,10 +764,12 @@ class CustomQueryBuilder(match.QueryBuilder):
             ret = f"NOT ({ret})"
         return ret
 
-    def _execute(self, lazy=False, dict_output=False):
+    def _execute(self, lazy=False, dict_output=False, projections=None):
         """
         Override of the original method.
         Mostly a copy/paste except we change the results format.
+        When projections are given, as {alias: Cypher expression}, the rows of these expressions
+        are returned without inflating neomodel objects.
         """
         if lazy:
             # inject id() into return or return_set
@@ -768,14 +781,41 @@ class CustomQueryBuilder(match.QueryBuilder):
                 self._ast.return_set = [
                     f"{db.get_id_method()}({item})" for item in self._ast.return_set
                 ]
-        query = self.build_query()
+        fetch_total_count = getattr(self.node_set, "_fetch_total_count", False)
+        fuse_total_count = fetch_total_count and self._can_fuse_count() and not lazy
+        if fuse_total_count:
+            # The count runs once in a subquery before the page and is returned in an extra column
+            count_query = self.build_count_query(alias="_total_count")
+            self._add_to_return_set("_total_count")
+            if projections is not None:
+                projections = {**projections, "_total_count": "_total_count"}
+            query = f"CALL {{ {count_query} }} {self.build_query(projections)}"
+        else:
+            query = self.build_query(projections)
         tracer = execution_context.get_opencensus_tracer()
         with tracer.span("neomodel.query") as span:
             span.add_attribute("cypher.query", query)
             span.add_attribute("cypher.params", self._query_params)
 
             results, prop_names = db.cypher_query(
-                query, self._query_params, resolve_objects=True
+                query, self._query_params, resolve_objects=projections is None
+            )
+
+        if fetch_total_count:
+            total_count = None
+            if fuse_total_count:
+                # Strip the count column so that callers get the same rows as without the count
+                index = prop_names.index("_total_count")
+                if results:
+                    total_count = results[0][index]
+                prop_names = [name for i, name in enumerate(prop_names) if i != index]
+                results = [
+                    [value for i, value in enumerate(row) if i != index]
+                    for row in results
+                ]
+            # The count row is lost when the page is empty
+            self.node_set.total_count = (
+                total_count if total_count is not None else self._count()
             )
 
         if dict_output:
@@ -787,14 +827,42 @@ class CustomQueryBuilder(match.QueryBuilder):
             return [n[0] for n in results]
         return results
 
-    def _count(self):
+    def _can_fuse_count(self) -> bool:
+        # The WITH clauses of random ordering and of collected values drop the count column
+        return not self._ast.with_clause and not self._ast.distinct
+
+    def build_count_query(self, alias: str | None = None) -> str:
+        """
+        Builds the query counting the distinct nodes of the node_set.source type.
+        It keeps the traversals and filters of the main query, without the returned relations, ordering and pagination.
+        """
         # we need to count the variable of the node_set.source type
         main_variable = self.node_set.source.__label__.lower()
-        self._ast.return_clause = f"count(DISTINCT {main_variable})"
-        self._ast.return_set = None
+        ast = self._ast
+        count_ast = copy.copy(ast)
+        count_ast.return_clause = f"count(DISTINCT {main_variable})" + (
+            f" AS {alias}" if alias else ""
+        )
+        count_ast.return_set = None
+        count_ast.collect = None
         # drop order_by, results in an invalid query
-        self._ast.order_by = None
-        query = self.build_query()
+        count_ast.order_by = None
+        count_ast.skip = None
+        count_ast.limit = None
+        # The selected single relations only restrict the results when they are filtered on
+        count_ast.relation_selectors = {
+            name: data
+            for name, data in ast.relation_selectors.items()
+            if data["filter_clause"]
+        }
+        self._ast = count_ast
+        try:
+            return self.build_query()
+        finally:
+            self._ast = ast
+
+    def _count(self):
+        query = self.build_count_query()
         results, _ = db.cypher_query(query, self._query_params)
         if len(results) > 0 and len(results[0]) > 0:
             return int(results[0][0])
@@ -861,6 +929,8 @@ class CustomNodeSet(match.NodeSet):
         self._values_to_collect = []
         self.order_by_elements = []
         self._optional_relation_to_fetch_single = {}
+        self._fetch_total_count = False
+        self.total_count = None
 
     def all(self, lazy=False, dict_output=False):
         """
@@ -887,6 +957,13 @@ class CustomNodeSet(match.NodeSet):
         self._optional_relations_to_fetch_and_collect = relation_names
         return self
 
+    def fetch_total_count(self):
+        """Custom method to also count the nodes of the set, regardless of the pagination.
+        The count is computed in the same query as the nodes when possible,
+        it is available as total_count once the set is executed."""
+        self._fetch_total_count = True
+        return self
+
     def collect_values(self, *relations_names):
         """Custom method to specify a set of extra optional relations to return in collection.
         The collection will be the only variable returned"""
@@ -1031,6 +1108,134 @@ def to_relation_trees(nodeset):
     return results
 
 
+def _model_row_property(node_class, name: str):
+    return node_class.defined_properties(aliases=False, rels=False).get(name)
+
+
+def _plan_model_rows(qbuilder, model) -> list[tuple] | None:
+    """
+    Finds the properties that `model.from_orm` reads on the relation trees of the query,
+    as (field name, query variable, database property, neomodel property) tuples.
+    The variable is None for fields that are always None, as their relation is not fetched.
+
+    Returns None when the model needs the relation trees: nested models, collected relations,
+    relations selected by type, or attributes that are not plain properties.
+    """
+    node_set = qbuilder.node_set
+    if not isinstance(node_set.source, type) or qbuilder._ast.distinct:
+        return None
+    root_class = node_set.source
+    root_variable = root_class.__label__.lower()
+    returned = set(qbuilder._ast.return_set)
+    if qbuilder._ast.return_clause:
+        returned.add(qbuilder._ast.return_clause)
+    if root_variable not in returned:
+        return None
+
+    plan = []
+    for name, field in model.__fields__.items():
+        if field.alias != name or (
+            isinstance(field.type_, type) and issubclass(field.type_, PydanticBaseModel)
+        ):
+            return None
+        source = field.field_info.extra.get("source")
+        if field.field_info.extra.get("exclude_from_orm"):
+            source = None
+        if not source or not ("." in source or "|" in source):
+            # Read from the root node itself
+            prop = _model_row_property(root_class, source or name)
+            if prop is not None:
+                plan.append(
+                    (name, root_variable, prop.db_property or source or name, prop)
+                )
+            elif source or hasattr(root_class, name):
+                return None
+            elif field.field_info.default is Ellipsis:
+                plan.append((name, None, None, None))
+            continue
+
+        *traversals, prop_name = re.split(r"[.|]", source)
+        from_relationship = source.rfind("|") > source.rfind(".")
+        if "|" in source and not from_relationship:
+            return None
+        relation_tree_map = qbuilder._ast.relation_tree_map
+        relation = None
+        node_class = parent_class = root_class
+        for part in traversals:
+            relation = relation_tree_map.get(part)
+            if relation is None:
+                break
+            relation_tree_map = relation["children"]
+            parent_class, node_class = node_class, relation["target"]
+        variable = None
+        if relation is not None:
+            if relation["variable_name"] == relation["rel_variable_name"]:
+                return None
+            variable = relation[
+                "rel_variable_name" if from_relationship else "variable_name"
+            ]
+            if variable in qbuilder._ast.collect:
+                return None
+        if variable not in returned:
+            # The relation is not part of the results, from_orm only accepts it for optional fields
+            if field.field_info.default is not None:
+                return None
+            plan.append((name, None, None, None))
+            continue
+        if from_relationship:
+            relationship_class = getattr(parent_class, traversals[-1]).definition[
+                "model"
+            ]
+            prop = _model_row_property(relationship_class, prop_name)
+            db_property = prop_name
+        else:
+            prop = _model_row_property(node_class, prop_name)
+            db_property = (prop.db_property or prop_name) if prop is not None else None
+        if prop is None:
+            return None
+        plan.append((name, variable, db_property, prop))
+    return plan
+
+
+def to_models(nodeset, model) -> list:
+    """
+    Builds a `model` object from every result contained in this node set,
+    as `model.from_orm` does from the relation trees returned by `to_relation_trees`.
+
+    When the fields of the model only read properties of the fetched nodes and relationships,
+    the query returns these properties alone, and the models are built from the rows
+    without inflating neomodel objects and walking their relation trees.
+    """
+    qbuilder = nodeset.query_cls(nodeset).build_ast()
+    plan = _plan_model_rows(qbuilder, model)
+    if not plan:
+        return [model.from_orm(node) for node in to_relation_trees(nodeset)]
+
+    projections = {}
+    for name, variable, db_property, prop in plan:
+        if variable is None:
+            continue
+        projections[name] = f"{variable}.{db_property}"
+        if prop.has_default:
+            # neomodel only sets the default when the property is missing on an existing node
+            projections[f"_{variable}_exists"] = f"{variable} IS NOT NULL"
+    rows = qbuilder._execute(dict_output=True, projections=projections)
+
+    models = []
+    for row in rows:
+        values = {}
+        for name, variable, _, prop in plan:
+            value = row[name] if variable is not None else None
+            if value is not None:
+                value = prop.inflate(value)
+            elif variable is not None and prop.has_default:
+                if row[f"_{variable}_exists"]:
+                    value = prop.default_value()
+            values[name] = value
+        models.append(model.parse_obj(values))
+    return models
+
+
 def classproperty(func) -> "classproperty.ClassPropertyFunction":
     class ClassPropertyFunction:
         def __init__(self, getter):
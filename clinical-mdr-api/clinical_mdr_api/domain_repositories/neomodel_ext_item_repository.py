@@ -3,6 +3,7 @@ from typing import Any, TypeVar
 
 from clinical_mdr_api.domain_repositories.models._utils import (
     CustomNodeSet,
+    to_models,
     to_relation_trees,
 )
 from clinical_mdr_api.repositories._utils import (
@@ -55,18 +56,17 @@ class NeomodelExtBaseRepository:
         )
         start: int = page_number * page_size
         end: int = start + page_size
-        nodes = to_relation_trees(
+        query = (
             self.get_neomodel_extension_query()
             .order_by(sort_paths[0] if len(sort_paths) > 0 else "uid")
-            .filter(*q_filters)[start:end]
+            .filter(*q_filters)
         )
-        all_data_model = [
-            self.return_model.from_orm(activity_node) for activity_node in nodes
-        ]
         if total_count:
-            len_query = self.root_class.nodes.filter(*q_filters)
-            all_nodes = len(len_query)
-        return all_data_model, all_nodes if total_count else 0
+            # Counted with the traversals and filters of the page, in the same query
+            query = query.fetch_total_count()
+        # The properties read by the return model are projected in the query when possible
+        all_data_model = to_models(query[start:end], self.return_model)
+        return all_data_model, query.total_count if total_count else 0
 
     def find_by_uid(self, uid: str) -> _StandardsReturnType | None:
         return to_relation_trees(self.get_neomodel_extension_query().filter(uid=uid))
@@ -1,6 +1,6 @@
 from typing import Collection
 
-from cachetools import TTLCache, cached
+from cachetools import cached
 from cachetools.keys import hashkey
 from neomodel import exceptions
 
@@ -14,18 +14,25 @@ from clinical_mdr_api.domain_repositories.models.clinical_programme import (
 from clinical_mdr_api.domain_repositories.models.project import Project
 from clinical_mdr_api.domain_repositories.models.study import StudyRoot
 from clinical_mdr_api.domains.projects.project import ProjectAR
+from clinical_mdr_api.repositories._cache import SharedTTLCache
 from clinical_mdr_api.repositories._utils import sb_clear_cache
 
 
 class ProjectRepository:
-    cache_store_item_by_uid = TTLCache(
-        maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    cache_store_item_by_uid = SharedTTLCache(
+        name="project_repository.cache_store_item_by_uid",
+        maxsize=config.CACHE_MAX_SIZE,
+        ttl=config.CACHE_TTL,
     )
-    cache_store_item_by_study_uid = TTLCache(
-        maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    cache_store_item_by_study_uid = SharedTTLCache(
+        name="project_repository.cache_store_item_by_study_uid",
+        maxsize=config.CACHE_MAX_SIZE,
+        ttl=config.CACHE_TTL,
     )
-    cache_store_item_by_project_number = TTLCache(
-        maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    cache_store_item_by_project_number = SharedTTLCache(
+        name="project_repository.cache_store_item_by_project_number",
+        maxsize=config.CACHE_MAX_SIZE,
+        ttl=config.CACHE_TTL,
     )
 
     def project_number_exists(self, project_number: str) -> bool:
@@ -48,7 +55,11 @@ class ProjectRepository:
             uid,
         )
 
-    @cached(cache=cache_store_item_by_uid, key=get_hashkey)
+    @cached(
+        cache=cache_store_item_by_uid,
+        key=get_hashkey,
+        lock=cache_store_item_by_uid.lock,
+    )
     def find_by_uid(self, uid: str) -> ProjectAR | None:
         project = Project.nodes.get_or_none(uid=uid)
         if project is not None:
@@ -63,7 +74,11 @@ class ProjectRepository:
             return project
         return None
 
-    @cached(cache=cache_store_item_by_project_number, key=get_hashkey)
+    @cached(
+        cache=cache_store_item_by_project_number,
+        key=get_hashkey,
+        lock=cache_store_item_by_project_number.lock,
+    )
     def find_by_project_number(self, project_number: str) -> ProjectAR | None:
         project = Project.nodes.first_or_none(project_number=project_number)
         if project is not None:
@@ -78,7 +93,11 @@ class ProjectRepository:
             return project
         return None
 
-    @cached(cache=cache_store_item_by_study_uid, key=get_hashkey)
+    @cached(
+        cache=cache_store_item_by_study_uid,
+        key=get_hashkey,
+        lock=cache_store_item_by_study_uid.lock,
+    )
     def find_by_study_uid(self, uid: str) -> ProjectAR:
         """
         Returns data from the project to which the study with provided uid belongs.
@@ -13,6 +13,9 @@ class DataModelIGRepository(StandardDataModelRepository):
     value_class = DataModelIGValue
     return_model = DataModelIG
 
+    def unique_sort_by(self) -> list[str] | None:
+        return ["version_number"]
+
     def specific_alias_clause(self) -> str:
         return """
         WITH *,
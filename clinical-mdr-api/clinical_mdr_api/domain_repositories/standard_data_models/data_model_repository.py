@@ -13,6 +13,9 @@ class DataModelRepository(StandardDataModelRepository):
     value_class = DataModelValue
     return_model = DataModel
 
+    def unique_sort_by(self) -> list[str] | None:
+        return ["version_number"]
+
     def specific_alias_clause(self) -> str:
         return """
         WITH *,
@@ -71,6 +71,9 @@ class DatasetRepository(StandardDataModelRepository):
     def sort_by(self) -> dict | None:
         return {"data_model_ig.ordinal": True}
 
+    def unique_sort_by(self) -> list[str] | None:
+        return ["implemented_dataset_class.dataset_class_name"]
+
     def specific_alias_clause(self) -> str:
         return """
         WITH *,
@@ -78,6 +78,9 @@ class DatasetScenarioRepository(StandardDataModelRepository):
     def sort_by(self) -> dict | None:
         return {"dataset.ordinal": True}
 
+    def unique_sort_by(self) -> list[str] | None:
+        return ["dataset.name"]
+
     def specific_alias_clause(self) -> str:
         return """
         WITH *,
@@ -16,6 +16,7 @@ from clinical_mdr_api.repositories._utils import (
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
+    ItemsPage,
 )
 
 
@@ -33,6 +34,13 @@ class StandardDataModelRepository(ABC):
     def sort_by(self) -> dict | None:
         return None
 
+    def unique_sort_by(self) -> list[str] | None:
+        """
+        Aliases identifying the rows sharing the same uid, in the order they are sorted after the uid.
+        Keyset pagination is only supported by the repositories returning them.
+        """
+        return None
+
     @abstractmethod
     def specific_alias_clause(self) -> str:
         """
@@ -155,8 +163,9 @@ class StandardDataModelRepository(ABC):
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        page_token: str | None = None,
         **kwargs,
-    ) -> tuple[list[BaseModel], int]:
+    ) -> ItemsPage:
         """
         Method runs a cypher query to fetch all needed data to create objects of type AggregateRootType.
         In the case of the following repository it will be some Concept aggregates.
@@ -170,7 +179,8 @@ class StandardDataModelRepository(ABC):
         :param filter_by:
         :param filter_operator:
         :param total_count:
-        :return GenericFilteringReturn[_AggregateRootType]:
+        :param page_token: token returned by a previous call, to retrieve the next page with keyset pagination
+        :return ItemsPage[BaseModel]:
         """
         match_clause = self.generic_match_clause(versioning_relationship="HAS_VERSION")
 
@@ -188,8 +198,11 @@ class StandardDataModelRepository(ABC):
             if self.union_match_clause(filter_query_parameters)
             else None,
             sort_by=self.sort_by() if self.sort_by() else sort_by,
+            implicit_sort_by="uid" if self.unique_sort_by() is not None else None,
+            unique_sort_by=self.unique_sort_by(),
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
             filter_by=FilterDict(elements=filter_by),
             filter_operator=filter_operator,
             total_count=total_count,
@@ -213,7 +226,11 @@ class StandardDataModelRepository(ABC):
         else:
             total_amount = 0
 
-        return extracted_items, total_amount
+        return ItemsPage(
+            extracted_items,
+            total_amount,
+            next_page_token=query.get_next_page_token(result_array, attributes_names),
+        )
 
     def get_distinct_headers(
         self,
@@ -87,6 +87,9 @@ class VariableClassRepository(StandardDataModelRepository):
     def sort_by(self) -> dict | None:
         return {"dataset_class.ordinal": True}
 
+    def unique_sort_by(self) -> list[str] | None:
+        return ["dataset_class.dataset_class_name"]
+
     def specific_alias_clause(self) -> str:
         return """
         WITH *,
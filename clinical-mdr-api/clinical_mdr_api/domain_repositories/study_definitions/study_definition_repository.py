@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Any
 
 from neomodel import NodeMeta, db
@@ -549,21 +550,70 @@ class StudyDefinitionRepository(ABC):
 
     @abstractmethod
     def _retrieve_fields_audit_trail(
-        self, uid: str
-    ) -> list[StudyFieldAuditTrailEntryAR] | None:
+        self,
+        uid: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        user_initials: str | None = None,
+        fields: list[str] | None = None,
+        page_size: int = 0,
+        page_token: str | None = None,
+    ) -> tuple[list[StudyFieldAuditTrailEntryAR] | None, str | None]:
         """
         Private method to retrieve an audit trail for a study by UID.
-        :return: A list of Study field audit trail objects.
+        :return: A list of Study field audit trail objects, None if nothing was found,
+            and the token of the next page, None if there is no next page.
         """
 
     def get_audit_trail_by_uid(
-        self, uid: str
+        self,
+        uid: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        user_initials: str | None = None,
+        fields: list[str] | None = None,
     ) -> list[StudyFieldAuditTrailEntryAR] | None:
         """
         Public method which is to retrieve the audit trail for a given study identified by UID.
+        The audit trail can be restricted to the actions done in a time range or by a user, and to some fields.
         :return: A list of retrieved data in a form StudyAuditTrailAR instances.
         """
-        return self._retrieve_fields_audit_trail(uid)
+        audit_trail, _ = self._retrieve_fields_audit_trail(
+            uid,
+            start_date=start_date,
+            end_date=end_date,
+            user_initials=user_initials,
+            fields=fields,
+        )
+        return audit_trail
+
+    def get_audit_trail_page_by_uid(
+        self,
+        uid: str,
+        page_size: int,
+        page_token: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        user_initials: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[StudyFieldAuditTrailEntryAR], str | None]:
+        """
+        Public method which is to retrieve a page of the audit trail for a given study identified by UID,
+        newest first. A page holds the actions of `page_size` distinct dates, the entries without any change
+        of the requested fields are left out, so a page may hold fewer entries.
+        :return: A list of retrieved data in a form StudyAuditTrailAR instances,
+            and the token to pass as page_token to retrieve the next page, None if it's the last page.
+        """
+        audit_trail, next_page_token = self._retrieve_fields_audit_trail(
+            uid,
+            start_date=start_date,
+            end_date=end_date,
+            user_initials=user_initials,
+            fields=fields,
+            page_size=page_size,
+            page_token=page_token,
+        )
+        return audit_trail or [], next_page_token
 
     @abstractmethod
     def _retrieve_study_subpart_with_history(self, uid: str, is_subpart: bool = False):
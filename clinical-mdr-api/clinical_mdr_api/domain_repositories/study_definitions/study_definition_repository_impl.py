@@ -1884,10 +1884,46 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
         return data
 
     def _retrieve_fields_audit_trail(
-        self, uid: str
-    ) -> list[StudyFieldAuditTrailEntryAR] | None:
-        query = """
-        MATCH (root:StudyRoot {uid: $studyuid})-[:AUDIT_TRAIL]->(action)
+        self,
+        uid: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        user_initials: str | None = None,
+        fields: list[str] | None = None,
+        page_size: int = 0,
+        page_token: str | None = None,
+    ) -> tuple[list[StudyFieldAuditTrailEntryAR] | None, str | None]:
+        next_page_token = None
+        if page_size > 0:
+            # Keyset pagination on the action dates, a page holds all the actions of page_size dates
+            (
+                action_filter,
+                action_params,
+                next_page_token,
+            ) = helpers.study_action_page_filter(
+                "MATCH (:StudyRoot {uid: $studyuid})-[:AUDIT_TRAIL]->(action:StudyAction)",
+                "action",
+                {"studyuid": uid},
+                page_size,
+                page_token,
+                start_date,
+                end_date,
+                user_initials,
+            )
+            if action_filter is None:
+                return [], None
+        elif page_token:
+            raise exceptions.ValidationException(
+                "page_token can only be used together with page_size"
+            )
+        else:
+            action_filter, action_params = helpers.study_action_filter(
+                "action", start_date, end_date, user_initials
+            )
+
+        query = f"""
+        MATCH (root:StudyRoot {{uid: $studyuid}})-[:AUDIT_TRAIL]->(action:StudyAction)
+        {action_filter}
  
         OPTIONAL MATCH (action)-[:BEFORE]->(before)
         WHERE "StudyField" in labels(before) or "StudyValue" in labels(before)
@@ -1935,21 +1971,21 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
         WHERE NOT (field_with_value[1][0] IS NOT NULL AND field_with_value[1][1] IS NOT NULL AND field_with_value[1][0] = field_with_value[1][1])
             AND NOT (field_with_value[1][0] IS NULL AND field_with_value[1][1] IS NULL)
         RETURN study_uid, toString(date) as date, user_initials, collect(
-             distinct {action:action, 
+             distinct {{action:action, 
              field:field_with_value[0], 
              before:toString(field_with_value[1][0]),  
              after:toString(field_with_value[1][1])
-             }) as actions 
+             }}) as actions 
         ORDER BY date DESC
 
       """
 
-        query_parameters = {"studyuid": uid}
+        query_parameters = {"studyuid": uid, **action_params}
         result_array, _ = db.cypher_query(query, query_parameters)
 
         # if the study is not found, return None.
         if len(result_array) == 0:
-            return None
+            return None, next_page_token
         audit_trail = [
             StudyFieldAuditTrailEntryAR(
                 study_uid=row[0],
@@ -1965,11 +2001,15 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
                     )
                     for action in row[3]
                     if action["field"] not in ["study_id_prefix"]
+                    and (
+                        fields is None
+                        or self.truncate_code_or_codes_suffix(action["field"]) in fields
+                    )
                 ],
             )
             for row in result_array
         ]
-        return audit_trail
+        return audit_trail, next_page_token
 
     @classmethod
     def truncate_code_or_codes_suffix(
@@ -2118,6 +2158,12 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
                             version_timestamp: ldr.start_date,
                             version_number: ldr.version_number
                         }  END AS draft_metadata,
+                        CASE WHEN study_parent_part_uid IS NULL THEN sv.study_id
+                        ELSE head([(sr)<-[:STUDY_SUBPART]-(:StudyRoot)-[:LATEST]->(psv:StudyValue) | psv.study_id + '-' + sv.subpart_id])
+                        END AS study_id,
+                        head([(sv)-[:HAS_PROJECT]->(:StudyProjectField)<-[:HAS_FIELD]-(p:Project) | p.name]) AS project_name,
+                        head([(sv)-[:HAS_PROJECT]->(:StudyProjectField)<-[:HAS_FIELD]-(:Project)<-[:HOLDS_PROJECT]-(cp:ClinicalProgramme) | cp.name])
+                        AS clinical_programme_name,
                         has_study_objective, has_study_endpoint, has_study_criteria, has_study_activity, has_study_activity_instruction
                     """
         return alias_clause
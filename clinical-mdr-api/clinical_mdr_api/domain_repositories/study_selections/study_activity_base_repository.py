@@ -1,4 +1,5 @@
 import abc
+import bisect
 import datetime
 from typing import Generic, TypeVar
 
@@ -28,6 +29,8 @@ _AggregateRootType = TypeVar("_AggregateRootType")
 
 class StudySelectionActivityBaseRepository(Generic[_AggregateRootType], abc.ABC):
     _aggregate_root_type: StudySelectionBaseAR
+    # Label of the selection nodes, used to find the dates of a page of their audit trail
+    _selection_label: str
 
     @staticmethod
     def _acquire_write_lock_study_value(uid: str) -> None:
@@ -71,7 +74,11 @@ class StudySelectionActivityBaseRepository(Generic[_AggregateRootType], abc.ABC)
         raise NotImplementedError
 
     @abc.abstractmethod
-    def get_audit_trail_query(self, study_selection_uid: str):
+    def get_audit_trail_query(self, study_selection_uid: str, action_filter: str = ""):
+        """
+        Returns the audit trail query of a specific selection, or of all the selections of the study.
+        In the latter case, `action_filter` is a WHERE clause on the `asa` actions which created the selection versions.
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -247,6 +254,136 @@ class StudySelectionActivityBaseRepository(Generic[_AggregateRootType], abc.ABC)
     def is_repository_based_on_ordered_selection(self):
         return True
 
+    @staticmethod
+    def _get_moved_selection_uids(
+        unchanged_selections: list[tuple[int, StudySelectionBaseVO, int]]
+    ) -> set[str]:
+        """
+        Returns the uids of the selections that were moved, out of the unchanged selections
+        given as (new order, selection, old order) tuples in the new order.
+
+        The selections keeping their relative order are the longest increasing subsequence of the old orders,
+        the other ones are the moved ones. The selections in between only shift because of the moves.
+        """
+        # tails[length - 1] is the index of the smallest old order ending an increasing subsequence of that length
+        tails = []
+        tail_orders = []
+        previous = [None] * len(unchanged_selections)
+        for index, (_, _, old_order) in enumerate(unchanged_selections):
+            position = bisect.bisect_left(tail_orders, old_order)
+            if position > 0:
+                previous[index] = tails[position - 1]
+            if position == len(tails):
+                tails.append(index)
+                tail_orders.append(old_order)
+            else:
+                tails[position] = index
+                tail_orders[position] = old_order
+        kept = set()
+        index = tails[-1] if tails else None
+        while index is not None:
+            kept.add(index)
+            index = previous[index]
+        return {
+            selection.study_selection_uid
+            for index, (_, selection, _) in enumerate(unchanged_selections)
+            if index not in kept
+        }
+
+    @staticmethod
+    def _update_selection_orders(study_uid: str, orders: dict[str, int]) -> set[str]:
+        """
+        Sets the order of the given selections of the latest study value, in a single statement.
+
+        The order the selection had when its audit entry was created is kept on the AFTER relationship
+        of that entry, so that the audit trail isn't rewritten by the shifts, which have no entry of their own.
+        The selections that are also part of a locked or released study version are left untouched,
+        the uids of the updated ones are returned.
+        """
+        if not orders:
+            return set()
+        updated_uids, _ = db.cypher_query(
+            """
+            MATCH (:StudyRoot {uid: $study_uid})-[:LATEST]->(sv:StudyValue)
+            UNWIND $orders AS row
+            MATCH (sv)-->(selection:StudySelection {uid: row.uid})
+            WHERE NOT EXISTS {
+                MATCH (selection)<--(other_value:StudyValue)
+                WHERE other_value <> sv
+            }
+            FOREACH (after IN [(selection)<-[after:AFTER]-(:StudyAction) | after] |
+                SET after.order = coalesce(after.order, selection.order)
+            )
+            SET selection.order = row.order
+            RETURN selection.uid
+            """,
+            {
+                "study_uid": study_uid,
+                "orders": [
+                    {"uid": uid, "order": order} for uid, order in orders.items()
+                ],
+            },
+        )
+        return {uid for uid, in updated_uids}
+
+    def _get_ordered_selection_changes(
+        self, study_selection: StudySelectionBaseAR
+    ) -> tuple[list, list]:
+        """
+        Returns the selections to remove and to add for a repository based on ordered selections.
+
+        The selections that are only shifted by moves, additions or deletions of other selections
+        keep their node, their order is updated in place without a new audit entry.
+        The moved and changed selections get a new node and an audit entry each,
+        as well as the shifted selections that are part of a locked or released study version.
+        """
+        closure_data = study_selection.repository_closure_data
+        closure_by_uid = {
+            item.study_selection_uid: (order, item)
+            for order, item in enumerate(closure_data, start=1)
+        }
+        current_uids = {
+            selection.study_selection_uid
+            for selection in study_selection.study_objects_selection
+        }
+        # only the deleted selections are removed
+        selections_to_remove = [
+            (order, closure_item)
+            for order, closure_item in enumerate(closure_data, start=1)
+            if closure_item.study_selection_uid not in current_uids
+        ]
+        unchanged_selections = [
+            (order, selection, closure_by_uid[selection.study_selection_uid][0])
+            for order, selection in enumerate(
+                study_selection.study_objects_selection, start=1
+            )
+            if selection.study_selection_uid in closure_by_uid
+            and closure_by_uid[selection.study_selection_uid][1] is selection
+        ]
+        moved_uids = self._get_moved_selection_uids(unchanged_selections)
+        updated_uids = self._update_selection_orders(
+            study_selection.study_uid,
+            {
+                selection.study_selection_uid: order
+                for order, selection, old_order in unchanged_selections
+                if order != old_order
+                and selection.study_selection_uid not in moved_uids
+            },
+        )
+
+        selections_to_add = []
+        for order, selection in enumerate(
+            study_selection.study_objects_selection, start=1
+        ):
+            if selection.study_selection_uid not in closure_by_uid:
+                selections_to_add.append((order, selection))
+            elif selection.study_selection_uid not in updated_uids:
+                old_order, closure_item = closure_by_uid[selection.study_selection_uid]
+                if closure_item is not selection or old_order != order:
+                    selections_to_remove.append((order, closure_item))
+                    selections_to_add.append((order, selection))
+        return selections_to_remove, selections_to_add
+
     def save(self, study_selection: StudySelectionBaseAR, author: str) -> None:
         assert study_selection.repository_closure_data is not None
         # get the closure_data
@@ -257,41 +394,42 @@ class StudySelectionActivityBaseRepository(Generic[_AggregateRootType], abc.ABC)
         study_root_node: StudyRoot = StudyRoot.nodes.get(uid=study_selection.study_uid)
         latest_study_value_node: StudyValue = study_root_node.latest_value.get_or_none()
 
-        # process new/changed/deleted elements for each activity
-        selections_to_remove = []
-        selections_to_add = []
+        if self.is_repository_based_on_ordered_selection():
+            (
+                selections_to_remove,
+                selections_to_add,
+            ) = self._get_ordered_selection_changes(study_selection)
+        else:
+            # process new/changed/deleted elements for each activity
+            selections_to_remove = []
+            selections_to_add = []
 
-        # check if object is removed from the selection list - delete has been called
-        if closure_data_length > len(study_selection.study_objects_selection):
-            # remove the last item from old list, as there will no longer be any study activity with that high order
-            if self.is_repository_based_on_ordered_selection():
-                selections_to_remove.append((len(closure_data), closure_data[-1]))
-            else:
+            # check if object is removed from the selection list - delete has been called
+            if closure_data_length > len(study_selection.study_objects_selection):
                 for order, closure_item in enumerate(closure_data, start=1):
                     if closure_item not in study_selection.study_objects_selection:
                         selections_to_remove.append((order, closure_item))
 
-        # loop through new data - start=1 as order starts at 1 not at 0 and find what needs to be removed and added
-        for order, selection in enumerate(
-            study_selection.study_objects_selection, start=1
-        ):
-            # check whether something new is added
-            if closure_data_length > order - 1:
-                # check if anything has changed
-                if selection is not closure_data[order - 1]:
+            # loop through new data - start=1 as order starts at 1 not at 0 and find what needs to be removed and added
+            for order, selection in enumerate(
+                study_selection.study_objects_selection, start=1
+            ):
+                # check whether something new is added
+                if closure_data_length > order - 1:
+                    # check if anything has changed
                     # don't modify the item if the change is the order change,
                     # if the item is actually changed (the uid is the same) we should modify it
                     if (
-                        self.is_repository_based_on_ordered_selection()
-                        or selection.study_selection_uid
+                        selection is not closure_data[order - 1]
+                        and selection.study_selection_uid
                         == closure_data[order - 1].study_selection_uid
                     ):
                         # update the selection by removing the old if the old exists, and adding new selection
                         selections_to_remove.append((order, closure_data[order - 1]))
                         selections_to_add.append((order, selection))
-            else:
-                # else something new have been added
-                selections_to_add.append((order, selection))
+                else:
+                    # else something new have been added
+                    selections_to_add.append((order, selection))
 
         # audit trail nodes dictionary, holds the new nodes created for the audit trail
         audit_trail_nodes = {}
@@ -367,18 +505,45 @@ class StudySelectionActivityBaseRepository(Generic[_AggregateRootType], abc.ABC)
         return audit_node
 
     def _get_selection_with_history(
-        self, study_uid: str, study_selection_uid: str = None
-    ):
+        self,
+        study_uid: str,
+        study_selection_uid: str = None,
+        start_date: datetime.datetime | None = None,
+        end_date: datetime.datetime | None = None,
+        user_initials: str | None = None,
+        page_size: int = 0,
+        page_token: str | None = None,
+    ) -> tuple[list, str | None]:
         """
         returns the audit trail for study activity either for a specific selection or for all study activity for the study
+        The audit trail of all study activities can be restricted to the actions done in a time range or by a user,
+        and to a page of the dates of these actions, along with the token of the next page.
         """
-
+        (
+            action_filter,
+            action_params,
+            next_page_token,
+        ) = helpers.study_selection_action_filter(
+            self._selection_label,
+            study_uid,
+            start_date,
+            end_date,
+            user_initials,
+            page_size,
+            page_token,
+        )
+        if action_filter is None:
+            return [], None
         audit_trail_query = self.get_audit_trail_query(
-            study_selection_uid=study_selection_uid
+            study_selection_uid=study_selection_uid, action_filter=action_filter
         )
         specific_activity_selections_audit_trail = db.cypher_query(
             audit_trail_query,
-            {"study_uid": study_uid, "study_selection_uid": study_selection_uid},
+            {
+                "study_uid": study_uid,
+                "study_selection_uid": study_selection_uid,
+                **action_params,
+            },
         )
         result = []
         for res in helpers.db_result_to_list(specific_activity_selections_audit_trail):
@@ -393,16 +558,50 @@ class StudySelectionActivityBaseRepository(Generic[_AggregateRootType], abc.ABC)
                     selection=res, change_type=change_type, end_date=end_date
                 )
             )
-        return result
+        return result, next_page_token
 
     def find_selection_history(
-        self, study_uid: str, study_selection_uid: str | None = None
+        self,
+        study_uid: str,
+        study_selection_uid: str | None = None,
+        start_date: datetime.datetime | None = None,
+        end_date: datetime.datetime | None = None,
+        user_initials: str | None = None,
     ) -> list[dict | None]:
         if study_selection_uid:
-            return self._get_selection_with_history(
+            selection_history, _ = self._get_selection_with_history(
                 study_uid=study_uid, study_selection_uid=study_selection_uid
             )
-        return self._get_selection_with_history(study_uid=study_uid)
+            return selection_history
+        selection_history, _ = self._get_selection_with_history(
+            study_uid=study_uid,
+            start_date=start_date,
+            end_date=end_date,
+            user_initials=user_initials,
+        )
+        return selection_history
+
+    def find_selection_history_page(
+        self,
+        study_uid: str,
+        page_size: int,
+        page_token: str | None = None,
+        start_date: datetime.datetime | None = None,
+        end_date: datetime.datetime | None = None,
+        user_initials: str | None = None,
+    ) -> tuple[list, str | None]:
+        """
+        Returns the versions of the selections of a study created on `page_size` dates of edit, newest dates first,
+        and the token to pass as page_token to retrieve the next page, None if it's the last page.
+        """
+        return self._get_selection_with_history(
+            study_uid=study_uid,
+            start_date=start_date,
+            end_date=end_date,
+            user_initials=user_initials,
+            page_size=page_size,
+            page_token=page_token,
+        )
 
     def close(self) -> None:
         # Our repository guidelines state that repos should have a close method
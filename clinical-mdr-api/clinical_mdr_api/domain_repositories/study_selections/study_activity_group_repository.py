@@ -1,6 +1,7 @@
 import datetime
 from dataclasses import dataclass
 
+from clinical_mdr_api.domain_repositories._utils import helpers
 from clinical_mdr_api.domain_repositories.generic_repository import (
     manage_previous_connected_study_selection_relationships,
 )
@@ -45,6 +46,7 @@ class StudySelectionActivityGroupRepository(
     StudySelectionActivityBaseRepository[StudySelectionActivityGroupAR]
 ):
     _aggregate_root_type = StudySelectionActivityGroupAR
+    _selection_label = "StudyActivityGroup"
 
     def is_repository_based_on_ordered_selection(self):
         return False
@@ -102,7 +104,7 @@ class StudySelectionActivityGroupRepository(
             end_date=end_date,
         )
 
-    def get_audit_trail_query(self, study_selection_uid: str):
+    def get_audit_trail_query(self, study_selection_uid: str, action_filter: str = ""):
         if study_selection_uid:
             audit_trail_cypher = """
             MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(sa:StudyActivityGroup {uid: $study_selection_uid})
@@ -112,9 +114,10 @@ class StudySelectionActivityGroupRepository(
             WITH distinct(all_sa), study_activity
             """
         else:
-            audit_trail_cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sa:StudyActivityGroup)
+            audit_trail_cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(asa:StudyAction)-[{helpers.study_selection_audit_trail_relationship(action_filter)}]->(all_sa:StudyActivityGroup)
                 <-[:STUDY_ACTIVITY_HAS_STUDY_ACTIVITY_GROUP]-(study_activity:StudyActivity)
+            {action_filter}
             WITH DISTINCT all_sa, study_activity
             """
         audit_trail_cypher += """
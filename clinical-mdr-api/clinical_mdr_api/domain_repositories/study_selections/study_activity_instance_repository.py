@@ -1,6 +1,7 @@
 import datetime
 from dataclasses import dataclass
 
+from clinical_mdr_api.domain_repositories._utils import helpers
 from clinical_mdr_api.domain_repositories.generic_repository import (
     manage_previous_connected_study_selection_relationships,
 )
@@ -51,6 +52,7 @@ class StudySelectionActivityInstanceRepository(
     StudySelectionActivityBaseRepository[StudySelectionActivityInstanceAR]
 ):
     _aggregate_root_type = StudySelectionActivityInstanceAR
+    _selection_label = "StudyActivityInstance"
 
     def is_repository_based_on_ordered_selection(self):
         return False
@@ -226,7 +228,7 @@ class StudySelectionActivityInstanceRepository(
             end_date=end_date,
         )
 
-    def get_audit_trail_query(self, study_selection_uid: str):
+    def get_audit_trail_query(self, study_selection_uid: str, action_filter: str = ""):
         if study_selection_uid:
             audit_trail_cypher = """
             MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(sa:StudyActivityInstance {uid: $study_selection_uid})
@@ -235,8 +237,9 @@ class StudySelectionActivityInstanceRepository(
             WITH distinct(all_sa)
             """
         else:
-            audit_trail_cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sa:StudyActivityInstance)
+            audit_trail_cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(asa:StudyAction)-[{helpers.study_selection_audit_trail_relationship(action_filter)}]->(all_sa:StudyActivityInstance)
+            {action_filter}
             WITH DISTINCT all_sa
             """
         audit_trail_cypher += """
@@ -1,6 +1,7 @@
 import datetime
 from dataclasses import dataclass
 
+from clinical_mdr_api.domain_repositories._utils import helpers
 from clinical_mdr_api.domain_repositories.generic_repository import (
     manage_previous_connected_study_selection_relationships,
 )
@@ -55,6 +56,7 @@ class StudySelectionActivityRepository(
     StudySelectionActivityBaseRepository[StudySelectionActivityAR]
 ):
     _aggregate_root_type = StudySelectionActivityAR
+    _selection_label = "StudyActivity"
 
     def _create_value_object_from_repository(
         self, selection: dict, acv: bool
@@ -220,7 +222,7 @@ class StudySelectionActivityRepository(
             end_date=end_date,
         )
 
-    def get_audit_trail_query(self, study_selection_uid: str):
+    def get_audit_trail_query(self, study_selection_uid: str, action_filter: str = ""):
         if study_selection_uid:
             audit_trail_cypher = """
             MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(sa:StudyActivity { uid: $study_selection_uid})
@@ -229,8 +231,9 @@ class StudySelectionActivityRepository(
             WITH distinct(all_sa)
             """
         else:
-            audit_trail_cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sa:StudyActivity)
+            audit_trail_cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(asa:StudyAction)-[{helpers.study_selection_audit_trail_relationship(action_filter)}]->(all_sa:StudyActivity)
+            {action_filter}
             WITH DISTINCT all_sa
             """
         audit_trail_cypher += """
@@ -249,12 +252,13 @@ class StudySelectionActivityRepository(
                     OPTIONAL MATCH (all_sa)-[:STUDY_ACTIVITY_HAS_STUDY_SOA_GROUP]->(soa_group:StudySoAGroup)-[:HAS_FLOWCHART_GROUP]->(fgr:CTTermRoot)
                     WITH DISTINCT all_sa, ar, ver, fgr, soa_group
                     ORDER BY all_sa.order ASC
-                    MATCH (all_sa)<-[:AFTER]-(asa:StudyAction)
+                    MATCH (all_sa)<-[after:AFTER]-(asa:StudyAction)
                     OPTIONAL MATCH (all_sa)<-[:BEFORE]-(bsa:StudyAction)
-                    WITH all_sa, ar, asa, bsa, ver, fgr, soa_group
+                    WITH all_sa, ar, asa, after, bsa, ver, fgr, soa_group
                     ORDER BY all_sa.uid, asa.date DESC
                     RETURN
-                        all_sa.order AS activity_order,
+                        // The order of a selection shifted since the action is kept on the AFTER relationship
+                        coalesce(after.order, all_sa.order) AS activity_order,
                         all_sa.uid AS study_selection_uid,
                         head([(all_sa)-[:STUDY_ACTIVITY_HAS_STUDY_ACTIVITY_SUBGROUP]->(study_activity_subgroup_selection)
                             -[:HAS_SELECTED_ACTIVITY_SUBGROUP]->(:ActivitySubGroupValue)<-[:HAS_VERSION]-(activity_subgroup_root:ActivitySubGroupRoot) | 
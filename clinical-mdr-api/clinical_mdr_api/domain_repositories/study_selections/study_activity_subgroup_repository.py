@@ -1,6 +1,7 @@
 import datetime
 from dataclasses import dataclass
 
+from clinical_mdr_api.domain_repositories._utils import helpers
 from clinical_mdr_api.domain_repositories.generic_repository import (
     manage_previous_connected_study_selection_relationships,
 )
@@ -44,6 +45,7 @@ class StudySelectionActivitySubGroupRepository(
     StudySelectionActivityBaseRepository[StudySelectionActivitySubGroupAR]
 ):
     _aggregate_root_type = StudySelectionActivitySubGroupAR
+    _selection_label = "StudyActivitySubGroup"
 
     def is_repository_based_on_ordered_selection(self):
         return False
@@ -101,7 +103,7 @@ class StudySelectionActivitySubGroupRepository(
             end_date=end_date,
         )
 
-    def get_audit_trail_query(self, study_selection_uid: str):
+    def get_audit_trail_query(self, study_selection_uid: str, action_filter: str = ""):
         if study_selection_uid:
             audit_trail_cypher = """
             MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(sa:StudyActivitySubGroup {uid: $study_selection_uid})
@@ -111,9 +113,10 @@ class StudySelectionActivitySubGroupRepository(
             WITH distinct(all_sa), study_activity
             """
         else:
-            audit_trail_cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sa:StudyActivitySubGroup)
+            audit_trail_cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(asa:StudyAction)-[{helpers.study_selection_audit_trail_relationship(action_filter)}]->(all_sa:StudyActivitySubGroup)
                 <-[:STUDY_ACTIVITY_HAS_STUDY_ACTIVITY_SUBGROUP]-(study_activity:StudyActivity)
+            {action_filter}
             WITH DISTINCT all_sa, study_activity
             """
         audit_trail_cypher += """
@@ -417,11 +417,35 @@ class StudySelectionObjectiveRepository:
         return StudyObjective.get_next_free_uid_and_increment_counter()
 
     def _get_selection_with_history(
-        self, study_uid: str, study_selection_uid: str | None = None
-    ):
+        self,
+        study_uid: str,
+        study_selection_uid: str | None = None,
+        start_date: datetime.datetime | None = None,
+        end_date: datetime.datetime | None = None,
+        user_initials: str | None = None,
+        page_size: int = 0,
+        page_token: str | None = None,
+    ) -> tuple[list[SelectionHistory], str | None]:
         """
         returns the audit trail for study objectives either for a specific selection or for all study objectives for the study
+        The audit trail of all study objectives can be restricted to the actions done in a time range or by a user,
+        and to a page of the dates of these actions, along with the token of the next page.
         """
+        (
+            action_filter,
+            action_params,
+            next_page_token,
+        ) = helpers.study_selection_action_filter(
+            "StudyObjective",
+            study_uid,
+            start_date,
+            end_date,
+            user_initials,
+            page_size,
+            page_token,
+        )
+        if action_filter is None:
+            return [], None
         if study_selection_uid:
             cypher = """
             MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(so:StudyObjective { uid: $study_selection_uid})
@@ -430,8 +454,11 @@ class StudySelectionObjectiveRepository:
             WITH distinct(all_so)
             """
         else:
-            cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_so:StudyObjective)
+            # Each version of a study objective is created by one action, so the filters
+            # on the actions are applied before any version is expanded
+            cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(asa:StudyAction)-[{helpers.study_selection_audit_trail_relationship(action_filter)}]->(all_so:StudyObjective)
+            {action_filter}
             WITH DISTINCT all_so
             """
         specific_objective_selections_audit_trail = db.cypher_query(
@@ -466,7 +493,11 @@ class StudySelectionObjectiveRepository:
                 bsa.date AS end_date,
                 all_so.order AS order,
                 ver.version AS objective_version""",
-            {"study_uid": study_uid, "study_selection_uid": study_selection_uid},
+            {
+                "study_uid": study_uid,
+                "study_selection_uid": study_selection_uid,
+                **action_params,
+            },
         )
         result = []
         for res in helpers.db_result_to_list(specific_objective_selections_audit_trail):
@@ -491,20 +522,54 @@ class StudySelectionObjectiveRepository:
                     objective_version=res["objective_version"],
                 )
             )
-        return result
+        return result, next_page_token
 
     def find_selection_history(
-        self, study_uid: str, study_selection_uid: str | None = None
+        self,
+        study_uid: str,
+        study_selection_uid: str | None = None,
+        start_date: datetime.datetime | None = None,
+        end_date: datetime.datetime | None = None,
+        user_initials: str | None = None,
     ) -> list[dict | None]:
         """
         Simple method to return all versions of a study objectives for a study.
         Optionally a specific selection uid is given to see only the response for a specific selection.
         """
         if study_selection_uid:
-            return self._get_selection_with_history(
+            selection_history, _ = self._get_selection_with_history(
                 study_uid=study_uid, study_selection_uid=study_selection_uid
             )
-        return self._get_selection_with_history(study_uid=study_uid)
+            return selection_history
+        selection_history, _ = self._get_selection_with_history(
+            study_uid=study_uid,
+            start_date=start_date,
+            end_date=end_date,
+            user_initials=user_initials,
+        )
+        return selection_history
+
+    def find_selection_history_page(
+        self,
+        study_uid: str,
+        page_size: int,
+        page_token: str | None = None,
+        start_date: datetime.datetime | None = None,
+        end_date: datetime.datetime | None = None,
+        user_initials: str | None = None,
+    ) -> tuple[list[SelectionHistory], str | None]:
+        """
+        Returns the versions of the study objectives of a study created on `page_size` dates of edit, newest dates first,
+        and the token to pass as page_token to retrieve the next page, None if it's the last page.
+        """
+        return self._get_selection_with_history(
+            study_uid=study_uid,
+            start_date=start_date,
+            end_date=end_date,
+            user_initials=user_initials,
+            page_size=page_size,
+            page_token=page_token,
+        )
 
     def close(self) -> None:
         # Our repository guidelines state that repos should have a close method
@@ -1,6 +1,7 @@
 import datetime
 from dataclasses import dataclass
 
+from clinical_mdr_api.domain_repositories._utils import helpers
 from clinical_mdr_api.domain_repositories.generic_repository import (
     manage_previous_connected_study_selection_relationships,
 )
@@ -41,6 +42,7 @@ class SelectionHistory:
 
 class StudySoAGroupRepository(StudySelectionActivityBaseRepository[StudySoAGroupAR]):
     _aggregate_root_type = StudySoAGroupAR
+    _selection_label = "StudySoAGroup"
 
     def is_repository_based_on_ordered_selection(self):
         return False
@@ -99,7 +101,7 @@ class StudySoAGroupRepository(StudySelectionActivityBaseRepository[StudySoAGroup
             end_date=end_date,
         )
 
-    def get_audit_trail_query(self, study_selection_uid: str):
+    def get_audit_trail_query(self, study_selection_uid: str, action_filter: str = ""):
         if study_selection_uid:
             audit_trail_cypher = """
             MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(sa:StudySoAGroup {uid: $study_selection_uid})
@@ -109,9 +111,10 @@ class StudySoAGroupRepository(StudySelectionActivityBaseRepository[StudySoAGroup
             WITH distinct(all_sa), study_activity
             """
         else:
-            audit_trail_cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudySoAGroup)-[:BEFORE|AFTER]->(all_sa:StudySoAGroup)
+            audit_trail_cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(asa:StudyAction)-[{helpers.study_selection_audit_trail_relationship(action_filter)}]->(all_sa:StudySoAGroup)
                 <-[:STUDY_ACTIVITY_HAS_STUDY_SOA_GROUP]-(study_activity:StudyActivity)
+            {action_filter}
             WITH DISTINCT all_sa, study_activity
             """
         audit_trail_cypher += """
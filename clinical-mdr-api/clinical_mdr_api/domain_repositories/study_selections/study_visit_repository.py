@@ -152,6 +152,41 @@ class StudyVisitRepository:
 
         return result[0][0] if len(result) > 0 else 0
 
+    def count_activities_by_visit(
+        self, study_uid: str, study_value_version: str | None = None
+    ) -> dict[str, int]:
+        """
+        Returns the amount of activities assigned to each study visit of given study, in a single query
+
+        :return: dict of visit uid to amount of activities, visits without activities are left out
+        """
+        if study_value_version:
+            query = """
+                MATCH (:StudyRoot {uid:$study_uid})-[:HAS_VERSION{status:'RELEASED', version:$study_value_version}]-(:StudyValue)-[:HAS_STUDY_VISIT]->(visit:StudyVisit)
+                WITH DISTINCT visit.uid AS visit_uid
+                MATCH (:StudyRoot)-[l:HAS_VERSION{status:'RELEASED', version:$study_value_version}]-(:StudyValue)-[:HAS_STUDY_VISIT]->(svis:StudyVisit{uid:visit_uid})
+                MATCH (svis:StudyVisit)-[:STUDY_VISIT_HAS_SCHEDULE]->(activity_schedule:StudyActivitySchedule)--(:StudyValue)-[l:HAS_VERSION{status:'RELEASED', version:$study_value_version}]-(:StudyRoot)
+                RETURN visit_uid, count(activity_schedule)
+                """
+            result, _ = db.cypher_query(
+                query=query,
+                params={
+                    "study_uid": study_uid,
+                    "study_value_version": study_value_version,
+                },
+            )
+        else:
+            query = """
+                MATCH (:StudyRoot {uid:$study_uid})-[:LATEST]->(:StudyValue)-[:HAS_STUDY_VISIT]->(visit:StudyVisit)
+                WITH DISTINCT visit.uid AS visit_uid
+                MATCH (:StudyValue)-[:HAS_STUDY_VISIT]->(svis:StudyVisit{uid:visit_uid})
+                MATCH (svis:StudyVisit)-[:STUDY_VISIT_HAS_SCHEDULE]->(activity_schedule:StudyActivitySchedule)
+                RETURN visit_uid, count(activity_schedule)
+                """
+            result, _ = db.cypher_query(query=query, params={"study_uid": study_uid})
+
+        return {visit_uid: count for visit_uid, count in result}
+
     def count_study_visits(self, study_uid: str) -> int:
         nodes = to_relation_trees(
             StudyVisit.nodes.filter(
@@ -1,10 +1,10 @@
-import logging
 from dataclasses import asdict, dataclass
+from threading import Lock
 
-from neo4j.exceptions import ServiceUnavailable
+from cachetools import TTLCache, cached
 from neomodel import db
 
-log = logging.getLogger(__name__)
+from clinical_mdr_api import config
 
 
 @dataclass
@@ -34,47 +34,44 @@ def parameter_concept_create_factory(name, query):
     return ParameterConcept(name, values)
 
 
+# The parameter concepts are fetched on first use, rather than when the API starts,
+# and kept for a while as they seldom change
+@cached(cache=TTLCache(maxsize=1, ttl=config.CACHE_TTL), lock=Lock())
+def get_parameter_concepts() -> list[ParameterConcept]:
+    time_unit = parameter_concept_create_factory(
+        name="TimeUnit",
+        query="""
+        MATCH (n:UnitDefinitionRoot)-[:LATEST_FINAL]->(v:UnitDefinitionValue)-[:HAS_CT_DIMENSION]->
+        (term_root:CTTermRoot)-[:HAS_NAME_ROOT]->()-[:LATEST_FINAL]->(:CTTermNameValue {name: "TIME"}) 
+        return n.uid as uid, v.name as name, 'TimeUnit' as type
+        """,
+    )
+    acidity_unit = parameter_concept_create_factory(
+        name="AcidityUnit",
+        query="""
+        MATCH (n:UnitDefinitionRoot)-[:LATEST_FINAL]->(v:UnitDefinitionValue)-[:HAS_CT_DIMENSION]->
+        (term_root:CTTermRoot)-[:HAS_NAME_ROOT]->()-[:LATEST_FINAL]->(:CTTermNameValue {name: "ACIDITY"}) 
+        return n.uid as uid, v.name as name, 'AcidityUnit' as type
+        """,
+    )
+    concentration_unit = parameter_concept_create_factory(
+        name="ConcentrationUnit",
+        query="""
+        MATCH (n:UnitDefinitionRoot)-[:LATEST_FINAL]->(v:UnitDefinitionValue)-[:HAS_CT_DIMENSION]->
+        (term_root:CTTermRoot)-[:HAS_NAME_ROOT]->()-[:LATEST_FINAL]->(:CTTermNameValue {name: "CONCENTRATION"}) 
+        return n.uid as uid, v.name as name, 'ConcentrationUnit' as type
+        """,
+    )
+    return [time_unit, acidity_unit, concentration_unit]
+
+
 class ComplexTemplateParameterRepository:
-    def __init__(self):
-        try:
-            self._fetch_concepts()
-        except ServiceUnavailable:
-            log.error(
-                "The neo4j database is unavailable. API functionality will be severely limited."
-            )
-            self.concepts = None
-
-    def _fetch_concepts(self):
-        time_unit = parameter_concept_create_factory(
-            name="TimeUnit",
-            query="""
-            MATCH (n:UnitDefinitionRoot)-[:LATEST_FINAL]->(v:UnitDefinitionValue)-[:HAS_CT_DIMENSION]->
-            (term_root:CTTermRoot)-[:HAS_NAME_ROOT]->()-[:LATEST_FINAL]->(:CTTermNameValue {name: "TIME"}) 
-            return n.uid as uid, v.name as name, 'TimeUnit' as type
-            """,
-        )
-        acidity_unit = parameter_concept_create_factory(
-            name="AcidityUnit",
-            query="""
-            MATCH (n:UnitDefinitionRoot)-[:LATEST_FINAL]->(v:UnitDefinitionValue)-[:HAS_CT_DIMENSION]->
-            (term_root:CTTermRoot)-[:HAS_NAME_ROOT]->()-[:LATEST_FINAL]->(:CTTermNameValue {name: "ACIDITY"}) 
-            return n.uid as uid, v.name as name, 'AcidityUnit' as type
-            """,
-        )
-        concentration_unit = parameter_concept_create_factory(
-            name="ConcentrationUnit",
-            query="""
-            MATCH (n:UnitDefinitionRoot)-[:LATEST_FINAL]->(v:UnitDefinitionValue)-[:HAS_CT_DIMENSION]->
-            (term_root:CTTermRoot)-[:HAS_NAME_ROOT]->()-[:LATEST_FINAL]->(:CTTermNameValue {name: "CONCENTRATION"}) 
-            return n.uid as uid, v.name as name, 'ConcentrationUnit' as type
-            """,
-        )
-        self.concepts = [time_unit, acidity_unit, concentration_unit]
+    @property
+    def concepts(self) -> list[ParameterConcept]:
+        return get_parameter_concepts()
 
     def find_extended(self):
         values = self.find_all_with_samples()
-        if self.concepts is None:
-            self._fetch_concepts()
         for concept in self.concepts:
             values.append(concept.get_values())
         values.sort(key=lambda s: s["name"])
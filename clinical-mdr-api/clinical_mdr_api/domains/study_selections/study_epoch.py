@@ -212,6 +212,20 @@ class StudyEpochVO:
         return self._is_deleted
 
 
+@dataclass
+class _VisitTiming:
+    """
+    Absolute duration of a visit, with the anchors it was computed from
+    """
+
+    visit: StudyVisitVO
+    anchor_visit: StudyVisitVO | None
+    subvisit_anchor: StudyVisitVO | None
+    absolute_duration: int | None
+    # whether the study day and week values of the visit were derived from this duration
+    derived: bool = False
+
+
 @dataclass
 class TimelineAR:
     """
@@ -219,10 +233,67 @@ class TimelineAR:
     Generally timeline consists of visits ordered by their internal relations.
     If there is a need to create ordered setup of visits and epochs you have to
     collect_visits_to_epochs
+
+    The ordered visits are kept until the visits are changed through add_visit, remove_visit or update_visit.
+    The absolute durations are kept by visit, only the visits whose anchors changed
+    and the visits anchored to them are recomputed when the timeline is generated again.
     """
 
     study_uid: str
-    _visits: list["StudyVisitOGM"]
+    _visits: list[StudyVisitVO]
+    _ordered_visits: list[StudyVisitVO] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _timings: dict[int, _VisitTiming] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def _get_timing(self, visit: StudyVisitVO) -> _VisitTiming:
+        timing = self._timings.get(id(visit))
+        if timing is None or timing.visit is not visit:
+            timing = _VisitTiming(
+                visit=visit,
+                anchor_visit=visit.anchor_visit,
+                subvisit_anchor=visit.subvisit_anchor,
+                absolute_duration=visit.get_absolute_duration(),
+            )
+            self._timings[id(visit)] = timing
+        return timing
+
+    def _get_absolute_duration(self, visit: StudyVisitVO) -> int | None:
+        return self._get_timing(visit).absolute_duration
+
+    def _invalidate_timings(self):
+        """
+        Drops the absolute durations of the visits whose anchors changed, and of the visits anchored to them
+        """
+        anchored_visits = {}
+        invalid_visits = []
+        for visit in self._visits:
+            for anchor in (visit.anchor_visit, visit.subvisit_anchor):
+                if anchor is not None:
+                    anchored_visits.setdefault(id(anchor), []).append(visit)
+            timing = self._timings.get(id(visit))
+            if (
+                timing is None
+                or timing.visit is not visit
+                or timing.anchor_visit is not visit.anchor_visit
+                or timing.subvisit_anchor is not visit.subvisit_anchor
+            ):
+                invalid_visits.append(visit)
+        # the durations of removed visits are not needed anymore
+        visit_ids = {id(visit) for visit in self._visits}
+        for visit_id in list(self._timings):
+            if visit_id not in visit_ids:
+                del self._timings[visit_id]
+        invalidated = set()
+        while invalid_visits:
+            visit = invalid_visits.pop()
+            if id(visit) in invalidated:
+                continue
+            invalidated.add(id(visit))
+            self._timings.pop(id(visit), None)
+            invalid_visits.extend(anchored_visits.get(id(visit), []))
 
     def _generate_timeline(self):
         """
@@ -265,11 +336,12 @@ class TimelineAR:
             ):
                 visits = subvisit_sets[visit.visit_sublabel_reference]
                 visit.set_subvisit_anchor(visits[0].visit)
+        self._invalidate_timings()
         ordered_visits = sorted(
             self._visits,
             key=lambda x: (
-                x.get_absolute_duration() is None,
-                x.get_absolute_duration(),
+                self._get_absolute_duration(x) is None,
+                self._get_absolute_duration(x),
             ),
         )
         last_visit_num = 1
@@ -308,6 +380,8 @@ class TimelineAR:
                 last_visit_num += 1
                 order += 1
 
+        # the special visits may have a new anchor
+        self._invalidate_timings()
         for order, visit in enumerate(ordered_visits):
             if (
                 visit.visit_subclass
@@ -331,10 +405,9 @@ class TimelineAR:
                     increment_step = 1
                 num = visits[-1].number + increment_step
                 # if additional visit is taking place before anchor visit in group of subvisits
-                if (
-                    visits[-1].visit.get_absolute_duration()
-                    > visit.get_absolute_duration()
-                ):
+                if self._get_absolute_duration(
+                    visits[-1].visit
+                ) > self._get_absolute_duration(visit):
                     last_subvisit_number = visits[-1].number
                     # take subvisit number from the last visit
                     visit.set_subvisit_number(last_subvisit_number)
@@ -347,8 +420,11 @@ class TimelineAR:
                     visit.set_subvisit_number(num)
                     visits.append(Subvisit(visit, num))
 
-            # derive timing properties in the end when all subvisits are set
-            if visit.timepoint:
+            # derive timing properties in the end when all subvisits are set,
+            # the visits keeping their absolute duration keep the derived values
+            timing = self._get_timing(visit)
+            if visit.timepoint and not timing.derived:
+                timing.derived = True
                 visit.study_day.value = visit.derive_study_day_number()
                 visit.study_duration_days.value = (
                     visit.derive_study_duration_days_number()
@@ -363,8 +439,8 @@ class TimelineAR:
         ordered_visits = sorted(
             self._visits,
             key=lambda x: (
-                x.get_absolute_duration() is None,
-                x.get_absolute_duration(),
+                self._get_absolute_duration(x) is None,
+                self._get_absolute_duration(x),
             ),
         )
 
@@ -447,11 +523,16 @@ class TimelineAR:
         visits = self._visits
         visits.append(visit)
         self._visits = visits
+        self._timings.pop(id(visit), None)
+        self._ordered_visits = None
         self._visits = self.ordered_study_visits
+        # the anchors depend on the order of the visits, the timeline is generated again on next access
+        self._ordered_visits = None
 
     def remove_visit(self, visit: StudyVisitVO):
         visits = [v for v in self._visits if v != visit]
         self._visits = visits
+        self._ordered_visits = None
 
     def update_visit(self, visit: StudyVisitVO):
         """
@@ -460,15 +541,21 @@ class TimelineAR:
         new_visits = [v for v in self._visits if v.uid != visit.uid]
         new_visits.append(visit)
         self._visits = new_visits
+        # the visit may have been changed in place
+        self._timings.pop(id(visit), None)
+        self._ordered_visits = None
         self._visits = self.ordered_study_visits
+        # the anchors depend on the order of the visits, the timeline is generated again on next access
+        self._ordered_visits = None
 
     @property
     def ordered_study_visits(self):
         """
         Accessor for generated order
         """
-        visits = self._generate_timeline()
-        return visits
+        if self._ordered_visits is None:
+            self._ordered_visits = self._generate_timeline()
+        return list(self._ordered_visits)
 
 
 @dataclass
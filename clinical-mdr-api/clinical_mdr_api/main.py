@@ -28,6 +28,10 @@ from clinical_mdr_api.oauth.dependencies import (
     validate_token,
 )
 from clinical_mdr_api.oauth.discovery import reconfigure_with_openid_discovery
+from clinical_mdr_api.repositories._cache import (
+    start_cache_invalidation_bus,
+    stop_cache_invalidation_bus,
+)
 from clinical_mdr_api.telemetry.traceback_middleware import ExceptionTracebackMiddleware
 from clinical_mdr_api.telemetry.tracing_middleware import TracingMiddleware
 from clinical_mdr_api.utils.api_version import get_api_version
@@ -141,6 +145,16 @@ async def openid_discovery_on_startup():
         await reconfigure_with_openid_discovery()
 
 
+@app.on_event("startup")
+def cache_invalidation_bus_on_startup():
+    start_cache_invalidation_bus()
+
+
+@app.on_event("shutdown")
+def cache_invalidation_bus_on_shutdown():
+    stop_cache_invalidation_bus()
+
+
 @app.exception_handler(exceptions.MDRApiBaseException)
 def mdr_api_exception_handler(
     request: Request, exception: exceptions.MDRApiBaseException
@@ -2,10 +2,11 @@ import json
 import re
 from copy import copy
 from datetime import datetime
+from enum import Enum
 from typing import Any, Callable, Generic, Iterable, Self, Type, TypeVar
 
 from pydantic import BaseModel as PydanticBaseModel
-from pydantic import conint
+from pydantic import Field, conint
 from pydantic.generics import GenericModel
 from starlette.responses import Response
 
@@ -263,16 +264,45 @@ class CustomPage(GenericModel, Generic[T]):
         total (int): The total number of items that match the query.
         page (int): The number of the current page.
         size (int): The maximum number of items per page.
+        next_page_token (str | None): Opaque token to pass as `page_token` to retrieve the next page.
+            Only returned by endpoints supporting keyset pagination, when there may be a next page.
+        count_strategy (str | None): Strategy used to compute `total`.
+            Only returned by endpoints supporting several count strategies, when the total count was requested.
     """
 
     items: list[T]
     total: conint(ge=0)
     page: conint(ge=0)
     size: conint(ge=0)
+    next_page_token: str | None = Field(None, nullable=True)
+    count_strategy: str | None = Field(None, nullable=True)
 
     @classmethod
-    def create(cls, items: list[T], total: int, page: int, size: int) -> Self:
-        return cls(total=total, items=items, page=page, size=size)
+    def create(
+        cls,
+        items: list[T],
+        total: int,
+        page: int,
+        size: int,
+        next_page_token: str | None = None,
+        count_strategy: str | None = None,
+    ) -> Self:
+        # Optional fields are only set when provided, to keep them out of responses excluding unset fields
+        optional_fields = {
+            "next_page_token": next_page_token,
+            "count_strategy": count_strategy,
+        }
+        return cls(
+            total=total,
+            items=items,
+            page=page,
+            size=size,
+            **{
+                key: value
+                for key, value in optional_fields.items()
+                if value is not None
+            },
+        )
 
 
 class GenericFilteringReturn(GenericModel, Generic[T]):
@@ -282,14 +312,31 @@ class GenericFilteringReturn(GenericModel, Generic[T]):
     Attributes:
         items (list[T]): The items returned by the query.
         total (int): The total number of items that match the query.
+        next_page_token (str | None): Token to retrieve the next page with keyset pagination, if supported.
+        count_strategy (str | None): Strategy used to compute the total count, if reported.
     """
 
     items: list[T]
     total: conint(ge=0)
+    next_page_token: str | None = None
+    count_strategy: str | None = None
 
     @classmethod
-    def create(cls, items: list[T], total: int) -> Self:
-        return cls(items=items, total=total)
+    def create(
+        cls,
+        items: list[T],
+        total: int,
+        next_page_token: str | None = None,
+        count_strategy: Enum | str | None = None,
+    ) -> Self:
+        return cls(
+            items=items,
+            total=total,
+            next_page_token=next_page_token,
+            count_strategy=count_strategy.value
+            if isinstance(count_strategy, Enum)
+            else count_strategy,
+        )
 
 
 class PrettyJSONResponse(Response):
@@ -0,0 +1,446 @@
+"""
+Repository caches kept coherent between the workers of a deployment.
+
+Each worker keeps its own in-memory `SharedTTLCache` objects. Whenever a worker invalidates
+the entries of some uids (or a whole cache), it applies the invalidation locally and publishes it
+on the `CacheInvalidationBus`, so that the other workers drop the same entries instead of serving
+stale data until the TTL expires.
+"""
+import abc
+import logging
+import os
+import pickle
+import socket
+import stat
+import threading
+import uuid
+from typing import Any, Callable, Hashable, Iterable
+
+from cachetools import Cache, TTLCache
+
+from clinical_mdr_api import config
+
+log = logging.getLogger(__name__)
+
+InvalidationCallback = Callable[[str | None, list[Hashable] | None], None]
+
+# Largest message sent on the bus, the size of the receive buffer
+MAX_MESSAGE_SIZE = 65536
+
+
+class CacheInvalidationBus(abc.ABC):
+    """
+    Channel carrying cache invalidation messages between the workers.
+
+    A message is a `(cache_name, uids)` tuple, where `None` uids invalidate the whole cache,
+    and `(None, None)` invalidates all the caches.
+    """
+
+    @abc.abstractmethod
+    def start(self, on_invalidate: InvalidationCallback) -> None:
+        """Starts receiving the messages published by the other workers."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def publish(self, cache_name: str, uids: list[Hashable] | None) -> None:
+        """Sends a message to all the other workers."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Stops receiving messages."""
+
+
+class LocalCacheInvalidationBus(CacheInvalidationBus):
+    """Bus for deployments with a single worker, where there is nobody else to notify."""
+
+    def start(self, on_invalidate: InvalidationCallback) -> None:
+        pass
+
+    def publish(self, cache_name: str, uids: list[Hashable] | None) -> None:
+        pass
+
+
+class UnixSocketCacheInvalidationBus(CacheInvalidationBus):
+    """
+    Bus for the workers of a single host, based on Unix datagram sockets.
+
+    Each worker binds a socket in `directory` and publishes a message by sending it to
+    all the other sockets found there. Sockets left behind by dead workers are removed
+    when sending to them fails. The directory is only accessible to the owner,
+    as the messages are pickled uids.
+
+    Messages are split so that each datagram fits in MAX_MESSAGE_SIZE. Sending never blocks:
+    a worker whose queue is full, or whose message can't be sent, is asked to clear all its caches,
+    at the latest with the next message published.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}-{uuid.uuid4().hex}.sock")
+        self._socket: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        # Peers that missed a message and still have to clear all their caches
+        self._stale_peers: set[str] = set()
+        self._lock = threading.Lock()
+
+    def start(self, on_invalidate: InvalidationCallback) -> None:
+        if self._socket is not None:
+            return
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        directory_stat = os.stat(self.directory)
+        if directory_stat.st_uid != os.getuid() or stat.S_IMODE(
+            directory_stat.st_mode
+        ) & (stat.S_IRWXG | stat.S_IRWXO):
+            raise RuntimeError(
+                f"Cache invalidation directory '{self.directory}' must only be accessible to its owner"
+            )
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self.path)
+        self._thread = threading.Thread(
+            target=self._receive, args=(self._socket, on_invalidate), daemon=True
+        )
+        self._thread.start()
+
+    def _receive(self, sock: socket.socket, on_invalidate: InvalidationCallback):
+        while True:
+            try:
+                # One more byte to detect truncated messages
+                message = sock.recv(MAX_MESSAGE_SIZE + 1)
+            except OSError:
+                # Socket closed
+                return
+            try:
+                if len(message) > MAX_MESSAGE_SIZE:
+                    raise ValueError(f"Message larger than {MAX_MESSAGE_SIZE} bytes")
+                cache_name, uids = pickle.loads(message)
+            except Exception as _ex:  # pylint: disable=broad-exception-caught
+                log.warning(
+                    "Invalid cache invalidation message, clearing all caches: %s", _ex
+                )
+                cache_name, uids = None, None
+            try:
+                on_invalidate(cache_name, uids)
+            except Exception:  # pylint: disable=broad-exception-caught
+                log.exception("Failed to apply cache invalidation message")
+
+    @staticmethod
+    def _encode(cache_name: str | None, uids: list[Hashable] | None) -> list[bytes]:
+        """Returns the datagrams of a message, splitting its uids so that each one fits in MAX_MESSAGE_SIZE."""
+        message = pickle.dumps((cache_name, uids))
+        if len(message) <= MAX_MESSAGE_SIZE:
+            return [message]
+        if uids is None or len(uids) <= 1:
+            # Can't be split any further
+            return [pickle.dumps((None, None))]
+        half = len(uids) // 2
+        return UnixSocketCacheInvalidationBus._encode(
+            cache_name, uids[:half]
+        ) + UnixSocketCacheInvalidationBus._encode(cache_name, uids[half:])
+
+    def publish(self, cache_name: str, uids: list[Hashable] | None) -> None:
+        messages = self._encode(cache_name, list(uids) if uids is not None else None)
+        clear_all = pickle.dumps((None, None))
+        try:
+            peers = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            for peer in peers:
+                path = os.path.join(self.directory, peer)
+                if path == self.path or not peer.endswith(".sock"):
+                    continue
+                with self._lock:
+                    stale = path in self._stale_peers
+                try:
+                    if stale:
+                        # Clearing all the caches covers this message as well
+                        sock.sendto(clear_all, path)
+                    else:
+                        for message in messages:
+                            sock.sendto(message, path)
+                    stale = False
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Worker is gone
+                    stale = False
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                except OSError as _ex:
+                    # E.g. the queue of the worker is full
+                    stale = not self._send_clear_all(sock, clear_all, path)
+                    log.warning(
+                        "Failed to send cache invalidation to %s, %s: %s",
+                        path,
+                        "will clear all its caches with the next message"
+                        if stale
+                        else "cleared all its caches",
+                        _ex,
+                    )
+                with self._lock:
+                    if stale:
+                        self._stale_peers.add(path)
+                    else:
+                        self._stale_peers.discard(path)
+
+    @staticmethod
+    def _send_clear_all(sock: socket.socket, clear_all: bytes, path: str) -> bool:
+        try:
+            sock.sendto(clear_all, path)
+        except OSError:
+            return False
+        return True
+
+    def close(self) -> None:
+        if self._socket is None:
+            return
+        self._socket.close()
+        self._socket = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _create_cache_invalidation_bus() -> CacheInvalidationBus:
+    if config.CACHE_INVALIDATION_BUS == "unix":
+        return UnixSocketCacheInvalidationBus(config.CACHE_INVALIDATION_SOCKET_DIR)
+    if config.CACHE_INVALIDATION_BUS == "local":
+        return LocalCacheInvalidationBus()
+    raise ValueError(
+        f"Unsupported CACHE_INVALIDATION_BUS '{config.CACHE_INVALIDATION_BUS}'"
+    )
+
+
+_shared_caches: dict[str, "SharedTTLCache"] = {}
+_bus: CacheInvalidationBus = _create_cache_invalidation_bus()
+
+
+def set_cache_invalidation_bus(bus: CacheInvalidationBus) -> None:
+    """Replaces the bus used by all the shared caches, e.g. with another backend."""
+    global _bus  # pylint: disable=global-statement
+    _bus.close()
+    _bus = bus
+
+
+def start_cache_invalidation_bus() -> None:
+    """Starts applying the invalidations published by the other workers. Called on application startup."""
+    _bus.start(_apply_invalidation)
+
+
+def stop_cache_invalidation_bus() -> None:
+    _bus.close()
+
+
+def _apply_invalidation(cache_name: str | None, uids: list[Hashable] | None) -> None:
+    if cache_name is None:
+        # The message carrying the invalidation was lost
+        for cache in list(_shared_caches.values()):
+            cache.invalidate_local()
+        return
+    if uids is None:
+        cache = _shared_caches.get(cache_name)
+        if cache is not None:
+            cache.invalidate_local()
+        return
+    # The items of these uids may be embedded in the values of any cache
+    for cache in list(_shared_caches.values()):
+        cache.invalidate_local(uids)
+
+
+def get_shared_caches() -> list["SharedTTLCache"]:
+    return list(_shared_caches.values())
+
+
+def uid_of_key(key: Hashable) -> Hashable:
+    """
+    Returns the uid of the item cached with the given key.
+    Cache keys are built as `hashkey(str(type(self)), uid, ...)` by the repositories.
+    """
+    if isinstance(key, tuple) and len(key) > 1:
+        return key[1]
+    return key
+
+
+def linked_uids(value: Any, max_depth: int = 5) -> set[Hashable]:
+    """
+    Returns the uids of the items embedded in a cached value, e.g. the activity instance class
+    and the activity groupings of an activity instance aggregate.
+    These are the values of the `uid`, `*_uid` and `*_uids` attributes of the value,
+    and of the objects and collections it holds, down to max_depth levels.
+    """
+    uids = set()
+    seen = set()
+
+    def walk(obj: Any, depth: int):
+        if depth > max_depth or id(obj) in seen or callable(obj):
+            return
+        if isinstance(obj, list | tuple | set | frozenset):
+            seen.add(id(obj))
+            for item in obj:
+                walk(item, depth + 1)
+            return
+        if isinstance(obj, dict):
+            attributes = obj
+        else:
+            attributes = getattr(obj, "__dict__", None)
+            if attributes is None:
+                return
+        seen.add(id(obj))
+        for name, attribute in attributes.items():
+            name = str(name).lstrip("_")
+            if name == "uid" or name.endswith("_uid"):
+                if isinstance(attribute, str):
+                    uids.add(attribute)
+            elif name.endswith("_uids") and isinstance(
+                attribute, list | tuple | set | frozenset
+            ):
+                uids.update(uid for uid in attribute if isinstance(uid, str))
+            else:
+                walk(attribute, depth + 1)
+
+    walk(value, 0)
+    return uids
+
+
+_MISSING = object()
+
+
+class SharedTTLCache(TTLCache):
+    """
+    TTLCache whose invalidations are propagated to the caches of the same name in the other workers.
+
+    Entries are indexed by the uid of their key (see `uid_of_key`), by the uid of their value,
+    and by the uids of the items embedded in their value (see `linked_uids`).
+    Invalidating a uid thus also evicts the entries cached under the ids of its linked versions,
+    and the entries of the items embedding it, in all the shared caches.
+
+    The cache must be used with its `lock`, e.g. `@cached(cache=cache, key=..., lock=cache.lock)`,
+    as invalidations from the other workers are applied from the bus thread.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.name = name
+        self.lock = threading.RLock()
+        self._keys_by_uid: dict[Hashable, set[Hashable]] = {}
+        self._uids_by_key: dict[Hashable, set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        _shared_caches[name] = self
+
+    def __getitem__(self, key):
+        try:
+            value = super().__getitem__(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._unindex(key)
+        uids = {uid_of_key(key), getattr(value, "uid", None)} | linked_uids(value)
+        uids.discard(None)
+        self._uids_by_key[key] = uids
+        for uid in uids:
+            self._keys_by_uid.setdefault(uid, set()).add(key)
+
+    def __delitem__(self, key):
+        try:
+            super().__delitem__(key)
+        finally:
+            # TTLCache raises KeyError after removing an expired entry
+            self._unindex(key)
+
+    def _unindex(self, key):
+        for uid in self._uids_by_key.pop(key, set()):
+            keys = self._keys_by_uid.get(uid)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_uid[uid]
+
+    def pop(self, key, default=_MISSING):
+        # Doesn't count as a hit
+        if key in self:
+            value = super().__getitem__(key)
+            del self[key]
+            return value
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        # TTLCache.currsize expires entries itself
+        size = Cache.currsize.fget(self)
+        super().expire(time)
+        expired = size - Cache.currsize.fget(self)
+        if expired:
+            self.expirations += expired
+            # Expired entries are removed without going through __delitem__
+            for key in [key for key in self._uids_by_key if key not in self]:
+                self._unindex(key)
+
+    def clear(self):
+        evictions = self.evictions
+        super().clear()
+        # Clearing goes through popitem, without evicting anything
+        self.evictions = evictions
+        self._keys_by_uid.clear()
+        self._uids_by_key.clear()
+
+    def invalidate_local(self, uids: Iterable[Hashable] | None = None) -> None:
+        with self.lock:
+            if uids is None:
+                self.invalidations += self.currsize
+                self.clear()
+                return
+            for uid in uids:
+                for key in list(self._keys_by_uid.get(uid, set())):
+                    if key in self:
+                        self.invalidations += 1
+                    try:
+                        del self[key]
+                    except KeyError:
+                        pass
+
+    def invalidate(self, uids: Iterable[Hashable] | None = None) -> None:
+        """
+        Removes the entries of the given uids, or all entries if no uids are given, in all the workers.
+        The entries embedding the given uids are removed from the other shared caches as well.
+        """
+        uids = list(uids) if uids is not None else None
+        _apply_invalidation(self.name, uids)
+        _bus.publish(self.name, uids)
+
+    def get_statistics(self) -> dict:
+        """Returns the usage counters of the cache in this worker, since it started."""
+        return {
+            "name": self.name,
+            "size": self.currsize,
+            "max_size": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+def clear_cache(cache: TTLCache) -> None:
+    """Clears a cache, in all the workers if it is shared."""
+    if isinstance(cache, SharedTTLCache):
+        cache.invalidate()
+    else:
+        cache.clear()
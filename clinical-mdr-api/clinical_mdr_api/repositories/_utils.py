@@ -1,10 +1,16 @@
+import base64
 import functools
+import hashlib
+import json
 import logging
 import re
+import threading
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable
+from typing import Any, Callable, Hashable, Iterable
 
+import neo4j
+from cachetools import TTLCache
 from dateutil.parser import isoparse
 from neo4j.exceptions import CypherSyntaxError
 from neomodel import Q, db
@@ -15,6 +21,7 @@ from clinical_mdr_api import config, exceptions
 from clinical_mdr_api.models.concepts.concept import VersionProperties
 from clinical_mdr_api.models.controlled_terminologies.ct_term import SimpleTermModel
 from clinical_mdr_api.models.standard_data_models.sponsor_model import SponsorModelBase
+from clinical_mdr_api.repositories._cache import SharedTTLCache, clear_cache
 
 # Re-used regex
 nested_regex = re.compile(r"\.")
@@ -321,12 +328,54 @@ def is_date(string):
         return False
 
 
+class CountStrategy(Enum):
+    """
+    How CypherQueryBuilder computes the total count of a query.
+
+    EXACT : separate count query, re-running the match and alias clauses.
+    FUSED : exact count computed in the same round-trip as the page, through a CALL {} subquery.
+    CACHED : exact count, cached by a hash of the count query and its filter parameters for COUNT_CACHE_TTL.
+    ESTIMATED : count of the nodes or relationships of count_pattern, read from the count store
+        when no filter is applied, exact count otherwise.
+    """
+
+    EXACT = "exact"
+    FUSED = "fused"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+
+    @staticmethod
+    def from_str(label: str | None) -> "CountStrategy":
+        if label is None:
+            return CountStrategy.EXACT
+        try:
+            return CountStrategy(label.lower())
+        except ValueError as _ex:
+            raise exceptions.ValidationException(
+                f"Count strategy only accepts values of {[_.value for _ in CountStrategy]}."
+            ) from _ex
+
+
 class GenericFilteringReturn:
     def __init__(self, items: list[Any], total: int):
         self.items = items
         self.total = total
 
 
+class ItemsPage(tuple):
+    """
+    The (items, total) pair returned by the repositories listing items,
+    which also carries the token of the next page when the repository supports keyset pagination.
+    """
+
+    next_page_token: str | None
+
+    def __new__(cls, items: list[Any], total: int, next_page_token: str | None = None):
+        page = super().__new__(cls, (items, total))
+        page.next_page_token = next_page_token
+        return page
+
+
 class FilterOperator(Enum):
     AND = "and"
     OR = "or"
@@ -381,6 +430,73 @@ class FilterDict(BaseModel):
         return val
 
 
+def _encode_page_token_value(value: Any) -> Any:
+    if isinstance(value, neo4j.time.DateTime):
+        return {"datetime": value.iso_format()}
+    if isinstance(value, neo4j.time.Date):
+        return {"date": value.iso_format()}
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    return value
+
+
+def encode_page_token(sort_keys: list[list[Any]], values: list[Any]) -> str:
+    """
+    Encodes the sort keys and the sort values of the last returned row into an opaque page token.
+    """
+    payload = json.dumps(
+        {"s": sort_keys, "v": [_encode_page_token_value(_v) for _v in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def page_token_sort_value(value: Any) -> Any:
+    """
+    Returns the value compared when paginating a list of items with a page token,
+    which is the same for a value and for its encoding in a page token.
+    """
+    value = _encode_page_token_value(value)
+    if (
+        isinstance(value, dict)
+        and len(value) == 1
+        and value.keys() <= {"datetime", "date"}
+    ):
+        return next(iter(value.values()))
+    return value
+
+
+def decode_page_token(page_token: str) -> dict:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(page_token.encode("ascii")))
+    except (ValueError, UnicodeError) as _ex:
+        raise exceptions.ValidationException(
+            f"Invalid page_token '{page_token}'"
+        ) from _ex
+    if not isinstance(payload, dict) or {"s", "v"} - payload.keys():
+        raise exceptions.ValidationException(f"Invalid page_token '{page_token}'")
+    return payload
+
+
+def _get_row_value(row: dict, path: str) -> Any:
+    # Sort keys can be the size of a returned value, e.g. size(name)
+    if path.startswith("size(") and path.endswith(")"):
+        value = _get_row_value(row, path.removeprefix("size(").removesuffix(")"))
+        return len(value) if value is not None else None
+    # Sort keys can point to a property of a returned node or map, e.g. value_node.name
+    parts = path.split(".")
+    value = row[parts[0]]
+    for part in parts[1:]:
+        if value is None:
+            return None
+        value = value.get(part)
+    return value
+
+
+# Total counts cached by the CACHED count strategy, keyed by a hash of the count query and its parameters
+count_cache = TTLCache(maxsize=config.CACHE_MAX_SIZE, ttl=config.COUNT_CACHE_TTL)
+
+
 class CypherQueryBuilder:
     """
     This class builds two queries : items and total_count with filtering and pagination capabilities.
@@ -418,12 +534,30 @@ class CypherQueryBuilder:
         format_filter_sort_keys: Callable. In some cases, the returned model property
             keys differ from the property keys defined in the database.
             To cover these cases, a conversion function can be provided.
+        page_token : str, opaque token returned as next_page_token by a previous call.
+            When provided, keyset pagination is used instead of SKIP/LIMIT : the query resumes
+            right after the sort key values of the last row of the previous page,
+            so every page costs the same no matter how deep it is.
+            An empty page_token requests the first page sorted by the sort keys, with its next_page_token.
+            Without sort_by or page_token, the rows are returned in the order of the caller's clauses
+            and no next_page_token is issued.
+            Requires page_size and implicit_sort_by. If implicit_sort_by alone doesn't identify a row,
+            the other identifying aliases have to be given in unique_sort_by.
+        unique_sort_by: list of aliases appended to the sort after implicit_sort_by, so that
+            the order is total and keyset pagination never skips or repeats rows.
+        count_strategy : CountStrategy used by get_total_count. Defaults to EXACT.
+        count_pattern : Pattern served by the Neo4j count store (a single labelled node, or a relationship
+            type with at most one labelled end) matched once per result row, e.g. '(:CTCodelistRoot)'.
+            Required by the ESTIMATED count strategy, which falls back to EXACT when not given.
+            Callers must only give it when the match clause doesn't filter the rows.
 
     Output properties :
         full_query : Complete cypher query with all clauses. See build_full_query
             method definition for more details.
         count_query : Cypher query with match, filter clauses, and results count. See
             build_count_query method definition for more details.
+        used_count_strategy : CountStrategy actually used to compute the total count,
+            set by get_total_count.
         parameters : Parameters object to pass along with the cypher query.
 
     Internal properties :
@@ -432,6 +566,8 @@ class CypherQueryBuilder:
         sort_clause : str - Generated on class init ; adds sorting on aliases as
             defined in the sort_by dictionary.
         pagination_clause : str - Generated on class init ; adds pagination.
+        keyset_clause : str - Generated on class init when a page_token is given ;
+            predicate which only keeps rows sorted after the last row of the previous page.
     """
 
     def __init__(
@@ -449,6 +585,10 @@ class CypherQueryBuilder:
         wildcard_properties_list: list[str] | None = None,
         format_filter_sort_keys: Callable | None = None,
         union_match_clause: str | None = None,
+        page_token: str | None = None,
+        unique_sort_by: list[str] | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        count_pattern: str | None = None,
     ):
         if wildcard_properties_list is None:
             wildcard_properties_list = []
@@ -466,9 +606,16 @@ class CypherQueryBuilder:
         self.return_model = return_model
         self.wildcard_properties_list = wildcard_properties_list
         self.format_filter_sort_keys = format_filter_sort_keys
+        self.page_token = page_token
+        self.unique_sort_by = unique_sort_by if unique_sort_by is not None else []
+        self.count_strategy = count_strategy
+        self.count_pattern = count_pattern
+        self.used_count_strategy: CountStrategy | None = None
+        self._fused_total_count: int | None = None
         self.filter_clause = ""
         self.sort_clause = ""
         self.pagination_clause = ""
+        self.keyset_clause = ""
         self.parameters = {}
 
         # Auto-generate internal clauses
@@ -476,10 +623,12 @@ class CypherQueryBuilder:
             self.build_filter_clause()
         if self.page_size > 0:
             self.build_pagination_clause()
-        if self.sort_by:
+        if self.sort_by or self.page_token is not None:
             if not isinstance(self.sort_by, dict):
                 raise exceptions.ValidationException("sort_by must be a dict")
             self.build_sort_clause()
+        if self.page_token:
+            self.build_keyset_clause()
 
         # Auto-generate final queries
         self.build_full_query()
@@ -753,7 +902,116 @@ class CypherQueryBuilder:
             + f" {self.filter_operator.value.upper()} ".join(list(filter_predicates))
         )
 
+    def get_sort_keys(self) -> list[list[Any]]:
+        """
+        Returns the list of [alias, ascending] pairs defining the order of the full query :
+        the sort_by aliases, then implicit_sort_by and unique_sort_by aliases in ascending order.
+        """
+        sort_keys = [[key, bool(ascending)] for key, ascending in self.sort_by.items()]
+        if self.implicit_sort_by is not None:
+            sort_keys.append([self.implicit_sort_by, True])
+        sort_keys += [[key, True] for key in self.unique_sort_by]
+
+        formatted_sort_keys = []
+        for key, ascending in sort_keys:
+            if self.format_filter_sort_keys:
+                key = self.format_filter_sort_keys(key)
+            if key not in [_key for _key, _ in formatted_sort_keys]:
+                formatted_sort_keys.append([key, ascending])
+        return formatted_sort_keys
+
+    def _supports_keyset_pagination(self) -> bool:
+        return (
+            self.page_size > 0
+            and self.implicit_sort_by is not None
+            and not self.union_match_clause
+        )
+
+    def build_keyset_clause(self) -> None:
+        """
+        Builds the predicate selecting the rows which are sorted after the row encoded in page_token.
+        For sort keys k1, k2, ..., kn it has the form :
+            (k1 after v1) OR (k1 = v1 AND k2 after v2) OR ... OR (k1 = v1 AND ... AND kn after vn)
+        Cypher sorts null values last in ascending order and first in descending order,
+        'after' takes that into account.
+        """
+        if self.page_size <= 0:
+            raise exceptions.ValidationException(
+                "page_token can only be used together with page_size"
+            )
+        if not self._supports_keyset_pagination():
+            raise exceptions.ValidationException(
+                "page_token is not supported for this endpoint"
+            )
+        sort_keys = self.get_sort_keys()
+        token = decode_page_token(self.page_token)
+        if token["s"] != sort_keys or len(token["v"]) != len(sort_keys):
+            raise exceptions.ValidationException(
+                "page_token doesn't match the requested sort_by"
+            )
+
+        equal_predicates = []
+        keyset_predicates = []
+        for index, ((alias, ascending), value) in enumerate(zip(sort_keys, token["v"])):
+            param = f"$keyset_{index}"
+            if isinstance(value, dict) and "datetime" in value:
+                param = f"datetime($keyset_{index})"
+                value = value["datetime"]
+            elif isinstance(value, dict) and "date" in value:
+                param = f"date($keyset_{index})"
+                value = value["date"]
+            self.parameters[f"keyset_{index}"] = value
+
+            if value is None:
+                after_predicate = f"{alias} IS NOT NULL" if not ascending else None
+                equal_predicate = f"{alias} IS NULL"
+            else:
+                after_predicate = (
+                    f"({alias} > {param} OR {alias} IS NULL)"
+                    if ascending
+                    else f"{alias} < {param}"
+                )
+                equal_predicate = f"{alias} = {param}"
+
+            if after_predicate is not None:
+                keyset_predicates.append(
+                    "(" + " AND ".join(equal_predicates + [after_predicate]) + ")"
+                )
+            equal_predicates.append(equal_predicate)
+
+        self.keyset_clause = (
+            "(" + " OR ".join(keyset_predicates) + ")" if keyset_predicates else "false"
+        )
+
+    def get_next_page_token(
+        self, result_array: list[Any], attributes_names: list[str]
+    ) -> str | None:
+        """
+        Returns the token to pass as page_token to retrieve the page following the given results,
+        or None if the given results are the last page or the sort keys are not returned by the query.
+        """
+        if (
+            not self._supports_keyset_pagination()
+            or len(result_array) < self.page_size
+            # Without an explicit sort, the order is the one given by the caller's clauses
+            or not self.sort_clause
+        ):
+            return None
+        sort_keys = self.get_sort_keys()
+        last_row = dict(zip(attributes_names, result_array[-1]))
+        try:
+            values = [_get_row_value(last_row, alias) for alias, _ in sort_keys]
+        except (KeyError, AttributeError):
+            return None
+        return encode_page_token(sort_keys, values)
+
     def build_pagination_clause(self) -> None:
+        if self.page_token:
+            # Keyset pagination, the rows of the previous pages are excluded by the keyset clause
+            self.pagination_clause = "LIMIT $page_size"
+            self.parameters["page_size"] = self.page_size
+            return
+
         validate_max_skip_clause(page_number=self.page_number, page_size=self.page_size)
 
         # Set clause
@@ -767,21 +1025,10 @@ class CypherQueryBuilder:
         _sort_clause = "ORDER BY "
         # Add list of order by statements parsed from dict
         # If necessary, replace key using return-model-to-cypher fieldname mapping
-        sort_by_statements = map(
-            lambda key: f"{self.format_filter_sort_keys(key) if self.format_filter_sort_keys else key} "
-            + ("ASC" if self.sort_by[key] else "DESC"),
-            self.sort_by.keys(),
-        )
-        sort_by_statements = list(sort_by_statements)
-        if (
-            self.implicit_sort_by is not None
-            and self.implicit_sort_by not in self.sort_by
-        ):
-            sort_by_statements.append(
-                self.format_filter_sort_keys(self.implicit_sort_by)
-                if self.format_filter_sort_keys
-                else self.implicit_sort_by
-            )
+        sort_by_statements = [
+            f"{key} " + ("ASC" if ascending else "DESC")
+            for key, ascending in self.get_sort_keys()
+        ]
         # Set clause
         self.sort_clause = _sort_clause + ",".join(sort_by_statements)
 
@@ -790,20 +1037,27 @@ class CypherQueryBuilder:
         The generated query will have the following pattern :
             MATCH caller-provided (and WITH, CALL, ... any custom pattern matching necessary)
             > WITH alias_clause caller-provided
-            > WHERE filter_clause using aliases
+            > WHERE filter_clause using aliases (and keyset_clause when a page_token is given)
             > RETURN * to return results as is
             > ORDER BY to sort results using aliases
             > SKIP * LIMIT * to paginate results
         """
         _with_alias_clause = f"WITH {self.alias_clause}"
         _return_clause = "RETURN *"
+        _where_clause = self.filter_clause
+        if self.keyset_clause:
+            _where_clause = (
+                f"WHERE ({self.filter_clause.removeprefix('WHERE ')}) AND {self.keyset_clause}"
+                if self.filter_clause
+                else f"WHERE {self.keyset_clause}"
+            )
 
         # Set clause
         self.full_query = " ".join(
             [
                 self.match_clause,
                 _with_alias_clause,
-                self.filter_clause,
+                _where_clause,
                 _return_clause,
                 self.sort_clause,
                 self.pagination_clause,
@@ -912,21 +1166,129 @@ class CypherQueryBuilder:
         """
         return re.sub(nested_regex, "_", alias)
 
+    def build_fused_query(self) -> str:
+        """
+        The generated query returns the page and the total count in one round-trip :
+            CALL { count_query } > CALL { full_query } > RETURN * with the count in a _total_count column
+        """
+        return " ".join(
+            [
+                "CALL {",
+                self.count_query.replace(
+                    "RETURN count(*) AS total_count",
+                    "RETURN count(*) AS _total_count",
+                ),
+                "}",
+                "CALL {",
+                self.full_query,
+                "}",
+                "RETURN *",
+            ]
+        )
+
     def execute(self) -> tuple[Any, Any]:
+        fused = self.total_count and self.count_strategy == CountStrategy.FUSED
         try:
             result_array, attributes_names = db.cypher_query(
-                query=self.full_query, params=self.parameters
+                query=self.build_fused_query() if fused else self.full_query,
+                params=self.parameters,
             )
         except CypherSyntaxError as _ex:
             raise exceptions.ValidationException(
                 "Unsupported filtering or sort parameters specified"
             ) from _ex
+        if fused:
+            # Strip the count column so that callers get the same rows as with full_query
+            index = attributes_names.index("_total_count")
+            if result_array:
+                self._fused_total_count = result_array[0][index]
+            attributes_names = [
+                name for i, name in enumerate(attributes_names) if i != index
+            ]
+            result_array = [
+                [value for i, value in enumerate(row) if i != index]
+                for row in result_array
+            ]
         return result_array, attributes_names
 
+    def _count_cache_key(self) -> str:
+        # Pagination and keyset parameters don't change the total count
+        parameters = {
+            key: value
+            for key, value in self.parameters.items()
+            if key not in ("page_number", "page_size") and not key.startswith("keyset_")
+        }
+        return hashlib.sha256(
+            json.dumps(
+                [self.count_query, parameters], sort_keys=True, default=str
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def _execute_count_query(self) -> int:
+        count_result, _ = db.cypher_query(
+            query=self.count_query, params=self.parameters
+        )
+        return count_result[0][0] if len(count_result) > 0 else 0
 
-def sb_clear_cache(caches: list[str] | None = None):
+    def get_total_count(self) -> int:
+        """
+        Returns the total count of the results matching the filters, computed with count_strategy.
+        Must be called after execute. The strategy actually used is set in used_count_strategy.
+        """
+        if self.count_strategy == CountStrategy.FUSED:
+            self.used_count_strategy = CountStrategy.FUSED
+            if self._fused_total_count is not None:
+                return self._fused_total_count
+            # The page was empty, so the count row was lost with it
+            return self._execute_count_query()
+
+        if self.count_strategy == CountStrategy.ESTIMATED:
+            if (
+                self.count_pattern is not None
+                and not self.filter_clause
+                and not self.union_match_clause
+            ):
+                self.used_count_strategy = CountStrategy.ESTIMATED
+                # Served by the count store, without scanning nodes
+                count_result, _ = db.cypher_query(
+                    query=f"MATCH {self.count_pattern} RETURN count(*)"
+                )
+                return count_result[0][0] if count_result else 0
+            self.used_count_strategy = CountStrategy.EXACT
+            return self._execute_count_query()
+
+        if self.count_strategy == CountStrategy.CACHED:
+            self.used_count_strategy = CountStrategy.CACHED
+            cache_key = self._count_cache_key()
+            total = count_cache.get(cache_key)
+            if total is None:
+                total = self._execute_count_query()
+                count_cache[cache_key] = total
+            return total
+
+        self.used_count_strategy = CountStrategy.EXACT
+        return self._execute_count_query()
+
+
+# Uids written by the sb_clear_cache decorated functions being executed in the current thread,
+# by id of the cache they have to be evicted from
+_cache_invalidation_scope = threading.local()
+
+
+def sb_clear_cache(
+    caches: list[str] | None = None,
+    uids: Callable[..., Iterable[Hashable | None]] | None = None,
+):
     """
     Decorator that will clear the specified caches after the wrapped function execution.
+    Shared caches are cleared in all the workers.
+
+    If uids is given, it is called with the arguments of the wrapped function and returns the uids
+    of the items it writes. Only the entries of these uids, and of the cached items embedding them,
+    are then evicted from the shared caches, instead of clearing them. The whole caches are still cleared when a returned uid is None.
+
+    Decorated functions called from a function evicting uids from the same caches add their uids
+    to the ones evicted when the outer function returns, and clear nothing themselves.
     """
     if caches is None:
         caches = []
@@ -934,20 +1296,54 @@ def sb_clear_cache(caches: list[str] | None = None):
     def decorator(function):
         @functools.wraps(function)
         def wrapper(self, *args, **kwargs):
+            target_caches = {
+                cache_name: getattr(self, cache_name)
+                for cache_name in caches
+                if getattr(self, cache_name, None) is not None
+            }
+            written_uids = set(uids(self, *args, **kwargs)) if uids else None
+            if written_uids is not None and None in written_uids:
+                written_uids = None
+
+            outer_scope = getattr(_cache_invalidation_scope, "uids_by_cache", None)
+            if outer_scope is not None and all(
+                id(cache) in outer_scope for cache in target_caches.values()
+            ):
+                for cache in target_caches.values():
+                    outer_scope[id(cache)].update(written_uids or [])
+                return function(self, *args, **kwargs)
+
+            scope = {}
+            if written_uids is not None:
+                scope = {
+                    id(cache): set(written_uids)
+                    for cache in target_caches.values()
+                    if isinstance(cache, SharedTTLCache)
+                }
+            _cache_invalidation_scope.uids_by_cache = {**(outer_scope or {}), **scope}
             try:
                 result = function(self, *args, **kwargs)
                 return result
             finally:
-                for cache_name in caches:
-                    cache = getattr(self, cache_name, None)
-                    if cache:
+                _cache_invalidation_scope.uids_by_cache = outer_scope
+                for cache_name, cache in target_caches.items():
+                    if id(cache) in scope:
                         log.info(
-                            "Clear cache '%s.%s' of size: %s",
+                            "Invalidate %s uids in cache '%s.%s'",
+                            len(scope[id(cache)]),
                             type(self).__name__,
                             cache_name,
-                            cache.currsize,
                         )
-                        cache.clear()
+                        cache.invalidate(scope[id(cache)])
+                        continue
+                    # An empty shared cache is still cleared, as the other workers may hold entries
+                    log.info(
+                        "Clear cache '%s.%s' of size: %s",
+                        type(self).__name__,
+                        cache_name,
+                        cache.currsize,
+                    )
+                    clear_cache(cache)
 
         return wrapper
 
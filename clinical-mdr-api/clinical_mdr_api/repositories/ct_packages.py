@@ -1,5 +1,13 @@
+import json
+import zlib
+
+from neo4j.time import DateTime
 from neomodel import db
 
+# Increment when the layout of the changes stored on the NEXT_PACKAGE relationships changes,
+# the stored changes are then computed again
+PACKAGE_CHANGES_FORMAT = 1
+
 CODELIST_DATA_RETRIEVAL_SPECIFIC_QUERY = """
 MATCH (old_package:CTPackage {name:$old_package_name})-[:CONTAINS_CODELIST]->(package_codelist:CTPackageCodelist)-[:CONTAINS_ATTRIBUTES]->
 (codelist_attr_val)<-[old_versions:HAS_VERSION]-(codelist_attr_root)<-[:HAS_ATTRIBUTES_ROOT]-(old_codelist_root {uid:$codelist_uid})
@@ -102,6 +110,45 @@ WITH collect(apoc.map.fromValues([term_root.uid, {
 RETURN apoc.map.mergeList(items) AS items_map
 """
 
+# The consecutive packages of the catalogue from the old package to the new package,
+# with the changes stored between them if they are still valid
+PACKAGE_STEPS_RETRIEVAL = """
+MATCH (catalogue:CTCatalogue)-[:CONTAINS_PACKAGE]->(old_package:CTPackage {name:$old_package_name})
+MATCH (catalogue)-[:CONTAINS_PACKAGE]->(new_package:CTPackage {name:$new_package_name})
+MATCH (catalogue)-[:CONTAINS_PACKAGE]->(package:CTPackage)
+WHERE old_package.effective_date <= package.effective_date <= new_package.effective_date
+WITH package ORDER BY package.effective_date
+WITH collect(package) AS packages
+UNWIND range(0, size(packages) - 2) AS index
+WITH index, packages[index] AS old_package, packages[index + 1] AS new_package
+OPTIONAL MATCH (old_package)-[rel:NEXT_PACKAGE]->(new_package)
+RETURN old_package.name, new_package.name,
+CASE WHEN rel.changes_key = $changes_format + '|' + toString(old_package.import_date) + '|' + toString(new_package.import_date)
+THEN rel.changes END AS changes
+ORDER BY index
+"""
+
+PACKAGE_STEP_LOCK = """
+MATCH (old_package:CTPackage {name:$old_package_name}), (new_package:CTPackage {name:$new_package_name})
+CALL apoc.lock.nodes([old_package, new_package])
+OPTIONAL MATCH (old_package)-[rel:NEXT_PACKAGE]->(new_package)
+RETURN coalesce(
+rel.changes_key = $changes_format + '|' + toString(old_package.import_date) + '|' + toString(new_package.import_date),
+false)
+"""
+
+PACKAGE_STEP_SAVE = """
+MATCH (old_package:CTPackage {name:$old_package_name}), (new_package:CTPackage {name:$new_package_name})
+MERGE (old_package)-[rel:NEXT_PACKAGE]->(new_package)
+SET rel.changes = $changes,
+rel.changes_key = $changes_format + '|' + toString(old_package.import_date) + '|' + toString(new_package.import_date)
+"""
+
+TERM_CODELISTS_RETRIEVAL = """
+MATCH (term_root:CTTermRoot) WHERE term_root.uid IN $term_uids
+RETURN term_root.uid, [(codelist_root)-[:HAS_TERM]->(term_root) | codelist_root.uid] AS codelists
+"""
+
 TERM_DIFF_CLAUSE = """
 CASE WHEN old_items_map[common_item] <> new_items_map[common_item] THEN
 apoc.map.fromValues([
@@ -325,97 +372,238 @@ def codelist_diff(left_cl, right_cl):
     return result
 
 
-@db.transaction
-def get_ct_packages_changes(old_package_name: str, new_package_name: str) -> dict:
-    output = {}
-    # codelists query
-    # Fetch the codelists and terms and do the comparison here.
-    # Doing the comparison in cypher uses too much ram.
-    query_params_old = {
-        "package_name": old_package_name,
-    }
-    query_params_new = {
-        "package_name": new_package_name,
+def diff_package_items(old_items: dict, new_items: dict, are_different) -> dict:
+    """
+    Compares the codelists or the terms of two packages, given as maps of uid to item.
+    The updated items are kept as pairs of the old and the new item, so that the changes can be composed.
+    """
+    old_uids = set(old_items.keys())
+    new_uids = set(new_items.keys())
+    return {
+        "new": [new_items[uid] for uid in new_uids - old_uids],
+        "deleted": [old_items[uid] for uid in old_uids - new_uids],
+        "updated": [
+            [old_items[uid], new_items[uid]]
+            for uid in new_uids & old_uids
+            if are_different(old_items[uid], new_items[uid])
+        ],
     }
-    old_codelists_ret, _ = db.cypher_query(
-        PACKAGE_CODELISTS_DATA_RETRIEVAL, query_params_old
-    )
-    new_codelists_ret, _ = db.cypher_query(
-        PACKAGE_CODELISTS_DATA_RETRIEVAL, query_params_new
-    )
 
-    new_codelists = new_codelists_ret[0][0]
-    old_codelists = old_codelists_ret[0][0]
-    old_uids = set(old_codelists.keys())
-    new_uids = set(new_codelists.keys())
-    added_uids = new_uids - old_uids
-    deleted_uids = old_uids - new_uids
-    added_codelists = [new_codelists[uid] for uid in added_uids]
-    deleted_codelists = [old_codelists[uid] for uid in deleted_uids]
-
-    # Find changed codelists
-    cl_common_uids = new_uids & old_uids
-    changed_codelists = []
-    for uid in cl_common_uids:
-        old_codelist = old_codelists[uid]
-        new_codelist = new_codelists[uid]
-        if are_codelists_different(old_codelist, new_codelist):
-            changed_codelists.append(codelist_diff(old_codelist, new_codelist))
 
-    output["new_codelists"] = (
-        sorted(added_codelists, key=lambda ct_codelist: ct_codelist["change_date"])
-        if len(added_codelists) > 0
-        else []
-    )
-    output["deleted_codelists"] = (
-        sorted(deleted_codelists, key=lambda ct_codelist: ct_codelist["change_date"])
-        if len(deleted_codelists) > 0
-        else []
+def compose_package_changes(steps: list[dict], are_different) -> dict:
+    """
+    Composes the changes between consecutive packages into the changes between the first and the last package.
+    Only the state of an item before the first change and after the last change is compared,
+    an item deleted and then added again is thus updated or not changed at all.
+    """
+    first_items = {}
+    last_items = {}
+    for step in steps:
+        for item in step["new"]:
+            first_items.setdefault(item["uid"], None)
+            last_items[item["uid"]] = item
+        for item in step["deleted"]:
+            first_items.setdefault(item["uid"], item)
+            last_items[item["uid"]] = None
+        for old_item, new_item in step["updated"]:
+            first_items.setdefault(old_item["uid"], old_item)
+            last_items[old_item["uid"]] = new_item
+
+    changes = {"new": [], "deleted": [], "updated": []}
+    for uid, first_item in first_items.items():
+        last_item = last_items[uid]
+        if first_item is None:
+            if last_item is not None:
+                changes["new"].append(last_item)
+        elif last_item is None:
+            changes["deleted"].append(first_item)
+        elif are_different(first_item, last_item):
+            changes["updated"].append([first_item, last_item])
+    return changes
+
+
+def dump_package_changes(changes: dict) -> bytes:
+    return zlib.compress(
+        json.dumps(
+            changes, default=lambda value: value.iso_format(), separators=(",", ":")
+        ).encode("utf-8")
     )
-    output["updated_codelists"] = (
-        sorted(changed_codelists, key=lambda ct_codelist: ct_codelist["change_date"])
-        if len(changed_codelists) > 0
-        else []
+
+
+def load_package_changes(data: bytes) -> dict:
+    def load_item(item: dict) -> dict:
+        if "change_date" in item:
+            item["change_date"] = DateTime.from_iso_format(item["change_date"])
+        return item
+
+    return json.loads(zlib.decompress(data).decode("utf-8"), object_hook=load_item)
+
+
+def get_package_items(package_name: str) -> dict:
+    """Returns the codelists and the terms of a package, as maps of uid to item."""
+    items = {}
+    for kind, query in (
+        ("codelists", PACKAGE_CODELISTS_DATA_RETRIEVAL),
+        ("terms", PACKAGE_TERMS_DATA_RETRIEVAL),
+    ):
+        ret, _ = db.cypher_query(query, {"package_name": package_name})
+        items[kind] = {
+            uid: {**item, "value_node": dict(item["value_node"])}
+            for uid, item in ret[0][0].items()
+        }
+    return items
+
+
+def diff_packages(old_items: dict, new_items: dict) -> dict:
+    """Returns the changes of the codelists and of the terms between the items of two packages."""
+    return {
+        "codelists": diff_package_items(
+            old_items["codelists"], new_items["codelists"], are_codelists_different
+        ),
+        "terms": diff_package_items(
+            old_items["terms"], new_items["terms"], are_terms_different
+        ),
+    }
+
+
+def get_package_steps(old_package_name: str, new_package_name: str) -> list | None:
+    """
+    Returns the stored changes between each pair of consecutive packages from the old package to the new package.
+    Returns None if the changes of any pair are not stored or are outdated, see `store_package_steps`.
+    """
+    pairs, _ = db.cypher_query(
+        PACKAGE_STEPS_RETRIEVAL,
+        {
+            "old_package_name": old_package_name,
+            "new_package_name": new_package_name,
+            "changes_format": str(PACKAGE_CHANGES_FORMAT),
+        },
     )
+    if any(stored_changes is None for _, _, stored_changes in pairs):
+        return None
+    return [load_package_changes(stored_changes) for _, _, stored_changes in pairs]
 
-    old_terms_ret, _ = db.cypher_query(PACKAGE_TERMS_DATA_RETRIEVAL, query_params_old)
-    new_terms_ret, _ = db.cypher_query(PACKAGE_TERMS_DATA_RETRIEVAL, query_params_new)
-
-    new_terms = new_terms_ret[0][0]
-    old_terms = old_terms_ret[0][0]
-    old_uids = set(old_terms.keys())
-    new_uids = set(new_terms.keys())
-    added_uids = new_uids - old_uids
-    deleted_uids = old_uids - new_uids
-    added_terms = [new_terms[uid] for uid in added_uids]
-    deleted_terms = [old_terms[uid] for uid in deleted_uids]
-
-    # Find changed terms
-    common_uids = new_uids & old_uids
-    changed_terms = []
-    for uid in common_uids:
-        old_term = old_terms[uid]
-        new_term = new_terms[uid]
-        if are_terms_different(old_term, new_term):
-            changed_terms.append(term_diff(old_term, new_term))
 
-    output["new_terms"] = (
-        sorted(added_terms, key=lambda ct_term: ct_term["change_date"])
-        if len(added_terms) > 0
-        else []
+def store_package_steps(
+    old_package_name: str, new_package_name: str
+) -> list[tuple[str, str]]:
+    """
+    Computes and stores the changes between each pair of consecutive packages from the old package to the new package,
+    on the NEXT_PACKAGE relationship between the two packages.
+    Only the missing or outdated changes are computed, the pairs they were computed for are returned.
+    Each pair is stored in its own transaction, with both packages locked,
+    so that concurrent calls neither compute the same changes twice nor create duplicate relationships.
+    """
+    query_params = {
+        "old_package_name": old_package_name,
+        "new_package_name": new_package_name,
+        "changes_format": str(PACKAGE_CHANGES_FORMAT),
+    }
+    with db.transaction:
+        pairs, _ = db.cypher_query(PACKAGE_STEPS_RETRIEVAL, query_params)
+
+    stored_pairs = []
+    loaded_package_items = {}
+    for old_name, new_name, stored_changes in pairs:
+        if stored_changes is not None:
+            continue
+        pair_params = {
+            **query_params,
+            "old_package_name": old_name,
+            "new_package_name": new_name,
+        }
+        with db.transaction:
+            [[up_to_date]], _ = db.cypher_query(PACKAGE_STEP_LOCK, pair_params)
+            if up_to_date:
+                continue
+            # The packages are loaded once, each one is compared with the previous and the next package
+            old_items = loaded_package_items.pop(old_name, None) or get_package_items(
+                old_name
+            )
+            new_items = get_package_items(new_name)
+            loaded_package_items = {new_name: new_items}
+            db.cypher_query(
+                PACKAGE_STEP_SAVE,
+                {
+                    **pair_params,
+                    "changes": dump_package_changes(
+                        diff_packages(old_items, new_items)
+                    ),
+                },
+            )
+        stored_pairs.append((old_name, new_name))
+    return stored_pairs
+
+
+@db.transaction
+def get_ct_packages_changes(old_package_name: str, new_package_name: str) -> dict:
+    # The comparison is composed from the changes stored between consecutive packages.
+    # Doing the comparison in cypher uses too much ram.
+    steps = get_package_steps(old_package_name, new_package_name)
+    if steps is None:
+        # The changes are not stored yet, the two packages are compared directly
+        steps = [
+            diff_packages(
+                get_package_items(old_package_name),
+                get_package_items(new_package_name),
+            )
+        ]
+    codelist_changes = compose_package_changes(
+        [step["codelists"] for step in steps], are_codelists_different
     )
-    output["deleted_terms"] = (
-        sorted(deleted_terms, key=lambda ct_term: ct_term["change_date"])
-        if len(deleted_terms) > 0
-        else []
+    term_changes = compose_package_changes(
+        [step["terms"] for step in steps], are_terms_different
     )
-    output["updated_terms"] = (
-        sorted(changed_terms, key=lambda ct_term: ct_term["change_date"])
-        if len(changed_terms) > 0
-        else []
+
+    # The codelists of the terms are the current ones, they are not part of the packages
+    term_uids = [
+        item["uid"] for item in term_changes["new"] + term_changes["deleted"]
+    ] + [new_term["uid"] for _, new_term in term_changes["updated"]]
+    term_codelists_ret, _ = db.cypher_query(
+        TERM_CODELISTS_RETRIEVAL, {"term_uids": term_uids}
     )
+    term_codelists = dict(term_codelists_ret)
+    for term in term_changes["new"] + term_changes["deleted"]:
+        term["codelists"] = term_codelists.get(term["uid"], [])
+    for _, new_term in term_changes["updated"]:
+        new_term["codelists"] = term_codelists.get(new_term["uid"], [])
+
+    output = {
+        "new_codelists": sorted(
+            codelist_changes["new"], key=lambda ct_codelist: ct_codelist["change_date"]
+        ),
+        "deleted_codelists": sorted(
+            codelist_changes["deleted"],
+            key=lambda ct_codelist: ct_codelist["change_date"],
+        ),
+        "updated_codelists": sorted(
+            (
+                codelist_diff(old_codelist, new_codelist)
+                for old_codelist, new_codelist in codelist_changes["updated"]
+            ),
+            key=lambda ct_codelist: ct_codelist["change_date"],
+        ),
+        "new_terms": sorted(
+            term_changes["new"], key=lambda ct_term: ct_term["change_date"]
+        ),
+        "deleted_terms": sorted(
+            term_changes["deleted"], key=lambda ct_term: ct_term["change_date"]
+        ),
+        "updated_terms": sorted(
+            (
+                term_diff(old_term, new_term)
+                for old_term, new_term in term_changes["updated"]
+            ),
+            key=lambda ct_term: ct_term["change_date"],
+        ),
+    }
 
-    update_modified_codelists(output=output, all_codelists_in_package=new_codelists)
+    new_codelists_ret, _ = db.cypher_query(
+        PACKAGE_CODELISTS_DATA_RETRIEVAL, {"package_name": new_package_name}
+    )
+    update_modified_codelists(
+        output=output, all_codelists_in_package=new_codelists_ret[0][0]
+    )
     return output
 
 
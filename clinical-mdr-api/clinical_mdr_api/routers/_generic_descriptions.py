@@ -69,6 +69,15 @@ In case the value is set to `0`, all rows will be returned.\n
 Errors: `page_number` not provided.
 """
 
+PAGE_TOKEN = """
+Opaque token returned as `next_page_token` in the response of the previous page.\n
+Functionality: when provided, the page following the previous one is returned using keyset pagination,
+which costs the same no matter how deep the page is. `page_number` is then ignored.
+An empty `page_token` returns the first page in the default order along with its `next_page_token`,
+pages are otherwise only returned with a `next_page_token` when `sort_by` is given.\n
+Errors: the token was issued for a different `sort_by`, or `page_size` is `0`.
+"""
+
 FILTERS = """
 JSON dictionary of field names and search strings, with a choice of operators for building complex filtering queries.
 
@@ -120,6 +129,15 @@ TOTAL_COUNT = (
     "Functionality: retrieve total count of queried entities.\n\n"
 )
 
+COUNT_STRATEGY = (
+    "Specifies how the total count is computed when `total_count` is requested - `exact`, `fused`, `cached` or `estimated`.\n\n"
+    "Default: `exact` (separate count query).\n\n"
+    "Functionality: `fused` computes the exact count in the same database round-trip as the page, "
+    "`cached` reuses an exact count computed shortly before for the same filters, "
+    "`estimated` returns a fast approximation for unfiltered lists and falls back to `exact` otherwise. "
+    "The strategy actually used is returned in `count_strategy`.\n\n"
+)
+
 HEADER_FIELD_NAME = (
     "The field name for which to lookup possible values in the database.\n\n"
     "Functionality: searches for possible values (aka 'headers') of this field in the database."
@@ -151,6 +169,21 @@ STUDY_VALUE_VERSION_QUERY = Query(
     regex=FLOAT_REGEX,
 )
 
+AUDIT_TRAIL_START_DATE = (
+    "Optionally, the earliest date of the returned audit trail actions, included.\n\n"
+    "Functionality: restricts the audit trail to the actions done since this date."
+)
+
+AUDIT_TRAIL_END_DATE = (
+    "Optionally, the latest date of the returned audit trail actions, included.\n\n"
+    "Functionality: restricts the audit trail to the actions done until this date."
+)
+
+AUDIT_TRAIL_USER_INITIALS = (
+    "Optionally, the user who did the returned audit trail actions.\n\n"
+    "Functionality: restricts the audit trail to the actions done by this user."
+)
+
 ERROR_404 = {"model": ErrorResponse, "description": "Entity not found"}
 ERROR_500 = {"model": ErrorResponse, "description": "Internal Server Error"}
 
@@ -3,6 +3,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, Query
 
 from clinical_mdr_api.oauth import get_current_user_id, rbac
+from clinical_mdr_api.repositories._cache import clear_cache, get_shared_caches
 from clinical_mdr_api.routers import _generic_descriptions
 from clinical_mdr_api.services._meta_repository import MetaRepository
 
@@ -34,6 +35,24 @@ def get_caches(
     return [_get_cache_info(x, show_items) for x in all_repos]
 
 
+@router.get(
+    "/caches/statistics",
+    dependencies=[rbac.ADMIN_READ],
+    summary="Returns the usage statistics of the shared cache stores",
+    description="""Counters of hits, misses, evictions (cache full), expirations (TTL reached)
+and invalidations (writes), since the start of the API worker serving the request.""",
+    status_code=200,
+    responses={
+        404: _generic_descriptions.ERROR_404,
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def get_cache_statistics(
+    _current_user_id: str = Depends(get_current_user_id),
+) -> list[dict]:
+    return [cache.get_statistics() for cache in get_shared_caches()]
+
+
 @router.delete(
     "/caches",
     dependencies=[rbac.ADMIN_WRITE],
@@ -52,7 +71,7 @@ def clear_caches(
         for store_name in CACHE_STORE_NAMES:
             cache_store = getattr(repo, store_name, None)
             if cache_store is not None:
-                cache_store.clear()
+                clear_cache(cache_store)
 
     return get_caches(current_user_id)
 
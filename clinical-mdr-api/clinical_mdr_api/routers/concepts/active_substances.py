@@ -71,7 +71,8 @@ Possible errors:
             "text/xml",
             "application/json",
         ],
-    }
+    },
+    batch_with_page_token=True,
 )
 # pylint: disable=unused-argument
 def get_active_substances(
@@ -96,6 +97,7 @@ def get_active_substances(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
 ):
     active_substance_service = ActiveSubstanceService(user=current_user_id)
@@ -107,9 +109,14 @@ def get_active_substances(
         total_count=total_count,
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
+        page_token=page_token,
     )
     return CustomPage.create(
-        items=results.items, total=results.total, page=page_number, size=page_size
+        items=results.items,
+        total=results.total,
+        page=page_number,
+        size=page_size,
+        next_page_token=results.next_page_token,
     )
 
 
@@ -78,7 +78,8 @@ Possible errors:
             "text/xml",
             "application/json",
         ],
-    }
+    },
+    batch_with_page_token=True,
 )
 # pylint: disable=unused-argument
 def get_activities(
@@ -126,6 +127,7 @@ def get_activities(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
 ):
     activity_service = ActivityService(user=current_user_id)
@@ -141,9 +143,14 @@ def get_activities(
         activity_names=activity_names,
         activity_subgroup_names=activity_subgroup_names,
         activity_group_names=activity_group_names,
+        page_token=page_token,
     )
     return CustomPage.create(
-        items=results.items, total=results.total, page=page_number, size=page_size
+        items=results.items,
+        total=results.total,
+        page=page_number,
+        size=page_size,
+        next_page_token=results.next_page_token,
     )
 
 
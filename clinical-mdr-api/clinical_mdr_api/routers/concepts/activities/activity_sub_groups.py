@@ -77,6 +77,7 @@ def get_activity_subgroups(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
 ):
     activity_subgroup_service = ActivitySubGroupService(user=current_user_id)
@@ -90,9 +91,14 @@ def get_activity_subgroups(
         filter_operator=FilterOperator.from_str(operator),
         activity_group_uid=activity_group_uid,
         activity_group_names=activity_group_names,
+        page_token=page_token,
     )
     return CustomPage.create(
-        items=results.items, total=results.total, page=page_number, size=page_size
+        items=results.items,
+        total=results.total,
+        page=page_number,
+        size=page_size,
+        next_page_token=results.next_page_token,
     )
 
 
@@ -146,12 +146,23 @@ def store_odm_xml(
         default=None,
         description=MAPPER_DESCRIPTION,
     ),
+    batch_size: int
+    | None = Query(
+        None,
+        ge=1,
+        description="If specified, the definitions are stored in transactions of `batch_size` definitions "
+        "instead of a single transaction. "
+        "The progress is saved with each transaction, so that importing the same files again after a failure "
+        "resumes the import where it stopped.",
+    ),
 ):
     if exporter == ExporterType.OSB:
         odm_xml_importer_service = OdmXmlImporterService(xml_file, mapper_file)
     else:
         odm_xml_importer_service = OdmClinicalXmlImporterService(xml_file, mapper_file)
 
+    if batch_size:
+        return odm_xml_importer_service.store_odm_xml_in_batches(batch_size)
     return odm_xml_importer_service.store_odm_xml()
 
 
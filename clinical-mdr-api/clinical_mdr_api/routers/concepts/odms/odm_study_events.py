@@ -61,7 +61,8 @@ OdmStudyEventUID = Path(None, description="The unique id of the ODM Study Event.
             "text/xml",
             "application/json",
         ],
-    }
+    },
+    batch_with_page_token=True,
 )
 # pylint: disable=unused-argument
 def get_all_odm_study_events(
@@ -86,6 +87,7 @@ def get_all_odm_study_events(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
 ):
     odm_study_event_service = OdmStudyEventService()
     results = odm_study_event_service.get_all_concepts(
@@ -96,9 +98,14 @@ def get_all_odm_study_events(
         total_count=total_count,
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
+        page_token=page_token,
     )
     return CustomPage.create(
-        items=results.items, total=results.total, page=page_number, size=page_size
+        items=results.items,
+        total=results.total,
+        page=page_number,
+        size=page_size,
+        next_page_token=results.next_page_token,
     )
 
 
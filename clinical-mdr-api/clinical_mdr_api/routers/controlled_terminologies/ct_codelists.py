@@ -9,7 +9,7 @@ from clinical_mdr_api import config, models
 from clinical_mdr_api.models.error import ErrorResponse
 from clinical_mdr_api.models.utils import CustomPage
 from clinical_mdr_api.oauth import get_current_user_id, rbac
-from clinical_mdr_api.repositories._utils import FilterOperator
+from clinical_mdr_api.repositories._utils import CountStrategy, FilterOperator
 from clinical_mdr_api.routers import _generic_descriptions, decorators
 from clinical_mdr_api.services.controlled_terminologies.ct_codelist import (
     CTCodelistService,
@@ -92,7 +92,8 @@ def create(
             "text/xml",
             "application/json",
         ],
-    }
+    },
+    batch_with_page_token=True,
 )
 # pylint: disable=unused-argument
 def get_codelists(
@@ -141,6 +142,9 @@ def get_codelists(
 `operator` specifies which logical operation - `and` or `or` - should be used in case multiple CT Term UIDs are provided. Default: `and`""",
         example="""{"term_uids": [""], "operator": "and"}""",
     ),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
+    count_strategy: str
+    | None = Query("exact", description=_generic_descriptions.COUNT_STRATEGY),
     current_user_id: str = Depends(get_current_user_id),
 ):
     ct_codelist_service = CTCodelistService(user=current_user_id)
@@ -155,9 +159,16 @@ def get_codelists(
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
         term_filter=term_filter,
+        page_token=page_token,
+        count_strategy=CountStrategy.from_str(count_strategy),
     )
     return CustomPage.create(
-        items=results.items, total=results.total, page=page_number, size=page_size
+        items=results.items,
+        total=results.total,
+        page=page_number,
+        size=page_size,
+        next_page_token=results.next_page_token,
+        count_strategy=results.count_strategy,
     )
 
 
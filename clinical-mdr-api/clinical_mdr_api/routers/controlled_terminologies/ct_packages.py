@@ -2,8 +2,9 @@
 from datetime import date
 
 from fastapi import APIRouter, Depends, Path, Query
+from fastapi.responses import StreamingResponse
 
-from clinical_mdr_api import models
+from clinical_mdr_api import config, models
 from clinical_mdr_api.oauth import get_current_user_id, rbac
 from clinical_mdr_api.routers import _generic_descriptions
 from clinical_mdr_api.services.controlled_terminologies.ct_package import (
@@ -62,6 +63,16 @@ def get_packages_changes_between_codelists_and_terms(
         description="The datetime for the new package, for instance '2020-06-26'"
         "\n_the possible dates for given catalogue_name can be retrieved by the /ct/packages/dates endpoint",
     ),
+    page_number: int
+    | None = Query(1, ge=1, description=_generic_descriptions.PAGE_NUMBER),
+    page_size: int
+    | None = Query(
+        0,
+        ge=0,
+        le=config.MAX_PAGE_SIZE,
+        description="Number of items to be returned per page, in each list of changes.\n"
+        "Default: 0, all the changes are returned.",
+    ),
     current_user_id: str = Depends(get_current_user_id),
 ):
     ct_package_service = CTPackageService(current_user_id)
@@ -69,9 +80,74 @@ def get_packages_changes_between_codelists_and_terms(
         catalogue_name=catalogue_name,
         old_package_date=old_package_date,
         new_package_date=new_package_date,
+        page_number=page_number,
+        page_size=page_size,
     )
 
 
+@router.get(
+    "/packages/changes/stream",
+    dependencies=[rbac.LIBRARY_READ],
+    summary="Returns changes between codelists and terms inside two different packages, as newline-delimited JSON.",
+    description="Each line is one changed codelist or term, "
+    "its `change` field tells which list of the /ct/packages/changes response it belongs to.",
+    response_class=StreamingResponse,
+    status_code=200,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        404: _generic_descriptions.ERROR_404,
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def stream_packages_changes_between_codelists_and_terms(
+    catalogue_name: str,
+    old_package_date: date = Query(
+        ...,
+        description="The date for the old package, for instance '2020-03-27'"
+        "\n_the possible dates for given catalogue_name can be retrieved by the /ct/packages/dates endpoint",
+    ),
+    new_package_date: date = Query(
+        ...,
+        description="The date for the new package, for instance '2020-06-26'"
+        "\n_the possible dates for given catalogue_name can be retrieved by the /ct/packages/dates endpoint",
+    ),
+    current_user_id: str = Depends(get_current_user_id),
+):
+    ct_package_service = CTPackageService(current_user_id)
+    return StreamingResponse(
+        ct_package_service.stream_ct_packages_changes(
+            catalogue_name=catalogue_name,
+            old_package_date=old_package_date,
+            new_package_date=new_package_date,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post(
+    "/packages/changes/steps",
+    dependencies=[rbac.ADMIN_WRITE],
+    summary="Computes and stores the changes between the consecutive packages of a catalogue.",
+    description="""The comparisons of two packages returned by /ct/packages/changes are composed
+from the changes stored between the consecutive packages in between.
+To be called after importing packages, the changes that are already stored are not computed again.
+Until then, the two packages are compared directly.
+
+Returns the names of the pairs of packages the changes were computed for.""",
+    status_code=200,
+    responses={
+        404: _generic_descriptions.ERROR_404,
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def store_packages_changes(
+    catalogue_name: str,
+    current_user_id: str = Depends(get_current_user_id),
+) -> list[dict]:
+    ct_package_service = CTPackageService(current_user_id)
+    return ct_package_service.store_ct_packages_changes(catalogue_name=catalogue_name)
+
+
 @router.get(
     "/packages/{codelist_uid}/changes",
     dependencies=[rbac.LIBRARY_READ],
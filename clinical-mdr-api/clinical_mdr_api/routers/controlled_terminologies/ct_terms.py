@@ -9,7 +9,7 @@ from clinical_mdr_api import config, models
 from clinical_mdr_api.models.error import ErrorResponse
 from clinical_mdr_api.models.utils import CustomPage
 from clinical_mdr_api.oauth import get_current_user_id, rbac
-from clinical_mdr_api.repositories._utils import FilterOperator
+from clinical_mdr_api.repositories._utils import CountStrategy, FilterOperator
 from clinical_mdr_api.routers import _generic_descriptions, decorators
 from clinical_mdr_api.services.controlled_terminologies.ct_term import CTTermService
 
@@ -100,7 +100,8 @@ def create(
             "text/xml",
             "application/json",
         ],
-    }
+    },
+    batch_with_page_token=True,
 )
 # pylint: disable=unused-argument
 def get_all_terms(
@@ -140,6 +141,9 @@ def get_all_terms(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
+    count_strategy: str
+    | None = Query("exact", description=_generic_descriptions.COUNT_STRATEGY),
     current_user_id: str = Depends(get_current_user_id),
 ):
     ct_term_service = CTTermService(user=current_user_id)
@@ -154,9 +158,16 @@ def get_all_terms(
         total_count=total_count,
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
+        page_token=page_token,
+        count_strategy=CountStrategy.from_str(count_strategy),
     )
     return CustomPage.create(
-        items=results.items, total=results.total, page=page_number, size=page_size
+        items=results.items,
+        total=results.total,
+        page=page_number,
+        size=page_size,
+        next_page_token=results.next_page_token,
+        count_strategy=results.count_strategy,
     )
 
 
@@ -6,7 +6,6 @@ from fastapi.responses import Response
 from clinical_mdr_api.oauth import rbac
 from clinical_mdr_api.routers import _generic_descriptions
 from clinical_mdr_api.routers.studies.study import router
-from clinical_mdr_api.services.ctr_xml.ctr_xml_service import CTRXMLService
 
 StudyUID = Path(None, description="The unique id of the study.")
 
@@ -29,4 +28,7 @@ class XMLResponse(Response):
 def get_odm_xml(
     uid: str = StudyUID,
 ) -> XMLResponse:
+    # The generated CTR XML bindings are slow to import, they are only loaded on the first export
+    from clinical_mdr_api.services.ctr_xml.ctr_xml_service import CTRXMLService
+
     return XMLResponse(content=CTRXMLService().get_ctr_odm(uid))
@@ -4,19 +4,32 @@ import collections
 import csv
 import functools
 import io
-from typing import Any
+import logging
+import tempfile
+from typing import Any, Callable, Iterable, Iterator
 
 import yaml
 from dict2xml import dict2xml
 from fastapi.responses import StreamingResponse
-from openpyxl import Workbook
 
-from clinical_mdr_api import exceptions
+from clinical_mdr_api import config, exceptions
 from clinical_mdr_api.models import utils
 from clinical_mdr_api.models.utils import BaseModel
 from clinical_mdr_api.services.studies.study import StudyService
 
+log = logging.getLogger(__name__)
+
 REGISTERED_EXPORT_FORMATS = {}
+# Written at the end of a streamed export when fetching the following items failed
+EXPORT_ERROR_MARKERS = {
+    "text/csv": '"ERROR: the export failed, the items above are incomplete"\r\n',
+    "text/xml": "\n<!-- ERROR: the export failed, the items above are incomplete -->",
+}
+
+# Number of rows serialized before a chunk of the export is sent
+EXPORT_CHUNK_ROWS = 100
+# Size of the chunks read from the serialized XLSX file
+EXPORT_CHUNK_BYTES = 64 * 1024
 
 
 def register_export_format(name: str):
@@ -120,56 +133,64 @@ def _convert_data_to_rows(data: dict, headers: list[Any]):
         yield rs
 
 
-def _convert_data_to_list(data: dict, headers: list[Any]) -> list[Any]:
-    """Generate a list of dictionaries based on given data."""
-    # First, convert received headers to a more usable representation
-    dict_headers = _convert_headers_to_dict(headers)
-    result = []
-    for value in _extract_values_from_data(data, dict_headers):
-        result.append(value)
-    return result
-
-
 @register_export_format("text/csv")
-def _export_to_csv(data: dict, headers: list[Any]):
+def _export_to_csv(data: dict, headers: list[Any]) -> Iterator[str]:
     """Export given data to CSV.
 
     The generated CSV content will only contain items listed in
-    headers.
+    headers. It is yielded in chunks of EXPORT_CHUNK_ROWS rows.
     """
     stream = io.StringIO()
     writer = csv.writer(stream, delimiter=",", quoting=csv.QUOTE_ALL)
-    for row in _convert_data_to_rows(data, headers):
+    for index, row in enumerate(_convert_data_to_rows(data, headers), start=1):
         writer.writerow(row)
-    return stream.getvalue()
+        if index % EXPORT_CHUNK_ROWS == 0:
+            yield stream.getvalue()
+            stream.seek(0)
+            stream.truncate()
+    yield stream.getvalue()
 
 
 @register_export_format(
     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 )
-def _export_to_xslx(data: dict, headers: list[Any]):
+def _export_to_xslx(data: dict, headers: list[Any]) -> Iterator[bytes]:
     """Export given data to XLSX.
 
     The generated content will only contain items listed in headers.
+    Rows are written to a temporary file by a write-only workbook,
+    which is then yielded in chunks of EXPORT_CHUNK_BYTES.
     """
-    stream = io.BytesIO()
-    workbook = Workbook()
-    # grab the active worksheet
-    worksheet = workbook.active
+    # openpyxl is slow to import, it is only loaded for the XLSX export
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
     for row in _convert_data_to_rows(data, headers):
         worksheet.append(row)
-    workbook.save(stream)
-    return stream.getvalue()
+    with tempfile.TemporaryFile() as stream:
+        workbook.save(stream)
+        stream.seek(0)
+        while chunk := stream.read(EXPORT_CHUNK_BYTES):
+            yield chunk
 
 
 @register_export_format("text/xml")
-def _export_to_xml(data: dict, headers: list[Any]):
+def _export_to_xml(data: dict, headers: list[Any]) -> Iterator[str]:
     """Export given data to XML.
 
     The generated content will only contain items listed in headers.
+    It is yielded item by item.
     """
-    export_dict = {"item": _convert_data_to_list(data, headers)}
-    return dict2xml(export_dict, wrap="items", indent="  ")
+    yield "<items>"
+    empty = True
+    for value in _extract_values_from_data(data, _convert_headers_to_dict(headers)):
+        empty = False
+        item = dict2xml({"item": value}, indent="  ")
+        yield "\n" + "\n".join("  " + line for line in item.split("\n"))
+    if empty:
+        yield "\n  <item></item>"
+    yield "\n</items>"
 
 
 @register_export_format("application/x-yaml")
@@ -196,14 +217,64 @@ def export(export_format: str, data: dict, export_definition: dict, *args, **kwa
         result = REGISTERED_EXPORT_FORMATS[export_format](
             data, headers, *args, **kwargs
         )
-        response = StreamingResponse(iter([result]), media_type=export_format)
+        if isinstance(result, str | bytes):
+            result = iter([result])
+        result = iter(result)
+        # The first chunk is produced before the response is started, so that errors are still returned as such.
+        # The XLSX export produces its first chunk once all items are fetched.
+        first_chunk = next(result, None)
+        response = StreamingResponse(
+            _stream_export(export_format, first_chunk, result),
+            media_type=export_format,
+        )
         response.headers["Content-Disposition"] = "attachment; filename=export"
         return response
     return data
 
 
-def allow_exports(export_definition: dict):
-    """Decorator used to add export functionality to list type endpoint."""
+def _stream_export(
+    export_format: str, first_chunk: str | bytes | None, chunks: Iterator
+) -> Iterator[str | bytes]:
+    """
+    Yields the chunks of an export whose response is already started.
+    A failure can then only be reported in the content, before the response is aborted.
+    """
+    if first_chunk is None:
+        return
+    yield first_chunk
+    try:
+        yield from chunks
+    except Exception:
+        log.exception("Export to %s failed after the response started", export_format)
+        if export_format in EXPORT_ERROR_MARKERS:
+            yield EXPORT_ERROR_MARKERS[export_format]
+        raise
+
+
+def _iterate_batches(
+    func: Callable, args: tuple, kwargs: dict, first_batch: utils.CustomPage
+) -> Iterable[Any]:
+    """
+    Yields the items of first_batch, which is the first page of EXPORT_BATCH_SIZE items
+    returned by the endpoint, then the items of the following pages, fetched with their page token.
+    """
+    batch = first_batch
+    while True:
+        yield from batch.items
+        if not batch.next_page_token:
+            return
+        batch = func(*args, **{**kwargs, "page_token": batch.next_page_token})
+
+
+def allow_exports(export_definition: dict, batch_with_page_token: bool = False):
+    """Decorator used to add export functionality to list type endpoint.
+
+    When all items are exported (`page_size` of 0) from an endpoint given `batch_with_page_token`,
+    they are fetched in pages of EXPORT_BATCH_SIZE items while the export is streamed.
+    Only endpoints paginated in the database with a `page_token` are given `batch_with_page_token`:
+    their pages are sorted by unique keys and each page costs the same,
+    whereas endpoints filtering their items in memory would fetch all items for every page.
+    """
 
     def decorator(func):
         @functools.wraps(func)
@@ -212,12 +283,42 @@ def allow_exports(export_definition: dict):
             accept = None
             if request:
                 accept = request.headers.get("accept", "application/json")
-            result = func(*args, **kwargs)
             formats = export_definition.get("formats", [])
             formats.extend(export_definition.keys())
-            if accept and accept in formats:
-                result = export(accept, result, export_definition)
-            return result
+            if not accept or accept not in formats:
+                return func(*args, **kwargs)
+
+            if (
+                batch_with_page_token
+                and accept in REGISTERED_EXPORT_FORMATS
+                and kwargs.get("page_size") == 0
+                and kwargs.get("page_number") is not None
+            ):
+                batch_kwargs = {
+                    **kwargs,
+                    "page_number": 1,
+                    "page_size": config.EXPORT_BATCH_SIZE,
+                    # The first page in the default order, with the token of the next page
+                    "page_token": "",
+                }
+                if "total_count" in batch_kwargs:
+                    batch_kwargs["total_count"] = False
+                first_batch = func(*args, **batch_kwargs)
+                if (
+                    first_batch.next_page_token
+                    or len(first_batch.items) < config.EXPORT_BATCH_SIZE
+                ):
+                    return export(
+                        accept,
+                        _iterate_batches(func, args, batch_kwargs, first_batch),
+                        export_definition,
+                    )
+                # A full page without a token can't be followed,
+                # e.g. when sorted by values which can't be written in a token
+                return export(accept, func(*args, **kwargs), export_definition)
+
+            result = func(*args, **kwargs)
+            return export(accept, result, export_definition)
 
         return wrapper
 
@@ -55,7 +55,8 @@ State after:
             "text/xml",
             "application/json",
         ],
-    }
+    },
+    batch_with_page_token=True,
 )
 # pylint: disable=unused-argument
 def get_dataset_variables(
@@ -92,6 +93,7 @@ def get_dataset_variables(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
 ):
     dataset_variable_service = DatasetVariableService(user=current_user_id)
@@ -105,9 +107,14 @@ def get_dataset_variables(
         data_model_ig_name=data_model_ig_name,
         data_model_ig_version=data_model_ig_version,
         dataset_scenario_uid=dataset_scenario_uid,
+        page_token=page_token,
     )
     return CustomPage.create(
-        items=results.items, total=results.total, page=page_number, size=page_size
+        items=results.items,
+        total=results.total,
+        page=page_number,
+        size=page_size,
+        next_page_token=results.next_page_token,
     )
 
 
@@ -1,7 +1,9 @@
+from datetime import datetime
 from typing import Any
 
 from fastapi import APIRouter, Body, Depends, Path, Query, Response
 from fastapi import status as response_status
+from fastapi.responses import StreamingResponse
 from pydantic.types import Json
 from starlette.requests import Request
 
@@ -524,7 +526,8 @@ def get_snapshot_history(
     dependencies=[rbac.STUDY_READ],
     summary="Returns the audit trail for the fields of a specific study definition identified by 'uid'.",
     description="Actions on the study are grouped by date of edit."
-    "Optionally select which subset of fields should be reflected in the audit trail.",
+    "Optionally select which subset of fields should be reflected in the audit trail, "
+    "and restrict it to the actions done in a time range or by a user.",
     response_model=list[StudyFieldAuditTrailEntry],
     status_code=200,
     responses={
@@ -546,15 +549,165 @@ def get_fields_audit_trail(
     | None = Query(
         None, description=study_fields_audit_trail_section_description("exclude")
     ),
+    start_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_START_DATE),
+    end_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_END_DATE),
+    user_initials: str
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_USER_INITIALS),
+    fields: list[str]
+    | None = Query(
+        None,
+        description="Optionally, the names of the fields the audit trail is restricted to.",
+    ),
     current_user_id: str = Depends(get_current_user_id),
 ):
     study_service = StudyService(user=current_user_id)
     study_fields_audit_trail = study_service.get_fields_audit_trail_by_uid(
-        uid=uid, include_sections=include_sections, exclude_sections=exclude_sections
+        uid=uid,
+        include_sections=include_sections,
+        exclude_sections=exclude_sections,
+        start_date=start_date,
+        end_date=end_date,
+        user_initials=user_initials,
+        fields=fields,
     )
     return study_fields_audit_trail
 
 
+@router.get(
+    "/{uid}/fields-audit-trail/paginated",
+    dependencies=[rbac.STUDY_READ],
+    summary="Returns a page of the audit trail for the fields of a specific study definition identified by 'uid'.",
+    description="""Actions on the study are grouped by date of edit, newest first.
+Optionally select which subset of fields should be reflected in the audit trail.
+
+A page holds the actions of `page_size` dates of edit. The entries without any change of the selected fields
+are left out, so a page can hold fewer entries. The following page is retrieved by passing
+the returned `next_page_token` as `page_token`, it is not returned for the last page.""",
+    response_model=CustomPage[StudyFieldAuditTrailEntry],
+    response_model_exclude_unset=True,
+    status_code=200,
+    responses={
+        404: {
+            "model": ErrorResponse,
+            "description": "Not Found - The study with the specified 'uid'"
+            " wasn't found.",
+        },
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def get_fields_audit_trail_page(
+    uid: str = StudyUID,
+    include_sections: list[StudyComponentEnum]
+    | None = Query(
+        None, description=study_fields_audit_trail_section_description("include")
+    ),
+    exclude_sections: list[StudyComponentEnum]
+    | None = Query(
+        None, description=study_fields_audit_trail_section_description("exclude")
+    ),
+    start_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_START_DATE),
+    end_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_END_DATE),
+    user_initials: str
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_USER_INITIALS),
+    fields: list[str]
+    | None = Query(
+        None,
+        description="Optionally, the names of the fields the audit trail is restricted to.",
+    ),
+    page_size: int = Query(
+        config.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=config.MAX_PAGE_SIZE,
+        description="Number of dates of edit to be returned per page.",
+    ),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
+    current_user_id: str = Depends(get_current_user_id),
+):
+    study_service = StudyService(user=current_user_id)
+    (
+        study_fields_audit_trail,
+        next_page_token,
+    ) = study_service.get_fields_audit_trail_page_by_uid(
+        uid=uid,
+        page_size=page_size,
+        page_token=page_token,
+        include_sections=include_sections,
+        exclude_sections=exclude_sections,
+        start_date=start_date,
+        end_date=end_date,
+        user_initials=user_initials,
+        fields=fields,
+    )
+    return CustomPage.create(
+        items=study_fields_audit_trail,
+        total=0,
+        page=0,
+        size=page_size,
+        next_page_token=next_page_token,
+    )
+
+
+@router.get(
+    "/{uid}/fields-audit-trail/stream",
+    dependencies=[rbac.STUDY_READ],
+    summary="Returns the whole audit trail for the fields of a specific study definition identified by 'uid', "
+    "as newline-delimited JSON.",
+    description="Each line is one entry of the /studies/{uid}/fields-audit-trail response, newest first. "
+    "The audit trail is read from the database one page at a time while it is sent.",
+    response_class=StreamingResponse,
+    status_code=200,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        404: {
+            "model": ErrorResponse,
+            "description": "Not Found - The study with the specified 'uid'"
+            " wasn't found.",
+        },
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def stream_fields_audit_trail(
+    uid: str = StudyUID,
+    include_sections: list[StudyComponentEnum]
+    | None = Query(
+        None, description=study_fields_audit_trail_section_description("include")
+    ),
+    exclude_sections: list[StudyComponentEnum]
+    | None = Query(
+        None, description=study_fields_audit_trail_section_description("exclude")
+    ),
+    start_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_START_DATE),
+    end_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_END_DATE),
+    user_initials: str
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_USER_INITIALS),
+    fields: list[str]
+    | None = Query(
+        None,
+        description="Optionally, the names of the fields the audit trail is restricted to.",
+    ),
+    current_user_id: str = Depends(get_current_user_id),
+):
+    study_service = StudyService(user=current_user_id)
+    return StreamingResponse(
+        study_service.stream_fields_audit_trail_by_uid(
+            uid=uid,
+            include_sections=include_sections,
+            exclude_sections=exclude_sections,
+            start_date=start_date,
+            end_date=end_date,
+            user_initials=user_initials,
+            fields=fields,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.get(
     "/{uid}/audit-trail",
     dependencies=[rbac.STUDY_READ],
@@ -1,4 +1,5 @@
 import os
+from datetime import datetime
 from typing import Any
 
 from fastapi import APIRouter, Body, Depends, Path, Query, Request, Response, status
@@ -103,6 +104,7 @@ def get_all_selected_objectives_for_all_studies(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
 ) -> CustomPage[models.StudySelectionObjective]:
     service = StudyObjectiveSelectionService(author=current_user_id)
@@ -116,12 +118,14 @@ def get_all_selected_objectives_for_all_studies(
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
+        page_token=page_token,
     )
     return CustomPage.create(
         items=all_selections.items,
         total=all_selections.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_selections.next_page_token,
     )
 
 
@@ -234,6 +238,7 @@ def get_all_selected_objectives(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     study_value_version: str | None = _generic_descriptions.STUDY_VALUE_VERSION_QUERY,
 ) -> GenericFilteringReturn[models.StudySelectionObjective]:
     service = StudyObjectiveSelectionService(author=current_user_id)
@@ -246,6 +251,7 @@ def get_all_selected_objectives(
         page_size=page_size,
         total_count=total_count,
         study_value_version=study_value_version,
+        page_token=page_token,
     )
 
 
@@ -311,6 +317,8 @@ The following values should be return for all study objectives.
 - objective
 - objective_level
 - order
+
+The audit trail can be restricted to the actions done in a time range or by a user.
     """,
     response_model=list[models.StudySelectionObjectiveCore],
     response_model_exclude_unset=True,
@@ -321,10 +329,112 @@ The following values should be return for all study objectives.
     },
 )
 def get_all_objectives_audit_trail(
-    uid: str = studyUID, current_user_id: str = Depends(get_current_user_id)
+    uid: str = studyUID,
+    start_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_START_DATE),
+    end_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_END_DATE),
+    user_initials: str
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_USER_INITIALS),
+    current_user_id: str = Depends(get_current_user_id),
 ) -> list[models.StudySelectionObjectiveCore]:
     service = StudyObjectiveSelectionService(author=current_user_id)
-    return service.get_all_selection_audit_trail(study_uid=uid)
+    return service.get_all_selection_audit_trail(
+        study_uid=uid,
+        start_date=start_date,
+        end_date=end_date,
+        user_initials=user_initials,
+    )
+
+
+@router.get(
+    "/studies/{uid}/study-objectives/audit-trail/paginated",
+    dependencies=[rbac.STUDY_READ],
+    summary="Returns a page of the full audit trail related to definition of all study objectives.",
+    description="""
+The entries of /studies/{uid}/study-objectives/audit-trail created on `page_size` dates of edit, newest dates first.
+
+The audit trail can be restricted to the actions done in a time range or by a user.
+The following page is retrieved by passing the returned `next_page_token` as `page_token`,
+it is not returned for the last page.
+    """,
+    response_model=CustomPage[models.StudySelectionObjectiveCore],
+    response_model_exclude_unset=True,
+    status_code=200,
+    responses={
+        404: _generic_descriptions.ERROR_404,
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def get_all_objectives_audit_trail_page(
+    uid: str = studyUID,
+    start_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_START_DATE),
+    end_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_END_DATE),
+    user_initials: str
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_USER_INITIALS),
+    page_size: int = Query(
+        config.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=config.MAX_PAGE_SIZE,
+        description="Number of dates of edit to be returned per page.",
+    ),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
+    current_user_id: str = Depends(get_current_user_id),
+):
+    service = StudyObjectiveSelectionService(author=current_user_id)
+    items, next_page_token = service.get_all_selection_audit_trail_page(
+        study_uid=uid,
+        page_size=page_size,
+        page_token=page_token,
+        start_date=start_date,
+        end_date=end_date,
+        user_initials=user_initials,
+    )
+    return CustomPage.create(
+        items=items,
+        total=0,
+        page=0,
+        size=page_size,
+        next_page_token=next_page_token,
+    )
+
+
+@router.get(
+    "/studies/{uid}/study-objectives/audit-trail/stream",
+    dependencies=[rbac.STUDY_READ],
+    summary="Returns the full audit trail related to definition of all study objectives, as newline-delimited JSON.",
+    description="Each line is one entry of the /studies/{uid}/study-objectives/audit-trail response, newest dates of edit first. "
+    "The audit trail is read from the database one page at a time while it is sent.",
+    response_class=StreamingResponse,
+    status_code=200,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        404: _generic_descriptions.ERROR_404,
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def stream_all_objectives_audit_trail(
+    uid: str = studyUID,
+    start_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_START_DATE),
+    end_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_END_DATE),
+    user_initials: str
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_USER_INITIALS),
+    current_user_id: str = Depends(get_current_user_id),
+):
+    service = StudyObjectiveSelectionService(author=current_user_id)
+    return StreamingResponse(
+        service.stream_all_selection_audit_trail(
+            study_uid=uid,
+            start_date=start_date,
+            end_date=end_date,
+            user_initials=user_initials,
+        ),
+        media_type="application/x-ndjson",
+    )
 
 
 @router.get(
@@ -687,6 +797,7 @@ def get_all_selected_endpoints_for_all_studies(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
 ) -> CustomPage[models.StudySelectionEndpoint]:
     service = StudyEndpointSelectionService(author=current_user_id)
@@ -700,12 +811,14 @@ def get_all_selected_endpoints_for_all_studies(
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
+        page_token=page_token,
     )
     return CustomPage.create(
         items=all_selections.items,
         total=all_selections.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_selections.next_page_token,
     )
 
 
@@ -836,6 +949,7 @@ def get_all_selected_endpoints(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     study_value_version: str | None = _generic_descriptions.STUDY_VALUE_VERSION_QUERY,
 ) -> GenericFilteringReturn[models.StudySelectionEndpoint]:
     service = StudyEndpointSelectionService(author=current_user_id)
@@ -848,6 +962,7 @@ def get_all_selected_endpoints(
         page_size=page_size,
         total_count=total_count,
         study_value_version=study_value_version,
+        page_token=page_token,
     )
 
 
@@ -1401,6 +1516,7 @@ def get_all_selected_compounds_for_all_studies(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
 ) -> CustomPage[models.StudySelectionCompound]:
     service = StudyCompoundSelectionService(author=current_user_id)
@@ -1413,12 +1529,14 @@ def get_all_selected_compounds_for_all_studies(
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
+        page_token=page_token,
     )
     return CustomPage.create(
         items=all_selections.items,
         total=all_selections.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_selections.next_page_token,
     )
 
 
@@ -1549,6 +1667,7 @@ def get_all_selected_compounds(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
 ) -> GenericFilteringReturn[models.StudySelectionCompound]:
     service = StudyCompoundSelectionService(author=current_user_id)
     return service.get_all_selection(
@@ -1559,6 +1678,7 @@ def get_all_selected_compounds(
         page_number=page_number,
         page_size=page_size,
         total_count=total_count,
+        page_token=page_token,
     )
 
 
@@ -2149,6 +2269,7 @@ def get_all_selected_criteria_for_all_studies(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
 ) -> CustomPage[models.StudySelectionCriteria]:
     service = StudyCriteriaSelectionService(author=current_user_id)
@@ -2162,12 +2283,14 @@ def get_all_selected_criteria_for_all_studies(
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
+        page_token=page_token,
     )
     return CustomPage.create(
         items=all_selections.items,
         total=all_selections.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_selections.next_page_token,
     )
 
 
@@ -2313,6 +2436,7 @@ def get_all_selected_criteria(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
     study_value_version: str | None = _generic_descriptions.STUDY_VALUE_VERSION_QUERY,
 ) -> CustomPage[models.StudySelectionCriteria]:
@@ -2327,6 +2451,7 @@ def get_all_selected_criteria(
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
         study_value_version=study_value_version,
+        page_token=page_token,
     )
 
     return CustomPage.create(
@@ -2334,6 +2459,7 @@ def get_all_selected_criteria(
         total=all_items.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_items.next_page_token,
     )
 
 
@@ -3000,6 +3126,7 @@ def get_all_selected_activity_instances_for_all_studies(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
 ) -> CustomPage[models.StudySelectionActivityInstance]:
     service = StudyActivityInstanceSelectionService(author=current_user_id)
@@ -3016,12 +3143,14 @@ def get_all_selected_activity_instances_for_all_studies(
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
+        page_token=page_token,
     )
     return CustomPage.create(
         items=all_selections.items,
         total=all_selections.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_selections.next_page_token,
     )
 
 
@@ -3114,6 +3243,7 @@ def get_all_selected_activity_instances(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     uid: str = studyUID,
     study_value_version: str | None = _generic_descriptions.STUDY_VALUE_VERSION_QUERY,
     current_user_id: str = Depends(get_current_user_id),
@@ -3132,12 +3262,14 @@ def get_all_selected_activity_instances(
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
         study_value_version=study_value_version,
+        page_token=page_token,
     )
     return CustomPage.create(
         items=all_items.items,
         total=all_items.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_items.next_page_token,
     )
 
 
@@ -3418,6 +3550,7 @@ def get_all_selected_activities_for_all_studies(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
 ) -> CustomPage[models.StudySelectionEndpoint]:
     service = StudyActivitySelectionService(author=current_user_id)
@@ -3433,12 +3566,14 @@ def get_all_selected_activities_for_all_studies(
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
+        page_token=page_token,
     )
     return CustomPage.create(
         items=all_selections.items,
         total=all_selections.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_selections.next_page_token,
     )
 
 
@@ -3515,6 +3650,7 @@ def get_all_selected_activities(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     uid: str = studyUID,
     study_value_version: str | None = _generic_descriptions.STUDY_VALUE_VERSION_QUERY,
     current_user_id: str = Depends(get_current_user_id),
@@ -3532,12 +3668,14 @@ def get_all_selected_activities(
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
         study_value_version=study_value_version,
+        page_token=page_token,
     )
     return CustomPage.create(
         items=all_items.items,
         total=all_items.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_items.next_page_token,
     )
 
 
@@ -3597,6 +3735,8 @@ The following values should be returned for all study activities:
 - action
 - activity
 - order
+
+The audit trail can be restricted to the actions done in a time range or by a user.
     """,
     response_model=list[models.StudySelectionActivityCore],
     response_model_exclude_unset=True,
@@ -3607,10 +3747,112 @@ The following values should be returned for all study activities:
     },
 )
 def get_all_activity_audit_trail(
-    uid: str = studyUID, current_user_id: str = Depends(get_current_user_id)
+    uid: str = studyUID,
+    start_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_START_DATE),
+    end_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_END_DATE),
+    user_initials: str
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_USER_INITIALS),
+    current_user_id: str = Depends(get_current_user_id),
 ) -> list[models.StudySelectionActivityCore]:
     service = StudyActivitySelectionService(author=current_user_id)
-    return service.get_all_selection_audit_trail(study_uid=uid)
+    return service.get_all_selection_audit_trail(
+        study_uid=uid,
+        start_date=start_date,
+        end_date=end_date,
+        user_initials=user_initials,
+    )
+
+
+@router.get(
+    "/studies/{uid}/study-activities/audit-trail/paginated",
+    dependencies=[rbac.STUDY_READ],
+    summary="Returns a page of the full audit trail related to definition of all study activities.",
+    description="""
+The entries of /studies/{uid}/study-activities/audit-trail created on `page_size` dates of edit, newest dates first.
+
+The audit trail can be restricted to the actions done in a time range or by a user.
+The following page is retrieved by passing the returned `next_page_token` as `page_token`,
+it is not returned for the last page.
+    """,
+    response_model=CustomPage[models.StudySelectionActivityCore],
+    response_model_exclude_unset=True,
+    status_code=200,
+    responses={
+        404: _generic_descriptions.ERROR_404,
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def get_all_activities_audit_trail_page(
+    uid: str = studyUID,
+    start_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_START_DATE),
+    end_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_END_DATE),
+    user_initials: str
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_USER_INITIALS),
+    page_size: int = Query(
+        config.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=config.MAX_PAGE_SIZE,
+        description="Number of dates of edit to be returned per page.",
+    ),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
+    current_user_id: str = Depends(get_current_user_id),
+):
+    service = StudyActivitySelectionService(author=current_user_id)
+    items, next_page_token = service.get_all_selection_audit_trail_page(
+        study_uid=uid,
+        page_size=page_size,
+        page_token=page_token,
+        start_date=start_date,
+        end_date=end_date,
+        user_initials=user_initials,
+    )
+    return CustomPage.create(
+        items=items,
+        total=0,
+        page=0,
+        size=page_size,
+        next_page_token=next_page_token,
+    )
+
+
+@router.get(
+    "/studies/{uid}/study-activities/audit-trail/stream",
+    dependencies=[rbac.STUDY_READ],
+    summary="Returns the full audit trail related to definition of all study activities, as newline-delimited JSON.",
+    description="Each line is one entry of the /studies/{uid}/study-activities/audit-trail response, newest dates of edit first. "
+    "The audit trail is read from the database one page at a time while it is sent.",
+    response_class=StreamingResponse,
+    status_code=200,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        404: _generic_descriptions.ERROR_404,
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def stream_all_activities_audit_trail(
+    uid: str = studyUID,
+    start_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_START_DATE),
+    end_date: datetime
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_END_DATE),
+    user_initials: str
+    | None = Query(None, description=_generic_descriptions.AUDIT_TRAIL_USER_INITIALS),
+    current_user_id: str = Depends(get_current_user_id),
+):
+    service = StudyActivitySelectionService(author=current_user_id)
+    return StreamingResponse(
+        service.stream_all_selection_audit_trail(
+            study_uid=uid,
+            start_date=start_date,
+            end_date=end_date,
+            user_initials=user_initials,
+        ),
+        media_type="application/x-ndjson",
+    )
 
 
 @router.get(
@@ -3967,6 +4209,7 @@ def get_all_selected_arms(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     uid: str = studyUID,
     current_user_id: str = Depends(get_current_user_id),
     study_value_version: str | None = _generic_descriptions.STUDY_VALUE_VERSION_QUERY,
@@ -3981,6 +4224,7 @@ def get_all_selected_arms(
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
         study_value_version=study_value_version,
+        page_token=page_token,
     )
 
     return CustomPage.create(
@@ -3988,6 +4232,7 @@ def get_all_selected_arms(
         total=all_items.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_items.next_page_token,
     )
 
 
@@ -4068,6 +4313,7 @@ def get_all_selected_arms_for_all_studies(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
 ) -> CustomPage[models.StudySelectionArmWithConnectedBranchArms]:
     service = StudyArmSelectionService(author=current_user_id)
@@ -4080,12 +4326,14 @@ def get_all_selected_arms_for_all_studies(
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
+        page_token=page_token,
     )
     return CustomPage.create(
         items=all_selections.items,
         total=all_selections.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_selections.next_page_token,
     )
 
 
@@ -4398,6 +4646,7 @@ def get_all_selected_elements(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     study_value_version: str | None = _generic_descriptions.STUDY_VALUE_VERSION_QUERY,
     current_user_id: str = Depends(get_current_user_id),
 ) -> CustomPage[models.StudySelectionElement]:
@@ -4411,6 +4660,7 @@ def get_all_selected_elements(
         filter_operator=FilterOperator.from_str(operator),
         sort_by=sort_by,
         study_value_version=study_value_version,
+        page_token=page_token,
     )
 
     return CustomPage.create(
@@ -4418,6 +4668,7 @@ def get_all_selected_elements(
         total=all_items.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_items.next_page_token,
     )
 
 
@@ -5082,6 +5333,7 @@ def get_all_selected_cohorts(
     operator: str | None = Query("and", description=_generic_descriptions.OPERATOR),
     total_count: bool
     | None = Query(False, description=_generic_descriptions.TOTAL_COUNT),
+    page_token: str | None = Query(None, description=_generic_descriptions.PAGE_TOKEN),
     current_user_id: str = Depends(get_current_user_id),
     arm_uid: str
     | None = Query(
@@ -5103,12 +5355,14 @@ def get_all_selected_cohorts(
         study_uid=uid,
         arm_uid=arm_uid,
         study_value_version=study_value_version,
+        page_token=page_token,
     )
     return CustomPage.create(
         items=all_selections.items,
         total=all_selections.total,
         page=page_number,
         size=page_size,
+        next_page_token=all_selections.next_page_token,
     )
 
 
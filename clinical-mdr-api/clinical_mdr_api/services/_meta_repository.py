@@ -49,6 +49,9 @@ from clinical_mdr_api.domain_repositories.concepts.odms.form_repository import (
 from clinical_mdr_api.domain_repositories.concepts.odms.formal_expression_repository import (
     FormalExpressionRepository,
 )
+from clinical_mdr_api.domain_repositories.concepts.odms.import_checkpoint_repository import (
+    ImportCheckpointRepository,
+)
 from clinical_mdr_api.domain_repositories.concepts.odms.item_group_repository import (
     ItemGroupRepository,
 )
@@ -491,6 +494,10 @@ class MetaRepository:
     def odm_vendor_attribute_repository(self) -> VendorAttributeRepository:
         return VendorAttributeRepository()
 
+    @property
+    def odm_import_checkpoint_repository(self) -> ImportCheckpointRepository:
+        return ImportCheckpointRepository()
+
     @property
     def criteria_repository(self) -> CriteriaRepository:
         return CriteriaRepository()
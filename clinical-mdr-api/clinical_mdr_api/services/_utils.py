@@ -27,6 +27,9 @@ from clinical_mdr_api.repositories._utils import (
     ComparisonOperator,
     FilterDict,
     FilterOperator,
+    decode_page_token,
+    encode_page_token,
+    page_token_sort_value,
 )
 
 
@@ -428,6 +431,8 @@ def service_level_generic_filtering(
     total_count: bool = False,
     page_number: int = 1,
     page_size: int = 0,
+    page_token: str | None = None,
+    unique_sort_by: list[str] | None = None,
 ) -> GenericFilteringReturn:
     """
     Filters and sorts a list of items based on the provided filter and sort criteria.
@@ -440,6 +445,10 @@ def service_level_generic_filtering(
         total_count (bool, optional): If True, returns the total count of items.
         page_number (int, optional): The page number to retrieve.
         page_size (int, optional): The number of items to retrieve per page.
+        page_token (str | None, optional): Token returned with a previous page, to retrieve the page following it
+            instead of the page_number page.
+        unique_sort_by (list[str] | None, optional): Keys identifying an item, sorting the items after sort_by.
+            Pages are only returned with a next_page_token when given.
 
     Returns:
         GenericFilteringReturn: A named tuple containing the filtered and sorted items and the total count (if applicable).
@@ -518,21 +527,100 @@ def service_level_generic_filtering(
             f"Invalid filter_operator: {filter_operator}"
         )
     # Do sorting
+    keyset = page_size > 0 and unique_sort_by is not None
+    if page_token and not keyset:
+        raise exceptions.ValidationException(
+            "page_token is not supported for this endpoint"
+        )
     for sort_key, sort_order in sort_by.items():
         filtered_items.sort(
-            key=lambda x, s=sort_key: (
-                elm if (elm := extract_nested_key_value(x, s)) is not None else "-1"
-            ),
+            key=lambda x, s=sort_key: _sort_value(x, s),
             reverse=not sort_order,
         )
     # Do count
     count = len(filtered_items) if total_count else 0
     # Do pagination
-    if page_size > 0:
+    next_page_token = None
+    if keyset:
+        sort_keys = [[key, bool(ascending)] for key, ascending in sort_by.items()]
+        sort_keys += [[key, True] for key in unique_sort_by if key not in sort_by]
+        start = (
+            _keyset_start(filtered_items, sort_keys, unique_sort_by, page_token)
+            if page_token
+            else (page_number - 1) * page_size
+        )
+        end = start + page_size
+        if end < len(filtered_items):
+            try:
+                next_page_token = encode_page_token(
+                    sort_keys,
+                    [
+                        extract_nested_key_value(filtered_items[end - 1], key)
+                        for key, _ in sort_keys
+                    ],
+                )
+            except TypeError:
+                # Sorted by values which can't be written in a token
+                next_page_token = None
+        filtered_items = filtered_items[start:end]
+    elif page_size > 0:
         filtered_items = filtered_items[
             (page_number - 1) * page_size : page_number * page_size
         ]
-    return GenericFilteringReturn.create(items=filtered_items, total=count)
+    return GenericFilteringReturn.create(
+        items=filtered_items, total=count, next_page_token=next_page_token
+    )
+
+
+def _sort_value(item: Any, key: str) -> Any:
+    value = extract_nested_key_value(item, key)
+    return value if value is not None else "-1"
+
+
+def _keyset_start(
+    items: list[Any],
+    sort_keys: list[list[Any]],
+    unique_sort_by: list[str],
+    page_token: str,
+) -> int:
+    """
+    Returns the index of the first of the sorted items following the item encoded in page_token.
+    """
+    token = decode_page_token(page_token)
+    if token["s"] != sort_keys or len(token["v"]) != len(sort_keys):
+        raise exceptions.ValidationException(
+            "page_token doesn't match the requested sort_by"
+        )
+    token_values = {
+        key: page_token_sort_value(value) if value is not None else "-1"
+        for (key, _), value in zip(sort_keys, token["v"])
+    }
+
+    def item_values(item: Any, keys: list[str]) -> list[Any]:
+        return [page_token_sort_value(_sort_value(item, key)) for key in keys]
+
+    last_item_values = [token_values[key] for key in unique_sort_by]
+    for index, item in enumerate(items):
+        if item_values(item, unique_sort_by) == last_item_values:
+            return index + 1
+
+    # The last item of the previous page was removed since, the page starts with the items sorted
+    # at its place. The last sort_by key sorts the items first, so it is compared first.
+    compared_keys = [
+        [key, ascending]
+        for key, ascending in reversed(sort_keys)
+        if key not in unique_sort_by
+    ]
+    for index, item in enumerate(items):
+        for key, ascending in compared_keys:
+            (value,) = item_values(item, [key])
+            if value != token_values[key]:
+                if (value > token_values[key]) == ascending:
+                    return index
+                break
+        else:
+            return index
+    return len(items)
 
 
 def service_level_generic_header_filtering(
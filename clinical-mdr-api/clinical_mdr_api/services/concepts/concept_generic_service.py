@@ -170,6 +170,7 @@ class ConceptGenericService(Generic[_AggregateRootType], ABC):
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
         only_specific_status: str = ObjectStatus.LATEST.name,
+        page_token: str | None = None,
         **kwargs,
     ) -> GenericFilteringReturn[BaseModel]:
         return self.non_transactional_get_all_concepts(
@@ -181,6 +182,7 @@ class ConceptGenericService(Generic[_AggregateRootType], ABC):
             filter_operator,
             total_count,
             only_specific_status,
+            page_token=page_token,
             **kwargs,
         )
 
@@ -194,11 +196,12 @@ class ConceptGenericService(Generic[_AggregateRootType], ABC):
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
         only_specific_status: str = ObjectStatus.LATEST.name,
+        page_token: str | None = None,
         **kwargs,
     ) -> GenericFilteringReturn[BaseModel]:
         self.enforce_library(library)
 
-        items, total = self.repository.find_all(
+        page = self.repository.find_all(
             library=library,
             total_count=total_count,
             sort_by=sort_by,
@@ -207,10 +210,14 @@ class ConceptGenericService(Generic[_AggregateRootType], ABC):
             page_number=page_number,
             page_size=page_size,
             only_specific_status=only_specific_status,
+            page_token=page_token,
             **kwargs,
         )
+        items, total = page
 
-        all_concepts = GenericFilteringReturn.create(items, total)
+        all_concepts = GenericFilteringReturn.create(
+            items, total, next_page_token=page.next_page_token
+        )
         all_concepts.items = [
             self._transform_aggregate_root_to_pydantic_model(concept_ar)
             for concept_ar in all_concepts.items
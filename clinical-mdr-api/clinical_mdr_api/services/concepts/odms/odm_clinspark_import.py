@@ -57,11 +57,11 @@ class OdmClinicalXmlImporterService(OdmXmlImporterService):
 
         super().__init__(xml_file, mapper_file)
 
-    def store_odm_xml(self):
+    def _prepare(self):
         self._set_unit_definitions()
         self._set_codelists()
 
-        return super().store_odm_xml()
+        super()._prepare()
 
     def _set_unit_definitions(self):
         measurement_unit_names = {
@@ -297,17 +297,11 @@ class OdmClinicalXmlImporterService(OdmXmlImporterService):
 
         item_unit_definitions = self._get_item_unit_definition_inputs(item_def)
 
-        codelist = next(
-            (
-                codelist
-                for codelist in self.codelists
-                if item_def.getElementsByTagName("CodeListRef")
-                and codelist.getAttribute("OID")
-                == item_def.getElementsByTagName("CodeListRef")[0].getAttribute(
-                    "CodeListOID"
-                )
-            ),
-            None,
+        codelist_refs = item_def.getElementsByTagName("CodeListRef")
+        codelist = (
+            self.codelists.get(codelist_refs[0].getAttribute("CodeListOID"))
+            if codelist_refs
+            else None
         )
 
         codelist_uid = next(
@@ -1,3 +1,6 @@
+from clinical_mdr_api.domain_repositories.concepts.odms.metadata_repository import (
+    MetadataRepository,
+)
 from clinical_mdr_api.domains.concepts.utils import TargetType
 from clinical_mdr_api.exceptions import BusinessLogicException
 from clinical_mdr_api.models.concepts.odms.odm_condition import OdmCondition
@@ -54,6 +57,7 @@ class OdmDataExtractor:
     codelists: list[CTCodelistAttributes]
     ct_terms: list[dict[str, str]]
     unit_definitions: list[UnitDefinitionModel]
+    items_by_codelist_uid: dict[str, list[OdmItem]]
 
     vendor_namespace_service: OdmVendorNamespaceService
     vendor_element_service: OdmVendorElementService
@@ -99,31 +103,45 @@ class OdmDataExtractor:
         self.codelists = []
         self.ct_terms = []
         self.unit_definitions = []
+        self.items_by_codelist_uid = {}
 
         self.status = status
 
         if target_type == TargetType.STUDY_EVENT:
-            study_event = self.study_event_service.get_by_uid(target_uid)
-            self.target_name = study_event.name
-            self.set_forms_of_target(study_event)
+            self.target_name = self.study_event_service.get_by_uid(target_uid).name
         elif target_type == TargetType.FORM:
             self.odm_forms.append(self.form_service.get_by_uid(target_uid))
             self.target_name = self.odm_forms[0].name
-            self.set_item_groups_of_forms(self.odm_forms)
         elif target_type == TargetType.ITEM_GROUP:
             self.odm_item_groups.append(self.item_group_service.get_by_uid(target_uid))
             self.target_name = self.odm_item_groups[0].name
-            self.set_items_of_item_groups(self.odm_item_groups)
         elif target_type == TargetType.ITEM:
             self.odm_items.append(self.item_service.get_by_uid(target_uid))
             self.target_name = self.odm_items[0].name
-            self.set_unit_definitions_of_items(self.odm_items)
-            self.set_codelists_of_items(self.odm_items)
         else:
             raise BusinessLogicException("Requested target type not supported.")
 
         self.target_uid = target_uid
 
+        # The whole tree is resolved at once, then each level is fetched with a single query
+        tree_uids = MetadataRepository().get_odm_tree_uids(
+            target_uid, target_type, status
+        )
+        if target_type == TargetType.STUDY_EVENT:
+            self.odm_forms = self._get_concepts(
+                self.form_service, tree_uids[TargetType.FORM]
+            )
+        if target_type in (TargetType.STUDY_EVENT, TargetType.FORM):
+            self.odm_item_groups = self._get_concepts(
+                self.item_group_service, tree_uids[TargetType.ITEM_GROUP]
+            )
+        if target_type != TargetType.ITEM:
+            self.odm_items = self._get_concepts(
+                self.item_service, tree_uids[TargetType.ITEM]
+            )
+
+        self.set_unit_definitions_of_items(self.odm_items)
+        self.set_codelists_of_items(self.odm_items)
         self.set_conditions(self.odm_forms, self.odm_item_groups)
         self.set_methods(self.odm_item_groups)
         self.set_vendor_namespaces()
@@ -132,28 +150,21 @@ class OdmDataExtractor:
 
     def set_ref_vendor_attributes(self):
         vendor_attributes = self.vendor_attribute_service.get_all_concepts(
-            filter_by={
-                "uid": {
-                    "v": (
-                        {
-                            attribute.uid
-                            for form in self.odm_forms
-                            for item_group in form.item_groups
-                            if item_group.vendor
-                            for attribute in item_group.vendor.attributes
-                        }
-                        | {
-                            attribute.uid
-                            for item_group in self.odm_item_groups
-                            for item in item_group.items
-                            if item.vendor
-                            for attribute in item.vendor.attributes
-                        }
-                    ),
-                    "op": "eq",
-                }
-            },
             only_specific_status=self.status,
+            uids={
+                attribute.uid
+                for form in self.odm_forms
+                for item_group in form.item_groups
+                if item_group.vendor
+                for attribute in item_group.vendor.attributes
+            }
+            | {
+                attribute.uid
+                for item_group in self.odm_item_groups
+                for item in item_group.items
+                if item.vendor
+                for attribute in item.vendor.attributes
+            },
         ).items
 
         self.ref_odm_vendor_attributes = {
@@ -167,24 +178,17 @@ class OdmDataExtractor:
 
     def set_vendor_elements(self):
         vendor_elements = self.vendor_element_service.get_all_concepts(
-            filter_by={
-                "uid": {
-                    "v": (
-                        {
-                            element.uid
-                            for form in self.odm_forms
-                            for element in form.vendor_elements
-                        }
-                        | {
-                            element.uid
-                            for item_group in self.odm_item_groups
-                            for element in item_group.vendor_elements
-                        }
-                    ),
-                    "op": "eq",
-                }
-            },
             only_specific_status=self.status,
+            uids={
+                element.uid
+                for form in self.odm_forms
+                for element in form.vendor_elements
+            }
+            | {
+                element.uid
+                for item_group in self.odm_item_groups
+                for element in item_group.vendor_elements
+            },
         ).items
 
         self.odm_vendor_elements = {
@@ -209,64 +213,15 @@ class OdmDataExtractor:
             for vendor_namespace in vendor_namespaces
         }
 
-    def set_forms_of_target(self, target):
-        self.odm_forms = sorted(
-            self.form_service.get_all_concepts(
-                filter_by={
-                    "uid": {
-                        "v": [form.uid for form in target.forms],
-                        "op": "eq",
-                    }
-                },
-                only_specific_status=self.status,
-            ).items,
-            key=lambda elm: elm.name,
-        )
-
-        self.set_item_groups_of_forms(self.odm_forms)
+    def _get_concepts(self, service, uids: list[str]) -> list:
+        if not uids:
+            return []
 
-    def set_item_groups_of_forms(self, forms: list[OdmForm]):
-        self.odm_item_groups = sorted(
-            self.item_group_service.get_all_concepts(
-                filter_by={
-                    "uid": {
-                        "v": [
-                            item_group.uid
-                            for form in forms
-                            for item_group in form.item_groups
-                        ],
-                        "op": "eq",
-                    }
-                },
-                only_specific_status=self.status,
-            ).items,
-            key=lambda elm: elm.name,
-        )
-
-        self.set_items_of_item_groups(self.odm_item_groups)
-
-    def set_items_of_item_groups(self, item_groups: list[OdmItemGroup]):
-        self.odm_items = sorted(
-            self.item_service.get_all_concepts(
-                filter_by={
-                    "uid": {
-                        "v": [
-                            item.uid
-                            for item_group in item_groups
-                            for item in item_group.items
-                        ],
-                        "op": "eq",
-                    }
-                },
-                only_specific_status=self.status,
-            ).items,
+        return sorted(
+            service.get_all_concepts(only_specific_status=self.status, uids=uids).items,
             key=lambda elm: elm.name,
         )
 
-        self.set_unit_definitions_of_items(self.odm_items)
-        self.set_codelists_of_items(self.odm_items)
-        self.set_conditions(self.odm_forms, self.odm_item_groups)
-
     def set_conditions(self, forms, item_groups):
         oids = [
             item_group.collection_exception_condition_oid
@@ -281,8 +236,7 @@ class OdmDataExtractor:
         if oids:
             self.odm_conditions = sorted(
                 self.condition_service.get_all_concepts(
-                    filter_by={"oid": {"v": oids, "op": "eq"}},
-                    only_specific_status=self.status,
+                    only_specific_status=self.status, oids=oids
                 ).items,
                 key=lambda elm: elm.name,
             )
@@ -295,8 +249,7 @@ class OdmDataExtractor:
         if oids:
             self.odm_methods = sorted(
                 self.method_service.get_all_concepts(
-                    filter_by={"oid": {"v": oids, "op": "eq"}},
-                    only_specific_status=self.status,
+                    only_specific_status=self.status, oids=oids
                 ).items,
                 key=lambda elm: elm.name,
             )
@@ -320,6 +273,13 @@ class OdmDataExtractor:
         )
 
     def set_codelists_of_items(self, items: list[OdmItem]):
+        self.items_by_codelist_uid = {}
+        for item in sorted(items, key=lambda elm: elm.name):
+            if item.codelist:
+                self.items_by_codelist_uid.setdefault(item.codelist.uid, []).append(
+                    item
+                )
+
         self.codelists = sorted(
             self.ct_codelist_attributes_service.get_all_ct_codelists(
                 catalogue_name=None,
@@ -346,11 +306,4 @@ class OdmDataExtractor:
         )
 
     def get_items_by_codelist_uid(self, codelist_uid: str):
-        return sorted(
-            [
-                item
-                for item in self.odm_items
-                if item.codelist and item.codelist.uid == codelist_uid
-            ],
-            key=lambda elm: elm.name,
-        )
+        return self.items_by_codelist_uid.get(codelist_uid, [])
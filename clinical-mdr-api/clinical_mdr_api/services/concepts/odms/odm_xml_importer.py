@@ -1,4 +1,7 @@
+import logging
+from itertools import islice
 from time import time
+from typing import Callable
 from xml.dom import minicompat, minidom
 
 from fastapi import UploadFile
@@ -95,9 +98,12 @@ from clinical_mdr_api.services.concepts.unit_definitions.unit_definition import
 from clinical_mdr_api.services.controlled_terminologies.ct_term_attributes import (
     CTTermAttributesService,
 )
-from clinical_mdr_api.services.utils.odm_xml_mapper import map_xml
+from clinical_mdr_api.services.utils.odm_xml_index import OdmXmlDefinitions, OdmXmlIndex
+from clinical_mdr_api.services.utils.odm_xml_mapper import read_mapping_rules
 from clinical_mdr_api.utils import strtobool
 
+log = logging.getLogger(__name__)
+
 
 class OdmXmlImporterService:
     _repos: MetaRepository
@@ -115,14 +121,14 @@ class OdmXmlImporterService:
     unit_definition_service: UnitDefinitionService
     ct_term_attributes_service: CTTermAttributesService
 
-    xml_document: minidom.Document
-    form_defs: minicompat.NodeList
-    item_group_defs: minicompat.NodeList
-    item_defs: minicompat.NodeList
-    condition_defs: minicompat.NodeList
-    method_defs: minicompat.NodeList
-    codelists: minicompat.NodeList
-    measurement_units: minicompat.NodeList
+    xml_index: OdmXmlIndex
+    form_defs: OdmXmlDefinitions
+    item_group_defs: OdmXmlDefinitions
+    item_defs: OdmXmlDefinitions
+    condition_defs: OdmXmlDefinitions
+    method_defs: OdmXmlDefinitions
+    codelists: OdmXmlDefinitions
+    measurement_units: OdmXmlDefinitions
 
     namespace_prefixes: dict[str, str]
 
@@ -142,6 +148,10 @@ class OdmXmlImporterService:
 
     mapper_file: UploadFile | None = None
 
+    batch_size: int | None = None
+    checkpoint_key: str
+    checkpoint: dict[str, list[str]]
+
     OSB_PREFIX = "osb"
     EXCLUDED_OSB_VENDOR_ATTRIBUTES = [
         "version",
@@ -188,14 +198,51 @@ class OdmXmlImporterService:
 
         self.mapper_file = mapper_file
 
-        self.xml_document = minidom.parseString(xml_file.file.read())
-
-        map_xml(self.xml_document, mapper_file)
+        self.xml_index = OdmXmlIndex(xml_file.file, read_mapping_rules(mapper_file))
 
         self._set_def_elements()
 
     @db.transaction
     def store_odm_xml(self):
+        self._prepare()
+        self._create_methods_with_relations()
+        self._create_conditions_with_relations()
+        self._create_items_with_relations()
+        self._create_item_groups_with_relations()
+        self._create_forms_with_relations()
+        self._create_study_event_with_relations()
+
+        return self._get_newly_created()
+
+    def store_odm_xml_in_batches(self, batch_size: int):
+        """
+        Same as `store_odm_xml`, but stores the definitions in transactions of `batch_size` definitions.
+
+        A checkpoint of the stored definitions is saved along with each transaction,
+        so that importing the same files again after a failure resumes the import where it stopped.
+        """
+        self.batch_size = batch_size
+        self.checkpoint_key = f"{type(self).__name__}:{self.xml_index.digest}"
+        self.checkpoint = (
+            self._repos.odm_import_checkpoint_repository.find(self.checkpoint_key) or {}
+        )
+        if self.checkpoint:
+            log.info("Resuming ODM XML import %s", self.checkpoint_key)
+
+        with db.transaction:
+            self._prepare()
+        self._create_methods_with_relations()
+        self._create_conditions_with_relations()
+        self._create_items_with_relations()
+        self._create_item_groups_with_relations()
+        self._create_forms_with_relations()
+        with db.transaction:
+            self._create_study_event_with_relations()
+            self._repos.odm_import_checkpoint_repository.delete(self.checkpoint_key)
+
+        return self._get_newly_created()
+
+    def _prepare(self):
         self._set_vendor_namespaces()
         self._create_missing_vendor_namespaces()
         self._set_vendor_attributes()
@@ -205,13 +252,8 @@ class OdmXmlImporterService:
         self._set_unit_definition_uids_by()
         self._set_measurement_unit_names_by_oid()
         self._set_ct_term_attributes()
-        self._create_methods_with_relations()
-        self._create_conditions_with_relations()
-        self._create_items_with_relations()
-        self._create_item_groups_with_relations()
-        self._create_forms_with_relations()
-        self._create_study_event_with_relations()
 
+    def _get_newly_created(self):
         return {
             "vendor_namespaces": self._get_newly_created_vendor_namespaces(),
             "vendor_attributes": self._get_newly_created_vendor_attributes(),
@@ -225,18 +267,59 @@ class OdmXmlImporterService:
         }
 
     def _set_def_elements(self):
-        self.measurement_units = self.xml_document.getElementsByTagName(
-            "MeasurementUnit"
-        )
-        self.form_defs = self.xml_document.getElementsByTagName("FormDef")
-        self.item_group_defs = self.xml_document.getElementsByTagName("ItemGroupDef")
-        self.item_defs = self.xml_document.getElementsByTagName("ItemDef")
-        self.condition_defs = self.xml_document.getElementsByTagName("ConditionDef")
-        self.method_defs = self.xml_document.getElementsByTagName("MethodDef")
-        self.codelists = self.xml_document.getElementsByTagName("CodeList")
+        self.measurement_units = self.xml_index["MeasurementUnit"]
+        self.form_defs = self.xml_index["FormDef"]
+        self.item_group_defs = self.xml_index["ItemGroupDef"]
+        self.item_defs = self.xml_index["ItemDef"]
+        self.condition_defs = self.xml_index["ConditionDef"]
+        self.method_defs = self.xml_index["MethodDef"]
+        self.codelists = self.xml_index["CodeList"]
+
+    def _store_definitions(
+        self,
+        name: str,
+        definitions: OdmXmlDefinitions,
+        create_definition: Callable[[minidom.Element], object],
+        repository: OdmGenericRepository,
+        service,
+        save_to: list,
+    ):
+        """
+        Creates the concepts of the given definitions, in batches when importing in batches.
+        On resume, the concepts stored before are loaded instead of being created again.
+        """
+        if self.batch_size is None:
+            for definition in definitions:
+                create_definition(definition)
+            return
+
+        stored_uids = self.checkpoint.setdefault(name, [])
+        if stored_uids:
+            rs, _ = repository.find_all(
+                filter_by={"uid": {"v": stored_uids, "op": "eq"}}
+            )
+            save_to.extend(
+                service._transform_aggregate_root_to_pydantic_model(concept_ar)
+                for concept_ar in rs
+            )
+
+        for start in range(len(stored_uids), len(definitions), self.batch_size):
+            with db.transaction:
+                for definition in islice(definitions.iter_from(start), self.batch_size):
+                    stored_uids.append(create_definition(definition).uid)
+                self._repos.odm_import_checkpoint_repository.save(
+                    self.checkpoint_key, self.checkpoint
+                )
+            log.info(
+                "Imported %s/%s %s of ODM XML import %s",
+                len(stored_uids),
+                len(definitions),
+                name,
+                self.checkpoint_key,
+            )
 
     def _set_vendor_namespaces(self):
-        odm_element = self.xml_document.getElementsByTagName("ODM")[0]
+        odm_element = self.xml_index.odm_element
         for attribute in odm_element.attributes.values():
             if attribute.prefix and attribute.localName != "odm":
                 self.namespace_prefixes[attribute.localName] = attribute.nodeValue
@@ -489,28 +572,32 @@ class OdmXmlImporterService:
                 )
             )
 
-            vendor_attribute_patterns = (
-                self.odm_vendor_attribute_service.get_regex_patterns_of_attributes(
-                    [
-                        odm_vendor_relation.uid
-                        for odm_vendor_relation in odm_vendor_relations
-                    ]
-                )
-            )
-            self.odm_vendor_attribute_service.attribute_values_matches_their_regex(
-                odm_vendor_relations, vendor_attribute_patterns
-            )
-            self.odm_vendor_attribute_service.is_vendor_compatible(
-                odm_vendor_relations, compatible_type
-            )
+        if not odm_vendor_relations:
+            return
 
-        for odm_vendor_relation in odm_vendor_relations:
-            repository.add_relation(
-                uid=uid,
-                relation_uid=odm_vendor_relation.uid,
-                relationship_type=RelationType.VENDOR_ATTRIBUTE,
-                parameters={"value": odm_vendor_relation.value},
+        vendor_attribute_patterns = (
+            self.odm_vendor_attribute_service.get_regex_patterns_of_attributes(
+                [
+                    odm_vendor_relation.uid
+                    for odm_vendor_relation in odm_vendor_relations
+                ]
             )
+        )
+        self.odm_vendor_attribute_service.attribute_values_matches_their_regex(
+            odm_vendor_relations, vendor_attribute_patterns
+        )
+        self.odm_vendor_attribute_service.is_vendor_compatible(
+            odm_vendor_relations, compatible_type
+        )
+
+        repository.add_relations(
+            uid=uid,
+            relations=[
+                (odm_vendor_relation.uid, {"value": odm_vendor_relation.value})
+                for odm_vendor_relation in odm_vendor_relations
+            ],
+            relationship_type=RelationType.VENDOR_ATTRIBUTE,
+        )
 
     def _create_relationship_with_vendor_elements(
         self,
@@ -550,13 +637,14 @@ class OdmXmlImporterService:
                 )
             )
 
-        for odm_vendor_relation in odm_vendor_relations:
-            repository.add_relation(
-                uid=uid,
-                relation_uid=odm_vendor_relation.uid,
-                relationship_type=RelationType.VENDOR_ELEMENT,
-                parameters={"value": odm_vendor_relation.value},
-            )
+        repository.add_relations(
+            uid=uid,
+            relations=[
+                (odm_vendor_relation.uid, {"value": odm_vendor_relation.value})
+                for odm_vendor_relation in odm_vendor_relations
+            ],
+            relationship_type=RelationType.VENDOR_ELEMENT,
+        )
 
     def _create_relationship_with_vendor_element_attributes(
         self,
@@ -564,6 +652,7 @@ class OdmXmlImporterService:
         child_elements: minicompat.NodeList,
         repository: OdmGenericRepository,
     ):
+        odm_vendor_relations: list[OdmVendorRelationPostInput] = []
         for child_element in child_elements:
             if (
                 not isinstance(child_element, minidom.Element)
@@ -575,7 +664,6 @@ class OdmXmlImporterService:
             ):
                 continue
 
-            odm_vendor_relations: list[OdmVendorRelationPostInput] = []
             for child_element_attribute in child_element.attributes.values():
                 if (
                     not isinstance(child_element_attribute, minidom.Attr)
@@ -614,13 +702,14 @@ class OdmXmlImporterService:
                     )
                 )
 
-            for odm_vendor_relation in odm_vendor_relations:
-                repository.add_relation(
-                    uid=uid,
-                    relation_uid=odm_vendor_relation.uid,
-                    relationship_type=RelationType.VENDOR_ELEMENT_ATTRIBUTE,
-                    parameters={"value": odm_vendor_relation.value},
-                )
+        repository.add_relations(
+            uid=uid,
+            relations=[
+                (odm_vendor_relation.uid, {"value": odm_vendor_relation.value})
+                for odm_vendor_relation in odm_vendor_relations
+            ],
+            relationship_type=RelationType.VENDOR_ELEMENT_ATTRIBUTE,
+        )
 
     def _vendor_attribute_exists(self, prefix, vendor_attribute_name):
         if (
@@ -761,215 +850,260 @@ class OdmXmlImporterService:
         return new_formal_expressions
 
     def _create_conditions_with_relations(self):
-        for condition_def in self.condition_defs:
-            descriptions = self._extract_descriptions(condition_def)
+        self._store_definitions(
+            "conditions",
+            self.condition_defs,
+            self._create_condition_with_relations,
+            self._repos.odm_condition_repository,
+            self.odm_condition_service,
+            self.db_conditions,
+        )
 
-            rs = self._create(
-                self._repos.odm_condition_repository,
-                self.odm_condition_service,
-                self.db_conditions,
-                OdmConditionPostInput(
-                    oid=condition_def.getAttribute("OID"),
-                    name=condition_def.getAttribute("Name"),
-                    formal_expressions=[
-                        formal_expression.uid
-                        for formal_expression in self._create_formal_expressions(
-                            condition_def
-                        )
-                    ],
-                    descriptions=[
-                        self._create_description(
-                            name=description["name"],
-                            lang=description["lang"],
-                            description=description["description"],
-                        ).uid
-                        for description in descriptions
-                    ],
-                    alias_uids=[],
-                ),
-            )
-            self._approve(
-                self._repos.odm_condition_repository, self.odm_condition_service, rs
-            )
+    def _create_condition_with_relations(self, condition_def):
+        descriptions = self._extract_descriptions(condition_def)
+
+        rs = self._create(
+            self._repos.odm_condition_repository,
+            self.odm_condition_service,
+            self.db_conditions,
+            OdmConditionPostInput(
+                oid=condition_def.getAttribute("OID"),
+                name=condition_def.getAttribute("Name"),
+                formal_expressions=[
+                    formal_expression.uid
+                    for formal_expression in self._create_formal_expressions(
+                        condition_def
+                    )
+                ],
+                descriptions=[
+                    self._create_description(
+                        name=description["name"],
+                        lang=description["lang"],
+                        description=description["description"],
+                    ).uid
+                    for description in descriptions
+                ],
+                alias_uids=[],
+            ),
+        )
+        self._approve(
+            self._repos.odm_condition_repository, self.odm_condition_service, rs
+        )
+        return rs
 
     def _create_methods_with_relations(self):
-        for method_def in self.method_defs:
-            descriptions = self._extract_descriptions(method_def)
+        self._store_definitions(
+            "methods",
+            self.method_defs,
+            self._create_method_with_relations,
+            self._repos.odm_method_repository,
+            self.odm_method_service,
+            self.db_methods,
+        )
 
-            rs = self._create(
-                self._repos.odm_method_repository,
-                self.odm_method_service,
-                self.db_methods,
-                OdmMethodPostInput(
-                    oid=method_def.getAttribute("OID"),
-                    name=method_def.getAttribute("Name"),
-                    method_type=method_def.getAttribute("Name"),
-                    formal_expressions=[
-                        formal_expression.uid
-                        for formal_expression in self._create_formal_expressions(
-                            method_def
-                        )
-                    ],
-                    descriptions=[
-                        self._create_description(
-                            name=description["name"],
-                            lang=description["lang"],
-                            description=description["description"],
-                        ).uid
-                        for description in descriptions
-                    ],
-                    alias_uids=[],
-                ),
-            )
-            self._approve(
-                self._repos.odm_method_repository, self.odm_method_service, rs
-            )
+    def _create_method_with_relations(self, method_def):
+        descriptions = self._extract_descriptions(method_def)
+
+        rs = self._create(
+            self._repos.odm_method_repository,
+            self.odm_method_service,
+            self.db_methods,
+            OdmMethodPostInput(
+                oid=method_def.getAttribute("OID"),
+                name=method_def.getAttribute("Name"),
+                method_type=method_def.getAttribute("Name"),
+                formal_expressions=[
+                    formal_expression.uid
+                    for formal_expression in self._create_formal_expressions(method_def)
+                ],
+                descriptions=[
+                    self._create_description(
+                        name=description["name"],
+                        lang=description["lang"],
+                        description=description["description"],
+                    ).uid
+                    for description in descriptions
+                ],
+                alias_uids=[],
+            ),
+        )
+        self._approve(self._repos.odm_method_repository, self.odm_method_service, rs)
+        return rs
 
     def _create_items_with_relations(self):
-        for item_def in self.item_defs:
-            self._create_missing_vendors(item_def)
+        self._store_definitions(
+            "items",
+            self.item_defs,
+            self._create_item_with_relations,
+            self._repos.odm_item_repository,
+            self.odm_item_service,
+            self.db_items,
+        )
 
-            (
-                odm_item_post_input,
-                terms,
-                unit_definitions,
-            ) = self._get_odm_item_post_input(item_def)
+    def _create_item_with_relations(self, item_def):
+        self._create_missing_vendors(item_def)
 
-            rs = self._create(
-                self._repos.odm_item_repository,
-                self.odm_item_service,
-                self.db_items,
-                odm_item_post_input,
-            )
+        (
+            odm_item_post_input,
+            terms,
+            unit_definitions,
+        ) = self._get_odm_item_post_input(item_def)
 
-            if terms:
-                self.odm_item_service._manage_terms(rs.uid, terms)
-            self.odm_item_service._manage_unit_definitions(rs.uid, unit_definitions)
+        rs = self._create(
+            self._repos.odm_item_repository,
+            self.odm_item_service,
+            self.db_items,
+            odm_item_post_input,
+        )
 
-            self._create_relationships_with_vendors(
-                rs.uid,
-                item_def,
-                self._repos.odm_item_repository,
-                VendorCompatibleType.ITEM_DEF,
-            )
-            self._approve(self._repos.odm_item_repository, self.odm_item_service, rs)
+        if terms:
+            self.odm_item_service._manage_terms(rs.uid, terms)
+        self.odm_item_service._manage_unit_definitions(rs.uid, unit_definitions)
+
+        self._create_relationships_with_vendors(
+            rs.uid,
+            item_def,
+            self._repos.odm_item_repository,
+            VendorCompatibleType.ITEM_DEF,
+        )
+        self._approve(self._repos.odm_item_repository, self.odm_item_service, rs)
+        return rs
 
     def _create_item_groups_with_relations(self):
-        for item_group_def in self.item_group_defs:
-            self._create_missing_vendors(item_group_def)
+        item_uids_by_oid: dict[str, str] = {}
+        for db_item in self.db_items:
+            item_uids_by_oid.setdefault(db_item.oid, db_item.uid)
+
+        self._store_definitions(
+            "item_groups",
+            self.item_group_defs,
+            lambda item_group_def: self._create_item_group_with_relations(
+                item_group_def, item_uids_by_oid
+            ),
+            self._repos.odm_item_group_repository,
+            self.odm_item_group_service,
+            self.db_item_groups,
+        )
 
-            rs = self._create(
-                self._repos.odm_item_group_repository,
-                self.odm_item_group_service,
-                self.db_item_groups,
-                self._get_odm_item_group_post_input(item_group_def),
-            )
+    def _create_item_group_with_relations(
+        self, item_group_def, item_uids_by_oid: dict[str, str]
+    ):
+        self._create_missing_vendors(item_group_def)
 
-            self._create_relationships_with_vendors(
-                rs.uid,
-                item_group_def,
-                self._repos.odm_item_group_repository,
-                VendorCompatibleType.ITEM_GROUP_DEF,
-            )
+        rs = self._create(
+            self._repos.odm_item_group_repository,
+            self.odm_item_group_service,
+            self.db_item_groups,
+            self._get_odm_item_group_post_input(item_group_def),
+        )
 
-            odm_item_group_items: list[OdmItemGroupItemPostInput] = []
-            for item_ref in item_group_def.getElementsByTagName("ItemRef"):
-                self._create_missing_vendor_attributes(item_ref.attributes.values())
+        self._create_relationships_with_vendors(
+            rs.uid,
+            item_group_def,
+            self._repos.odm_item_group_repository,
+            VendorCompatibleType.ITEM_GROUP_DEF,
+        )
 
-                odm_item_group_items.append(
-                    OdmItemGroupItemPostInput(
-                        uid=next(
-                            (
-                                db_item.uid
-                                for db_item in self.db_items
-                                if db_item.oid == item_ref.getAttribute("ItemOID")
-                            ),
-                            None,
-                        ),
-                        order_number=item_ref.getAttribute("OrderNumber"),
-                        mandatory=item_ref.getAttribute("Mandatory"),
-                        key_sequence="None",
-                        method_oid=item_ref.getAttribute("MethodOID") or None,
-                        imputation_method_oid="None",
-                        role="None",
-                        role_codelist_oid="None",
-                        collection_exception_condition_oid=item_ref.getAttribute(
-                            "CollectionExceptionConditionOID"
-                        ),
-                        vendor=OdmRefVendorPostInput(
-                            attributes=self._get_list_of_attributes(
-                                item_ref.attributes.items()
-                            )
-                        ),
-                    )
+        odm_item_group_items: list[OdmItemGroupItemPostInput] = []
+        for item_ref in item_group_def.getElementsByTagName("ItemRef"):
+            self._create_missing_vendor_attributes(item_ref.attributes.values())
+
+            odm_item_group_items.append(
+                OdmItemGroupItemPostInput(
+                    uid=item_uids_by_oid.get(item_ref.getAttribute("ItemOID")),
+                    order_number=item_ref.getAttribute("OrderNumber"),
+                    mandatory=item_ref.getAttribute("Mandatory"),
+                    key_sequence="None",
+                    method_oid=item_ref.getAttribute("MethodOID") or None,
+                    imputation_method_oid="None",
+                    role="None",
+                    role_codelist_oid="None",
+                    collection_exception_condition_oid=item_ref.getAttribute(
+                        "CollectionExceptionConditionOID"
+                    ),
+                    vendor=OdmRefVendorPostInput(
+                        attributes=self._get_list_of_attributes(
+                            item_ref.attributes.items()
+                        )
+                    ),
                 )
-
-            self.odm_item_group_service.non_transactional_add_items(
-                rs.uid, odm_item_group_items
             )
 
-            self._approve(
-                self._repos.odm_item_group_repository, self.odm_item_group_service, rs
-            )
+        self.odm_item_group_service.non_transactional_add_items(
+            rs.uid, odm_item_group_items
+        )
+
+        self._approve(
+            self._repos.odm_item_group_repository, self.odm_item_group_service, rs
+        )
+        return rs
 
     def _create_forms_with_relations(self):
-        for form_def in self.form_defs:
-            self._create_missing_vendors(form_def)
+        item_group_uids_by_oid: dict[str, str] = {}
+        for db_item_group in self.db_item_groups:
+            item_group_uids_by_oid.setdefault(db_item_group.oid, db_item_group.uid)
+
+        self._store_definitions(
+            "forms",
+            self.form_defs,
+            lambda form_def: self._create_form_with_relations(
+                form_def, item_group_uids_by_oid
+            ),
+            self._repos.odm_form_repository,
+            self.odm_form_service,
+            self.db_forms,
+        )
 
-            rs = self._create(
-                self._repos.odm_form_repository,
-                self.odm_form_service,
-                self.db_forms,
-                self._get_odm_form_post_input(form_def),
-            )
+    def _create_form_with_relations(
+        self, form_def, item_group_uids_by_oid: dict[str, str]
+    ):
+        self._create_missing_vendors(form_def)
 
-            self._create_relationships_with_vendors(
-                rs.uid,
-                form_def,
-                self._repos.odm_form_repository,
-                VendorCompatibleType.FORM_DEF,
-            )
-            odm_form_item_groups: list[OdmFormItemGroupPostInput] = []
-            for item_group_ref in form_def.getElementsByTagName("ItemGroupRef"):
-                self._create_missing_vendor_attributes(
-                    item_group_ref.attributes.values()
-                )
+        rs = self._create(
+            self._repos.odm_form_repository,
+            self.odm_form_service,
+            self.db_forms,
+            self._get_odm_form_post_input(form_def),
+        )
 
-                odm_form_item_groups.append(
-                    OdmFormItemGroupPostInput(
-                        uid=next(
-                            (
-                                db_item_group.uid
-                                for db_item_group in self.db_item_groups
-                                if db_item_group.oid
-                                == item_group_ref.getAttribute("ItemGroupOID")
-                            ),
-                            None,
-                        ),
-                        order_number=item_group_ref.getAttribute("OrderNumber"),
-                        mandatory=item_group_ref.getAttribute("Mandatory"),
-                        collection_exception_condition_oid=item_group_ref.getAttribute(
-                            "CollectionExceptionConditionOID"
-                        ),
-                        vendor=OdmRefVendorPostInput(
-                            attributes=self._get_list_of_attributes(
-                                item_group_ref.attributes.items()
-                            )
-                        ),
-                    )
+        self._create_relationships_with_vendors(
+            rs.uid,
+            form_def,
+            self._repos.odm_form_repository,
+            VendorCompatibleType.FORM_DEF,
+        )
+        odm_form_item_groups: list[OdmFormItemGroupPostInput] = []
+        for item_group_ref in form_def.getElementsByTagName("ItemGroupRef"):
+            self._create_missing_vendor_attributes(item_group_ref.attributes.values())
+
+            odm_form_item_groups.append(
+                OdmFormItemGroupPostInput(
+                    uid=item_group_uids_by_oid.get(
+                        item_group_ref.getAttribute("ItemGroupOID")
+                    ),
+                    order_number=item_group_ref.getAttribute("OrderNumber"),
+                    mandatory=item_group_ref.getAttribute("Mandatory"),
+                    collection_exception_condition_oid=item_group_ref.getAttribute(
+                        "CollectionExceptionConditionOID"
+                    ),
+                    vendor=OdmRefVendorPostInput(
+                        attributes=self._get_list_of_attributes(
+                            item_group_ref.attributes.items()
+                        )
+                    ),
                 )
-
-            self.odm_form_service.non_transactional_add_item_groups(
-                rs.uid, odm_form_item_groups
             )
 
-            self._approve(self._repos.odm_form_repository, self.odm_form_service, rs)
+        self.odm_form_service.non_transactional_add_item_groups(
+            rs.uid, odm_form_item_groups
+        )
+
+        self._approve(self._repos.odm_form_repository, self.odm_form_service, rs)
+        return rs
 
     def _create_study_event_with_relations(self):
-        if self.xml_document.getElementsByTagName("StudyName"):
-            study_name = self.xml_document.getElementsByTagName("StudyName")[
-                0
-            ].firstChild.nodeValue
+        if self.xml_index.study_name:
+            study_name = self.xml_index.study_name
         else:
             study_name = f"@{int(time() * 1_000)}"
 
@@ -991,18 +1125,22 @@ class OdmXmlImporterService:
                 )
             )
 
-        for odm_study_event_form in odm_study_event_forms:
-            self._repos.odm_study_event_repository.add_relation(
-                uid=rs.uid,
-                relation_uid=odm_study_event_form.uid,
-                relationship_type=RelationType.FORM,
-                parameters={
-                    "order_number": odm_study_event_form.order_number,
-                    "mandatory": strtobool(odm_study_event_form.mandatory),
-                    "locked": strtobool(odm_study_event_form.locked),
-                    "collection_exception_condition_oid": odm_study_event_form.collection_exception_condition_oid,
-                },
-            )
+        self._repos.odm_study_event_repository.add_relations(
+            uid=rs.uid,
+            relations=[
+                (
+                    odm_study_event_form.uid,
+                    {
+                        "order_number": odm_study_event_form.order_number,
+                        "mandatory": strtobool(odm_study_event_form.mandatory),
+                        "locked": strtobool(odm_study_event_form.locked),
+                        "collection_exception_condition_oid": odm_study_event_form.collection_exception_condition_oid,
+                    },
+                )
+                for odm_study_event_form in odm_study_event_forms
+            ],
+            relationship_type=RelationType.FORM,
+        )
 
         self._approve(
             self._repos.odm_study_event_repository, self.odm_study_event_service, rs
@@ -1305,17 +1443,11 @@ class OdmXmlImporterService:
 
         item_unit_definitions = self._get_item_unit_definition_inputs(item_def)
 
-        codelist = next(
-            (
-                codelist
-                for codelist in self.codelists
-                if item_def.getElementsByTagName("CodeListRef")
-                and codelist.getAttribute("OID")
-                == item_def.getElementsByTagName("CodeListRef")[0].getAttribute(
-                    "CodeListOID"
-                )
-            ),
-            None,
+        codelist_refs = item_def.getElementsByTagName("CodeListRef")
+        codelist = (
+            self.codelists.get(codelist_refs[0].getAttribute("CodeListOID"))
+            if codelist_refs
+            else None
         )
 
         input_terms = []
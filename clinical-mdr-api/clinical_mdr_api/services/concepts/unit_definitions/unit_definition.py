@@ -67,6 +67,7 @@ class UnitDefinitionService:
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[UnitDefinitionModel]:
         # for unit-definitions we want to return the shortest unit-definitions first
         if sort_by is None:
@@ -74,7 +75,7 @@ class UnitDefinitionService:
         else:
             validate_is_dict("sort_by", sort_by)
             sort_by["size(name)"] = "true"
-        items, total_items = self._repos.unit_definition_repository.find_all(
+        page = self._repos.unit_definition_repository.find_all(
             library=library_name,
             total_count=total_count,
             sort_by=sort_by,
@@ -84,8 +85,12 @@ class UnitDefinitionService:
             page_size=page_size,
             dimension=dimension,
             subset=subset,
+            page_token=page_token,
+        )
+        items, total_items = page
+        units = GenericFilteringReturn.create(
+            items, total_items, next_page_token=page.next_page_token
         )
-        units = GenericFilteringReturn.create(items, total_items)
         units.items = [
             UnitDefinitionModel.from_unit_definition_ar(
                 unit_definition_ar,
@@ -18,7 +18,7 @@ from clinical_mdr_api.models import (
     CTCodelistNameAndAttributes,
 )
 from clinical_mdr_api.models.utils import GenericFilteringReturn
-from clinical_mdr_api.repositories._utils import FilterOperator
+from clinical_mdr_api.repositories._utils import CountStrategy, FilterOperator
 from clinical_mdr_api.services._meta_repository import MetaRepository  # type: ignore
 from clinical_mdr_api.services._utils import is_library_editable, normalize_string
 
@@ -179,6 +179,8 @@ class CTCodelistService:
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
         term_filter: dict | None = None,
+        page_token: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> GenericFilteringReturn[CTCodelistNameAndAttributes]:
         self.enforce_catalogue_library_package(catalogue_name, library, package)
 
@@ -194,6 +196,8 @@ class CTCodelistService:
                 page_number=page_number,
                 page_size=page_size,
                 term_filter=term_filter,
+                page_token=page_token,
+                count_strategy=count_strategy,
             )
         )
 
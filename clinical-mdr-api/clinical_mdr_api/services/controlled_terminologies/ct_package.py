@@ -1,4 +1,8 @@
+import json
 from datetime import date
+from typing import Iterator
+
+from fastapi.encoders import jsonable_encoder
 
 from clinical_mdr_api import exceptions, models
 from clinical_mdr_api.models import (
@@ -10,6 +14,7 @@ from clinical_mdr_api.models import (
 from clinical_mdr_api.repositories.ct_packages import (
     get_ct_packages_changes,
     get_ct_packages_codelist_changes,
+    store_package_steps,
 )
 from clinical_mdr_api.services._meta_repository import MetaRepository  # type: ignore
 from clinical_mdr_api.services._utils import normalize_string
@@ -69,8 +74,17 @@ class CTPackageService:
             self._close_all_repos()
 
     def get_ct_packages_changes(
-        self, catalogue_name: str, old_package_date: date, new_package_date: date
+        self,
+        catalogue_name: str,
+        old_package_date: date,
+        new_package_date: date,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> CTPackageChanges:
+        """
+        Returns the changes between two packages.
+        With a page size, each list of changes is limited to the given page.
+        """
         try:
             old_package, new_package = self.validate_input_and_get_packages(
                 catalogue_name=catalogue_name,
@@ -82,6 +96,11 @@ class CTPackageService:
                 old_package_name=old_package.name,
                 new_package_name=new_package.name,
             )
+            if page_size > 0:
+                result = {
+                    key: items[(page_number - 1) * page_size : page_number * page_size]
+                    for key, items in result.items()
+                }
 
             return CTPackageChanges.from_repository_output(
                 old_package_name=old_package.name,
@@ -91,6 +110,68 @@ class CTPackageService:
         finally:
             self._close_all_repos()
 
+    def stream_ct_packages_changes(
+        self, catalogue_name: str, old_package_date: date, new_package_date: date
+    ) -> Iterator[str]:
+        """
+        Returns the changes between two packages as lines of JSON, one line per changed codelist or term.
+        The `change` field of each line is the list of CTPackageChanges the item belongs to.
+        """
+        # The changes are computed before the response starts, so that the errors are still returned as such
+        changes = self.get_ct_packages_changes(
+            catalogue_name=catalogue_name,
+            old_package_date=old_package_date,
+            new_package_date=new_package_date,
+        )
+
+        def lines() -> Iterator[str]:
+            for change in CTPackageChanges.__fields__:
+                if change in ("from_package", "to_package"):
+                    continue
+                for item in getattr(changes, change):
+                    yield json.dumps(
+                        {
+                            "from_package": changes.from_package,
+                            "to_package": changes.to_package,
+                            "change": change,
+                            **jsonable_encoder(item),
+                        }
+                    ) + "\n"
+
+        return lines()
+
+    def store_ct_packages_changes(self, catalogue_name: str) -> list[dict]:
+        """
+        Computes and stores the missing changes between the consecutive packages of a catalogue,
+        the comparisons of its packages are then composed from the stored changes.
+        Returns the pairs of packages the changes were computed for.
+        """
+        try:
+            if not self._repos.ct_catalogue_repository.catalogue_exists(
+                normalize_string(catalogue_name)
+            ):
+                raise exceptions.BusinessLogicException(
+                    f"There is no catalogue identified by provided catalogue name ({catalogue_name})"
+                )
+
+            packages = sorted(
+                self._repos.ct_package_repository.find_all(
+                    catalogue_name=catalogue_name
+                ),
+                key=lambda package: package.effective_date,
+            )
+            if len(packages) < 2:
+                return []
+            return [
+                {"from_package": old_package_name, "to_package": new_package_name}
+                for old_package_name, new_package_name in store_package_steps(
+                    old_package_name=packages[0].name,
+                    new_package_name=packages[-1].name,
+                )
+            ]
+        finally:
+            self._close_all_repos()
+
     def get_ct_packages_codelist_changes(
         self,
         catalogue_name: str,
@@ -19,7 +19,7 @@ from clinical_mdr_api.domains.versioned_object_aggregate import (
 )
 from clinical_mdr_api.models import CTTerm, CTTermCreateInput, CTTermNameAndAttributes
 from clinical_mdr_api.models.utils import GenericFilteringReturn
-from clinical_mdr_api.repositories._utils import FilterOperator
+from clinical_mdr_api.repositories._utils import CountStrategy, FilterOperator
 from clinical_mdr_api.services._meta_repository import MetaRepository  # type: ignore
 from clinical_mdr_api.services._utils import is_library_editable, normalize_string
 
@@ -150,6 +150,8 @@ class CTTermService:
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        page_token: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> GenericFilteringReturn[CTTermNameAndAttributes]:
         self.enforce_codelist_package_library(
             codelist_uid, codelist_name, library, package
@@ -167,6 +169,8 @@ class CTTermService:
                 filter_operator=filter_operator,
                 page_number=page_number,
                 page_size=page_size,
+                page_token=page_token,
+                count_strategy=count_strategy,
             )
         )
 
@@ -86,12 +86,13 @@ class DictionaryCodelistGenericService:
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[BaseModel]:
         self.enforce_library(library)
 
         dictionary_type = self.get_dictionary_type(library=library)
 
-        items, total = self.repository.find_all(
+        page = self.repository.find_all(
             library_name=dictionary_type,
             sort_by=sort_by,
             filter_by=filter_by,
@@ -99,9 +100,13 @@ class DictionaryCodelistGenericService:
             page_number=page_number,
             page_size=page_size,
             total_count=total_count,
+            page_token=page_token,
         )
+        items, total = page
 
-        all_dictionary_codelists = GenericFilteringReturn.create(items, total)
+        all_dictionary_codelists = GenericFilteringReturn.create(
+            items, total, next_page_token=page.next_page_token
+        )
         all_dictionary_codelists.items = [
             DictionaryCodelist.from_dictionary_codelist_ar(dictionary_codelist_ar)
             for dictionary_codelist_ar in all_dictionary_codelists.items
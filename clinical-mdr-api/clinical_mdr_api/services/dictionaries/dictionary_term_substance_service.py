@@ -104,8 +104,9 @@ class DictionaryTermSubstanceService(
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
         codelist_name: str = "",
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[DictionaryTermSubstance]:
-        items, total = self.repository.find_all(
+        page = self.repository.find_all(
             codelist_name=codelist_name,
             sort_by=sort_by,
             filter_by=filter_by,
@@ -113,9 +114,13 @@ class DictionaryTermSubstanceService(
             page_number=page_number,
             page_size=page_size,
             total_count=total_count,
+            page_token=page_token,
         )
+        items, total = page
 
-        all_dictionary_terms = GenericFilteringReturn.create(items, total)
+        all_dictionary_terms = GenericFilteringReturn.create(
+            items, total, next_page_token=page.next_page_token
+        )
         all_dictionary_terms.items = [
             self._transform_aggregate_root_to_pydantic_model(dictionary_term_ar)
             for dictionary_term_ar in all_dictionary_terms.items
@@ -1,7 +1,8 @@
 from neomodel import db
 
 from clinical_mdr_api.domains.versioned_object_aggregate import LibraryVO
-from clinical_mdr_api.models.utils import BaseModel
+from clinical_mdr_api.models.utils import BaseModel, GenericFilteringReturn
+from clinical_mdr_api.repositories._utils import FilterOperator
 from clinical_mdr_api.services.neomodel_ext_generic import (
     NeomodelExtGenericService,
     _AggregateRootType,
@@ -32,3 +33,31 @@ class StandardDataModelService(NeomodelExtGenericService):
     ):
         item = self.repository.find_by_uid(uid=uid, **kwargs)
         return item
+
+    @db.transaction
+    def get_all_items(
+        self,
+        sort_by: dict | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
+        filter_by: dict | None = None,
+        filter_operator: FilterOperator | None = FilterOperator.AND,
+        total_count: bool = False,
+        page_token: str | None = None,
+        **kwargs,
+    ) -> GenericFilteringReturn[BaseModel]:
+        page = self.repository.find_all(
+            total_count=total_count,
+            sort_by=sort_by,
+            filter_by=filter_by,
+            filter_operator=filter_operator,
+            page_number=page_number,
+            page_size=page_size,
+            page_token=page_token,
+            **kwargs,
+        )
+        items, total = page
+
+        return GenericFilteringReturn.create(
+            items, total, next_page_token=page.next_page_token
+        )
@@ -1,12 +1,15 @@
+import json
 from datetime import datetime
 from string import ascii_lowercase
-from typing import Any, Callable, Collection, Iterable
+from typing import Any, Callable, Collection, Iterable, Iterator
 
+from fastapi.encoders import jsonable_encoder
 from neomodel import db  # type: ignore
 
 from clinical_mdr_api import exceptions
 from clinical_mdr_api.config import (
     DAY_UNIT_NAME,
+    MAX_PAGE_SIZE,
     STUDY_FIELD_PREFERRED_TIME_UNIT_NAME,
     STUDY_FIELD_SOA_PREFERRED_TIME_UNIT_NAME,
     WEEK_UNIT_NAME,
@@ -56,7 +59,11 @@ from clinical_mdr_api.models.study_selections.study import (
     StudySubpartReorderingInput,
 )
 from clinical_mdr_api.models.utils import GenericFilteringReturn
-from clinical_mdr_api.repositories._utils import FilterOperator
+from clinical_mdr_api.repositories._utils import (
+    ComparisonOperator,
+    FilterDict,
+    FilterOperator,
+)
 from clinical_mdr_api.services._meta_repository import MetaRepository  # type: ignore
 from clinical_mdr_api.services._utils import (  # type: ignore
     FieldsDirective,
@@ -69,6 +76,33 @@ from clinical_mdr_api.services._utils import (  # type: ignore
     service_level_generic_header_filtering,
 )
 
+# CompactStudy fields which can be filtered and sorted on directly in the study snapshot query,
+# mapped onto the aliases defined in StudyDefinitionRepositoryImpl._build_snapshot_alias_clause
+COMPACT_STUDY_CYPHER_ALIASES = {
+    "uid": "uid",
+    "study_parent_part.uid": "study_parent_part_uid",
+    "current_metadata.identification_metadata.study_number": "current_metadata.study_number",
+    "current_metadata.identification_metadata.subpart_id": "current_metadata.subpart_id",
+    "current_metadata.identification_metadata.study_acronym": "current_metadata.study_acronym",
+    "current_metadata.identification_metadata.project_number": "current_metadata.project_number",
+    "current_metadata.identification_metadata.project_name": "project_name",
+    "current_metadata.identification_metadata.description": "current_metadata.description",
+    "current_metadata.identification_metadata.clinical_programme_name": "clinical_programme_name",
+    "current_metadata.identification_metadata.study_id": "study_id",
+    "current_metadata.version_metadata.study_status": "study_status",
+    "current_metadata.version_metadata.version_number": "current_metadata.version_number",
+    "current_metadata.version_metadata.version_timestamp": "current_metadata.version_timestamp",
+    "current_metadata.study_description.study_title": "current_metadata.study_title",
+    "current_metadata.study_description.study_short_title": "current_metadata.study_short_title",
+}
+
+# Comparison operators which behave the same in Cypher and in service_level_generic_filtering
+COMPACT_STUDY_CYPHER_OPERATORS = {
+    ComparisonOperator.EQUALS,
+    ComparisonOperator.NOT_EQUALS,
+    ComparisonOperator.CONTAINS,
+}
+
 
 class StudyService:
     _repos: MetaRepository
@@ -455,15 +489,27 @@ class StudyService:
         uid: str,
         include_sections: list[StudyComponentEnum] | None = None,
         exclude_sections: list[StudyComponentEnum] | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        user_initials: str | None = None,
+        fields: list[str] | None = None,
     ) -> list[StudyFieldAuditTrailEntry] | None:
         try:
             # call relevant finder (we use helper property to get to the repository)
             study_fields_audit_trail_vo_sequence = (
-                self._repos.study_definition_repository.get_audit_trail_by_uid(uid)
+                self._repos.study_definition_repository.get_audit_trail_by_uid(
+                    uid,
+                    start_date=start_date,
+                    end_date=end_date,
+                    user_initials=user_initials,
+                    fields=fields,
+                )
             )
 
             if study_fields_audit_trail_vo_sequence is None:
-                raise exceptions.NotFoundException(f"The study '{uid}' was not found.")
+                # Nothing matching the filters was found in an existing study
+                self.check_if_study_exists(uid)
+                return []
 
             # Filter to see only the relevant sections.
             result = self._models_study_field_audit_trail_from_audit_trail_vo(
@@ -476,6 +522,90 @@ class StudyService:
         finally:
             self._close_all_repos()
 
+    @db.transaction
+    def get_fields_audit_trail_page_by_uid(
+        self,
+        uid: str,
+        page_size: int,
+        page_token: str | None = None,
+        include_sections: list[StudyComponentEnum] | None = None,
+        exclude_sections: list[StudyComponentEnum] | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        user_initials: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[StudyFieldAuditTrailEntry], str | None]:
+        """
+        Returns a page of the audit trail of the study fields, newest first,
+        and the token to pass as page_token to retrieve the next page, None if it's the last page.
+        """
+        try:
+            self.check_if_study_exists(uid)
+            (
+                study_fields_audit_trail_vo_sequence,
+                next_page_token,
+            ) = self._repos.study_definition_repository.get_audit_trail_page_by_uid(
+                uid,
+                page_size=page_size,
+                page_token=page_token,
+                start_date=start_date,
+                end_date=end_date,
+                user_initials=user_initials,
+                fields=fields,
+            )
+
+            result = self._models_study_field_audit_trail_from_audit_trail_vo(
+                study_audit_trail_vo_sequence=study_fields_audit_trail_vo_sequence,
+                include_sections=include_sections,
+                exclude_sections=exclude_sections,
+                find_term_by_uid=self._repos.ct_term_name_repository.find_by_uid,
+            )
+            return result, next_page_token
+        finally:
+            self._close_all_repos()
+
+    def stream_fields_audit_trail_by_uid(
+        self,
+        uid: str,
+        include_sections: list[StudyComponentEnum] | None = None,
+        exclude_sections: list[StudyComponentEnum] | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        user_initials: str | None = None,
+        fields: list[str] | None = None,
+    ) -> Iterator[str]:
+        """
+        Returns the whole audit trail of the study fields as lines of JSON, one line per entry, newest first.
+        The audit trail is read one page at a time while the lines are sent.
+        """
+
+        def get_page(page_token: str | None):
+            return self.get_fields_audit_trail_page_by_uid(
+                uid,
+                page_size=MAX_PAGE_SIZE,
+                page_token=page_token,
+                include_sections=include_sections,
+                exclude_sections=exclude_sections,
+                start_date=start_date,
+                end_date=end_date,
+                user_initials=user_initials,
+                fields=fields,
+            )
+
+        # The first page is read before the response starts, so that the errors are still returned as such
+        first_page = get_page(None)
+
+        def lines() -> Iterator[str]:
+            entries, next_page_token = first_page
+            while True:
+                for entry in entries:
+                    yield json.dumps(jsonable_encoder(entry)) + "\n"
+                if next_page_token is None:
+                    return
+                entries, next_page_token = get_page(next_page_token)
+
+        return lines()
+
     @db.transaction
     def get_subpart_audit_trail_by_uid(
         self, uid: str, is_subpart: bool = False
@@ -494,6 +624,40 @@ class StudyService:
         finally:
             self._close_all_repos()
 
+    @staticmethod
+    def _map_compact_study_filtering_to_cypher(
+        filter_by: dict | None,
+        sort_by: dict,
+        filter_operator: FilterOperator | None,
+        has_any_relationship_filter: bool,
+    ) -> tuple[dict, dict] | None:
+        """
+        Translates CompactStudy filter_by and sort_by keys into aliases of the study snapshot query.
+        Returns None if any of the requested filters or sort keys cannot be expressed in Cypher,
+        in which case the filtering has to be done in the service layer.
+        """
+        # The has_study_* flags are added to the Cypher filters, which would make them OR-ed
+        if filter_operator == FilterOperator.OR and has_any_relationship_filter:
+            return None
+
+        cypher_filter_by = {}
+        for key, filter_elem in FilterDict(elements=filter_by).elements.items():
+            alias = COMPACT_STUDY_CYPHER_ALIASES.get(key)
+            if alias is None or filter_elem.op not in COMPACT_STUDY_CYPHER_OPERATORS:
+                return None
+            cypher_filter_by[alias] = {"v": filter_elem.v, "op": filter_elem.op.value}
+
+        cypher_sort_by = {}
+        for key, ascending in sort_by.items():
+            alias = COMPACT_STUDY_CYPHER_ALIASES.get(key)
+            if alias is None:
+                return None
+            cypher_sort_by[alias] = ascending
+        # uid is unique, it makes the order stable between pages
+        cypher_sort_by.setdefault("uid", True)
+
+        return cypher_filter_by, cypher_sort_by
+
     def get_all(
         self,
         include_sections: list[StudyComponentEnum] | None = None,
@@ -512,10 +676,60 @@ class StudyService:
         deleted: bool = False,
     ) -> GenericFilteringReturn[CompactStudy]:
         try:
-            # Note that for this endpoint, we have to override the generic filtering
-            # Some transformation logic is happening from an aggregated object to the pydantic return model
-            # This logic prevents us from doing the filtering, sorting, and pagination on the Cypher side
-            # Consequently, this has to be done here in the service layer
+            if not sort_by:
+                sort_by = {"uid": True}
+
+            cypher_filtering = self._map_compact_study_filtering_to_cypher(
+                filter_by=filter_by,
+                sort_by=sort_by,
+                filter_operator=filter_operator,
+                has_any_relationship_filter=any(
+                    flag is not None
+                    for flag in (
+                        has_study_objective,
+                        has_study_endpoint,
+                        has_study_criteria,
+                        has_study_activity,
+                        has_study_activity_instruction,
+                    )
+                ),
+            )
+            if cypher_filtering is not None:
+                # All requested filters and sort keys are available as Cypher aliases,
+                # so only the requested page is retrieved and turned into CompactStudy models
+                cypher_filter_by, cypher_sort_by = cypher_filtering
+                page = self._repos.study_definition_repository.find_all(
+                    has_study_objective=has_study_objective,
+                    has_study_endpoint=has_study_endpoint,
+                    has_study_criteria=has_study_criteria,
+                    has_study_activity=has_study_activity,
+                    has_study_activity_instruction=has_study_activity_instruction,
+                    sort_by=cypher_sort_by,
+                    page_number=page_number,
+                    page_size=page_size,
+                    filter_by=cypher_filter_by,
+                    filter_operator=filter_operator,
+                    total_count=total_count,
+                    deleted=deleted,
+                )
+                return GenericFilteringReturn.create(
+                    items=[
+                        self._models_compact_study_from_study_definition_ar(
+                            study_definition_ar=item,
+                            find_project_by_project_number=self._repos.project_repository.find_by_project_number,
+                            find_clinical_programme_by_uid=self._repos.clinical_programme_repository.find_by_uid,
+                            find_study_parent_part_by_uid=self._repos.study_definition_repository.find_by_uid,
+                            include_sections=include_sections,
+                            exclude_sections=exclude_sections,
+                        )
+                        for item in page.items
+                    ],
+                    total=page.total,
+                )
+
+            # Some of the requested fields (e.g. wildcard filtering or parent part details)
+            # are only available after the transformation from an aggregated object to the pydantic return model
+            # Consequently, the filtering, sorting, and pagination has to be done here in the service layer
             all_items = self._repos.study_definition_repository.find_all(
                 has_study_objective=has_study_objective,
                 has_study_endpoint=has_study_endpoint,
@@ -528,9 +742,6 @@ class StudyService:
                 deleted=deleted,
             )
 
-            if not sort_by:
-                sort_by = {"uid": True}
-
             # then prepare and return response of our service
             parsed_items = [
                 self._models_compact_study_from_study_definition_ar(
@@ -37,6 +37,7 @@ class StudyActivityInstanceSelectionService(StudyActivitySelectionBaseService):
     _repos: MetaRepository
     repository_interface = StudySelectionActivityInstanceRepository
     selected_object_repository_interface = ActivityInstanceRepository
+    selection_uid_field = "study_activity_instance_uid"
 
     def _get_selected_object_exist_check(self) -> Callable[[str], bool]:
         return self.selected_object_repository.final_concept_exists
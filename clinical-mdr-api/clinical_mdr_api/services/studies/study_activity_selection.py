@@ -65,6 +65,7 @@ class StudyActivitySelectionService(StudyActivitySelectionBaseService):
     _repos: MetaRepository
     repository_interface = StudySelectionActivityRepository
     selected_object_repository_interface = ActivityRepository
+    selection_uid_field = "study_activity_uid"
 
     def _get_selected_object_exist_check(self) -> Callable[[str], bool]:
         return self.selected_object_repository.final_or_replaced_retired_activity_exists
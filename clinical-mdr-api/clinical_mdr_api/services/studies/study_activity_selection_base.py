@@ -1,9 +1,13 @@
 import abc
-from typing import Any, Callable, TypeVar
+import json
+from datetime import datetime
+from typing import Any, Callable, Iterator, TypeVar
 
+from fastapi.encoders import jsonable_encoder
 from neomodel import db
 
 from clinical_mdr_api import exceptions
+from clinical_mdr_api.config import MAX_PAGE_SIZE
 from clinical_mdr_api.domain_repositories.study_selections.study_activity_base_repository import (
     StudySelectionActivityBaseRepository,
 )
@@ -24,6 +28,8 @@ class StudyActivitySelectionBaseService(StudySelectionMixin):
     _repos: MetaRepository
     repository_interface: type
     selected_object_repository_interface: type
+    # Field identifying the selections, used to paginate them with a page token
+    selection_uid_field: str
 
     def __init__(self, author):
         self._repos = MetaRepository()
@@ -96,6 +102,7 @@ class StudyActivitySelectionBaseService(StudySelectionMixin):
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        page_token: str | None = None,
         **kwargs,
     ) -> GenericFilteringReturn[BaseModel]:
         selection_ars = self.repository.find_all(
@@ -119,6 +126,8 @@ class StudyActivitySelectionBaseService(StudySelectionMixin):
             total_count=total_count,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            unique_sort_by=[self.selection_uid_field],
         )
         return filtered_items
 
@@ -132,6 +141,7 @@ class StudyActivitySelectionBaseService(StudySelectionMixin):
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
         study_value_version: str | None = None,
+        page_token: str | None = None,
         **kwargs,
     ) -> GenericFilteringReturn[BaseModel]:
         repos = self._repos
@@ -151,6 +161,8 @@ class StudyActivitySelectionBaseService(StudySelectionMixin):
                 total_count=total_count,
                 page_number=page_number,
                 page_size=page_size,
+                page_token=page_token,
+                unique_sort_by=[self.selection_uid_field],
             )
 
             return filtered_items
@@ -158,11 +170,22 @@ class StudyActivitySelectionBaseService(StudySelectionMixin):
             repos.close()
 
     @db.transaction
-    def get_all_selection_audit_trail(self, study_uid: str) -> list[BaseModel]:
+    def get_all_selection_audit_trail(
+        self,
+        study_uid: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        user_initials: str | None = None,
+    ) -> list[BaseModel]:
         repos = self._repos
         try:
             try:
-                selection_history = self.repository.find_selection_history(study_uid)
+                selection_history = self.repository.find_selection_history(
+                    study_uid,
+                    start_date=start_date,
+                    end_date=end_date,
+                    user_initials=user_initials,
+                )
             except ValueError as value_error:
                 raise exceptions.NotFoundException(value_error.args[0])
 
@@ -172,6 +195,81 @@ class StudyActivitySelectionBaseService(StudySelectionMixin):
         finally:
             repos.close()
 
+    @db.transaction
+    def get_all_selection_audit_trail_page(
+        self,
+        study_uid: str,
+        page_size: int,
+        page_token: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        user_initials: str | None = None,
+    ) -> tuple[list[BaseModel], str | None]:
+        """
+        Returns the audit trail of all the selections of a study, restricted to the versions created on
+        `page_size` dates of edit, newest dates first,
+        and the token to pass as page_token to retrieve the next page, None if it's the last page.
+        """
+        repos = self._repos
+        try:
+            try:
+                (
+                    selection_history,
+                    next_page_token,
+                ) = self.repository.find_selection_history_page(
+                    study_uid,
+                    page_size=page_size,
+                    page_token=page_token,
+                    start_date=start_date,
+                    end_date=end_date,
+                    user_initials=user_initials,
+                )
+            except ValueError as value_error:
+                raise exceptions.NotFoundException(value_error.args[0])
+
+            return (
+                self._transform_history_to_response_model(selection_history, study_uid),
+                next_page_token,
+            )
+        finally:
+            repos.close()
+
+    def stream_all_selection_audit_trail(
+        self,
+        study_uid: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        user_initials: str | None = None,
+    ) -> Iterator[str]:
+        """
+        Returns the whole audit trail of all the selections of a study as lines of JSON, one line per version,
+        newest dates of edit first. The audit trail is read one page at a time while the lines are sent.
+        """
+
+        def get_page(page_token: str | None):
+            return self.get_all_selection_audit_trail_page(
+                study_uid,
+                page_size=MAX_PAGE_SIZE,
+                page_token=page_token,
+                start_date=start_date,
+                end_date=end_date,
+                user_initials=user_initials,
+            )
+
+        # The first page is read before the response starts, so that the errors are still returned as such
+        first_page = get_page(None)
+
+        def lines() -> Iterator[str]:
+            items, next_page_token = first_page
+            while True:
+                for item in items:
+                    yield json.dumps(jsonable_encoder(item)) + "\n"
+                if next_page_token is None:
+                    return
+                items, next_page_token = get_page(next_page_token)
+
+        return lines()
+
     @db.transaction
     def get_specific_selection_audit_trail(
         self, study_uid: str, study_selection_uid: str
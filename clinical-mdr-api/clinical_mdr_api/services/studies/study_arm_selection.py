@@ -85,6 +85,7 @@ class StudyArmSelectionService(StudySelectionMixin):
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[models.StudySelectionArmWithConnectedBranchArms]:
         repos = self._repos
         arm_selection_ars = repos.study_arm_repository.find_all(
@@ -109,6 +110,8 @@ class StudyArmSelectionService(StudySelectionMixin):
             total_count=total_count,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            unique_sort_by=["arm_uid"],
         )
         return filtered_items
 
@@ -176,6 +179,7 @@ class StudyArmSelectionService(StudySelectionMixin):
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
         study_value_version: str | None = None,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[models.StudySelectionArmWithConnectedBranchArms]:
         repos = MetaRepository()
         try:
@@ -193,6 +197,8 @@ class StudyArmSelectionService(StudySelectionMixin):
                 total_count=total_count,
                 page_number=page_number,
                 page_size=page_size,
+                page_token=page_token,
+                unique_sort_by=["arm_uid"],
             )
 
             return filtered_items
@@ -75,6 +75,7 @@ class StudyCohortSelectionService(StudySelectionMixin):
         total_count: bool = False,
         arm_uid: str | None = None,
         study_value_version: str | None = None,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[models.StudySelectionCohort]:
         repos = self._repos
         try:
@@ -103,6 +104,8 @@ class StudyCohortSelectionService(StudySelectionMixin):
                 total_count=total_count,
                 page_number=page_number,
                 page_size=page_size,
+                page_token=page_token,
+                unique_sort_by=["cohort_uid"],
             )
             return filtered_items
         finally:
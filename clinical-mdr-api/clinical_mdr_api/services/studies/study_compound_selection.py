@@ -171,6 +171,7 @@ class StudyCompoundSelectionService(
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[models.StudySelectionCompound]:
         repos = self._repos
         compound_selection_ars = repos.study_compound_repository.find_all(
@@ -196,6 +197,8 @@ class StudyCompoundSelectionService(
             total_count=total_count,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            unique_sort_by=["study_compound_uid"],
         )
         return filtered_items
 
@@ -267,6 +270,7 @@ class StudyCompoundSelectionService(
         page_number: int = 1,
         page_size: int = 0,
         total_count: bool = False,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[models.StudySelectionCompound]:
         repos = MetaRepository()
         try:
@@ -285,6 +289,8 @@ class StudyCompoundSelectionService(
                 total_count=total_count,
                 page_number=page_number,
                 page_size=page_size,
+                page_token=page_token,
+                unique_sort_by=["study_compound_uid"],
             )
             return selection
         finally:
@@ -543,6 +543,7 @@ class StudyCriteriaSelectionService(StudySelectionMixin):
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[models.StudySelectionCriteria]:
         repos = self._repos
 
@@ -570,6 +571,8 @@ class StudyCriteriaSelectionService(StudySelectionMixin):
             total_count=total_count,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            unique_sort_by=["study_criteria_uid"],
         )
         return filtered_items
 
@@ -645,6 +648,7 @@ class StudyCriteriaSelectionService(StudySelectionMixin):
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
         study_value_version: str | None = None,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[models.StudySelectionCriteria]:
         repos = self._repos
         try:
@@ -673,6 +677,8 @@ class StudyCriteriaSelectionService(StudySelectionMixin):
                 total_count=total_count,
                 page_number=page_number,
                 page_size=page_size,
+                page_token=page_token,
+                unique_sort_by=["study_criteria_uid"],
             )
 
             return filtered_items
@@ -1,14 +1,20 @@
+import hashlib
+import json
 import logging
 import os
+import threading
 from collections import OrderedDict
+from functools import lru_cache
 from typing import Mapping, MutableMapping
 
 import yattag
+from cachetools.keys import hashkey
 from colour import Color
-from PIL import ImageFont
+from fastapi.encoders import jsonable_encoder
 
 from clinical_mdr_api import config, models
 from clinical_mdr_api.oauth import get_current_user_id
+from clinical_mdr_api.repositories._cache import SharedTTLCache
 from clinical_mdr_api.services.studies.study_arm_selection import (
     StudyArmSelectionService,
 )
@@ -57,6 +63,8 @@ FONT_NAME = "Times New Roman"
 FONT_FILE_NAME = "clinical_mdr_api/services/utils/LiberationSerif-Regular.ttf"
 FONT_SIZE = 12  # in points
 FONT_SIZE_POINT_TO_PIXELS_RATIO = PPI / DPI
+# Number of distinct texts (words and lines) whose rendered size is remembered
+TEXT_SIZE_CACHE_SIZE = 100000
 LINE_SPACING = 3
 TEXT_BOTTOM_EXTRA_PADDING = int(FONT_SIZE / 3)
 TEXT_COLOR_LIGHT = Color("white")
@@ -119,6 +127,36 @@ STYLES = {
 
 log = logging.getLogger(__name__)
 
+# SVG documents of the study versions, keyed by a hash of the data drawn
+design_figure_cache = SharedTTLCache(
+    name="study_design_figure.design_figure_cache",
+    maxsize=config.CACHE_MAX_SIZE,
+    ttl=config.CACHE_TTL,
+)
+
+# The font is shared by all the requests, and FreeType faces are not thread-safe
+_font_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def get_font():
+    """Returns the font of the figure texts, loaded once per process"""
+    # Pillow is only loaded when the first figure is drawn
+    from PIL import ImageFont
+
+    font_path = os.path.join(config.APP_ROOT_DIR, FONT_FILE_NAME)
+    # Although ImageFont.truetype() expects point size, it seems we need to scale it up for calculations in pixels
+    return ImageFont.truetype(
+        font_path, int(round(FONT_SIZE * FONT_SIZE_POINT_TO_PIXELS_RATIO))
+    )
+
+
+@lru_cache(maxsize=TEXT_SIZE_CACHE_SIZE)
+def get_text_size_px(text: str) -> tuple[int, int]:
+    """Returns width and height (in pixels) of given text if rendered with the figure font, remembered per text"""
+    with _font_lock:
+        return get_font().getbbox(text)[2:4]
+
 
 class StudyDesignFigureService:
     """Draws an SVG image of Study Design Figure
@@ -130,27 +168,71 @@ class StudyDesignFigureService:
     """
 
     def __init__(self):
-        font_path = os.path.join(config.APP_ROOT_DIR, FONT_FILE_NAME)
-        # Although ImageFont.truetype() expects point size, it seems we need to scale it up for calculations in pixels
         self.font_size = int(round(FONT_SIZE * FONT_SIZE_POINT_TO_PIXELS_RATIO))
-        self.font = ImageFont.truetype(font_path, self.font_size)
+        self.font = get_font()
         self._current_user_id = get_current_user_id()
 
-    def get_svg_document(self, study_uid: str):
-        """Fetches necessary data and returns the SVG drawing as text"""
+    def get_svg_document(self, study_uid: str, study_value_version: str | None = None):
+        """Fetches necessary data and returns the SVG drawing as text
+
+        The drawing is cached by a hash of the data drawn, so an unchanged study version is drawn only once.
+        """
 
         # fetch data
-        study_arms = self._get_study_arms(study_uid)
-        study_epochs = self._get_study_epochs(study_uid)
-        study_elements = self._get_study_elements(study_uid)
-        study_design_cells = self._get_study_design_cells(study_uid)
-        study_visits = self._get_study_visits(study_uid)
+        study_arms = self._get_study_arms(study_uid, study_value_version)
+        study_epochs = self._get_study_epochs(study_uid, study_value_version)
+        study_elements = self._get_study_elements(study_uid, study_value_version)
+        study_design_cells = self._get_study_design_cells(
+            study_uid, study_value_version
+        )
+        study_visits = self._get_study_visits(study_uid, study_value_version)
+        visits = self._select_first_visits(study_visits, study_epochs)
+
+        key = hashkey(
+            study_uid,
+            study_value_version,
+            self._hash_data(
+                study_arms, study_epochs, study_elements, study_design_cells, visits
+            ),
+        )
+        try:
+            with design_figure_cache.lock:
+                return design_figure_cache[key]
+        except KeyError:
+            pass
+
+        document = self._draw_svg_document(
+            study_arms, study_epochs, study_elements, study_design_cells, visits
+        )
+        with design_figure_cache.lock:
+            design_figure_cache[key] = document
+        return document
+
+    @staticmethod
+    def _hash_data(
+        study_arms, study_epochs, study_elements, study_design_cells, visits
+    ) -> str:
+        """Returns a hash of the data drawn in the figure"""
+        data = [
+            list(study_arms.values()),
+            list(study_epochs.values()),
+            list(study_elements.values()),
+            study_design_cells,
+            visits,
+        ]
+        return hashlib.sha256(
+            json.dumps(jsonable_encoder(data), sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def _draw_svg_document(
+        self, study_arms, study_epochs, study_elements, study_design_cells, visits
+    ) -> str:
+        """Lays out and returns the SVG drawing as text"""
 
         # organise the data
         table = self._mk_data_matrix(
             study_arms, study_epochs, study_elements, study_design_cells
         )
-        visits = self._select_first_visits(study_visits, study_epochs)
 
         # calculate table cells
         fig_width = self._calculate_widths(table)
@@ -171,21 +253,25 @@ class StudyDesignFigureService:
         return self.draw_svg(table, timeline, doc_width, doc_height)
 
     def _get_study_arms(
-        self, study_uid
+        self, study_uid, study_value_version: str | None = None
     ) -> Mapping[str, models.StudySelectionArmWithConnectedBranchArms]:
         """Returns Study Arms as an ordered dictionary of {uid: arm}"""
         study_arms = StudyArmSelectionService(self._current_user_id).get_all_selection(
-            study_uid=study_uid, sort_by={"order": True}
+            study_uid=study_uid,
+            sort_by={"order": True},
+            study_value_version=study_value_version,
         )
         study_arms = OrderedDict((arm.arm_uid, arm) for arm in study_arms.items)
         return study_arms
 
     def _get_study_epochs(
-        self, study_uid
+        self, study_uid, study_value_version: str | None = None
     ) -> Mapping[str, models.study_selections.study_epoch.StudyEpoch]:
         """Returns Study Epochs as an ordered dictionary of {uid: epoch}"""
         study_epochs = StudyEpochService(self._current_user_id).get_all_epochs(
-            study_uid=study_uid, sort_by={"order": True}
+            study_uid=study_uid,
+            sort_by={"order": True},
+            study_value_version=study_value_version,
         )
         study_epochs = OrderedDict(
             (epoch.uid, epoch)
@@ -195,30 +281,34 @@ class StudyDesignFigureService:
         return study_epochs
 
     def _get_study_elements(
-        self, study_uid
+        self, study_uid, study_value_version: str | None = None
     ) -> Mapping[str, models.StudySelectionElement]:
         """Returns Study Elements as an ordered dictionary of {uid: element}"""
         study_elements = StudyElementSelectionService(
             self._current_user_id
-        ).get_all_selection(study_uid=study_uid)
+        ).get_all_selection(
+            study_uid=study_uid, study_value_version=study_value_version
+        )
         study_elements = OrderedDict(
             (element.element_uid, element) for element in study_elements.items
         )
         return study_elements
 
-    def _get_study_design_cells(self, study_uid) -> list[models.StudyDesignCell]:
+    def _get_study_design_cells(
+        self, study_uid, study_value_version: str | None = None
+    ) -> list[models.StudyDesignCell]:
         """Returns a list of Study Design Cells"""
         study_design_cells = StudyDesignCellService(
             self._current_user_id
-        ).get_all_design_cells(study_uid)
+        ).get_all_design_cells(study_uid, study_value_version=study_value_version)
         return study_design_cells
 
     def _get_study_visits(
-        self, study_uid: str
+        self, study_uid: str, study_value_version: str | None = None
     ) -> Mapping[str, models.study_selections.study_visit.StudyVisit]:
         """Returns Study Visits as an ordered dictionary of {uid: visit}"""
         study_visits = StudyVisitService(self._current_user_id).get_all_visits(
-            study_uid
+            study_uid, study_value_version=study_value_version
         )
         study_visits = OrderedDict((visit.uid, visit) for visit in study_visits.items)
         return study_visits
@@ -705,9 +795,10 @@ class StudyDesignFigureService:
         min_width = max(w[1] for w in word_sizes)
         return optimal_width, min_width
 
-    def _get_text_size_px(self, text: str) -> tuple[int, int]:
+    @staticmethod
+    def _get_text_size_px(text: str) -> tuple[int, int]:
         """Returns width and height (in pixels) of given text if rendered with font and size"""
-        return self.font.getbbox(text)[2:4]
+        return get_text_size_px(text)
 
     def _get_words_size_px(self, text: str) -> tuple[tuple[str, int, int]]:
         """Returns a tuple of (word, width, height) in pixels of each word of a text if rendered with font and size"""
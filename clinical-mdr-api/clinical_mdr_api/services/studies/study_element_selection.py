@@ -230,6 +230,7 @@ class StudyElementSelectionService(
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
         study_value_version: str | None = None,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[models.StudySelectionElement]:
         repos = MetaRepository()
         try:
@@ -246,6 +247,8 @@ class StudyElementSelectionService(
                 total_count=total_count,
                 page_number=page_number,
                 page_size=page_size,
+                page_token=page_token,
+                unique_sort_by=["element_uid"],
             )
 
             return filtered_items
@@ -614,6 +614,7 @@ class StudyEndpointSelectionService(StudySelectionMixin):
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn[models.StudySelectionEndpoint]:
         repos = self._repos
         endpoint_selection_ars = repos.study_endpoint_repository.find_all(
@@ -640,6 +641,8 @@ class StudyEndpointSelectionService(StudySelectionMixin):
             total_count=total_count,
             page_number=page_number,
             page_size=page_size,
+            page_token=page_token,
+            unique_sort_by=["study_endpoint_uid"],
         )
         return filtered_items
 
@@ -714,6 +717,7 @@ class StudyEndpointSelectionService(StudySelectionMixin):
         page_size: int = 0,
         total_count: bool = False,
         study_value_version: str | None = None,
+        page_token: str | None = None,
     ) -> GenericFilteringReturn:
         repos = MetaRepository()
         try:
@@ -733,6 +737,8 @@ class StudyEndpointSelectionService(StudySelectionMixin):
                 total_count=total_count,
                 page_number=page_number,
                 page_size=page_size,
+                page_token=page_token,
+                unique_sort_by=["study_endpoint_uid"],
             )
             return selection
         finally:
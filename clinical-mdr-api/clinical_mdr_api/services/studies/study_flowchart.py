@@ -1,6 +1,9 @@
 import logging
-from typing import Iterable, Mapping, Sequence
+import math
+from copy import deepcopy
+from typing import Any, Callable, Hashable, Iterable, Mapping, Sequence
 
+from cachetools.keys import hashkey
 from docx.enum.style import WD_STYLE_TYPE
 from neomodel import db
 from opencensus.trace import execution_context
@@ -15,6 +18,7 @@ from clinical_mdr_api.models import (
     StudyVisit,
 )
 from clinical_mdr_api.models.study_selections.study_soa_footnote import StudySoAFootnote
+from clinical_mdr_api.repositories._cache import SharedTTLCache
 from clinical_mdr_api.services.studies.study import StudyService
 from clinical_mdr_api.services.studies.study_activity_schedule import (
     StudyActivityScheduleService,
@@ -65,6 +69,21 @@ DOCX_STYLES = {
 }
 
 
+# Protocol SoA flowchart tables and coordinates of the draft study versions, keyed by change stamp
+draft_flowchart_cache = SharedTTLCache(
+    name="study_flowchart.draft_flowchart_cache",
+    maxsize=config.CACHE_MAX_SIZE,
+    ttl=config.CACHE_TTL,
+)
+# Protocol SoA flowchart tables and coordinates of the locked and released study versions,
+# which never change
+released_flowchart_cache = SharedTTLCache(
+    name="study_flowchart.released_flowchart_cache",
+    maxsize=config.CACHE_MAX_SIZE,
+    ttl=math.inf,
+)
+
+
 class StudyFlowchartService:
     """Assemble Study Protocol SoA Flowchart"""
 
@@ -145,6 +164,59 @@ class StudyFlowchartService:
                 .items
             )
 
+    def _get_study_change_stamp(self, study_uid: str) -> Hashable | None:
+        """
+        Returns a stamp identifying the current state of the draft version of a study.
+
+        Every write of a study selection (activities, schedules, visits, footnotes ...) adds a StudyAction
+        to the audit trail of the study, and every write of its metadata creates a new StudyValue.
+        Returns None if the study does not exist.
+        """
+        result, _ = db.cypher_query(
+            """
+            MATCH (sr:StudyRoot {uid: $study_uid})-[:LATEST]->(sv:StudyValue)
+            OPTIONAL MATCH (sr)-[:AUDIT_TRAIL]->(sa:StudyAction)
+            RETURN elementId(sv), count(sa), toString(max(sa.date))
+            """,
+            {"study_uid": study_uid},
+        )
+        return tuple(result[0]) if result else None
+
+    def _get_cached(
+        self,
+        kind: str,
+        study_uid: str,
+        study_value_version: str | None,
+        build: Callable[[], Any],
+        *args: Hashable,
+    ) -> Any:
+        """
+        Returns a copy of the result of build, cached by study version.
+
+        Locked and released versions are cached for good, drafts are cached by their change stamp,
+        so that any write to the study makes the next call build the result again.
+        """
+        if study_value_version:
+            cache = released_flowchart_cache
+            key = hashkey(kind, study_uid, study_value_version, *args)
+        else:
+            stamp = self._get_study_change_stamp(study_uid)
+            if stamp is None:
+                return build()
+            cache = draft_flowchart_cache
+            key = hashkey(kind, study_uid, stamp, *args)
+
+        try:
+            with cache.lock:
+                result = cache[key]
+        except KeyError:
+            result = build()
+            with cache.lock:
+                cache[key] = result
+
+        # Callers modify the returned table in place
+        return deepcopy(result)
+
     @staticmethod
     def _sort_study_activities(
         study_selection_activities: list[StudySelectionActivity],
@@ -251,6 +323,18 @@ class StudyFlowchartService:
 
         self._validate_parameters(study_uid, study_value_version=study_value_version)
 
+        return self._get_cached(
+            "coordinates",
+            study_uid,
+            study_value_version,
+            lambda: self._build_flowchart_item_uid_coordinates(
+                study_uid, study_value_version=study_value_version
+            ),
+        )
+
+    def _build_flowchart_item_uid_coordinates(
+        self, study_uid: str, study_value_version: str | None = None
+    ) -> dict[str, tuple[int, int]]:
         study_activity_schedules: list[
             StudyActivitySchedule
         ] = self._get_study_activity_schedules(
@@ -387,6 +471,22 @@ class StudyFlowchartService:
             study_uid, study_value_version=study_value_version, time_unit=time_unit
         )
 
+        return self._get_cached(
+            "table",
+            study_uid,
+            study_value_version,
+            lambda: self._build_flowchart_table(
+                study_uid, time_unit, study_value_version=study_value_version
+            ),
+            time_unit,
+        )
+
+    def _build_flowchart_table(
+        self,
+        study_uid: str,
+        time_unit: str,
+        study_value_version: str | None = None,
+    ) -> TableWithFootnotes:
         study_selection_activities: list[
             StudySelectionActivity
         ] = self._get_study_activities(
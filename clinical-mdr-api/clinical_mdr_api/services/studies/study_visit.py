@@ -397,12 +397,13 @@ class StudyVisitService:
         visits = self._get_all_visits(
             study_uid, study_value_version=study_value_version
         )
+        activity_counts = self.repo.count_activities_by_visit(
+            study_uid=study_uid, study_value_version=study_value_version
+        )
         visits = [
             self._transform_all_to_response_model(
                 visit,
-                study_activity_count=self.repo.count_activities(
-                    visit_uid=visit.uid, study_value_version=study_value_version
-                ),
+                study_activity_count=activity_counts.get(visit.uid, 0),
                 study_value_version=study_value_version,
             )
             for visit in visits
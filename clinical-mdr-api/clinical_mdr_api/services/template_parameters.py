@@ -2,12 +2,10 @@ from clinical_mdr_api.domain_repositories.template_parameters.complex_parameter
     ComplexTemplateParameterRepository,
 )
 
-repository = ComplexTemplateParameterRepository()
-
 
 def get_all():
-    return repository.find_all_with_samples()
+    return ComplexTemplateParameterRepository().find_all_with_samples()
 
 
 def get_template_parameter_terms(name: str):
-    return repository.find_values(name)
+    return ComplexTemplateParameterRepository().find_values(name)
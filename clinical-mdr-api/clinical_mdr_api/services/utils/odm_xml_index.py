@@ -0,0 +1,195 @@
+import hashlib
+import json
+from typing import BinaryIO, Iterator
+from xml.dom import minidom
+
+from lxml import etree
+
+from clinical_mdr_api.exceptions import BusinessLogicException
+from clinical_mdr_api.services.utils.odm_xml_mapper import apply_mapping_rules
+
+DEF_TAGS = (
+    "MeasurementUnit",
+    "FormDef",
+    "ItemGroupDef",
+    "ItemDef",
+    "ConditionDef",
+    "MethodDef",
+    "CodeList",
+)
+
+_FRAGMENT_PARSER = etree.XMLParser(
+    resolve_entities=False, no_network=True, strip_cdata=False
+)
+
+
+class _HashingReader:
+    """File wrapper computing the digest of everything read from the wrapped file."""
+
+    def __init__(self, file: BinaryIO, digest):
+        self.file = file
+        self.digest = digest
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.file.read(size)
+        self.digest.update(data)
+        return data
+
+
+class OdmXmlDefinitions:
+    """
+    Definitions of a given tag, in document order.
+
+    Each definition is parsed into its own small DOM document when iterated over or looked up by OID,
+    so only one definition at a time has to be held as DOM nodes.
+    """
+
+    def __init__(self, index: "OdmXmlIndex", tag: str):
+        self._index = index
+        self._fragments: list[tuple[int, bytes]] = []
+        self._positions_by_oid: dict[str, int] = {}
+        self.tag = tag
+
+    def _append(self, oid: str | None, chain_id: int, fragment: bytes):
+        if oid is not None:
+            self._positions_by_oid.setdefault(oid, len(self._fragments))
+        self._fragments.append((chain_id, fragment))
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+    def __iter__(self) -> Iterator[minidom.Element]:
+        return self.iter_from(0)
+
+    def iter_from(self, start: int) -> Iterator[minidom.Element]:
+        for chain_id, fragment in self._fragments[start:]:
+            yield self._index._materialize(chain_id, fragment)
+
+    def get(self, oid: str | None) -> minidom.Element | None:
+        """Returns the first definition identified by the given OID, if any."""
+        position = self._positions_by_oid.get(oid)
+        if position is None:
+            return None
+        return self._index._materialize(*self._fragments[position])
+
+
+class OdmXmlIndex:
+    """
+    Compact index of the definitions of an ODM XML document.
+
+    The document is streamed with `lxml.etree.iterparse` and only the definitions listed in `DEF_TAGS`
+    are kept, serialized and grouped by tag, instead of building the DOM of the whole document.
+    The elements enclosing the definitions are kept without their content, so that definitions are
+    parsed again within their original ancestors and the mapping rules apply to them as they would
+    to the whole document.
+    """
+
+    def __init__(self, file: BinaryIO, mapping_rules: list[dict[str, str]]):
+        self.mapping_rules = mapping_rules
+        self.definitions = {tag: OdmXmlDefinitions(self, tag) for tag in DEF_TAGS}
+        self.odm_element: minidom.Element | None = None
+        self.study_name: str | None = None
+        self._chains: list[list[tuple[str, dict, dict]]] = []
+
+        digest = hashlib.sha256(json.dumps(mapping_rules).encode("utf-8"))
+        try:
+            self._parse(_HashingReader(file, digest))
+        except etree.XMLSyntaxError as exc:
+            raise BusinessLogicException(f"Invalid XML file: {exc}") from exc
+        self.digest = digest.hexdigest()
+
+    def __getitem__(self, tag: str) -> OdmXmlDefinitions:
+        return self.definitions[tag]
+
+    def _parse(self, file):
+        ancestors: list[tuple[str, dict, dict]] = []
+        chain_id = -1
+        # Number of definitions being parsed, definitions can't be cleared while nested in another one
+        open_definitions = 0
+        in_study_name = False
+
+        for event, element in etree.iterparse(
+            file,
+            events=("start", "end"),
+            resolve_entities=False,
+            no_network=True,
+            remove_comments=True,
+            strip_cdata=False,
+        ):
+            tag = self._qualified_name(element)
+
+            if event == "start":
+                if tag in self.definitions:
+                    open_definitions += 1
+                elif tag == "StudyName" and self.study_name is None:
+                    in_study_name = True
+                elif not open_definitions:
+                    if not ancestors:
+                        self.odm_element = self._parse_odm_element(element)
+                    ancestors.append(
+                        (element.tag, dict(element.attrib), dict(element.nsmap))
+                    )
+                    chain_id = -1
+                continue
+
+            if tag in self.definitions:
+                if chain_id < 0:
+                    self._chains.append(list(ancestors))
+                    chain_id = len(self._chains) - 1
+                self.definitions[tag]._append(
+                    element.get("OID"),
+                    chain_id,
+                    etree.tostring(element, with_tail=False),
+                )
+                open_definitions -= 1
+            elif in_study_name:
+                # A missing text node means an empty StudyName
+                self.study_name = element.text or ""
+                in_study_name = False
+            elif not open_definitions:
+                ancestors.pop()
+                chain_id = -1
+
+            if not open_definitions:
+                element.clear()
+                parent = element.getparent()
+                if parent is not None:
+                    parent.remove(element)
+
+    @staticmethod
+    def _qualified_name(element) -> str:
+        local_name = etree.QName(element).localname
+        return f"{element.prefix}:{local_name}" if element.prefix else local_name
+
+    @staticmethod
+    def _parse_odm_element(element) -> minidom.Element:
+        odm_element = etree.Element(element.tag, element.attrib, nsmap=element.nsmap)
+        return minidom.parseString(etree.tostring(odm_element)).documentElement
+
+    def _materialize(self, chain_id: int, fragment: bytes) -> minidom.Element:
+        root = parent = None
+        for tag, attrib, nsmap in self._chains[chain_id]:
+            if parent is None:
+                root = parent = etree.Element(tag, attrib, nsmap=nsmap)
+            else:
+                parent = etree.SubElement(parent, tag, attrib, nsmap=nsmap)
+
+        element = etree.fromstring(fragment, _FRAGMENT_PARSER)
+        if root is None:
+            root = element
+        else:
+            parent.append(element)
+            # Drops the declarations repeated on the definition by the serialization
+            etree.cleanup_namespaces(root)
+
+        document = minidom.parseString(etree.tostring(root))
+        apply_mapping_rules(document, self.mapping_rules)
+
+        node = document.documentElement
+        for _ in self._chains[chain_id]:
+            node = next(
+                child
+                for child in node.childNodes
+                if child.nodeType == minidom.Node.ELEMENT_NODE
+            )
+        return node
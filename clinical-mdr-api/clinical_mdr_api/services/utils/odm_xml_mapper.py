@@ -30,11 +30,27 @@ def map_xml(xml_document: Document, mapper: UploadFile | None):
     Returns:
         None
 
+    Raises:
+        BusinessLogicException: If the mapper is not in CSV format, or if the mandatory mapping fields are not present.
+    """
+    apply_mapping_rules(xml_document, read_mapping_rules(mapper))
+
+
+def read_mapping_rules(mapper: UploadFile | None) -> list[dict[str, str]]:
+    """
+    Reads the mapping rules of a CSV mapper file, so that they can be applied to several XML documents.
+
+    Args:
+        mapper (UploadFile | None): The CSV file containing the mapping rules.
+
+    Returns:
+        list[dict[str, str]]: The mapping rules, empty if no mapper is provided.
+
     Raises:
         BusinessLogicException: If the mapper is not in CSV format, or if the mandatory mapping fields are not present.
     """
     if not mapper:
-        return
+        return []
 
     if mapper.content_type != "text/csv":
         raise BusinessLogicException("Only CSV format is supported.")
@@ -46,7 +62,21 @@ def map_xml(xml_document: Document, mapper: UploadFile | None):
             f"These headers must be present: {sorted(MANDATORY_MAPPER_FIELDS)}"
         )
 
-    for mapping in dict_reader:
+    return list(dict_reader)
+
+
+def apply_mapping_rules(xml_document: Document, mapping_rules: list[dict[str, str]]):
+    """
+    Transform XML Elements and Attributes according to the given mapping rules.
+
+    Args:
+        xml_document (Document): The XML document to modify.
+        mapping_rules (list[dict[str, str]]): The mapping rules, as returned by `read_mapping_rules`.
+
+    Returns:
+        None
+    """
+    for mapping in mapping_rules:
         parent = mapping["parent"] or "*"
 
         if mapping["type"] == "attribute":
@@ -16,6 +16,9 @@ import pytest
 from fastapi.testclient import TestClient
 from neomodel import db
 
+from clinical_mdr_api.domain_repositories.study_selections.study_activity_repository import (
+    StudySelectionActivityRepository,
+)
 from clinical_mdr_api.main import app
 from clinical_mdr_api.models import ClinicalProgramme, Project
 from clinical_mdr_api.models.concepts.activities.activity import Activity
@@ -1502,3 +1505,53 @@ def test_only_placeholder_study_activity_can_have_subgroup_and_group_not_specifi
         response.json()["message"]
         == "Only StudyActivity placeholder can link to None ActivitySubGroup or None ActivityGroup"
     )
+
+
+def test_reorder_keeps_the_order_of_the_audit_trail(api_client):
+    study_for_reorder = TestUtils.create_study()
+    study_activity_uids = [
+        create_study_activity(
+            study_uid=study_for_reorder.uid,
+            activity_uid=activity.uid,
+            activity_subgroup_uid=activity_subgroup.uid,
+            activity_group_uid=general_activity_group.uid,
+            soa_group_term_uid="term_efficacy_uid",
+        ).study_activity_uid
+        for activity, activity_subgroup in (
+            (randomized_activity, randomisation_activity_subgroup),
+            (body_mes_activity, randomisation_activity_subgroup),
+            (weight_activity, body_measurements_activity_subgroup),
+        )
+    ]
+    repository = StudySelectionActivityRepository()
+
+    def audit_trail_orders():
+        return sorted(
+            (entry.study_selection_uid, entry.change_type, entry.activity_order)
+            for entry in repository.find_selection_history(study_for_reorder.uid)
+        )
+
+    before_reorder = audit_trail_orders()
+    assert before_reorder == sorted(
+        (uid, "Create", order) for order, uid in enumerate(study_activity_uids, start=1)
+    )
+
+    # Move the last study activity to the top, the others are only shifted
+    response = api_client.patch(
+        f"/studies/{study_for_reorder.uid}/study-activities/{study_activity_uids[2]}/order",
+        json={"new_order": 1},
+    )
+    assert response.status_code == 200
+
+    response = api_client.get(f"/studies/{study_for_reorder.uid}/study-activities")
+    assert response.status_code == 200
+    assert [item["study_activity_uid"] for item in response.json()["items"]] == [
+        study_activity_uids[2],
+        study_activity_uids[0],
+        study_activity_uids[1],
+    ]
+    # The existing entries keep the order in effect when they were created,
+    # only the moved study activity gets a new entry
+    assert audit_trail_orders() == sorted(
+        before_reorder + [(study_activity_uids[2], "Edit", 1)]
+    )
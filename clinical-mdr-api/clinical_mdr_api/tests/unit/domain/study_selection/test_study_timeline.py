@@ -0,0 +1,134 @@
+import datetime
+from types import SimpleNamespace
+from unittest import mock
+
+from clinical_mdr_api.config import GLOBAL_ANCHOR_VISIT_NAME, PREVIOUS_VISIT_NAME
+from clinical_mdr_api.domains.study_definition_aggregates.study_metadata import (
+    StudyStatus,
+)
+from clinical_mdr_api.domains.study_selections.study_epoch import TimelineAR
+from clinical_mdr_api.domains.study_selections.study_visit import (
+    NumericValue,
+    StudyVisitVO,
+    TimePoint,
+    TimeUnit,
+    VisitClass,
+    VisitSubclass,
+)
+
+DAY = TimeUnit(
+    name="day",
+    conversion_factor_to_master=86400,
+    from_timedelta=lambda unit, value: value * unit.conversion_factor_to_master,
+)
+WEEK = TimeUnit(
+    name="week",
+    conversion_factor_to_master=604800,
+    from_timedelta=lambda unit, value: value * unit.conversion_factor_to_master,
+)
+
+
+def _visit(uid: str, visit_type: str, time_reference: str, days: int) -> StudyVisitVO:
+    return StudyVisitVO(
+        uid=uid,
+        consecutive_visit_group=None,
+        visit_window_min=None,
+        visit_window_max=None,
+        window_unit_uid=None,
+        description=None,
+        start_rule=None,
+        end_rule=None,
+        visit_contact_mode=SimpleNamespace(value="On Site Visit"),
+        visit_type=SimpleNamespace(value=visit_type),
+        status=StudyStatus.DRAFT,
+        start_date=datetime.datetime.now(datetime.timezone.utc),
+        author="test",
+        visit_class=VisitClass.SINGLE_VISIT,
+        visit_subclass=VisitSubclass.SINGLE_VISIT,
+        is_global_anchor_visit=time_reference == GLOBAL_ANCHOR_VISIT_NAME and days == 0,
+        visit_number=None,
+        visit_order=None,
+        show_visit=True,
+        timepoint=TimePoint(
+            uid=None,
+            visit_timereference=SimpleNamespace(value=time_reference),
+            time_unit_uid=None,
+            visit_value=days,
+        ),
+        study_day=NumericValue(uid=None, value=None),
+        study_duration_days=NumericValue(uid=None, value=None),
+        study_week=NumericValue(uid=None, value=None),
+        study_duration_weeks=NumericValue(uid=None, value=None),
+        week_in_study=NumericValue(uid=None, value=None),
+        time_unit_object=DAY,
+        day_unit_object=DAY,
+        week_unit_object=WEEK,
+    )
+
+
+def _timeline() -> TimelineAR:
+    return TimelineAR(
+        study_uid="study",
+        _visits=[
+            _visit("v1", "Baseline", GLOBAL_ANCHOR_VISIT_NAME, 0),
+            _visit("v2", "Treatment", GLOBAL_ANCHOR_VISIT_NAME, 14),
+            _visit("v3", "Follow-up", "Treatment", 7),
+            _visit("v4", "Follow-up 2", PREVIOUS_VISIT_NAME, 7),
+        ],
+    )
+
+
+def test_ordered_study_visits_are_generated_once():
+    timeline = _timeline()
+    with mock.patch.object(
+        TimelineAR, "_generate_timeline", wraps=timeline._generate_timeline
+    ) as generate_timeline:
+        first = timeline.ordered_study_visits
+        second = timeline.ordered_study_visits
+    assert generate_timeline.call_count == 1
+    assert [visit.uid for visit in first] == [visit.uid for visit in second]
+    assert [visit.uid for visit in first] == ["v1", "v2", "v3", "v4"]
+    assert [visit.visit_number for visit in first] == [1, 2, 3, 4]
+    assert [visit.study_day.value for visit in first] == [1, 15, 22, 29]
+
+
+def test_update_visit_recomputes_the_visits_anchored_to_it():
+    timeline = _timeline()
+    visits = {visit.uid: visit for visit in timeline.ordered_study_visits}
+
+    with mock.patch.object(
+        StudyVisitVO,
+        "get_absolute_duration",
+        autospec=True,
+        side_effect=StudyVisitVO.get_absolute_duration,
+    ) as get_absolute_duration:
+        timeline.update_visit(_visit("v2", "Treatment", GLOBAL_ANCHOR_VISIT_NAME, 35))
+        ordered_visits = timeline.ordered_study_visits
+
+    recomputed_uids = {call.args[0].uid for call in get_absolute_duration.mock_calls}
+    # the baseline visit is not anchored to the updated visit
+    assert "v1" not in recomputed_uids
+    assert [visit.uid for visit in ordered_visits] == ["v1", "v2", "v3", "v4"]
+    assert [visit.study_day.value for visit in ordered_visits] == [1, 36, 43, 50]
+    assert ordered_visits[0] is visits["v1"]
+
+
+def test_add_and_remove_visit():
+    timeline = _timeline()
+    timeline.ordered_study_visits
+    visit = _visit("v5", "Screening", GLOBAL_ANCHOR_VISIT_NAME, -7)
+    timeline.add_visit(visit)
+    assert [visit.uid for visit in timeline.ordered_study_visits] == [
+        "v5",
+        "v1",
+        "v2",
+        "v3",
+        "v4",
+    ]
+    timeline.remove_visit(visit)
+    assert [visit.uid for visit in timeline.ordered_study_visits] == [
+        "v1",
+        "v2",
+        "v3",
+        "v4",
+    ]
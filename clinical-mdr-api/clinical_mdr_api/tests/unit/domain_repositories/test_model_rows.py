@@ -0,0 +1,87 @@
+import re
+
+from clinical_mdr_api.domain_repositories.models import _utils
+from clinical_mdr_api.domain_repositories.models.generic import Library
+from clinical_mdr_api.domain_repositories.models.standard_data_model import (
+    DatasetVariable,
+    HasDatasetVariableRel,
+    SponsorModelDatasetVariableInstance,
+)
+from clinical_mdr_api.models.standard_data_models.sponsor_model_dataset_variable import (
+    SponsorModelDatasetVariable,
+)
+
+
+def _query():
+    return DatasetVariable.nodes.fetch_relations(
+        "has_sponsor_model_instance__has_variable",
+        "has_dataset_variable__has_library",
+    ).order_by("uid")
+
+
+def _values():
+    relation_tree_map = _query().query_cls(_query()).build_ast()._ast.relation_tree_map
+    instance = relation_tree_map["has_sponsor_model_instance"]
+    library = relation_tree_map["has_dataset_variable"]["children"]["has_library"]
+    return {
+        "datasetvariable": DatasetVariable(uid="DatasetVariable_000001"),
+        instance["variable_name"]: SponsorModelDatasetVariableInstance(
+            label="Study Identifier", length=8, qualifiers=["STUDYID"]
+        ),
+        instance["children"]["has_variable"]["rel_variable_name"]: (
+            HasDatasetVariableRel(ordinal="3")
+        ),
+        library["variable_name"]: Library(name="SDTM"),
+    }
+
+
+def test_models_are_built_from_projected_rows(monkeypatch):
+    values = _values()
+    queries = []
+
+    def cypher_query(query, params=None, resolve_objects=False):
+        queries.append((query, resolve_objects))
+        if resolve_objects:
+            columns = re.search(r"RETURN DISTINCT (.*) ORDER BY", query)[1].split(", ")
+            return [[values.get(column) for column in columns]], columns
+        projections = re.findall(r"(\w+)(?:\.(\w+)| IS NOT NULL) AS `(\w+)`", query)
+        row = [
+            getattr(values.get(variable), prop, None) if prop else variable in values
+            for variable, prop, _ in projections
+        ]
+        return [row], [alias for _, _, alias in projections]
+
+    monkeypatch.setattr(_utils.db, "cypher_query", cypher_query)
+
+    expected = [
+        SponsorModelDatasetVariable.from_orm(node)
+        for node in _utils.to_relation_trees(_query())
+    ]
+    models = _utils.to_models(_query(), SponsorModelDatasetVariable)
+
+    assert [model.dict() for model in models] == [model.dict() for model in expected]
+    assert models[0].label == "Study Identifier"
+    assert models[0].order == 3
+    query, resolve_objects = queries[-1]
+    assert not resolve_objects
+    assert "WITH DISTINCT" in query and "RETURN DISTINCT" not in query
+    # Only the properties read by the model are returned
+    assert re.search(r"RETURN \w+\.uid AS `uid`", query)
+    assert ".ordinal AS `order`" in query
+
+
+def test_models_with_nested_models_use_relation_trees(monkeypatch):
+    class VariableWithInstance(SponsorModelDatasetVariable):
+        instance: SponsorModelDatasetVariable | None = None
+
+    values = _values()
+
+    def cypher_query(query, params=None, resolve_objects=False):
+        assert resolve_objects
+        columns = re.search(r"RETURN DISTINCT (.*) ORDER BY", query)[1].split(", ")
+        return [[values.get(column) for column in columns]], columns
+
+    monkeypatch.setattr(_utils.db, "cypher_query", cypher_query)
+
+    [model] = _utils.to_models(_query(), VariableWithInstance)
+    assert model.uid == "DatasetVariable_000001"
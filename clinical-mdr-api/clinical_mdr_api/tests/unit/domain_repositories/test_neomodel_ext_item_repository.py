@@ -0,0 +1,40 @@
+from clinical_mdr_api.domain_repositories.models import _utils
+from clinical_mdr_api.domain_repositories.standard_data_models.sponsor_model_dataset_variable_repository import (
+    SponsorModelDatasetVariableRepository,
+)
+
+
+def test_find_all_counts_in_the_page_query(monkeypatch):
+    queries = []
+
+    def cypher_query(query, params=None, resolve_objects=False):
+        queries.append(query)
+        if query.startswith("CALL {"):
+            # Empty page
+            return [], ["datasetvariable", "_total_count"]
+        return [[25]], ["count"]
+
+    monkeypatch.setattr(_utils.db, "cypher_query", cypher_query)
+    repository = SponsorModelDatasetVariableRepository.__new__(
+        SponsorModelDatasetVariableRepository
+    )
+    items, total = repository.find_all(
+        page_number=4,
+        page_size=10,
+        total_count=True,
+        filter_by={"label": {"v": ["label"], "op": "co"}},
+    )
+
+    # The count row was lost with the empty page, so the count is run again on its own
+    assert items == []
+    assert total == 25
+    fused_query, count_query = queries
+    count_subquery = fused_query[len("CALL {") : fused_query.index("}")]
+    assert "count(DISTINCT datasetvariable) AS _total_count" in count_subquery
+    # The count follows the traversals and filters of the page, without its ordering and pagination
+    for query in (count_subquery, count_query):
+        assert "HAS_INSTANCE" in query
+        assert "HAS_DATASET_VARIABLE" in query
+        assert "=~ $" in query
+        assert "ORDER BY" not in query
+        assert "SKIP" not in query and "LIMIT" not in query
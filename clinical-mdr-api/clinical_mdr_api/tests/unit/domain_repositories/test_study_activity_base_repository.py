@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+
+from clinical_mdr_api.domain_repositories.study_selections import (
+    study_activity_base_repository,
+)
+from clinical_mdr_api.domain_repositories.study_selections.study_activity_base_repository import (
+    StudySelectionActivityBaseRepository,
+)
+from clinical_mdr_api.domain_repositories.study_selections.study_activity_repository import (
+    StudySelectionActivityRepository,
+)
+
+
+def _unchanged_selections(old_orders: list[int]):
+    return [
+        (order, SimpleNamespace(study_selection_uid=f"uid{old_order}"), old_order)
+        for order, old_order in enumerate(old_orders, start=1)
+    ]
+
+
+@pytest.mark.parametrize(
+    "old_orders, expected_moved_uids",
+    [
+        ([1, 2, 3, 4], set()),
+        # last selection moved to the top, the others only shift
+        ([4, 1, 2, 3], {"uid4"}),
+        # first selection moved to the bottom
+        ([2, 3, 4, 1], {"uid1"}),
+        # the third selection was deleted, the others keep their relative order
+        ([1, 2, 4, 5], set()),
+        ([], set()),
+    ],
+)
+def test_get_moved_selection_uids(old_orders, expected_moved_uids):
+    assert (
+        StudySelectionActivityBaseRepository._get_moved_selection_uids(
+            _unchanged_selections(old_orders)
+        )
+        == expected_moved_uids
+    )
+
+
+def test_get_moved_selection_uids_for_swapped_selections():
+    moved_uids = StudySelectionActivityBaseRepository._get_moved_selection_uids(
+        _unchanged_selections([1, 3, 2, 4])
+    )
+    assert moved_uids in ({"uid2"}, {"uid3"})
+
+
+def test_update_selection_orders_keeps_the_order_of_the_audit_entries(monkeypatch):
+    queries = []
+
+    def cypher_query(query, params):
+        queries.append((query, params))
+        return [["uid2"]], ["selection.uid"]
+
+    monkeypatch.setattr(study_activity_base_repository.db, "cypher_query", cypher_query)
+
+    updated_uids = StudySelectionActivityBaseRepository._update_selection_orders(
+        "Study_000001", {"uid2": 3}
+    )
+
+    assert updated_uids == {"uid2"}
+    query, params = queries[0]
+    assert params["orders"] == [{"uid": "uid2", "order": 3}]
+    # The order in effect is kept on the AFTER relationship before the selection is shifted
+    keep_order = "SET after.order = coalesce(after.order, selection.order)"
+    assert keep_order in query
+    assert query.index(keep_order) < query.index("SET selection.order = row.order")
+
+
+def test_activity_audit_trail_returns_the_order_of_the_audit_entry():
+    for study_selection_uid in ("StudyActivity_000001", None):
+        query = StudySelectionActivityRepository().get_audit_trail_query(
+            study_selection_uid
+        )
+        assert "MATCH (all_sa)<-[after:AFTER]-(asa:StudyAction)" in query
+        assert "coalesce(after.order, all_sa.order) AS activity_order" in query
@@ -2,6 +2,7 @@ import copy
 import random
 import unittest
 from dataclasses import dataclass, field
+from datetime import datetime
 from typing import AbstractSet, Any, Callable, Generic, TypeVar, cast
 from unittest.mock import patch
 
@@ -229,8 +230,15 @@ class StudyDefinitionRepositoryFake(StudyDefinitionRepository):
         return random_str()
 
     def _retrieve_fields_audit_trail(
-        self, uid: str
-    ) -> list[StudyFieldAuditTrailEntryAR] | None:
+        self,
+        uid: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        user_initials: str | None = None,
+        fields: list[str] | None = None,
+        page_size: int = 0,
+        page_token: str | None = None,
+    ) -> tuple[list[StudyFieldAuditTrailEntryAR] | None, str | None]:
         raise NotImplementedError("Study fields audit trail is not yet mocked.")
 
     def _retrieve_study_subpart_with_history(
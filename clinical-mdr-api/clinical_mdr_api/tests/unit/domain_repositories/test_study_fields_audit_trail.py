@@ -0,0 +1,117 @@
+from datetime import datetime, timezone
+
+import pytest
+from neo4j.time import DateTime
+
+from clinical_mdr_api import exceptions
+from clinical_mdr_api.domain_repositories._utils import helpers
+from clinical_mdr_api.domain_repositories.study_definitions import (
+    study_definition_repository_impl,
+)
+from clinical_mdr_api.domain_repositories.study_definitions.study_definition_repository_impl import (
+    StudyDefinitionRepositoryImpl,
+)
+
+
+def test_study_action_filter():
+    assert helpers.study_action_filter("action") == ("", {})
+
+    start_date = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    end_date = datetime(2023, 2, 1, tzinfo=timezone.utc)
+    clause, params = helpers.study_action_filter(
+        "asa", start_date=start_date, end_date=end_date, user_initials="TODO"
+    )
+    assert clause == (
+        "WHERE asa.date >= $asa_start_date AND asa.date <= $asa_end_date"
+        " AND asa.user_initials = $asa_user_initials"
+    )
+    assert params == {
+        "asa_start_date": start_date,
+        "asa_end_date": end_date,
+        "asa_user_initials": "TODO",
+    }
+
+
+def test_fields_audit_trail_pages(monkeypatch):
+    dates = [
+        DateTime.from_native(datetime(2023, 1, day, tzinfo=timezone.utc))
+        for day in (5, 4, 3)
+    ]
+    queries = []
+
+    def cypher_query(query, params):
+        queries.append((query, params))
+        if "RETURN DISTINCT action.date" in query:
+            before_date = params.get("action_before_date")
+            page = [_d for _d in dates if before_date is None or _d < before_date]
+            return [[_d] for _d in page[: params["page_size"]]], ["date"]
+        return [], []
+
+    monkeypatch.setattr(
+        study_definition_repository_impl.db, "cypher_query", cypher_query
+    )
+    repository = StudyDefinitionRepositoryImpl("TODO")
+
+    _, page_token = repository.get_audit_trail_page_by_uid("Study_000001", page_size=2)
+    assert page_token is not None
+    assert queries[-1][1]["page_dates"] == dates[:2]
+
+    _, page_token = repository.get_audit_trail_page_by_uid(
+        "Study_000001", page_size=2, page_token=page_token
+    )
+    assert page_token is None
+    assert queries[-1][1]["page_dates"] == dates[2:]
+
+    with pytest.raises(exceptions.ValidationException):
+        repository.get_audit_trail_page_by_uid(
+            "Study_000001", page_size=2, page_token="invalid"
+        )
+
+
+def test_study_selection_audit_trail_relationship():
+    assert helpers.study_selection_audit_trail_relationship("") == ":BEFORE|AFTER"
+    clause, _ = helpers.study_action_filter("asa", user_initials="TODO")
+    assert helpers.study_selection_audit_trail_relationship(clause) == ":AFTER"
+
+
+def test_study_selection_audit_trail_pages(monkeypatch):
+    dates = [
+        DateTime.from_native(datetime(2023, 1, day, tzinfo=timezone.utc))
+        for day in (5, 4, 3)
+    ]
+    queries = []
+
+    def cypher_query(query, params):
+        queries.append((query, params))
+        before_date = params.get("asa_before_date")
+        page = [_d for _d in dates if before_date is None or _d < before_date]
+        return [[_d] for _d in page[: params["page_size"]]], ["date"]
+
+    monkeypatch.setattr(helpers.db, "cypher_query", cypher_query)
+
+    clause, params, page_token = helpers.study_selection_action_filter(
+        "StudyObjective", "Study_000001", user_initials="TODO", page_size=2
+    )
+    assert "(asa:StudyAction)-[:AFTER]->(:StudyObjective)" in queries[-1][0]
+    assert clause == (
+        "WHERE asa.user_initials = $asa_user_initials AND asa.date IN $page_dates"
+    )
+    assert params == {"asa_user_initials": "TODO", "page_dates": dates[:2]}
+    assert page_token is not None
+
+    clause, params, page_token = helpers.study_selection_action_filter(
+        "StudyObjective", "Study_000001", page_size=2, page_token=page_token
+    )
+    assert clause == "WHERE asa.date IN $page_dates"
+    assert params == {"page_dates": dates[2:]}
+    assert page_token is None
+
+    dates.clear()
+    assert helpers.study_selection_action_filter(
+        "StudyObjective", "Study_000001", page_size=2
+    ) == (None, {}, None)
+
+    with pytest.raises(exceptions.ValidationException):
+        helpers.study_selection_action_filter(
+            "StudyObjective", "Study_000001", page_token="invalid"
+        )
@@ -0,0 +1,257 @@
+import os
+import pickle
+import socket
+import tempfile
+import time
+
+import pytest
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+
+from clinical_mdr_api.repositories._cache import (
+    MAX_MESSAGE_SIZE,
+    SharedTTLCache,
+    UnixSocketCacheInvalidationBus,
+    _apply_invalidation,
+    clear_cache,
+)
+from clinical_mdr_api.repositories._utils import sb_clear_cache
+
+
+def _wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class _Item:
+    def __init__(self, uid):
+        self.uid = uid
+
+
+class _Repository:
+    cache_store_item_by_uid = SharedTTLCache(
+        name="test_repository.cache_store_item_by_uid", maxsize=3, ttl=60
+    )
+
+    @cached(
+        cache=cache_store_item_by_uid,
+        key=lambda self, uid: hashkey(str(type(self)), uid),
+        lock=cache_store_item_by_uid.lock,
+    )
+    def find_by_uid(self, uid: str):
+        return _Item(uid)
+
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"], uids=lambda self, item: [item.uid]
+    )
+    def save(self, item):
+        self._save_value(item)
+
+    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    def _save_value(self, item):
+        pass
+
+    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    def delete_all(self):
+        pass
+
+
+def test_shared_cache_invalidation():
+    cache = SharedTTLCache(name="test_shared_cache", maxsize=10, ttl=60)
+    cache[hashkey("type", "uid_1", None)] = _Item("uid_1")
+    cache[hashkey("type", "uid_1", "1.0")] = _Item("uid_1")
+    # Linked version, cached by its own id
+    cache[hashkey("type", "element_id")] = _Item("uid_1")
+    cache[hashkey("type", "uid_2", None)] = _Item("uid_2")
+    cache.invalidate(["uid_1"])
+    assert list(cache.keys()) == [hashkey("type", "uid_2", None)]
+    assert cache.invalidations == 3
+    clear_cache(cache)
+    assert cache.currsize == 0
+
+    plain_cache = TTLCache(maxsize=10, ttl=60)
+    plain_cache["a"] = 1
+    clear_cache(plain_cache)
+    assert plain_cache.currsize == 0
+
+
+def test_shared_cache_invalidation_evicts_dependants():
+    cache = SharedTTLCache(name="test_shared_cache_dependants", maxsize=10, ttl=60)
+    other_cache = SharedTTLCache(
+        name="test_shared_cache_other_dependants", maxsize=10, ttl=60
+    )
+    instance = _Item("instance_1")
+    instance.concept_vo = {
+        "activity_instance_class_uid": "class_1",
+        "activity_groupings": [_Item("grouping_1")],
+    }
+    cache[hashkey("type", "instance_1", None)] = instance
+    cache[hashkey("type", "class_1", None)] = _Item("class_1")
+    other_cache[hashkey("type", "other_1", None)] = instance
+    cache[hashkey("type", "uid_2", None)] = _Item("uid_2")
+
+    # Writing the class evicts the instances embedding its name, in all the shared caches
+    cache.invalidate(["class_1"])
+    assert list(cache.keys()) == [hashkey("type", "uid_2", None)]
+    assert other_cache.currsize == 0
+
+    cache[hashkey("type", "instance_1", None)] = instance
+    cache.invalidate(["grouping_1"])
+    assert list(cache.keys()) == [hashkey("type", "uid_2", None)]
+
+
+def test_cache_statistics():
+    cache = SharedTTLCache(name="test_cache_statistics", maxsize=2, ttl=60)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1
+    with pytest.raises(KeyError):
+        cache["c"]  # pylint: disable=pointless-statement
+    cache["c"] = 3
+    cache.pop("c")
+    cache.clear()
+    statistics = cache.get_statistics()
+    assert statistics["hits"] == 1
+    assert statistics["misses"] == 1
+    assert statistics["evictions"] == 1
+    assert statistics["size"] == 0
+
+
+def test_sb_clear_cache_evicts_written_uids():
+    repository = _Repository()
+    cache = _Repository.cache_store_item_by_uid
+    cache.clear()
+    repository.find_by_uid("uid_1")
+    repository.find_by_uid("uid_2")
+
+    # Nested writes without uids don't clear the whole cache
+    repository.save(_Item("uid_1"))
+    assert [key[1] for key in cache.keys()] == ["uid_2"]
+
+    repository.find_by_uid("uid_1")
+    repository.save(_Item(None))
+    assert cache.currsize == 0
+
+    repository.find_by_uid("uid_1")
+    repository.delete_all()
+    assert cache.currsize == 0
+
+
+def test_unix_socket_bus():
+    with tempfile.TemporaryDirectory() as directory:
+        directory = os.path.join(directory, "bus")
+        received = []
+        sender = UnixSocketCacheInvalidationBus(directory)
+        receiver = UnixSocketCacheInvalidationBus(directory)
+        sender.start(lambda name, uids: None)
+        receiver.start(lambda name, uids: received.append((name, uids)))
+        try:
+            assert os.stat(directory).st_mode & 0o077 == 0
+
+            # A socket left behind by a dead worker is removed on publish
+            stale_path = os.path.join(directory, "0-stale.sock")
+            stale = UnixSocketCacheInvalidationBus(directory)
+            stale.path = stale_path
+            stale.start(lambda name, uids: None)
+            stale._socket.close()  # pylint: disable=protected-access
+
+            sender.publish("some_cache", ["uid_1", "uid_2"])
+            sender.publish("some_cache", None)
+            assert _wait_for(lambda: len(received) == 2)
+            assert received == [
+                ("some_cache", ["uid_1", "uid_2"]),
+                ("some_cache", None),
+            ]
+            assert not os.path.exists(stale_path)
+        finally:
+            sender.close()
+            receiver.close()
+        assert not os.path.exists(receiver.path)
+
+
+def test_unix_socket_bus_large_message():
+    with tempfile.TemporaryDirectory() as directory:
+        directory = os.path.join(directory, "bus")
+        received = []
+        sender = UnixSocketCacheInvalidationBus(directory)
+        receiver = UnixSocketCacheInvalidationBus(directory)
+        sender.start(lambda name, uids: None)
+        receiver.start(lambda name, uids: received.append((name, uids)))
+        try:
+            uids = [f"ActivityInstance_{i:06}" for i in range(10000)]
+            assert len(pickle.dumps(uids)) > MAX_MESSAGE_SIZE
+
+            sender.publish("some_cache", uids)
+            assert _wait_for(
+                lambda: sum(len(message[1]) for message in received) == len(uids)
+            )
+            assert len(received) > 1
+            assert all(name == "some_cache" for name, _ in received)
+            assert [uid for _, chunk in received for uid in chunk] == uids
+
+            # A uid too large to be sent clears all the caches instead
+            received.clear()
+            sender.publish("some_cache", ["x" * MAX_MESSAGE_SIZE])
+            assert _wait_for(lambda: len(received) == 1)
+            assert received == [(None, None)]
+        finally:
+            sender.close()
+            receiver.close()
+
+
+def test_unix_socket_bus_full_queue():
+    with tempfile.TemporaryDirectory() as directory:
+        directory = os.path.join(directory, "bus")
+        sender = UnixSocketCacheInvalidationBus(directory)
+        sender.start(lambda name, uids: None)
+        # A worker that doesn't read its messages
+        path = os.path.join(directory, "0-busy.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as busy:
+            busy.bind(path)
+            try:
+                uids = [f"uid_{i}" for i in range(1000)]
+                started = time.monotonic()
+                for _ in range(1000):
+                    sender.publish("some_cache", uids)
+                    if path in sender._stale_peers:  # pylint: disable=protected-access
+                        break
+                # Publishing doesn't block on the full queue
+                assert time.monotonic() - started < 5
+                assert path in sender._stale_peers  # pylint: disable=protected-access
+
+                busy.setblocking(False)
+                try:
+                    while True:
+                        busy.recv(MAX_MESSAGE_SIZE)
+                except BlockingIOError:
+                    pass
+
+                # The next message clears all the caches of the worker
+                sender.publish("some_cache", ["uid_1"])
+                assert pickle.loads(busy.recv(MAX_MESSAGE_SIZE)) == (None, None)
+                assert (
+                    path not in sender._stale_peers  # pylint: disable=protected-access
+                )
+                sender.publish("some_cache", ["uid_1"])
+                assert pickle.loads(busy.recv(MAX_MESSAGE_SIZE)) == (
+                    "some_cache",
+                    ["uid_1"],
+                )
+            finally:
+                sender.close()
+
+
+def test_apply_invalidation_clear_all():
+    cache = SharedTTLCache(name="test_clear_all_cache", maxsize=10, ttl=60)
+    other_cache = SharedTTLCache(name="test_clear_all_other_cache", maxsize=10, ttl=60)
+    cache["key"] = "value"
+    other_cache["other_key"] = "value"
+
+    _apply_invalidation(None, None)
+
+    assert cache.currsize == 0
+    assert other_cache.currsize == 0
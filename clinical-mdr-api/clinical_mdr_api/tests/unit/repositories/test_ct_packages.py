@@ -0,0 +1,244 @@
+from datetime import datetime, timezone
+
+import pytest
+from neo4j.time import DateTime
+
+from clinical_mdr_api.repositories import ct_packages
+from clinical_mdr_api.repositories.ct_packages import (
+    PACKAGE_CODELISTS_DATA_RETRIEVAL,
+    PACKAGE_STEP_LOCK,
+    PACKAGE_STEP_SAVE,
+    PACKAGE_STEPS_RETRIEVAL,
+    PACKAGE_TERMS_DATA_RETRIEVAL,
+    TERM_CODELISTS_RETRIEVAL,
+    are_terms_different,
+    compose_package_changes,
+    diff_package_items,
+    diff_packages,
+    dump_package_changes,
+    get_ct_packages_changes,
+    load_package_changes,
+    store_package_steps,
+)
+
+
+def _term(uid: str, preferred_term: str, day: int = 1) -> dict:
+    return {
+        "uid": uid,
+        "value_node": {
+            "concept_id": uid,
+            "preferred_term": preferred_term,
+            "synonyms": None,
+            "code_submission_value": uid,
+            "name_submission_value": uid,
+            "definition": "",
+        },
+        "change_date": DateTime.from_native(
+            datetime(2023, 1, day, tzinfo=timezone.utc)
+        ),
+        "codelists": ["C1"],
+    }
+
+
+def _compare(packages: list[dict]) -> dict:
+    steps = [
+        diff_package_items(old, new, are_terms_different)
+        for old, new in zip(packages, packages[1:])
+    ]
+    return compose_package_changes(steps, are_terms_different)
+
+
+def _uids(changes: dict) -> dict:
+    return {
+        "new": sorted(item["uid"] for item in changes["new"]),
+        "deleted": sorted(item["uid"] for item in changes["deleted"]),
+        "updated": sorted(old["uid"] for old, _ in changes["updated"]),
+    }
+
+
+def test_composed_changes_match_direct_comparison():
+    packages = [
+        {
+            "T1": _term("T1", "one"),
+            "T2": _term("T2", "two"),
+            "T3": _term("T3", "three"),
+            "T4": _term("T4", "four"),
+        },
+        {
+            # T1 updated, T2 deleted, T5 added
+            "T1": _term("T1", "one updated", day=2),
+            "T3": _term("T3", "three"),
+            "T4": _term("T4", "four"),
+            "T5": _term("T5", "five", day=2),
+        },
+        {
+            # T2 added again, T4 deleted, T5 deleted
+            "T1": _term("T1", "one updated", day=2),
+            "T2": _term("T2", "two"),
+            "T3": _term("T3", "three"),
+        },
+        {
+            # T1 updated again, T3 updated and reverted below, T6 added
+            "T1": _term("T1", "one updated twice", day=4),
+            "T2": _term("T2", "two"),
+            "T3": _term("T3", "three updated", day=4),
+            "T6": _term("T6", "six", day=4),
+        },
+        {
+            "T1": _term("T1", "one updated twice", day=4),
+            "T2": _term("T2", "two"),
+            "T3": _term("T3", "three"),
+            "T6": _term("T6", "six", day=4),
+        },
+    ]
+
+    for first in range(len(packages)):
+        for last in range(first, len(packages)):
+            composed = _compare(packages[first : last + 1])
+            direct = diff_package_items(
+                packages[first], packages[last], are_terms_different
+            )
+            assert _uids(composed) == _uids(direct)
+
+    composed = _compare(packages)
+    assert _uids(composed) == {"new": ["T6"], "deleted": ["T4"], "updated": ["T1"]}
+    [(old_term, new_term)] = composed["updated"]
+    assert old_term["value_node"]["preferred_term"] == "one"
+    assert new_term["value_node"]["preferred_term"] == "one updated twice"
+
+
+def test_stored_changes_round_trip():
+    changes = {
+        "terms": diff_package_items(
+            {"T1": _term("T1", "one"), "T2": _term("T2", "two")},
+            {"T1": _term("T1", "one updated", day=2), "T3": _term("T3", "three")},
+            are_terms_different,
+        )
+    }
+
+    loaded = load_package_changes(dump_package_changes(changes))
+
+    assert loaded == changes
+    assert isinstance(loaded["terms"]["new"][0]["change_date"], DateTime)
+
+
+PACKAGES = {
+    "P1": {"T1": _term("T1", "one"), "T2": _term("T2", "two")},
+    "P2": {"T1": _term("T1", "one updated", day=2), "T2": _term("T2", "two")},
+    "P3": {"T1": _term("T1", "one updated", day=2), "T3": _term("T3", "three")},
+}
+
+
+@pytest.fixture(name="queries")
+def fixture_queries(monkeypatch):
+    """
+    Answers the queries of the package comparisons from PACKAGES,
+    the changes between the consecutive packages are stored in `stored_steps`.
+    Returns the list of the queries run, with their parameters.
+    """
+    queries = []
+    stored_steps = {}
+
+    def cypher_query(query, params=None):
+        queries.append((query, params))
+        if query == PACKAGE_STEPS_RETRIEVAL:
+            names = sorted(PACKAGES)
+            names = names[
+                names.index(params["old_package_name"]) : names.index(
+                    params["new_package_name"]
+                )
+                + 1
+            ]
+            return [
+                [old_name, new_name, stored_steps.get((old_name, new_name))]
+                for old_name, new_name in zip(names, names[1:])
+            ], None
+        if query == PACKAGE_STEP_LOCK:
+            pair = (params["old_package_name"], params["new_package_name"])
+            return [[pair in stored_steps]], None
+        if query == PACKAGE_STEP_SAVE:
+            pair = (params["old_package_name"], params["new_package_name"])
+            stored_steps[pair] = params["changes"]
+            return [], None
+        if query == PACKAGE_CODELISTS_DATA_RETRIEVAL:
+            return [[{}]], None
+        if query == PACKAGE_TERMS_DATA_RETRIEVAL:
+            return [[PACKAGES[params["package_name"]]]], None
+        if query == TERM_CODELISTS_RETRIEVAL:
+            return [[uid, ["C1"]] for uid in params["term_uids"]], None
+        raise AssertionError(f"Unexpected query {query}")
+
+    monkeypatch.setattr(ct_packages.db, "cypher_query", cypher_query)
+    monkeypatch.setattr(ct_packages.db, "url", "bolt://test")
+    for method in ("begin", "commit", "rollback"):
+        monkeypatch.setattr(ct_packages.db, method, lambda *args, **kwargs: None)
+    return queries
+
+
+def _loaded_packages(queries: list) -> list[str]:
+    return [
+        params["package_name"]
+        for query, params in queries
+        if query == PACKAGE_TERMS_DATA_RETRIEVAL
+    ]
+
+
+def test_missing_steps_compare_packages_directly(queries):
+    changes = get_ct_packages_changes("P1", "P3")
+
+    assert not [query for query, _ in queries if query == PACKAGE_STEP_SAVE]
+    assert _loaded_packages(queries) == ["P1", "P3"]
+    assert [term["uid"] for term in changes["new_terms"]] == ["T3"]
+    assert [term["uid"] for term in changes["deleted_terms"]] == ["T2"]
+    assert [term["uid"] for term in changes["updated_terms"]] == ["T1"]
+
+
+def test_stored_steps_are_composed(queries):
+    assert store_package_steps("P1", "P3") == [("P1", "P2"), ("P2", "P3")]
+    # Each package is loaded once, and the stored changes are not computed again
+    assert _loaded_packages(queries) == ["P1", "P2", "P3"]
+    assert not store_package_steps("P1", "P3")
+    queries.clear()
+
+    changes = get_ct_packages_changes("P1", "P3")
+
+    assert not _loaded_packages(queries)
+    assert [term["uid"] for term in changes["new_terms"]] == ["T3"]
+    assert [term["uid"] for term in changes["deleted_terms"]] == ["T2"]
+    assert [term["uid"] for term in changes["updated_terms"]] == ["T1"]
+
+
+def test_steps_stored_concurrently_are_not_stored_again(queries, monkeypatch):
+    # The changes between P1 and P2 are stored by another call after the pairs were read,
+    # they are found once the packages are locked
+    lock_results = iter([[[True]], [[False]]])
+    cypher_query = ct_packages.db.cypher_query
+
+    def locking_cypher_query(query, params=None):
+        if query == PACKAGE_STEP_LOCK:
+            queries.append((query, params))
+            return next(lock_results), None
+        return cypher_query(query, params)
+
+    monkeypatch.setattr(ct_packages.db, "cypher_query", locking_cypher_query)
+
+    assert store_package_steps("P1", "P3") == [("P2", "P3")]
+    assert [
+        (params["old_package_name"], params["new_package_name"])
+        for query, params in queries
+        if query == PACKAGE_STEP_SAVE
+    ] == [("P2", "P3")]
+
+
+def test_diff_packages():
+    changes = diff_packages(
+        {"codelists": {}, "terms": PACKAGES["P1"]},
+        {"codelists": {}, "terms": PACKAGES["P3"]},
+    )
+
+    assert changes["codelists"] == {"new": [], "deleted": [], "updated": []}
+    assert _uids(changes["terms"]) == {
+        "new": ["T3"],
+        "deleted": ["T2"],
+        "updated": ["T1"],
+    }
@@ -0,0 +1,189 @@
+from unittest.mock import patch
+
+import pytest
+
+from clinical_mdr_api import exceptions
+from clinical_mdr_api.repositories._utils import (
+    CountStrategy,
+    CypherQueryBuilder,
+    FilterDict,
+    ItemsPage,
+    count_cache,
+    decode_page_token,
+    encode_page_token,
+)
+
+
+def _query_builder(**kwargs) -> CypherQueryBuilder:
+    kwargs.setdefault("page_size", 2)
+    return CypherQueryBuilder(
+        match_clause="MATCH (n:Node)",
+        alias_clause="n.uid AS uid, n.name AS name",
+        implicit_sort_by="uid",
+        **kwargs,
+    )
+
+
+def test_page_token_roundtrip():
+    token = encode_page_token([["name", True], ["uid", True]], ["Name", "uid_1"])
+    assert decode_page_token(token) == {
+        "s": [["name", True], ["uid", True]],
+        "v": ["Name", "uid_1"],
+    }
+
+
+def test_invalid_page_token():
+    with pytest.raises(exceptions.ValidationException):
+        decode_page_token("not a token")
+
+
+def test_next_page_token_only_for_full_page():
+    query = _query_builder(sort_by={"name": False})
+    rows = [["uid_1", "B"], ["uid_2", "A"]]
+    token = query.get_next_page_token(rows, ["uid", "name"])
+    assert decode_page_token(token) == {
+        "s": [["name", False], ["uid", True]],
+        "v": ["A", "uid_2"],
+    }
+    assert query.get_next_page_token(rows[:1], ["uid", "name"]) is None
+    assert (
+        _query_builder(page_size=0).get_next_page_token(rows, ["uid", "name"]) is None
+    )
+
+
+def test_default_sort_is_not_added_without_page_token():
+    query = _query_builder()
+    assert query.sort_clause == ""
+    assert "ORDER BY" not in query.full_query
+    assert (
+        query.get_next_page_token([["uid_1", "B"], ["uid_2", "A"]], ["uid", "name"])
+        is None
+    )
+
+
+def test_next_page_token_for_default_sort():
+    query = _query_builder(page_token="")
+    assert query.sort_clause == "ORDER BY uid ASC"
+    assert query.keyset_clause == ""
+    assert "SKIP $page_number * $page_size" in query.full_query
+    token = query.get_next_page_token([["uid_1", "B"], ["uid_2", "A"]], ["uid", "name"])
+    assert decode_page_token(token) == {"s": [["uid", True]], "v": ["uid_2"]}
+
+
+def test_next_page_token_for_size_sort_key():
+    query = _query_builder(sort_by={"size(name)": True})
+    token = query.get_next_page_token(
+        [["uid_1", "B"], ["uid_2", "AB"]], ["uid", "name"]
+    )
+    assert decode_page_token(token)["v"] == [2, "uid_2"]
+
+
+def test_items_page_unpacks_as_items_and_total():
+    page = ItemsPage(["item"], 1, next_page_token="token")
+    items, total = page
+    assert (items, total, page.next_page_token) == (["item"], 1, "token")
+
+
+def test_keyset_pagination_query():
+    token = encode_page_token([["name", False], ["uid", True]], ["A", "uid_2"])
+    query = _query_builder(
+        sort_by={"name": False},
+        page_token=token,
+        filter_by=FilterDict(elements={"name": {"v": ["A"], "op": "ne"}}),
+    )
+    assert "SKIP" not in query.full_query
+    assert "LIMIT $page_size" in query.full_query
+    assert (
+        "WHERE (name<>$name_0) AND ((name < $keyset_0) OR (name = $keyset_0 AND "
+        "(uid > $keyset_1 OR uid IS NULL)))" in query.full_query
+    )
+    assert "ORDER BY name DESC,uid ASC" in query.full_query
+    assert query.parameters["keyset_0"] == "A"
+    assert query.parameters["keyset_1"] == "uid_2"
+    assert "keyset" not in query.count_query
+
+
+def test_keyset_pagination_null_values():
+    token = encode_page_token([["name", True], ["uid", True]], [None, "uid_2"])
+    query = _query_builder(sort_by={"name": True}, page_token=token)
+    assert (
+        "WHERE ((name IS NULL AND (uid > $keyset_1 OR uid IS NULL)))"
+        in query.full_query
+    )
+
+
+def test_page_token_for_other_sort_is_rejected():
+    token = encode_page_token([["name", True], ["uid", True]], ["A", "uid_2"])
+    with pytest.raises(exceptions.ValidationException):
+        _query_builder(sort_by={"name": False}, page_token=token)
+
+
+def test_count_strategy_from_str():
+    assert CountStrategy.from_str(None) == CountStrategy.EXACT
+    assert CountStrategy.from_str("Fused") == CountStrategy.FUSED
+    with pytest.raises(exceptions.ValidationException):
+        CountStrategy.from_str("approximate")
+
+
+@patch("clinical_mdr_api.repositories._utils.db.cypher_query")
+def test_fused_count(cypher_query):
+    cypher_query.return_value = (
+        [[5, "uid_1", "A"], [5, "uid_2", "B"]],
+        ["_total_count", "uid", "name"],
+    )
+    query = _query_builder(total_count=True, count_strategy=CountStrategy.FUSED)
+    result_array, attributes_names = query.execute()
+    assert result_array == [["uid_1", "A"], ["uid_2", "B"]]
+    assert attributes_names == ["uid", "name"]
+    assert query.get_total_count() == 5
+    assert query.used_count_strategy == CountStrategy.FUSED
+    assert cypher_query.call_count == 1
+    fused_query = cypher_query.call_args.kwargs["query"]
+    assert fused_query.startswith("CALL {")
+    assert "RETURN count(*) AS _total_count" in fused_query
+
+
+@patch("clinical_mdr_api.repositories._utils.db.cypher_query")
+def test_cached_count(cypher_query):
+    cypher_query.return_value = ([[7]], ["total_count"])
+    count_cache.clear()
+    for page_number in (1, 2):
+        query = _query_builder(
+            total_count=True,
+            count_strategy=CountStrategy.CACHED,
+            page_number=page_number,
+        )
+        assert query.get_total_count() == 7
+        assert query.used_count_strategy == CountStrategy.CACHED
+    assert cypher_query.call_count == 1
+
+    query = _query_builder(
+        total_count=True,
+        count_strategy=CountStrategy.CACHED,
+        filter_by=FilterDict(elements={"name": {"v": ["A"], "op": "eq"}}),
+    )
+    query.get_total_count()
+    assert cypher_query.call_count == 2
+
+
+@patch("clinical_mdr_api.repositories._utils.db.cypher_query")
+def test_estimated_count(cypher_query):
+    cypher_query.return_value = ([[42]], ["count(*)"])
+    query = _query_builder(
+        total_count=True,
+        count_strategy=CountStrategy.ESTIMATED,
+        count_pattern="(:Node)",
+    )
+    assert query.get_total_count() == 42
+    assert query.used_count_strategy == CountStrategy.ESTIMATED
+    assert cypher_query.call_args.kwargs["query"] == "MATCH (:Node) RETURN count(*)"
+
+    query = _query_builder(
+        total_count=True,
+        count_strategy=CountStrategy.ESTIMATED,
+        count_pattern="(:Node)",
+        filter_by=FilterDict(elements={"name": {"v": ["A"], "op": "eq"}}),
+    )
+    query.get_total_count()
+    assert query.used_count_strategy == CountStrategy.EXACT
+    assert cypher_query.call_args.kwargs["query"] == query.count_query
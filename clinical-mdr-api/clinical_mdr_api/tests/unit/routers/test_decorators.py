@@ -0,0 +1,199 @@
+import asyncio
+import csv
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+from dict2xml import dict2xml
+from openpyxl import load_workbook
+
+from clinical_mdr_api.models.utils import CustomPage, GenericFilteringReturn
+from clinical_mdr_api.routers import decorators
+
+HEADERS = ["uid", "display_name=name"]
+ITEMS = [{"uid": f"uid_{i}", "name": f"Name {i}"} for i in range(25)]
+
+
+def _read(response) -> bytes:
+    async def read_chunks():
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(read_chunks())
+    return b"".join(
+        chunk.encode("utf-8") if isinstance(chunk, str) else chunk for chunk in chunks
+    )
+
+
+def _request(accept: str):
+    request = MagicMock()
+    request.headers = {"accept": accept}
+    return request
+
+
+def test_export_to_csv():
+    response = decorators.export("text/csv", ITEMS, {"defaults": HEADERS})
+    rows = list(csv.reader(io.StringIO(_read(response).decode("utf-8"))))
+    assert rows[0] == ["uid", "display_name"]
+    assert rows[1:] == [[item["uid"], item["name"]] for item in ITEMS]
+
+
+def test_export_to_xlsx():
+    response = decorators.export(
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        ITEMS,
+        {"defaults": HEADERS},
+    )
+    worksheet = load_workbook(io.BytesIO(_read(response))).active
+    rows = [list(row) for row in worksheet.iter_rows(values_only=True)]
+    assert rows[0] == ["uid", "display_name"]
+    assert rows[1:] == [[item["uid"], item["name"]] for item in ITEMS]
+
+
+def test_export_to_xml():
+    response = decorators.export("text/xml", ITEMS, {"defaults": HEADERS})
+    expected = dict2xml(
+        {
+            "item": [
+                {"uid": item["uid"], "display_name": item["name"]} for item in ITEMS
+            ]
+        },
+        wrap="items",
+        indent="  ",
+    )
+    assert _read(response).decode("utf-8") == expected
+
+    response = decorators.export("text/xml", [], {"defaults": HEADERS})
+    assert _read(response).decode("utf-8") == dict2xml(
+        {"item": []}, wrap="items", indent="  "
+    )
+
+
+def _get_page(items, page_number, page_size, page_token):
+    """Pages the items like an endpoint paginated in the database, with uid page tokens."""
+    start = (page_number - 1) * page_size
+    if page_token:
+        start = [item["uid"] for item in items].index(page_token) + 1
+    page = items[start : start + page_size]
+    next_page_token = None
+    if page_token is not None and len(page) == page_size:
+        next_page_token = page[-1]["uid"]
+    return CustomPage.create(
+        items=page,
+        total=0,
+        page=page_number,
+        size=page_size,
+        next_page_token=next_page_token,
+    )
+
+
+@patch.object(decorators.config, "EXPORT_BATCH_SIZE", 10)
+@patch.object(decorators, "EXPORT_CHUNK_ROWS", 5)
+def test_allow_exports_fetches_batches():
+    calls = []
+
+    @decorators.allow_exports(
+        {"defaults": HEADERS, "formats": ["text/csv"]}, batch_with_page_token=True
+    )
+    def get_items(
+        request,
+        page_number: int,
+        page_size: int,
+        total_count: bool,
+        page_token: str | None = None,
+    ):
+        calls.append((page_number, page_size, total_count, page_token))
+        return _get_page(ITEMS, page_number, page_size, page_token)
+
+    response = get_items(
+        request=_request("text/csv"), page_number=1, page_size=0, total_count=True
+    )
+    # Only the first batch is fetched before streaming
+    assert calls == [(1, 10, False, "")]
+    rows = list(csv.reader(io.StringIO(_read(response).decode("utf-8"))))
+    assert rows[1:] == [[item["uid"], item["name"]] for item in ITEMS]
+    # The following batches are fetched with the token of the previous one
+    assert calls == [
+        (1, 10, False, ""),
+        (1, 10, False, "uid_9"),
+        (1, 10, False, "uid_19"),
+    ]
+
+
+@patch.object(decorators.config, "EXPORT_BATCH_SIZE", 10)
+@patch.object(decorators, "EXPORT_CHUNK_ROWS", 5)
+def test_allow_exports_failed_batch_is_reported():
+    @decorators.allow_exports(
+        {
+            "defaults": HEADERS,
+            "formats": [
+                "text/csv",
+                "text/xml",
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            ],
+        },
+        batch_with_page_token=True,
+    )
+    def get_items(request, page_number: int, page_size: int, page_token=None):
+        if page_token:
+            raise RuntimeError("Database unavailable")
+        return _get_page(ITEMS, page_number, page_size, page_token)
+
+    for accept, marker in decorators.EXPORT_ERROR_MARKERS.items():
+        response = get_items(request=_request(accept), page_number=1, page_size=0)
+        chunks = []
+
+        async def read_chunks(response=response):
+            async for chunk in response.body_iterator:
+                chunks.append(chunk)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(read_chunks())
+        # The export is aborted after a marker telling that it is incomplete
+        assert chunks[-1] == marker
+        assert "uid_8" in "".join(chunks)
+
+    # Errors before the response is started are returned as such
+    with pytest.raises(RuntimeError):
+        get_items(
+            request=_request(
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            ),
+            page_number=1,
+            page_size=0,
+        )
+
+
+@patch.object(decorators.config, "EXPORT_BATCH_SIZE", 10)
+def test_allow_exports_fetches_all_items_of_other_endpoints():
+    calls = []
+
+    @decorators.allow_exports({"defaults": HEADERS, "formats": ["text/csv"]})
+    def get_items(request, page_number: int, page_size: int, page_token=None):
+        calls.append((page_number, page_size, page_token))
+        items = ITEMS[:page_size] if page_size else ITEMS
+        return GenericFilteringReturn.create(items=items, total=len(ITEMS))
+
+    response = get_items(request=_request("text/csv"), page_number=1, page_size=0)
+    # Endpoints filtering in memory are not fetched in batches
+    assert calls == [(1, 0, None)]
+    rows = list(csv.reader(io.StringIO(_read(response).decode("utf-8"))))
+    assert len(rows) == len(ITEMS) + 1
+
+
+@patch.object(decorators.config, "EXPORT_BATCH_SIZE", 10)
+def test_allow_exports_fetches_all_items_without_page_token():
+    calls = []
+
+    @decorators.allow_exports(
+        {"defaults": HEADERS, "formats": ["text/csv"]}, batch_with_page_token=True
+    )
+    def get_items(request, page_number: int, page_size: int, page_token=None):
+        calls.append((page_number, page_size, page_token))
+        # A full page returned without a token can't be followed
+        items = ITEMS[:page_size] if page_size else ITEMS
+        return CustomPage.create(items=items, total=0, page=page_number, size=page_size)
+
+    response = get_items(request=_request("text/csv"), page_number=1, page_size=0)
+    assert calls == [(1, 10, ""), (1, 0, None)]
+    rows = list(csv.reader(io.StringIO(_read(response).decode("utf-8"))))
+    assert len(rows) == len(ITEMS) + 1
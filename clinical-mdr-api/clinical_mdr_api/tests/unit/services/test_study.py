@@ -31,6 +31,7 @@ from clinical_mdr_api.models.study_selections.study import (
     StudyPreferredTimeUnit,
 )
 from clinical_mdr_api.models.utils import from_duration_object_to_value_and_unit
+from clinical_mdr_api.repositories._utils import FilterOperator
 from clinical_mdr_api.services._utils import create_duration_object_from_api_input
 from clinical_mdr_api.services.studies.study import StudyService
 from clinical_mdr_api.tests.unit.domain.clinical_programme_aggregate.test_clinical_programme import (
@@ -1820,3 +1821,45 @@ class TestStudyService(unittest.TestCase):
                     study_short_title=study_description.study_short_title,
                 ),
             )
+
+
+class TestStudyServiceCypherFiltering(unittest.TestCase):
+    def test__map_compact_study_filtering_to_cypher__supported_fields(self):
+        filter_by, sort_by = StudyService._map_compact_study_filtering_to_cypher(
+            filter_by={
+                "current_metadata.identification_metadata.study_acronym": {
+                    "v": ["ACR"],
+                    "op": "co",
+                }
+            },
+            sort_by={"current_metadata.identification_metadata.study_id": False},
+            filter_operator=FilterOperator.AND,
+            has_any_relationship_filter=False,
+        )
+        self.assertEqual(
+            filter_by, {"current_metadata.study_acronym": {"v": ["ACR"], "op": "co"}}
+        )
+        self.assertEqual(sort_by, {"study_id": False, "uid": True})
+
+    def test__map_compact_study_filtering_to_cypher__fallback(self):
+        for filter_by, sort_by, filter_operator, has_any_relationship_filter in [
+            ({"*": {"v": ["ACR"]}}, {"uid": True}, FilterOperator.AND, False),
+            (
+                {"study_parent_part.study_acronym": {"v": ["ACR"]}},
+                {"uid": True},
+                FilterOperator.AND,
+                False,
+            ),
+            ({"uid": {"v": ["A", "B"], "op": "bw"}}, {}, FilterOperator.AND, False),
+            ({}, {"possible_actions": True}, FilterOperator.AND, False),
+            ({"uid": {"v": ["A"]}}, {}, FilterOperator.OR, True),
+        ]:
+            with self.subTest(filter_by=filter_by, sort_by=sort_by):
+                self.assertIsNone(
+                    StudyService._map_compact_study_filtering_to_cypher(
+                        filter_by=filter_by,
+                        sort_by=sort_by,
+                        filter_operator=filter_operator,
+                        has_any_relationship_filter=has_any_relationship_filter,
+                    )
+                )
@@ -9,8 +9,11 @@ from clinical_mdr_api.models import (
     StudyVisit,
 )
 from clinical_mdr_api.models.study_selections.study_epoch import StudyEpoch
+from clinical_mdr_api.services.studies import study_design_figure
 from clinical_mdr_api.services.studies.study_design_figure import (
     StudyDesignFigureService,
+    get_font,
+    get_text_size_px,
 )
 
 STUDY_UID = "Study_000001"
@@ -2115,3 +2118,29 @@ def test_get_svg_document():
     assert "markerWidth" in doc, '"markerWidth" found, missing arrowhead markers?'
 
     assert doc == SVG_DOCUMENT
+
+
+def test_get_text_size_px():
+    for text in ("NPH insulin", "Metformin is longer", ""):
+        assert get_text_size_px(text) == get_font().getbbox(text)[2:4]
+        assert get_text_size_px(text) == get_text_size_px(text)
+
+
+def test_get_svg_document_is_cached(monkeypatch):
+    monkeypatch.setattr(study_design_figure, "get_current_user_id", lambda: None)
+    study_design_figure.design_figure_cache.clear()
+    drawn = []
+
+    class CountingStudyDesignFigureService(MockStudyDesignFigureService):
+        def draw_svg(self, *args, **kwargs):
+            drawn.append(args)
+            return super().draw_svg(*args, **kwargs)
+
+    first = CountingStudyDesignFigureService().get_svg_document(STUDY_UID)
+    second = CountingStudyDesignFigureService().get_svg_document(STUDY_UID)
+    assert first == second
+    assert len(drawn) == 1
+
+    # Another study version is drawn again
+    CountingStudyDesignFigureService().get_svg_document(STUDY_UID, "1.0")
+    assert len(drawn) == 2
@@ -56,6 +56,10 @@ class MockStudyFlowchartService(StudyFlowchartService):
     def _validate_parameters(self, *_args, **_kwargs):
         pass
 
+    def _get_study_change_stamp(self, *_args, **_kwargs):
+        # Not cached
+        return None
+
 
 # pylint: disable=redefined-outer-name
 @pytest.fixture(scope="module")
@@ -190,6 +194,41 @@ def test_get_flowchart_table(study_flowchart_service):
     assert table.dict() == EXPECTED_SOA_TABLE.dict()
 
 
+def test_get_flowchart_table_cached():
+    class CachedMockStudyFlowchartService(MockStudyFlowchartService):
+        stamp = ("study_value", 1, "2023-01-01")
+        builds = 0
+
+        def _get_study_change_stamp(self, *_args, **_kwargs):
+            return self.stamp
+
+        def _build_flowchart_table(self, *args, **kwargs):
+            self.builds += 1
+            return super()._build_flowchart_table(*args, **kwargs)
+
+    service = CachedMockStudyFlowchartService(USER_INITIALS)
+    table = service.get_flowchart_table(study_uid="cached_study", time_unit="day")
+    assert table.dict() == EXPECTED_SOA_TABLE.dict()
+
+    # Returned tables are copies, which can be modified
+    StudyFlowchartService.propagate_hidden_rows(table)
+    table = service.get_flowchart_table(study_uid="cached_study", time_unit="day")
+    assert table.dict() == EXPECTED_SOA_TABLE.dict()
+    assert service.builds == 1
+
+    service.stamp = ("study_value", 2, "2023-01-02")
+    service.get_flowchart_table(study_uid="cached_study", time_unit="day")
+    assert service.builds == 2
+
+    service.get_flowchart_table(
+        study_uid="cached_study", time_unit="day", study_value_version="1"
+    )
+    service.get_flowchart_table(
+        study_uid="cached_study", time_unit="day", study_value_version="1"
+    )
+    assert service.builds == 3
+
+
 def test_propagate_hidden_rows():
     table = deepcopy(EXPECTED_SOA_TABLE)
     StudyFlowchartService.propagate_hidden_rows(table)
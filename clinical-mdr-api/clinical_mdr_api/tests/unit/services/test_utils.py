@@ -4,6 +4,7 @@ from unittest import mock
 
 from parameterized import parameterized
 
+from clinical_mdr_api import exceptions
 from clinical_mdr_api.models.utils import BaseModel
 from clinical_mdr_api.repositories._utils import ComparisonOperator, FilterOperator
 from clinical_mdr_api.services import _utils
@@ -308,3 +309,59 @@ class TestServiceUtils(unittest.TestCase):
     )
     def test_normalize_string(self, string, expected):
         assert _utils.normalize_string(string) == expected
+
+    def test_service_level_generic_filtering_page_token(self):
+        items = [
+            BaseTestObject(k1=f"k1.row{index % 3}", uid=f"uid{index:02}")
+            for index in range(10)
+        ]
+        pages = []
+        page_token = None
+        while True:
+            out = _utils.service_level_generic_filtering(
+                items,
+                sort_by={"k1": False},
+                page_size=4,
+                page_token=page_token,
+                unique_sort_by=["uid"],
+            )
+            pages.append([item.uid for item in out.items])
+            page_token = out.next_page_token
+            if page_token is None:
+                break
+        expected = [
+            item.uid for item in sorted(items, key=lambda x: x.k1, reverse=True)
+        ]
+        assert pages == [expected[:4], expected[4:8], expected[8:]]
+
+        # The next page starts at the same place when the last item of the page was removed
+        first_page = _utils.service_level_generic_filtering(
+            items, sort_by={"k1": False}, page_size=4, unique_sort_by=["uid"]
+        )
+        remaining = [item for item in items if item.uid != first_page.items[-1].uid]
+        out = _utils.service_level_generic_filtering(
+            remaining,
+            sort_by={"k1": False},
+            page_size=4,
+            page_token=first_page.next_page_token,
+            unique_sort_by=["uid"],
+        )
+        assert [item.uid for item in out.items] == expected[4:8]
+
+    def test_service_level_generic_filtering_page_token_is_validated(self):
+        items = BaseTestObject.get_all_items()
+        out = _utils.service_level_generic_filtering(
+            items, page_size=10, unique_sort_by=["uid"]
+        )
+        with self.assertRaises(exceptions.ValidationException):
+            _utils.service_level_generic_filtering(
+                items,
+                sort_by={"k1": True},
+                page_size=10,
+                page_token=out.next_page_token,
+                unique_sort_by=["uid"],
+            )
+        with self.assertRaises(exceptions.ValidationException):
+            _utils.service_level_generic_filtering(
+                items, page_size=10, page_token=out.next_page_token
+            )
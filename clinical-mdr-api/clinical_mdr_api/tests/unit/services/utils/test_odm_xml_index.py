@@ -0,0 +1,118 @@
+import io
+from xml.dom import minidom
+
+import pytest
+
+from clinical_mdr_api.exceptions import BusinessLogicException
+from clinical_mdr_api.services.utils.odm_xml_index import DEF_TAGS, OdmXmlIndex
+from clinical_mdr_api.services.utils.odm_xml_mapper import apply_mapping_rules
+
+ODM_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<ODM xmlns="http://www.cdisc.org/ns/odm/v1.3" xmlns:osb="openstudybuilder.org" ODMVersion="1.3.2">
+  <Study OID="S1">
+    <GlobalVariables>
+      <StudyName>Study One</StudyName>
+    </GlobalVariables>
+    <BasicDefinitions>
+      <MeasurementUnit OID="U1" Name="kg"/>
+    </BasicDefinitions>
+    <MetaDataVersion OID="MDV1" Name="Metadata">
+      <FormDef OID="F1" Name="Form" Repeated="No" osb:instruction="Fill it">
+        <ItemGroupRef ItemGroupOID="G1" Mandatory="Yes"/>
+        <osb:DomainColor>#fff</osb:DomainColor>
+      </FormDef>
+      <ItemGroupDef OID="G1" Name="Group" Repeating="No">
+        <ItemRef ItemOID="I1" Mandatory="Yes"/>
+        <ItemRef ItemOID="I2" Mandatory="No"/>
+      </ItemGroupDef>
+      <ItemDef OID="I1" Name="Weight" DataType="float">
+        <MeasurementUnitRef MeasurementUnitOID="U1"/>
+      </ItemDef>
+      <ItemDef OID="I2" Name="Sex" DataType="text">
+        <CodeListRef CodeListOID="CL1"/>
+      </ItemDef>
+      <CodeList OID="CL1" Name="Sex" DataType="text">
+        <CodeListItem CodedValue="F"/>
+        <CodeListItem CodedValue="M"/>
+      </CodeList>
+      <MethodDef OID="M1" Name="Method" Type="Computation">
+        <FormalExpression Context="js"><![CDATA[a && b]]></FormalExpression>
+      </MethodDef>
+    </MetaDataVersion>
+  </Study>
+</ODM>
+"""
+
+MAPPING_RULES = [
+    {
+        "type": "attribute",
+        "parent": "",
+        "from_name": "Repeated",
+        "to_name": "Repeating",
+        "to_alias": "",
+        "from_alias": "",
+        "alias_context": "",
+    },
+    {
+        "type": "element",
+        "parent": "MetaDataVersion",
+        "from_name": "ItemRef",
+        "to_name": "osb:ItemRef",
+        "to_alias": "",
+        "from_alias": "",
+        "alias_context": "",
+    },
+]
+
+
+@pytest.mark.parametrize("mapping_rules", [[], MAPPING_RULES])
+def test_definitions_match_the_whole_document(mapping_rules):
+    xml_document = minidom.parseString(ODM_XML)
+    apply_mapping_rules(xml_document, mapping_rules)
+
+    index = OdmXmlIndex(io.BytesIO(ODM_XML), mapping_rules)
+
+    for tag in DEF_TAGS:
+        assert [definition.toxml() for definition in index[tag]] == [
+            element.toxml() for element in xml_document.getElementsByTagName(tag)
+        ]
+    assert index.study_name == "Study One"
+    assert sorted(index.odm_element.attributes.items()) == sorted(
+        xml_document.documentElement.attributes.items()
+    )
+
+
+def test_definitions_by_oid():
+    index = OdmXmlIndex(io.BytesIO(ODM_XML), [])
+
+    assert len(index["ItemDef"]) == 2
+    assert [item_def.getAttribute("OID") for item_def in index["ItemDef"]] == [
+        "I1",
+        "I2",
+    ]
+    assert [
+        codelist_item.getAttribute("CodedValue")
+        for codelist_item in index["CodeList"]
+        .get("CL1")
+        .getElementsByTagName("CodeListItem")
+    ] == ["F", "M"]
+    assert index["CodeList"].get("CL2") is None
+    assert [
+        item_def.getAttribute("OID") for item_def in index["ItemDef"].iter_from(1)
+    ] == ["I2"]
+
+
+def test_digest_depends_on_content_and_mapping_rules():
+    digest = OdmXmlIndex(io.BytesIO(ODM_XML), []).digest
+
+    assert OdmXmlIndex(io.BytesIO(ODM_XML), []).digest == digest
+    assert OdmXmlIndex(io.BytesIO(ODM_XML), MAPPING_RULES).digest != digest
+    assert (
+        OdmXmlIndex(io.BytesIO(ODM_XML.replace(b"Study One", b"Study Two")), []).digest
+        != digest
+    )
+
+
+def test_invalid_xml():
+    with pytest.raises(BusinessLogicException):
+        OdmXmlIndex(io.BytesIO(b"<ODM><Study></ODM>"), [])
@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+
+def profile_imports(module: str) -> list[tuple[str, int, int]]:
+    """
+    Imports the module in a new interpreter with `-X importtime`,
+    returns the (module name, self time, cumulative time) of each imported module, in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+        cwd=os.path.normpath(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if result.returncode != 0:
+        sys.stderr.write(
+            "\n".join(
+                line
+                for line in result.stderr.splitlines()
+                if not line.startswith("import time:")
+            )
+            + "\n"
+        )
+        raise RuntimeError(f"Importing {module} failed")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # Header line
+            continue
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def main(module: str, top: int, max_seconds: float | None) -> int:
+    imports = profile_imports(module)
+    total_us = next(
+        (cumulative for name, _, cumulative in imports if name == module),
+        sum(self_us for _, self_us, _ in imports),
+    )
+
+    print(f"Importing {module} took {total_us / 1e6:.2f} s, {len(imports)} modules")
+
+    print(f"\nSlowest {top} modules, including their own imports (ms):")
+    for name, _, cumulative in sorted(imports, key=lambda item: -item[2])[:top]:
+        print(f"{cumulative / 1000:10.1f}  {name}")
+
+    self_by_package = defaultdict(int)
+    for name, self_us, _ in imports:
+        self_by_package[name.split(".")[0]] += self_us
+    print(f"\nSlowest {top} top-level packages, own import time (ms):")
+    for package, self_us in sorted(self_by_package.items(), key=lambda item: -item[1])[
+        :top
+    ]:
+        print(f"{self_us / 1000:10.1f}  {package}")
+
+    if max_seconds is not None and total_us > max_seconds * 1e6:
+        print(
+            f"\nImport time {total_us / 1e6:.2f} s is over the target of {max_seconds:.2f} s"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Reports the time spent importing the modules loaded when the API starts, "
+        "measured in a new interpreter with `python -X importtime`"
+    )
+    parser.add_argument(
+        "module",
+        type=str,
+        nargs="?",
+        help="module to import",
+        default="clinical_mdr_api.main",
+    )
+    parser.add_argument(
+        "--top", type=int, help="number of modules and packages listed", default=25
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        help="exit with an error when the import takes longer than this",
+        default=None,
+    )
+
+    args = parser.parse_args()
+    sys.exit(main(**vars(args)))
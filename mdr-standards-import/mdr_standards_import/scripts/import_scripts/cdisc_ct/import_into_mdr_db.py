@@ -1,5 +1,7 @@
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from mdr_standards_import.scripts.utils import (
     are_lists_equal,
     get_sentence_case_string,
@@ -9,6 +11,11 @@ from mdr_standards_import.scripts.utils import (
 
 USER_INITIALS = None
 
+# Number of rows written per transaction
+DEFAULT_BATCH_SIZE = 500
+# Number of sessions writing batches in parallel
+DEFAULT_MAX_WORKERS = 4
+
 
 def print_ignored_stats(tx, effective_date):
     result = tx.run(
@@ -104,159 +111,270 @@ def get_codelists(tx, effective_date):
     return result.data()
 
 
-def merge_codelist_version_independent_data(tx, codelist_data):
+def _batches(rows, batch_size):
+    for start in range(0, len(rows), batch_size):
+        yield rows[start : start + batch_size]
+
+
+def write_in_batches(driver, database, work, rows, batch_size, max_workers, *args):
+    """
+    Writes the given rows with the transaction function `work`, one transaction per batch of `batch_size` rows.
+
+    The batches are written in parallel by up to `max_workers` sessions,
+    so the rows given in one call must not depend on each other.
+    """
+
+    def write_batch(batch):
+        with driver.session(database=database) as session:
+            session.write_transaction(work, batch, *args)
+
+    batches = list(_batches(rows, batch_size))
+    if max_workers <= 1 or len(batches) <= 1:
+        for batch in batches:
+            write_batch(batch)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # consuming the results raises the first error of the workers
+        for _ in executor.map(write_batch, batches):
+            pass
+
+
+@contextmanager
+def timed_step(description):
+    print(f"==  * {description}")
+    start_time = time.time()
+    yield
+    print(f"==      Duration: {round(time.time() - start_time, 1)} seconds")
+
+
+def plan_version_independent_data(codelists_data):
+    """
+    Gets the version independent data of the codelists to import, split into rows that don't depend on each other.
+
+    The terms shared by several codelists are merged only once.
+    """
+    codelists = []
+    terms = {}
+    package_terms = []
+    for codelist_data in codelists_data:
+        concept_id = codelist_data["codelist"]["concept_id"]
+        codelists.append(
+            {
+                "concept_id": concept_id,
+                "packages": [
+                    {
+                        "name": package["name"],
+                        "catalogue_name": package["catalogue_name"],
+                    }
+                    for package in codelist_data["packages"]
+                ],
+            }
+        )
+        for term_data in codelist_data["terms_data"]:
+            term = term_data["term"]
+            terms.setdefault(
+                term["uid"], {"uid": term["uid"], "concept_id": term["concept_id"]}
+            )
+            package_terms.append(
+                {
+                    "codelist_concept_id": concept_id,
+                    "term_uid": term["uid"],
+                    "package_names": [
+                        package["name"] for package in term_data["packages"]
+                    ],
+                }
+            )
+
+    return {
+        "codelists": codelists,
+        "terms": list(terms.values()),
+        "package_terms": package_terms,
+    }
+
+
+def merge_codelist_version_independent_data(tx, codelists):
     tx.run(
         """
         MERGE (library:Library{name: 'CDISC'})
-        WITH library, $codelist_data as data
-        MERGE (cl_root:CTCodelistRoot{uid: data.codelist.concept_id})
-        MERGE (library)-[:CONTAINS_CODELIST]->(cl_root)
-        MERGE (cl_root)-[:HAS_ATTRIBUTES_ROOT]->(:CTCodelistAttributesRoot)
-        MERGE (cl_root)-[:HAS_NAME_ROOT]->(:CTCodelistNameRoot)
+        WITH library
+        UNWIND $codelists AS codelist
+            MERGE (cl_root:CTCodelistRoot{uid: codelist.concept_id})
+            MERGE (library)-[:CONTAINS_CODELIST]->(cl_root)
+            MERGE (cl_root)-[:HAS_ATTRIBUTES_ROOT]->(:CTCodelistAttributesRoot)
+            MERGE (cl_root)-[:HAS_NAME_ROOT]->(:CTCodelistNameRoot)
         """,
-        codelist_data=codelist_data,
-        user_initials=USER_INITIALS,
+        codelists=codelists,
     )
 
 
-def merge_codelist_packages_version_independent_data(tx, codelist_data, effective_date):
+def merge_codelist_packages_version_independent_data(tx, codelists, effective_date):
     tx.run(
         """
-        WITH $codelist_data as data
-        MATCH (library:Library{name: 'CDISC'})-[:CONTAINS_CODELIST]->(cl_root:CTCodelistRoot{uid: data.codelist.concept_id})
+        UNWIND $codelists AS codelist
+        MATCH (library:Library{name: 'CDISC'})-[:CONTAINS_CODELIST]->(cl_root:CTCodelistRoot{uid: codelist.concept_id})
 
-        WITH library, data, cl_root
+        WITH codelist, cl_root
         // for each catalogue that has this codelist
-        FOREACH (package IN data.packages |
+        FOREACH (package IN codelist.packages |
             MERGE (ct_package:CTPackage{uid: package.name})
             MERGE (catalogue:CTCatalogue{name: package.catalogue_name})
             MERGE (catalogue)-[has_codelist:HAS_CODELIST]->(cl_root)
             ON CREATE SET
                 has_codelist.start_date=datetime($start_date),
                 has_codelist.user_initials=$user_initials
-            MERGE (package_codelist:CTPackageCodelist{uid: package.name + '_' + data.codelist.concept_id})
+            MERGE (package_codelist:CTPackageCodelist{uid: package.name + '_' + codelist.concept_id})
             MERGE (ct_package)-[:CONTAINS_CODELIST]->(package_codelist)
         )
         """,
-        codelist_data=codelist_data,
+        codelists=codelists,
         start_date=effective_date,
         user_initials=USER_INITIALS,
     )
 
 
-def merge_codelist_terms_version_independent_data(tx, codelist_data):
+def merge_term_version_independent_data(tx, terms):
     tx.run(
         """
-        WITH $codelist_data as data
-        MATCH (library:Library{name: 'CDISC'})-[:CONTAINS_CODELIST]->(cl_root:CTCodelistRoot{uid: data.codelist.concept_id})
-
-        WITH library, data, cl_root
-        // for each term of the codelist
-        FOREACH (term_data IN data.terms_data |
-            MERGE (t_root:CTTermRoot{uid: term_data.term.uid})
-            SET t_root.concept_id = term_data.term.concept_id
+        MATCH (library:Library{name: 'CDISC'})
+        UNWIND $terms AS term
+            MERGE (t_root:CTTermRoot{uid: term.uid})
+            SET t_root.concept_id = term.concept_id
             MERGE (library)-[:CONTAINS_TERM]->(t_root)
             MERGE (t_root)-[:HAS_ATTRIBUTES_ROOT]->(:CTTermAttributesRoot)
             MERGE (t_root)-[:HAS_NAME_ROOT]->(:CTTermNameRoot)
-            FOREACH (package IN term_data.packages |
-                MERGE (package_codelist:CTPackageCodelist{uid: package.name + '_' + data.codelist.concept_id})
-                MERGE (package_term:CTPackageTerm{uid: package.name + "_" + term_data.term.uid})
-                MERGE (package_codelist)-[:CONTAINS_TERM]->(package_term)
-            )
-        )
         """,
-        codelist_data=codelist_data,
-        user_initials=USER_INITIALS,
+        terms=terms,
     )
 
 
-def update_has_term_and_had_term_relationships(tx, codelists_data, effective_date):
+def merge_package_terms(tx, package_terms):
+    tx.run(
+        """
+        UNWIND $package_terms AS package_term_data
+        UNWIND package_term_data.package_names AS package_name
+            MERGE (package_codelist:CTPackageCodelist{uid: package_name + '_' + package_term_data.codelist_concept_id})
+            MERGE (package_term:CTPackageTerm{uid: package_name + "_" + package_term_data.term_uid})
+            MERGE (package_codelist)-[:CONTAINS_TERM]->(package_term)
+        """,
+        package_terms=package_terms,
+    )
+
+
+def get_codelist_terms(tx, codelist_uids, effective_date):
+    """
+    Gets the uids of the terms related to each codelist at the effective date,
+    grouped by relationship type: HAS_TERM for the active terms and HAD_TERM for the retired ones.
+    """
+    result = tx.run(
+        """
+        UNWIND $codelist_uids AS codelist_uid
+        MATCH (:CTCodelistRoot{uid: codelist_uid})-[ht:HAS_TERM|HAD_TERM]->(term_root)
+        WHERE ht.start_date <= datetime($effective_date) AND
+              (type(ht) = 'HAS_TERM' OR ht.end_date > datetime($effective_date))
+        RETURN codelist_uid, type(ht) AS relationship_type, collect(DISTINCT term_root.uid) AS term_uids
+        """,
+        codelist_uids=codelist_uids,
+        effective_date=effective_date,
+    )
+    codelist_terms = {}
+    for record in result:
+        codelist_terms.setdefault(record["codelist_uid"], {})[
+            record["relationship_type"]
+        ] = record["term_uids"]
+    return codelist_terms
+
+
+def plan_has_term_and_had_term_updates(codelists_data, codelist_terms):
+    terms_to_deactivate = []
+    terms_to_add = []
     nbr_added_terms = 0
     nbr_removed_terms = 0
     nbr_unchanged_terms = 0
     for codelist_data in codelists_data:
-        codelist = codelist_data.get("codelist", None)
+        codelist_uid = codelist_data["codelist"]["concept_id"]
 
         codelist_term_uids = [
             terms_data["term"]["uid"] for terms_data in codelist_data["terms_data"]
         ]
-
-        result = tx.run(
-            """
-            MATCH (:CTCodelistRoot{uid: $codelist_uid})-[ht:HAS_TERM]->(term_root)
-            WHERE ht.start_date <= datetime($effective_date)
-            RETURN DISTINCT term_root.uid AS uid, ht.start_date as start_date
-            """,
-            codelist_uid=codelist["concept_id"],
-            effective_date=effective_date,
-        )
-        matching_active_term_uids = list(result.value())
-
-        result = tx.run(
-            """
-            MATCH (:CTCodelistRoot{uid: $codelist_uid})-[ht:HAD_TERM]->(term_root)
-            WHERE ht.start_date <= datetime($effective_date) AND ht.end_date > datetime($effective_date)
-            RETURN DISTINCT term_root.uid AS uid
-            """,
-            codelist_uid=codelist["concept_id"],
-            effective_date=effective_date,
-        )
-        retired_term_uids = list(result.value())
+        existing_terms = codelist_terms.get(codelist_uid, {})
+        matching_active_term_uids = existing_terms.get("HAS_TERM", [])
+        retired_term_uids = set(existing_terms.get("HAD_TERM", []))
 
         term_uids_to_deactivate = [
             term_uid
             for term_uid in matching_active_term_uids
             if term_uid not in codelist_term_uids and term_uid not in retired_term_uids
         ]
-
-        nbr_removed_terms += len(term_uids_to_deactivate)
-        tx.run(
-            """
-            MATCH (codelist_root:CTCodelistRoot{uid: $codelist_uid})-[has_term:HAS_TERM]->(term_root)
-            WHERE term_root.uid IN $term_uids_to_deactivate
-
-            CREATE (codelist_root)-[had_term:HAD_TERM]->(term_root)
-            SET
-                had_term.start_date = has_term.start_date,
-                had_term.end_date = datetime($end_date),
-                had_term.user_initials = has_term.user_initials
-            DELETE has_term
-            """,
-            end_date=effective_date,
-            codelist_uid=codelist["concept_id"],
-            term_uids_to_deactivate=term_uids_to_deactivate,
-        )
-
+        matching_active_term_uids = set(matching_active_term_uids)
         term_uids_to_add = [
             term_uid
             for term_uid in codelist_term_uids
             if term_uid not in matching_active_term_uids
             and term_uid not in retired_term_uids
         ]
-        nbr_added_terms += len(term_uids_to_add)
-        tx.run(
-            """
-            MATCH (codelist_root:CTCodelistRoot{uid: $codelist_uid})
-            MATCH (term_root:CTTermRoot)
-            WHERE term_root.uid IN $new_term_uids
-
-            CREATE (codelist_root)-[:HAS_TERM{
-                start_date: datetime($start_date),
-                user_initials: $user_initials
-            }]->(term_root)
-            """,
-            start_date=effective_date,
-            codelist_uid=codelist["concept_id"],
-            new_term_uids=term_uids_to_add,
-            user_initials=USER_INITIALS,
+
+        terms_to_deactivate.extend(
+            {"codelist_uid": codelist_uid, "term_uid": term_uid}
+            for term_uid in term_uids_to_deactivate
+        )
+        # a term listed twice in a codelist is related to it only once
+        terms_to_add.extend(
+            {"codelist_uid": codelist_uid, "term_uid": term_uid}
+            for term_uid in dict.fromkeys(term_uids_to_add)
         )
+        nbr_removed_terms += len(term_uids_to_deactivate)
+        nbr_added_terms += len(term_uids_to_add)
         nbr_unchanged_terms += (
             len(codelist_term_uids)
             - len(term_uids_to_add)
             - len(term_uids_to_deactivate)
         )
-    # delete_contains_term_relationships(tx)
-    return nbr_added_terms, nbr_removed_terms, nbr_unchanged_terms
+
+    return {
+        "terms_to_deactivate": terms_to_deactivate,
+        "terms_to_add": terms_to_add,
+        "added_terms": nbr_added_terms,
+        "removed_terms": nbr_removed_terms,
+        "unchanged_terms": nbr_unchanged_terms,
+    }
+
+
+def deactivate_codelist_terms(tx, codelist_terms, effective_date):
+    tx.run(
+        """
+        UNWIND $codelist_terms AS codelist_term
+        MATCH (codelist_root:CTCodelistRoot{uid: codelist_term.codelist_uid})-[has_term:HAS_TERM]->
+              (term_root:CTTermRoot{uid: codelist_term.term_uid})
+
+        CREATE (codelist_root)-[had_term:HAD_TERM]->(term_root)
+        SET
+            had_term.start_date = has_term.start_date,
+            had_term.end_date = datetime($end_date),
+            had_term.user_initials = has_term.user_initials
+        DELETE has_term
+        """,
+        end_date=effective_date,
+        codelist_terms=codelist_terms,
+    )
+
+
+def add_codelist_terms(tx, codelist_terms, effective_date):
+    tx.run(
+        """
+        UNWIND $codelist_terms AS codelist_term
+        MATCH (codelist_root:CTCodelistRoot{uid: codelist_term.codelist_uid})
+        MATCH (term_root:CTTermRoot{uid: codelist_term.term_uid})
+
+        CREATE (codelist_root)-[:HAS_TERM{
+            start_date: datetime($start_date),
+            user_initials: $user_initials
+        }]->(term_root)
+        """,
+        start_date=effective_date,
+        codelist_terms=codelist_terms,
+        user_initials=USER_INITIALS,
+    )
 
 
 def delete_contains_term_relationships(tx):
@@ -525,7 +643,16 @@ def _fetch_all_codelists(tx, concept_ids, effective_date):
     return codelists
 
 
-def update_attributes(tx, codelists_data, effective_date):
+def plan_attribute_updates(
+    codelists_data, all_existing_codelists, all_existing_terms, effective_date
+):
+    """
+    Diffs the codelists and terms to import against their existing attribute values.
+
+    A term shared by several codelists can get a new version or new packages for each of them,
+    so the term changes are split into rounds where each term is written at most once.
+    The rows of a round don't depend on each other, and each round depends on the previous ones.
+    """
     new_terms = 0
     updated_terms = 0
     unchanged_terms = 0
@@ -534,22 +661,22 @@ def update_attributes(tx, codelists_data, effective_date):
     updated_codelists = 0
     unchanged_codelists = 0
 
-    cl_concept_ids = [cl["codelist"]["concept_id"] for cl in codelists_data]
-    all_existing_codelists = _fetch_all_codelists(tx, cl_concept_ids, effective_date)
+    codelist_changes = {"new": [], "updated": [], "existing": []}
+    term_rounds = []
+    # the latest attributes value of each term, taking the planned changes into account
+    latest_term_values = {}
+    nbr_term_writes = {}
+
     for codelist_data in codelists_data:
         codelist = codelist_data.get("codelist", None)
         terms_data = codelist_data.get("terms_data", {})
         packages = codelist_data.get("packages", None)
+        row = {"codelist": codelist, "packages": packages}
 
         record = all_existing_codelists.get(codelist["concept_id"])
 
         if record is None:
-            create_initial_codelist_attributes_value(
-                tx, effective_date, codelist, packages
-            )
-            create_initial_codelist_name(
-                tx, codelist, codelist.get("name", None), "Initial import from CDISC"
-            )
+            codelist_changes["new"].append(row)
             new_codelists += 1
         else:
             value = record["cl_attributes_value"]
@@ -557,7 +684,6 @@ def update_attributes(tx, codelists_data, effective_date):
 
             if value_for_date is not None:
                 if _are_attribute_values_equal(value_for_date, codelist):
-                    # print(f"Codelist {codelist['concept_id']} already has a version for {effective_date}, skipping")
                     unchanged_codelists += 1
                 else:
                     print(codelist)
@@ -567,46 +693,83 @@ def update_attributes(tx, codelists_data, effective_date):
                     )
 
             elif not _are_attribute_values_equal(value, codelist):
-                # if codelist["concept_id"] == "C100133":
-                #    print("create_new_version_codelist_attributes_value", effective_date, codelist, packages)
-                create_new_version_codelist_attributes_value(
-                    tx, effective_date, codelist, packages
-                )
+                codelist_changes["updated"].append(row)
                 updated_codelists += 1
             else:
-                use_existing_codelist_attributes_value(tx, codelist, packages)
+                codelist_changes["existing"].append(row)
                 unchanged_codelists += 1
 
-        new_t, upd_t, unch_t = merge_term_values(
-            tx, codelist, effective_date, terms_data
-        )
-        new_terms += new_t
-        updated_terms += upd_t
-        unchanged_terms += unch_t
+        for term_data in terms_data:
+            term = term_data.get("term", None)
+            row = {"term": term, "packages": term_data.get("packages", None)}
+
+            record = all_existing_terms.get(term["uid"])
+
+            if record is None and term["uid"] not in latest_term_values:
+                change = "new"
+                name = sponsor_specific_parse_term_name(codelist, term)
+                row["name"] = name
+                row["name_sentence_case"] = get_sentence_case_string(name)
+                new_terms += 1
+            elif (
+                record is not None and record["t_attributes_value_for_date"] is not None
+            ):
+                value_for_date = record["t_attributes_value_for_date"]
+                if _are_term_attribute_values_equal(value_for_date, term):
+                    unchanged_terms += 1
+                    continue
+                print(term)
+                print(value_for_date)
+                raise RuntimeError(
+                    f"Oh my god! Term {term['concept_id']} already has a version for {effective_date} but the definition has changed!"
+                )
+            elif not _are_term_attribute_values_equal(
+                latest_term_values.get(
+                    term["uid"], record and record["t_attributes_value"]
+                ),
+                term,
+            ):
+                change = "updated"
+                updated_terms += 1
+            else:
+                change = "existing"
+                unchanged_terms += 1
+
+            if change != "existing":
+                latest_term_values[term["uid"]] = term
+            round_index = nbr_term_writes.get(term["uid"], 0)
+            nbr_term_writes[term["uid"]] = round_index + 1
+            if round_index == len(term_rounds):
+                term_rounds.append({"new": [], "updated": [], "existing": []})
+            term_rounds[round_index][change].append(row)
+
     return {
-        "new_codelists": new_codelists,
-        "updated_codelists": updated_codelists,
-        "unchanged_codelists": unchanged_codelists,
-        "new_terms": new_terms,
-        "updated_terms": updated_terms,
-        "unchanged_terms": unchanged_terms,
+        "codelists": codelist_changes,
+        "term_rounds": term_rounds,
+        "summary": {
+            "new_codelists": new_codelists,
+            "updated_codelists": updated_codelists,
+            "unchanged_codelists": unchanged_codelists,
+            "new_terms": new_terms,
+            "updated_terms": updated_terms,
+            "unchanged_terms": unchanged_terms,
+        },
     }
 
 
-def create_initial_codelist_attributes_value(
-    tx, effective_date_string, codelist, packages
-):
+def create_initial_codelist_attributes_values(tx, codelists, effective_date_string):
     tx.run(
         """
-        MATCH (:CTCodelistRoot{uid: $codelist.concept_id})-[:HAS_ATTRIBUTES_ROOT]->(cl_attributes_root)
+        UNWIND $codelists AS row
+        MATCH (:CTCodelistRoot{uid: row.codelist.concept_id})-[:HAS_ATTRIBUTES_ROOT]->(cl_attributes_root)
         CREATE (cl_attributes_value: CTCodelistAttributesValue)
         SET
-            cl_attributes_value.name = $codelist.name,
-            cl_attributes_value.submission_value = $codelist.submission_value,
-            cl_attributes_value.preferred_term = $codelist.preferred_term,
-            cl_attributes_value.definition = $codelist.definition,
-            cl_attributes_value.extensible = coalesce(toBoolean($codelist.extensible), false),
-            cl_attributes_value.synonyms = $codelist.synonyms
+            cl_attributes_value.name = row.codelist.name,
+            cl_attributes_value.submission_value = row.codelist.submission_value,
+            cl_attributes_value.preferred_term = row.codelist.preferred_term,
+            cl_attributes_value.definition = row.codelist.definition,
+            cl_attributes_value.extensible = coalesce(toBoolean(row.codelist.extensible), false),
+            cl_attributes_value.synonyms = row.codelist.synonyms
         CREATE (cl_attributes_root)-[:LATEST]->(cl_attributes_value)
         CREATE (cl_attributes_root)-[:LATEST_FINAL]->(cl_attributes_value)
         CREATE (cl_attributes_root)-[:HAS_VERSION{
@@ -617,27 +780,27 @@ def create_initial_codelist_attributes_value(
             user_initials: $user_initials
         }]->(cl_attributes_value)
 
-        WITH cl_attributes_value
-        FOREACH (package IN $packages |
-            MERGE (package_codelist:CTPackageCodelist{uid: package.name + "_" + $codelist.concept_id})
+        WITH row, cl_attributes_value
+        FOREACH (package IN row.packages |
+            MERGE (package_codelist:CTPackageCodelist{uid: package.name + "_" + row.codelist.concept_id})
             CREATE (package_codelist)-[:CONTAINS_ATTRIBUTES]->(cl_attributes_value)
         )
         """,
         effective_date_string=effective_date_string,
-        codelist=codelist,
-        packages=packages,
+        codelists=codelists,
         user_initials=USER_INITIALS,
     )
 
 
-def create_initial_codelist_name(tx, codelist, name, change_description):
+def create_initial_codelist_names(tx, codelists, change_description):
     tx.run(
         """
-        MATCH (codelist_root:CTCodelistRoot{uid: $codelist_uid})-[:HAS_NAME_ROOT]->(name_root)
+        UNWIND $codelists AS row
+        MATCH (codelist_root:CTCodelistRoot{uid: row.codelist.concept_id})-[:HAS_NAME_ROOT]->(name_root)
         WHERE NOT (name_root)-[:LATEST]->()
         CREATE (name_root)-[:LATEST]->(name_value:CTCodelistNameValue)
         SET
-            name_value.name = $name
+            name_value.name = row.codelist.name
         CREATE (name_root)-[:LATEST_FINAL]->(name_value)
         CREATE (name_root)-[:HAS_VERSION{
             start_date: datetime(),
@@ -647,69 +810,68 @@ def create_initial_codelist_name(tx, codelist, name, change_description):
             user_initials: $user_initials
         }]->(name_value)
         """,
-        codelist_uid=codelist["concept_id"],
-        name=name,
+        codelists=codelists,
         user_initials=USER_INITIALS,
         change_description=change_description,
     ).consume()
 
 
-def create_new_version_codelist_attributes_value(
-    tx, effective_date_string, codelist, packages
-):
+def create_new_version_codelist_attributes_values(tx, codelists, effective_date_string):
     tx.run(
         """
-        MATCH (:CTCodelistRoot{uid: $codelist.concept_id})-[:HAS_ATTRIBUTES_ROOT]
-            ->(cl_attributes_root)-[latest_final:LATEST_FINAL]->(cl_old_attributes_value)
-            <-[latest:LATEST]-(cl_attributes_root)
-        WITH cl_attributes_root, cl_old_attributes_value, latest, latest_final
-        MATCH (cl_attributes_root)-[has_version:HAS_VERSION]->(cl_old_attributes_value)
-        SET has_version.end_date = datetime($effective_date_string)
-        DELETE latest, latest_final
-
-        WITH cl_attributes_root, has_version.version AS version LIMIT 1
-        CREATE (cl_new_attributes_value:CTCodelistAttributesValue)
-        SET
-            cl_new_attributes_value.name = $codelist.name,
-            cl_new_attributes_value.submission_value = $codelist.submission_value,
-            cl_new_attributes_value.preferred_term = $codelist.preferred_term,
-            cl_new_attributes_value.definition = $codelist.definition,
-            cl_new_attributes_value.extensible = coalesce(toBoolean($codelist.extensible), false),
-            cl_new_attributes_value.synonyms = $codelist.synonyms
-        CREATE (cl_attributes_root)-[:LATEST_FINAL]->(cl_new_attributes_value)
-        CREATE (cl_attributes_root)-[:HAS_VERSION{
-            start_date: datetime($effective_date_string),
-            status: 'Final',
-            version: toString(coalesce(toInteger(split(version, '.')[0]), 0) + 1) + '.0',
-            change_description: 'Imported from CDISC',
-            user_initials: $user_initials
-        }]->(cl_new_attributes_value)
-        CREATE (cl_attributes_root)-[:LATEST]->(cl_new_attributes_value)
+        UNWIND $codelists AS row
+        CALL { WITH row
+            MATCH (:CTCodelistRoot{uid: row.codelist.concept_id})-[:HAS_ATTRIBUTES_ROOT]
+                ->(cl_attributes_root)-[latest_final:LATEST_FINAL]->(cl_old_attributes_value)
+                <-[latest:LATEST]-(cl_attributes_root)
+            WITH cl_attributes_root, cl_old_attributes_value, latest, latest_final
+            MATCH (cl_attributes_root)-[has_version:HAS_VERSION]->(cl_old_attributes_value)
+            SET has_version.end_date = datetime($effective_date_string)
+            DELETE latest, latest_final
+
+            WITH cl_attributes_root, has_version.version AS version LIMIT 1
+            CREATE (cl_new_attributes_value:CTCodelistAttributesValue)
+            SET
+                cl_new_attributes_value.name = row.codelist.name,
+                cl_new_attributes_value.submission_value = row.codelist.submission_value,
+                cl_new_attributes_value.preferred_term = row.codelist.preferred_term,
+                cl_new_attributes_value.definition = row.codelist.definition,
+                cl_new_attributes_value.extensible = coalesce(toBoolean(row.codelist.extensible), false),
+                cl_new_attributes_value.synonyms = row.codelist.synonyms
+            CREATE (cl_attributes_root)-[:LATEST_FINAL]->(cl_new_attributes_value)
+            CREATE (cl_attributes_root)-[:HAS_VERSION{
+                start_date: datetime($effective_date_string),
+                status: 'Final',
+                version: toString(coalesce(toInteger(split(version, '.')[0]), 0) + 1) + '.0',
+                change_description: 'Imported from CDISC',
+                user_initials: $user_initials
+            }]->(cl_new_attributes_value)
+            CREATE (cl_attributes_root)-[:LATEST]->(cl_new_attributes_value)
 
-        WITH cl_new_attributes_value
-        FOREACH (package IN $packages |
-            MERGE (package_codelist:CTPackageCodelist{uid: package.name + "_" + $codelist.concept_id})
-            CREATE (package_codelist)-[:CONTAINS_ATTRIBUTES]->(cl_new_attributes_value)
-        )
+            WITH cl_new_attributes_value
+            FOREACH (package IN row.packages |
+                MERGE (package_codelist:CTPackageCodelist{uid: package.name + "_" + row.codelist.concept_id})
+                CREATE (package_codelist)-[:CONTAINS_ATTRIBUTES]->(cl_new_attributes_value)
+            )
+        }
         """,
         effective_date_string=effective_date_string,
-        codelist=codelist,
-        packages=packages,
+        codelists=codelists,
         user_initials=USER_INITIALS,
     )
 
 
-def use_existing_codelist_attributes_value(tx, codelist, packages):
+def use_existing_codelist_attributes_values(tx, codelists):
     tx.run(
         """
-        MATCH (:CTCodelistRoot{uid: $codelist.concept_id})-[:HAS_ATTRIBUTES_ROOT]->()-[:LATEST]->(cl_attributes_value)
-        WITH cl_attributes_value
-        UNWIND $packages AS package
-            MATCH (package_codelist:CTPackageCodelist{uid: package.name + "_" + $codelist.concept_id})
+        UNWIND $codelists AS row
+        MATCH (:CTCodelistRoot{uid: row.codelist.concept_id})-[:HAS_ATTRIBUTES_ROOT]->()-[:LATEST]->(cl_attributes_value)
+        WITH row, cl_attributes_value
+        UNWIND row.packages AS package
+            MATCH (package_codelist:CTPackageCodelist{uid: package.name + "_" + row.codelist.concept_id})
             MERGE (package_codelist)-[:CONTAINS_ATTRIBUTES]->(cl_attributes_value)
         """,
-        codelist=codelist,
-        packages=packages,
+        codelists=codelists,
     )
 
 
@@ -741,66 +903,19 @@ def _fetch_all_terms(tx, term_uids, effective_date):
     return terms
 
 
-def merge_term_values(tx, codelist, effective_date_string, terms_data):
-    new_terms = 0
-    updated_terms = 0
-    unchanged_terms = 0
-    term_uids = [term["term"]["uid"] for term in terms_data]
-    all_existing_terms = _fetch_all_terms(tx, term_uids, effective_date_string)
-    for term_data in terms_data:
-        term = term_data.get("term", None)
-        packages = term_data.get("packages", None)
-
-        record = all_existing_terms.get(term["uid"])
-
-        if record is None:
-            create_initial_term_attributes_value(
-                tx, effective_date_string, term, packages
-            )
-            create_initial_term_names(
-                tx,
-                term,
-                sponsor_specific_parse_term_name(codelist, term),
-                "Initial import from CDISC",
-            )
-            new_terms += 1
-        else:
-            value = record["t_attributes_value"]
-            value_for_date = record["t_attributes_value_for_date"]
-
-            if value_for_date is not None:
-                if _are_term_attribute_values_equal(value_for_date, term):
-                    unchanged_terms += 1
-                else:
-                    print(term)
-                    print(value_for_date)
-                    raise RuntimeError(
-                        f"Oh my god! Term {term['concept_id']} already has a version for {effective_date_string} but the definition has changed!"
-                    )
-
-            elif not _are_term_attribute_values_equal(value, term):
-                create_new_version_term_attributes_value(
-                    tx, effective_date_string, term, packages
-                )
-                updated_terms += 1
-            else:
-                use_existing_term_attributes_value(tx, term, packages)
-                unchanged_terms += 1
-    return new_terms, updated_terms, unchanged_terms
-
-
-def create_initial_term_attributes_value(tx, effective_date_string, term, packages):
+def create_initial_term_attributes_values(tx, terms, effective_date_string):
     tx.run(
         """
-        MATCH (:CTTermRoot{uid: $term.uid})-[:HAS_ATTRIBUTES_ROOT]->(t_attributes_root)
+        UNWIND $terms AS row
+        MATCH (:CTTermRoot{uid: row.term.uid})-[:HAS_ATTRIBUTES_ROOT]->(t_attributes_root)
         CREATE (t_attributes_value: CTTermAttributesValue)
         SET
-            t_attributes_value.code_submission_value = $term.code_submission_value,
-            t_attributes_value.name_submission_value = $term.name_submission_value,
-            t_attributes_value.preferred_term = $term.preferred_term,
-            t_attributes_value.definition = $term.definition,
-            t_attributes_value.synonyms = $term.synonyms,
-            t_attributes_value.concept_id = $term.concept_id
+            t_attributes_value.code_submission_value = row.term.code_submission_value,
+            t_attributes_value.name_submission_value = row.term.name_submission_value,
+            t_attributes_value.preferred_term = row.term.preferred_term,
+            t_attributes_value.definition = row.term.definition,
+            t_attributes_value.synonyms = row.term.synonyms,
+            t_attributes_value.concept_id = row.term.concept_id
         CREATE (t_attributes_root)-[:LATEST]->(t_attributes_value)
         CREATE (t_attributes_root)-[:LATEST_FINAL]->(t_attributes_value)
         CREATE (t_attributes_root)-[:HAS_VERSION{
@@ -811,28 +926,28 @@ def create_initial_term_attributes_value(tx, effective_date_string, term, packag
             user_initials: $user_initials
         }]->(t_attributes_value)
 
-        WITH t_attributes_value
-        FOREACH (package IN $packages |
-            MERGE (package_term:CTPackageTerm{uid: package.name + "_" + $term.uid})
+        WITH row, t_attributes_value
+        FOREACH (package IN row.packages |
+            MERGE (package_term:CTPackageTerm{uid: package.name + "_" + row.term.uid})
             CREATE (package_term)-[:CONTAINS_ATTRIBUTES]->(t_attributes_value)
         )
         """,
         effective_date_string=effective_date_string,
-        term=term,
-        packages=packages,
+        terms=terms,
         user_initials=USER_INITIALS,
     )
 
 
-def create_initial_term_names(tx, term, name, change_description):
+def create_initial_term_names(tx, terms, change_description):
     tx.run(
         """
-        MATCH (term_root:CTTermRoot{uid: $term_uid})-[:HAS_NAME_ROOT]->(name_root)
+        UNWIND $terms AS row
+        MATCH (term_root:CTTermRoot{uid: row.term.uid})-[:HAS_NAME_ROOT]->(name_root)
         WHERE NOT (name_root)-[:LATEST]->()
         CREATE (name_root)-[:LATEST]->(name_value:CTTermNameValue)
         SET
-            name_value.name = $name,
-            name_value.name_sentence_case = $name_sentence_case
+            name_value.name = row.name,
+            name_value.name_sentence_case = row.name_sentence_case
         CREATE (name_root)-[:LATEST_FINAL]->(name_value)
         CREATE (name_root)-[:HAS_VERSION{
             start_date: datetime(),
@@ -842,68 +957,68 @@ def create_initial_term_names(tx, term, name, change_description):
             user_initials: $user_initials
         }]->(name_value)
         """,
-        term_uid=term["uid"],
-        name=name,
-        name_sentence_case=get_sentence_case_string(name),
+        terms=terms,
         user_initials=USER_INITIALS,
         change_description=change_description,
     ).consume()
 
 
-def create_new_version_term_attributes_value(tx, effective_date_string, term, packages):
+def create_new_version_term_attributes_values(tx, terms, effective_date_string):
     tx.run(
         """
-        MATCH (:CTTermRoot{uid: $term.uid})-[:HAS_ATTRIBUTES_ROOT]
-            ->(t_attributes_root)-[latest_final:LATEST_FINAL]->(t_old_attributes_value)
-            <-[latest:LATEST]-(t_attributes_root)
-        WITH t_attributes_root, t_old_attributes_value, latest, latest_final
-        MATCH (t_attributes_root)-[has_version:HAS_VERSION]->(t_old_attributes_value)
-        SET has_version.end_date = datetime($effective_date_string)
-        DELETE latest, latest_final
-
-        WITH t_attributes_root, has_version.version AS version LIMIT 1
-        CREATE (t_new_attributes_value:CTTermAttributesValue)
-        SET
-            t_new_attributes_value.code_submission_value = $term.code_submission_value,
-            t_new_attributes_value.name_submission_value = $term.name_submission_value,
-            t_new_attributes_value.preferred_term = $term.preferred_term,
-            t_new_attributes_value.definition = $term.definition,
-            t_new_attributes_value.synonyms = $term.synonyms,
-            t_new_attributes_value.concept_id = $term.concept_id
-        CREATE (t_attributes_root)-[:LATEST_FINAL]->(t_new_attributes_value)
-        CREATE (t_attributes_root)-[:HAS_VERSION{
-            start_date: datetime($effective_date_string),
-            status: 'Final',
-            version: toString(coalesce(toInteger(split(version, '.')[0]), 0) + 1) + '.0',
-            change_description: 'Imported from CDISC',
-            user_initials: $user_initials
-        }]->(t_new_attributes_value)
-        CREATE (t_attributes_root)-[:LATEST]->(t_new_attributes_value)
+        UNWIND $terms AS row
+        CALL { WITH row
+            MATCH (:CTTermRoot{uid: row.term.uid})-[:HAS_ATTRIBUTES_ROOT]
+                ->(t_attributes_root)-[latest_final:LATEST_FINAL]->(t_old_attributes_value)
+                <-[latest:LATEST]-(t_attributes_root)
+            WITH t_attributes_root, t_old_attributes_value, latest, latest_final
+            MATCH (t_attributes_root)-[has_version:HAS_VERSION]->(t_old_attributes_value)
+            SET has_version.end_date = datetime($effective_date_string)
+            DELETE latest, latest_final
+
+            WITH t_attributes_root, has_version.version AS version LIMIT 1
+            CREATE (t_new_attributes_value:CTTermAttributesValue)
+            SET
+                t_new_attributes_value.code_submission_value = row.term.code_submission_value,
+                t_new_attributes_value.name_submission_value = row.term.name_submission_value,
+                t_new_attributes_value.preferred_term = row.term.preferred_term,
+                t_new_attributes_value.definition = row.term.definition,
+                t_new_attributes_value.synonyms = row.term.synonyms,
+                t_new_attributes_value.concept_id = row.term.concept_id
+            CREATE (t_attributes_root)-[:LATEST_FINAL]->(t_new_attributes_value)
+            CREATE (t_attributes_root)-[:HAS_VERSION{
+                start_date: datetime($effective_date_string),
+                status: 'Final',
+                version: toString(coalesce(toInteger(split(version, '.')[0]), 0) + 1) + '.0',
+                change_description: 'Imported from CDISC',
+                user_initials: $user_initials
+            }]->(t_new_attributes_value)
+            CREATE (t_attributes_root)-[:LATEST]->(t_new_attributes_value)
 
-        WITH t_new_attributes_value
-        FOREACH (package IN $packages |
-            MERGE (package_term:CTPackageTerm{uid: package.name + "_" + $term.uid})
-            CREATE (package_term)-[:CONTAINS_ATTRIBUTES]->(t_new_attributes_value)
-        )
+            WITH t_new_attributes_value
+            FOREACH (package IN row.packages |
+                MERGE (package_term:CTPackageTerm{uid: package.name + "_" + row.term.uid})
+                CREATE (package_term)-[:CONTAINS_ATTRIBUTES]->(t_new_attributes_value)
+            )
+        }
         """,
         effective_date_string=effective_date_string,
-        term=term,
-        packages=packages,
+        terms=terms,
         user_initials=USER_INITIALS,
     )
 
 
-def use_existing_term_attributes_value(tx, term, packages):
+def use_existing_term_attributes_values(tx, terms):
     tx.run(
         """
-        MATCH (:CTTermRoot{uid: $term.uid})-[:HAS_ATTRIBUTES_ROOT]->()-[:LATEST]->(t_attributes_value)
-        WITH t_attributes_value
-        UNWIND $packages AS package
-            MATCH (package_term:CTPackageTerm{uid: package.name + "_" + $term.uid})
+        UNWIND $terms AS row
+        MATCH (:CTTermRoot{uid: row.term.uid})-[:HAS_ATTRIBUTES_ROOT]->()-[:LATEST]->(t_attributes_value)
+        WITH row, t_attributes_value
+        UNWIND row.packages AS package
+            MATCH (package_term:CTPackageTerm{uid: package.name + "_" + row.term.uid})
             MERGE (package_term)-[:CONTAINS_ATTRIBUTES]->(t_attributes_value)
         """,
-        term=term,
-        packages=packages,
+        terms=terms,
     )
 
 
@@ -1297,7 +1412,17 @@ def import_from_cdisc_db_into_mdr(
     mdr_neo4j_driver,
     mdr_db_name,
     user_initials,
+    batch_size=DEFAULT_BATCH_SIZE,
+    max_workers=DEFAULT_MAX_WORKERS,
+    dry_run=False,
 ):
+    """
+    Imports the CT of the given effective date from the CDISC DB into the MDR DB.
+
+    The codelists and terms to import are diffed against the MDR DB, fetched at once,
+    then the changes are written in batches of `batch_size` rows by up to `max_workers` parallel sessions.
+    With `dry_run`, the planned changes are only reported.
+    """
     global USER_INITIALS
     USER_INITIALS = user_initials
 
@@ -1313,67 +1438,152 @@ def import_from_cdisc_db_into_mdr(
             tx.commit()
 
         # read from the CDISC DB
-        packages_data = session.read_transaction(get_packages, effective_date)
-        codelists_data = session.read_transaction(get_codelists, effective_date)
+        with timed_step("Reading the packages and codelists from the CDISC DB."):
+            packages_data = session.read_transaction(get_packages, effective_date)
+            codelists_data = session.read_transaction(get_codelists, effective_date)
 
         session.close()
 
-    with mdr_neo4j_driver.session(database=mdr_db_name) as session:
-        # write to the clinical MDR db
-
-        # print("==  * Retiring codelists.")
-        # session.write_transaction(retire_codelists, packages_data, effective_date)
+    codelist_uids = [
+        codelist_data["codelist"]["concept_id"] for codelist_data in codelists_data
+    ]
+    term_uids = list(
+        {
+            term_data["term"]["uid"]
+            for codelist_data in codelists_data
+            for term_data in codelist_data["terms_data"]
+        }
+    )
+    with timed_step("Reading the existing codelists and terms from the MDR DB."):
+        with mdr_neo4j_driver.session(database=mdr_db_name) as session:
+            codelist_terms = session.read_transaction(
+                get_codelist_terms, codelist_uids, effective_date
+            )
+            all_existing_codelists = session.read_transaction(
+                _fetch_all_codelists, codelist_uids, effective_date
+            )
+            all_existing_terms = session.read_transaction(
+                _fetch_all_terms, term_uids, effective_date
+            )
+            session.close()
 
-        print("==  * Merging structure nodes and relationships.")
-        session.write_transaction(
-            merge_catalogues_and_packages,
-            packages_data,
-            effective_date,
+    with timed_step("Planning the changes."):
+        version_independent_data = plan_version_independent_data(codelists_data)
+        has_term_changes = plan_has_term_and_had_term_updates(
+            codelists_data, codelist_terms
         )
-        session.close()
-    print("==  * Merging version independant codelist data.")
-    with mdr_neo4j_driver.session(database=mdr_db_name) as session:
-        for data in codelists_data:
-            # This is split into three separate transactions to reduce ram footprint
-            session.write_transaction(
+        attribute_changes = plan_attribute_updates(
+            codelists_data, all_existing_codelists, all_existing_terms, effective_date
+        )
+    summary = attribute_changes["summary"]
+    print(f"==      Codelists:                    {len(codelists_data):6}")
+    print(
+        f"==      Terms:                        {len(version_independent_data['terms']):6}"
+    )
+    print(f"==      Terms added to codelists:     {has_term_changes['added_terms']:6}")
+    print(
+        f"==      Terms removed from codelists: {has_term_changes['removed_terms']:6}"
+    )
+    print(
+        f"==      Unchanged terms in codelists: {has_term_changes['unchanged_terms']:6}"
+    )
+    print(f"==      New codelists:       {summary['new_codelists']:6}")
+    print(f"==      Updated codelists:   {summary['updated_codelists']:6}")
+    print(f"==      Unchanged codelists: {summary['unchanged_codelists']:6}")
+    print(f"==      New terms:           {summary['new_terms']:6}")
+    print(f"==      Updated terms:       {summary['updated_terms']:6}")
+    print(f"==      Unchanged terms:     {summary['unchanged_terms']:6}")
+
+    if dry_run:
+        print("==  * Dry run, nothing has been written to the MDR DB.")
+    else:
+
+        def write(work, rows, *args):
+            write_in_batches(
+                mdr_neo4j_driver,
+                mdr_db_name,
+                work,
+                rows,
+                batch_size,
+                max_workers,
+                *args,
+            )
+
+        # write to the clinical MDR db
+        with timed_step("Merging structure nodes and relationships."):
+            with mdr_neo4j_driver.session(database=mdr_db_name) as session:
+                session.write_transaction(
+                    merge_catalogues_and_packages,
+                    packages_data,
+                    effective_date,
+                )
+                session.close()
+
+        with timed_step("Merging version independant codelist data."):
+            write(
                 merge_codelist_version_independent_data,
-                data,
+                version_independent_data["codelists"],
             )
-            session.write_transaction(
-                merge_codelist_packages_version_independent_data, data, effective_date
+            write(
+                merge_codelist_packages_version_independent_data,
+                version_independent_data["codelists"],
+                effective_date,
             )
-            session.write_transaction(
-                merge_codelist_terms_version_independent_data,
-                data,
+            write(
+                merge_term_version_independent_data, version_independent_data["terms"]
             )
-        session.close()
+            write(merge_package_terms, version_independent_data["package_terms"])
 
-    with mdr_neo4j_driver.session(database=mdr_db_name) as session:
-        print("==  * Updating HAS_TERM and HAD_TERM relationships.")
-        added_terms, removed_terms, unchanged_terms = session.write_transaction(
-            update_has_term_and_had_term_relationships, codelists_data, effective_date
-        )
-        print(f"==      Terms added to codelists:     {added_terms:6}")
-        print(f"==      Terms removed from codelists: {removed_terms:6}")
-        print(f"==      Unchanged terms in codelists: {unchanged_terms:6}")
-        session.close()
+        with timed_step("Updating HAS_TERM and HAD_TERM relationships."):
+            write(
+                deactivate_codelist_terms,
+                has_term_changes["terms_to_deactivate"],
+                effective_date,
+            )
+            write(add_codelist_terms, has_term_changes["terms_to_add"], effective_date)
+
+        with timed_step("Updating attributes."):
+            codelist_changes = attribute_changes["codelists"]
+            write(
+                create_initial_codelist_attributes_values,
+                codelist_changes["new"],
+                effective_date,
+            )
+            write(
+                create_initial_codelist_names,
+                codelist_changes["new"],
+                "Initial import from CDISC",
+            )
+            write(
+                create_new_version_codelist_attributes_values,
+                codelist_changes["updated"],
+                effective_date,
+            )
+            write(use_existing_codelist_attributes_values, codelist_changes["existing"])
 
-    with mdr_neo4j_driver.session(database=mdr_db_name) as session:
-        print("==  * Updating attributes.")
-        summary = session.write_transaction(
-            update_attributes, codelists_data, effective_date
-        )
-        print(f"==      New codelists:       {summary['new_codelists']:6}")
-        print(f"==      Updated codelists:   {summary['updated_codelists']:6}")
-        print(f"==      Unchanged codelists: {summary['unchanged_codelists']:6}")
-        print(f"==      New terms:           {summary['new_terms']:6}")
-        print(f"==      Updated terms:       {summary['updated_terms']:6}")
-        print(f"==      Unchanged terms:     {summary['unchanged_terms']:6}")
+            for term_changes in attribute_changes["term_rounds"]:
+                write(
+                    create_initial_term_attributes_values,
+                    term_changes["new"],
+                    effective_date,
+                )
+                write(
+                    create_initial_term_names,
+                    term_changes["new"],
+                    "Initial import from CDISC",
+                )
+                write(
+                    create_new_version_term_attributes_values,
+                    term_changes["updated"],
+                    effective_date,
+                )
+                write(use_existing_term_attributes_values, term_changes["existing"])
 
-        print("==  * Creating CT stats update job.")
-        session.write_transaction(create_ct_stats_update_job)
+        with mdr_neo4j_driver.session(database=mdr_db_name) as session:
+            print("==  * Creating CT stats update job.")
+            session.write_transaction(create_ct_stats_update_job)
 
-        session.close()
+            session.close()
 
     end_time = time.time()
     elapsed_time = end_time - start_time
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import time
 import os
 from typing import List
@@ -49,6 +51,32 @@ CLASS_VERSION_REL_TYPE = "HAS_INSTANCE"
 VARIABLE_VERSION_REL_TYPE = "HAS_INSTANCE"
 SCENARIO_VERSION_REL_TYPE = "HAS_INSTANCE"
 
+# Properties compared to decide if an existing instance can be reused
+CLASS_CONTENT_PROPERTIES = ("title", "label", "description")
+SCENARIO_CONTENT_PROPERTIES = ("label",)
+VARIABLE_CONTENT_PROPERTIES = (
+    "title",
+    "label",
+    "description",
+    "role",
+    "notes",
+    "variable_c_code",
+    "usage_restrictions",
+    "examples",
+    "value_list",
+    "described_value_domain",
+    "role_description",
+    "simple_datatype",
+    "implementation_notes",
+    "mapping_instructions",
+    "prompt",
+    "question_text",
+    "completion_instructions",
+    "core",
+)
+
+BATCH_SIZE = int(load_env("DATA_MODEL_IMPORT_BATCH_SIZE", "500"))
+
 VARIABLE_VALUE_LIST_MAPPINGS_FILE = load_env(
     "VARIABLE_VALUE_LIST_MAPPINGS_FILE",
     "cdisc_data/extra/variable_value_list_mappings.csv",
@@ -460,47 +488,186 @@ def merge_data_model(tx, version_data):
         link_ig_with_data_model(tx, version_data)
 
 
-def _get_class_instances(tx, catalogue, data_model_type, uid):
+def content_hash(properties: dict, content_properties) -> str:
+    """
+    Canonical hash of the given content properties of a class, scenario or variable instance.
+
+    Two instances with the same content hash have the same content, so an existing instance
+    can be reused by comparing hashes instead of comparing the properties one by one.
+    """
+    canonical_content = json.dumps(
+        [properties.get(name, None) for name in content_properties], default=str
+    )
+    return hashlib.sha256(canonical_content.encode("utf-8")).hexdigest()
+
+
+def _run_for_each_row(tx, query, rows, **parameters):
+    """
+    Runs the given query once for each of the given rows, available as `row` in the query.
+
+    The rows are sent in batches of BATCH_SIZE rows, each row being handled by its own subquery
+    so that it sees the changes made for the previous rows.
+    """
+    for start in range(0, len(rows), BATCH_SIZE):
+        tx.run(
+            f"""
+            UNWIND $rows AS row
+            CALL {{ WITH row
+                {query}
+            }}
+            RETURN count(*) AS nbr_rows
+            """,
+            rows=rows[start : start + BATCH_SIZE],
+            **parameters,
+        ).consume()
+
+
+def _get_instance_hashes(tx, query, content_properties, **parameters):
+    """
+    Gets the existing instances returned by the given query, by uid and content hash.
+
+    The query returns the uid, the id of each instance, the content hash stored on the instance,
+    and its properties when no content hash is stored yet, along with the id of the node to store it on.
+    The missing content hashes of the instances imported before are stored.
+    """
+    instance_hashes = {}
+    missing_hashes = []
+    for record in tx.run(query, **parameters):
+        instance_hash = record["content_hash"]
+        if instance_hash is None:
+            instance_hash = content_hash(record["properties"], content_properties)
+            missing_hashes.append(
+                {"id": record["hashed_id"], "content_hash": instance_hash}
+            )
+        instance_hashes.setdefault(record["uid"], {}).setdefault(
+            instance_hash, record["id"]
+        )
+
+    _run_for_each_row(
+        tx,
+        """
+        MATCH (node)
+        WHERE id(node)=row.id
+        SET node.content_hash=row.content_hash
+        """,
+        missing_hashes,
+    )
+
+    return instance_hashes
+
+
+def _merge_instances(tx, rows, get_instance_hashes, create_instances, use_instances):
+    """
+    Creates an instance for each of the given rows, or reuses an existing instance with the same content hash.
+
+    The rows are planned as if they were imported one after the other:
+    a row reuses the instance created for a previous row with the same uid and content hash.
+    The instances are created first, then the reused instances are linked, both in batches.
+
+    Returns the rows for which an instance has been created,
+    with the number of new, updated and unchanged instances.
+    """
+    instance_hashes = get_instance_hashes(tx, list({row["uid"] for row in rows}))
+
+    rows_to_create = []
+    rows_to_reuse = []
+    rows_to_reuse_created = []
+    nbr_unchanged = 0
+    nbr_updated = 0
+    nbr_new = 0
+    for row in rows:
+        instances = instance_hashes.setdefault(row["uid"], {})
+        if row["content_hash"] in instances:
+            instance_id = instances[row["content_hash"]]
+            if instance_id is None:
+                # reuses the instance created for a previous row
+                rows_to_reuse_created.append(row)
+            else:
+                rows_to_reuse.append({**row, "instance_id": instance_id})
+            nbr_unchanged += 1
+        else:
+            if instances:
+                nbr_updated += 1
+            else:
+                nbr_new += 1
+            instances[row["content_hash"]] = None
+            rows_to_create.append(row)
+
+    create_instances(tx, rows_to_create)
+
+    if rows_to_reuse_created:
+        created_instance_hashes = get_instance_hashes(
+            tx, list({row["uid"] for row in rows_to_reuse_created})
+        )
+        for row in rows_to_reuse_created:
+            instance_id = created_instance_hashes.get(row["uid"], {}).get(
+                row["content_hash"], None
+            )
+            if instance_id is not None:
+                rows_to_reuse.append({**row, "instance_id": instance_id})
+
+    use_instances(tx, rows_to_reuse)
+
+    return rows_to_create, (nbr_new, nbr_updated, nbr_unchanged)
+
+
+def _get_class_instance_hashes(tx, version_data, uids):
     class_root_label = ""
     version_to_class_rel_type = ""
-    if data_model_type == DataModelType.FOUNDATIONAL.value:
+    if version_data["data_model_type"] == DataModelType.FOUNDATIONAL.value:
         class_root_label = DATASET_CLASS_ROOT_LABEL
         version_to_class_rel_type = VERSION_TO_CLASS_REL_TYPE
-    elif data_model_type == DataModelType.IMPLEMENTATION.value:
+    elif version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
         class_root_label = DATASET_ROOT_LABEL
         version_to_class_rel_type = VERSION_TO_DATASET_REL_TYPE
-    result = tx.run(
+    return _get_instance_hashes(
+        tx,
         f"""
-                MATCH (:{class_root_label}{{uid: $uid}})-[:{CLASS_VERSION_REL_TYPE}]->(value)
-                    <-[:{version_to_class_rel_type}]-(:DataModelVersion)<-[:CONTAINS_VERSION]-(catalogue:DataModelCatalogue {{name: $catalogue}})
-                RETURN DISTINCT value
-                """,
-        uid=uid,
-        catalogue=catalogue,
+        UNWIND $uids AS uid
+        MATCH (:{class_root_label}{{uid: uid}})-[:{CLASS_VERSION_REL_TYPE}]->(value)
+            <-[:{version_to_class_rel_type}]-(:DataModelVersion)<-[:CONTAINS_VERSION]-(catalogue:DataModelCatalogue {{name: $catalogue}})
+        WITH DISTINCT uid, value
+        RETURN
+            uid,
+            id(value) AS id,
+            id(value) AS hashed_id,
+            value.content_hash AS content_hash,
+            CASE WHEN value.content_hash IS NULL THEN value{{.*}} END AS properties
+        """,
+        CLASS_CONTENT_PROPERTIES,
+        uids=uids,
+        catalogue=version_data["catalogue"],
     )
-    records = [record for record in result]
-
-    return records
 
 
-def _get_scenario_instances(tx, catalogue, uid):
+def _get_scenario_instance_hashes(tx, version_data, uids):
     scenario_root_label = SCENARIO_ROOT_LABEL
     version_to_scenario_rel_type = VERSION_TO_SCENARIO_REL_TYPE
-    result = tx.run(
+    return _get_instance_hashes(
+        tx,
         f"""
-                MATCH (:{scenario_root_label}{{uid: $uid}})-[:HAS_INSTANCE]->(instance)
-                    <-[:{version_to_scenario_rel_type}]-(:DataModelVersion)<-[:CONTAINS_VERSION]-(catalogue:DataModelCatalogue {{name: $catalogue}})
-                RETURN DISTINCT instance
-                """,
-        uid=uid,
-        catalogue=catalogue,
+        UNWIND $uids AS uid
+        MATCH (:{scenario_root_label}{{uid: uid}})-[:{SCENARIO_VERSION_REL_TYPE}]->(instance)
+            <-[:{version_to_scenario_rel_type}]-(:DataModelVersion)<-[:CONTAINS_VERSION]-(catalogue:DataModelCatalogue {{name: $catalogue}})
+        WITH DISTINCT uid, instance
+        RETURN
+            uid,
+            id(instance) AS id,
+            id(instance) AS hashed_id,
+            instance.content_hash AS content_hash,
+            CASE WHEN instance.content_hash IS NULL THEN instance{{.*}} END AS properties
+        """,
+        SCENARIO_CONTENT_PROPERTIES,
+        uids=uids,
+        catalogue=version_data["catalogue"],
     )
-    records = [record for record in result]
-
-    return records
 
 
-def _get_variable_instances(tx, catalogue, data_model_type, parent_type, uid):
+def _get_variable_instance_hashes(tx, version_data, parent_type, uids):
+    """
+    The content of a variable of a scenario is split between the variable instance
+    and its scenario implementation, so its content hash is stored on the scenario implementation.
+    """
     model_root_label = ""
     model_value_label = ""
     class_value_label = ""
@@ -512,13 +679,13 @@ def _get_variable_instances(tx, catalogue, data_model_type, parent_type, uid):
     scenario_to_variable_rel_type = SCENARIO_TO_VARIABLE_REL_TYPE
     variable_to_scenario_variable_rel_type = VARIABLE_TO_SCENARIO_VARIABLE_REL_TYPE
     scenario_variable_to_scenario_rel_type = SCENARIO_VARIABLE_TO_SCENARIO_REL_TYPE
-    if data_model_type == DataModelType.FOUNDATIONAL.value:
+    if version_data["data_model_type"] == DataModelType.FOUNDATIONAL.value:
         model_root_label = DATA_MODEL_ROOT_LABEL
         model_value_label = DATA_MODEL_VALUE_LABEL
         class_value_label = DATASET_CLASS_VALUE_LABEL
         variable_root_label = VARIABLE_CLASS_ROOT_LABEL
         version_to_variable_rel_type = VERSION_TO_VARIABLE_CLASS_REL_TYPE
-    elif data_model_type == DataModelType.IMPLEMENTATION.value:
+    elif version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
         model_root_label = DATA_MODEL_IG_ROOT_LABEL
         model_value_label = DATA_MODEL_IG_VALUE_LABEL
         class_value_label = DATASET_VALUE_LABEL
@@ -529,260 +696,182 @@ def _get_variable_instances(tx, catalogue, data_model_type, parent_type, uid):
 
     if parent_type == "class":
         query = f"""
-            MATCH (:{variable_root_label}{{uid: $uid}})-[:HAS_INSTANCE]->(instance)
+            UNWIND $uids AS uid
+            MATCH (:{variable_root_label}{{uid: uid}})-[:{VARIABLE_VERSION_REL_TYPE}]->(instance)
                 <-[:{version_to_variable_rel_type}]-(:DataModelVersion)<-[:CONTAINS_VERSION]-(catalogue:DataModelCatalogue {{name: $catalogue}})
-            RETURN DISTINCT instance
+            WITH DISTINCT uid, instance
+            RETURN
+                uid,
+                id(instance) AS id,
+                id(instance) AS hashed_id,
+                instance.content_hash AS content_hash,
+                CASE WHEN instance.content_hash IS NULL THEN instance{{.*}} END AS properties
         """
     elif parent_type == "scenario":
         query = f"""
-            MATCH (:{variable_root_label}{{uid: $uid}})-[:HAS_INSTANCE]->(instance)
+            UNWIND $uids AS uid
+            MATCH (:{variable_root_label}{{uid: uid}})-[:{VARIABLE_VERSION_REL_TYPE}]->(instance)
                 <-[:{scenario_to_variable_rel_type}]-(scenario:{scenario_value_label})<-[:{class_to_scenario_rel_type}]-(:{class_value_label})
                 <--(:{model_value_label})<--(:{model_root_label})<--(catalogue:DataModelCatalogue {{name: $catalogue}})
             MATCH (scenario)<-[:{scenario_variable_to_scenario_rel_type}]-(impl:{scenario_variable_value_label})
                 <-[:{variable_to_scenario_variable_rel_type}]-(instance)
-            RETURN DISTINCT apoc.map.mergeList([{{id: id(instance)}}, instance{{.*}}, impl{{.*}}]) AS instance
+            WITH DISTINCT uid, instance, impl
+            RETURN
+                uid,
+                id(instance) AS id,
+                id(impl) AS hashed_id,
+                impl.content_hash AS content_hash,
+                CASE WHEN impl.content_hash IS NULL THEN apoc.map.mergeList([instance{{.*}}, impl{{.*}}]) END AS properties
         """
-    result = tx.run(
+    return _get_instance_hashes(
+        tx,
         query,
-        uid=uid,
-        catalogue=catalogue,
+        VARIABLE_CONTENT_PROPERTIES,
+        uids=uids,
+        catalogue=version_data["catalogue"],
     )
-    records = [record for record in result]
-
-    return records
-
-
-def _get_reusable_class(existing_classes, target_class):
-    for _class in existing_classes:
-        value = _class["value"]
-        reusable_version_id = (
-            value.id if hasattr(value, "id") else value.get("id", None)
-        )
-
-        if (
-            value.get("title", None) != target_class.get("title", None)
-            or value.get("label", None) != target_class.get("label", None)
-            or value.get("description", None) != target_class.get("description", None)
-        ):
-            continue
-        else:
-            return reusable_version_id
-    return None
 
 
 def merge_classes(tx, version_data, classes_data):
-    nbr_unchanged = 0
-    nbr_updated = 0
-    nbr_new = 0
-    for class_data in classes_data:
-        _class = class_data.get("class", None)
+    rows = [
+        {
+            "uid": class_data["class"]["uid"],
+            "content_hash": content_hash(class_data["class"], CLASS_CONTENT_PROPERTIES),
+            "class_data": class_data["class"],
+        }
+        for class_data in classes_data
+    ]
+    _, (nbr_new, nbr_updated, nbr_unchanged) = _merge_instances(
+        tx,
+        rows,
+        get_instance_hashes=lambda tx, uids: _get_class_instance_hashes(
+            tx, version_data, uids
+        ),
+        create_instances=lambda tx, rows: create_class_instances(
+            tx, version_data, rows
+        ),
+        use_instances=lambda tx, rows: use_existing_class_instances(
+            tx, version_data, rows
+        ),
+    )
 
-        records = _get_class_instances(
+    prefixed_version_number = _prettify_version_number(version_data["version_number"])
+    if version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
+        link_datasets_with_classes(
             tx,
-            catalogue=version_data["catalogue"],
-            data_model_type=version_data["data_model_type"],
-            uid=_class["uid"],
+            classes=[class_data["class"] for class_data in classes_data],
+            prefixed_version_number=prefixed_version_number,
         )
-        if records:
-            reusable_version_id = _get_reusable_class(records, _class)
 
-            if reusable_version_id is None:
-                create_new_class_instance(tx, version_data=version_data, _class=_class)
-                nbr_updated += 1
-
-            else:
-                use_existing_class_instance(
-                    tx,
-                    version_data=version_data,
-                    _class=_class,
-                    reusable_instance_id=reusable_version_id,
-                )
-                nbr_unchanged += 1
-        else:
-            create_initial_class_instance(tx, version_data=version_data, _class=_class)
-            nbr_new += 1
-
-    for class_data in [
-        c["class"]
-        for c in classes_data
-        if c["class"]["subclasses"] is not None and len(c["class"]["subclasses"]) > 0
-    ]:
-        link_class_with_subclasses(
-            tx,
-            _class=class_data,
-            subclasses=class_data.get("subclasses", []),
-            prefixed_version_number=_prettify_version_number(
-                version_data["version_number"]
-            ),
-        )
+    link_classes_with_subclasses(
+        tx,
+        classes=[
+            c["class"]
+            for c in classes_data
+            if c["class"]["subclasses"] is not None
+            and len(c["class"]["subclasses"]) > 0
+        ],
+        prefixed_version_number=prefixed_version_number,
+    )
     return nbr_new, nbr_updated, nbr_unchanged
 
 
-def _get_reusable_scenario(existing_scenarios, target_scenario):
-    for scenario in existing_scenarios:
-        instance = scenario["instance"]
-        reusable_version_id = (
-            instance.id if hasattr(instance, "id") else instance.get("id", None)
-        )
-        if instance.get("label", None) != target_scenario.get("label", None):
-            continue
-        else:
-            return reusable_version_id
-
-
 def merge_scenarios(tx, version_data, scenarios_data):
-    nbr_unchanged = 0
-    nbr_updated = 0
-    nbr_new = 0
-    for scenario_data in scenarios_data:
-        scenario = scenario_data.get("scenario", None)
-        dataset_href = scenario_data.get("dataset_href", None)
-
-        records = _get_scenario_instances(
-            tx,
-            catalogue=version_data["catalogue"],
-            uid=scenario["uid"],
-        )
-        if records:
-            reusable_instance_id = _get_reusable_scenario(records, scenario)
-            if reusable_instance_id is None:
-                create_new_scenario_instance(
-                    tx,
-                    version_data=version_data,
-                    scenario=scenario,
-                    dataset_href=dataset_href,
-                )
-                nbr_updated += 1
-            else:
-                use_existing_scenario_instance(
-                    tx,
-                    version_data=version_data,
-                    scenario=scenario,
-                    dataset_href=dataset_href,
-                    reusable_instance_id=reusable_instance_id,
-                )
-                nbr_unchanged += 1
-        else:
-            create_initial_scenario_instance(tx, version_data, scenario, dataset_href)
-            nbr_new += 1
+    rows = [
+        {
+            "uid": scenario_data["scenario"]["uid"],
+            "content_hash": content_hash(
+                scenario_data["scenario"], SCENARIO_CONTENT_PROPERTIES
+            ),
+            "scenario_data": scenario_data["scenario"],
+            "dataset_href": scenario_data.get("dataset_href", None),
+        }
+        for scenario_data in scenarios_data
+    ]
+    _, counts = _merge_instances(
+        tx,
+        rows,
+        get_instance_hashes=lambda tx, uids: _get_scenario_instance_hashes(
+            tx, version_data, uids
+        ),
+        create_instances=lambda tx, rows: create_scenario_instances(
+            tx, version_data, rows
+        ),
+        use_instances=lambda tx, rows: use_existing_scenario_instances(
+            tx, version_data, rows
+        ),
+    )
 
-    return nbr_new, nbr_updated, nbr_unchanged
-
-
-def _get_reusable_variable(existing_variables, target_variable):
-    for _variable in existing_variables:
-        value = _variable["instance"]
-        reusable_version_id = (
-            value.id if hasattr(value, "id") else value.get("id", None)
-        )
-        if (
-            value.get("title", None) != target_variable.get("title", None)
-            or value.get("label", None) != target_variable.get("label", None)
-            or value.get("description", None)
-            != target_variable.get("description", None)
-            or value.get("role", None) != target_variable.get("role", None)
-            or value.get("notes", None) != target_variable.get("notes", None)
-            or value.get("variable_c_code", None)
-            != target_variable.get("variable_c_code", None)
-            or value.get("usage_restrictions", None)
-            != target_variable.get("usage_restrictions", None)
-            or value.get("examples", None) != target_variable.get("examples", None)
-            or value.get("value_list", None) != target_variable.get("value_list", None)
-            or value.get("described_value_domain", None)
-            != target_variable.get("described_value_domain", None)
-            or value.get("role_description", None)
-            != target_variable.get("role_description", None)
-            or value.get("simple_datatype", None)
-            != target_variable.get("simple_datatype", None)
-            or value.get("implementation_notes", None)
-            != target_variable.get("implementation_notes", None)
-            or value.get("mapping_instructions", None)
-            != target_variable.get("mapping_instructions", None)
-            or value.get("prompt", None) != target_variable.get("prompt", None)
-            or value.get("question_text", None)
-            != target_variable.get("question_text", None)
-            or value.get("completion_instructions", None)
-            != target_variable.get("completion_instructions", None)
-            or value.get("core", None) != target_variable.get("core", None)
-        ):
-            continue
-        else:
-            return reusable_version_id
-    return None
+    return counts
 
 
 def merge_variables(tx, version_data, variables_data):
     nbr_unchanged = 0
     nbr_updated = 0
     nbr_new = 0
-    for variable_data in variables_data:
-        # First, iterate over all variables
-        # If this uid already has at least one instance
-        # Then either create a new one if some properties changed
-        # Or reuse the instance with same properties
-        # If there are no instances at all, create one for the first time
-        variable = variable_data.get("variable", None)
-        parent_href = variable_data.get("parent_href", None)
-        parent_type = variable_data.get("parent_type", None)
 
-        value_list_mappings = parse_value_list_mapping_file()
+    value_list_mappings = parse_value_list_mapping_file()
+    terms_by_value = {}
 
-        records = _get_variable_instances(
+    # The instances of the variables of classes and of scenarios are looked up separately
+    for parent_type in ["class", "scenario"]:
+        rows = [
+            {
+                "uid": variable_data["variable"]["uid"],
+                "content_hash": content_hash(
+                    variable_data["variable"], VARIABLE_CONTENT_PROPERTIES
+                ),
+                "variable_data": variable_data["variable"],
+                "parent_href": variable_data.get("parent_href", None),
+            }
+            for variable_data in variables_data
+            if variable_data.get("parent_type", None) == parent_type
+        ]
+        if not rows:
+            continue
+
+        created_rows, counts = _merge_instances(
             tx,
-            catalogue=version_data["catalogue"],
-            data_model_type=version_data["data_model_type"],
-            parent_type=parent_type,
-            uid=variable["uid"],
+            rows,
+            get_instance_hashes=lambda tx, uids: _get_variable_instance_hashes(
+                tx, version_data, parent_type, uids
+            ),
+            create_instances=lambda tx, rows: create_variable_instances(
+                tx, version_data, parent_type, rows
+            ),
+            use_instances=lambda tx, rows: use_existing_variable_instances(
+                tx, version_data, parent_type, rows
+            ),
         )
-        if records:
-            reusable_instance_id = _get_reusable_variable(records, variable)
-            if reusable_instance_id is None:
-                create_new_variable_instance(
+        nbr_new += counts[0]
+        nbr_updated += counts[1]
+        nbr_unchanged += counts[2]
+
+        for row in created_rows:
+            if "value_list" in row["variable_data"]:
+                link_variable_with_value_terms(
                     tx,
                     version_data=version_data,
-                    variable=variable,
-                    parent_href=parent_href,
-                    parent_type=parent_type,
+                    variable=row["variable_data"],
+                    parent_href=row["parent_href"],
                     value_list_mappings=value_list_mappings,
+                    terms_by_value=terms_by_value,
                 )
-                nbr_updated += 1
-            else:
-                use_existing_variable_instance(
-                    tx,
-                    version_data=version_data,
-                    variable=variable,
-                    parent_href=parent_href,
-                    instance_node_id=reusable_instance_id,
-                    parent_type=parent_type,
-                )
-                nbr_unchanged += 1
-        else:
-            create_initial_variable_instance(
-                tx,
-                version_data=version_data,
-                variable=variable,
-                parent_href=parent_href,
-                parent_type=parent_type,
-                value_list_mappings=value_list_mappings,
-            )
-            nbr_new += 1
 
-    for variable_data in variables_data:
-        # Iterate again over all variables to create the QUALIFIES_VARIABLES relationships
-        # Those exist between two variables of the same version
-        # So we need to ensure everything has been created first or we will miss relationships
-        variable = variable_data.get("variable", None)
-        if (
-            "qualifies_variables" in variable
-            and len(variable["qualifies_variables"]) > 0
-        ):
-            create_qualify_variable_relationships(
-                tx,
-                source_variable=variable,
-                prefixed_version_number=_prettify_version_number(
-                    version_data["version_number"]
-                ),
-            )
+    # The QUALIFIES_VARIABLES relationships exist between two variables of the same version
+    # So they are created once all the variables have been created, or we will miss relationships
+    create_qualify_variable_relationships(
+        tx,
+        source_variables=[
+            variable_data["variable"]
+            for variable_data in variables_data
+            if "qualifies_variables" in variable_data["variable"]
+            and len(variable_data["variable"]["qualifies_variables"]) > 0
+        ],
+        prefixed_version_number=_prettify_version_number(
+            version_data["version_number"]
+        ),
+    )
 
     return nbr_new, nbr_updated, nbr_unchanged
 
@@ -821,182 +910,93 @@ def parse_value_list_mapping_file() -> "dict[str, ValueListMapping]":
     return value_list_mappings
 
 
-def create_initial_class_instance(tx, version_data, _class):
+def _build_class_instance_links_query(version_data):
     model_value_label = ""
-    class_root_label = ""
-    class_value_label = ""
     model_to_class_rel_type = ""
     version_to_model_rel_type = ""
     version_to_class_rel_type = ""
-    prefixed_version_number = _prettify_version_number(version_data["version_number"])
     if version_data["data_model_type"] == DataModelType.FOUNDATIONAL.value:
         model_value_label = DATA_MODEL_VALUE_LABEL
-        class_root_label = DATASET_CLASS_ROOT_LABEL
-        class_value_label = DATASET_CLASS_VALUE_LABEL
         model_to_class_rel_type = CATALOGUE_TO_CLASS_ROOT_REL_TYPE
         version_to_model_rel_type = VERSION_TO_DATA_MODEL_REL_TYPE
         version_to_class_rel_type = VERSION_TO_CLASS_REL_TYPE
     elif version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
         model_value_label = DATA_MODEL_IG_VALUE_LABEL
-        class_root_label = DATASET_ROOT_LABEL
-        class_value_label = DATASET_VALUE_LABEL
         model_to_class_rel_type = CATALOGUE_TO_DATASET_ROOT_REL_TYPE
         version_to_model_rel_type = VERSION_TO_DATA_MODEL_IG_REL_TYPE
         version_to_class_rel_type = VERSION_TO_DATASET_REL_TYPE
 
-    tx.run(
-        f"""
-            MATCH (root:{class_root_label}{{uid: $uid}})
-            CREATE (instance: {class_value_label})
-            SET
-               instance.title = $class_data.title,
-               instance.label = $class_data.label,
-               instance.description = $class_data.description
-            CREATE (root)-[:{CLASS_VERSION_REL_TYPE}]->(instance)
-
-            WITH instance
+    return f"""
             MATCH (dmv:DataModelVersion {{href: $version_href}})-[{version_to_model_rel_type}]->(model_value:{model_value_label})
             MERGE (dmv)-[contains_class:{version_to_class_rel_type}]->(instance)
-            SET contains_class.href=$class_data.href
+            SET contains_class.href=row.class_data.href
             MERGE (model_value)-[has_class:{model_to_class_rel_type}]->(instance)
-            ON CREATE SET has_class.ordinal = $class_data.ordinal
+            ON CREATE SET has_class.ordinal = row.class_data.ordinal
 
-            WITH instance
+            WITH row, instance
             MATCH ()-[rel]->(prior_instance_node)<-[:{CLASS_VERSION_REL_TYPE}]-(prior_root_node)
-            WHERE rel.href=$class_data.prior_version AND (rel:{VERSION_TO_CLASS_REL_TYPE} OR rel:{VERSION_TO_DATASET_REL_TYPE})
-            CALL apoc.do.when($uid<>prior_root_node.uid,
+            WHERE rel.href=row.class_data.prior_version AND (rel:{VERSION_TO_CLASS_REL_TYPE} OR rel:{VERSION_TO_DATASET_REL_TYPE})
+            CALL apoc.do.when(row.uid<>prior_root_node.uid,
                 'WITH $instance AS instance, $prior_instance_node AS prior_instance_node MERGE (instance)<-[rep:REPLACED_BY]-(prior_instance_node) SET rep.catalogue=$catalogue, rep.version_number=$prefixed_version_number RETURN rep',
                 '',
-                {{prior_instance_node: prior_instance_node, instance: instance, catalogue: $class_data.catalogue, prefixed_version_number: $prefixed_version_number}}
+                {{prior_instance_node: prior_instance_node, instance: instance, catalogue: row.class_data.catalogue, prefixed_version_number: $prefixed_version_number}}
             )
             YIELD value AS result
             RETURN result
-        """,
-        uid=_class["uid"],
-        effective_date=version_data["effective_date"],
-        class_data=_class,
-        version_href=version_data["href"],
-        prefixed_version_number=prefixed_version_number,
-        user_initials=USER_INITIALS,
-    )
-
-    if version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
-        link_dataset_with_class(tx, _class, prefixed_version_number)
+    """
 
 
-def create_new_class_instance(tx, version_data, _class):
-    model_value_label = ""
+def create_class_instances(tx, version_data, rows):
+    class_root_label = ""
     class_value_label = ""
-    model_to_class_rel_type = ""
-    version_to_model_rel_type = ""
-    version_to_class_rel_type = ""
-    prefixed_version_number = _prettify_version_number(version_data["version_number"])
     if version_data["data_model_type"] == DataModelType.FOUNDATIONAL.value:
-        model_value_label = DATA_MODEL_VALUE_LABEL
+        class_root_label = DATASET_CLASS_ROOT_LABEL
         class_value_label = DATASET_CLASS_VALUE_LABEL
-        model_to_class_rel_type = CATALOGUE_TO_CLASS_ROOT_REL_TYPE
-        version_to_model_rel_type = VERSION_TO_DATA_MODEL_REL_TYPE
-        version_to_class_rel_type = VERSION_TO_CLASS_REL_TYPE
     elif version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
-        model_value_label = DATA_MODEL_IG_VALUE_LABEL
+        class_root_label = DATASET_ROOT_LABEL
         class_value_label = DATASET_VALUE_LABEL
-        model_to_class_rel_type = CATALOGUE_TO_DATASET_ROOT_REL_TYPE
-        version_to_model_rel_type = VERSION_TO_DATA_MODEL_IG_REL_TYPE
-        version_to_class_rel_type = VERSION_TO_DATASET_REL_TYPE
 
-    tx.run(
+    _run_for_each_row(
+        tx,
         f"""
-            MATCH (root{{uid: $uid}})
-            CREATE (new_instance: {class_value_label})
+            MATCH (root:{class_root_label}{{uid: row.uid}})
+            CREATE (instance: {class_value_label})
             SET
-               new_instance.title = $class_data.title,
-               new_instance.label = $class_data.label,
-               new_instance.description = $class_data.description
-            CREATE (root)-[:{CLASS_VERSION_REL_TYPE}]->(new_instance)
-
-            WITH new_instance
-            MATCH (dmv:DataModelVersion {{href: $version_href}})-[{version_to_model_rel_type}]->(model_value:{model_value_label})
-            MERGE (dmv)-[contains_class:{version_to_class_rel_type}]->(new_instance)
-            SET contains_class.href=$class_data.href
-            MERGE (model_value)-[has_class:{model_to_class_rel_type}]->(new_instance)
-            ON CREATE SET has_class.ordinal = $class_data.ordinal
+               instance.title = row.class_data.title,
+               instance.label = row.class_data.label,
+               instance.description = row.class_data.description,
+               instance.content_hash = row.content_hash
+            CREATE (root)-[:{CLASS_VERSION_REL_TYPE}]->(instance)
 
-            WITH new_instance
-            MATCH ()-[rel]->(prior_instance_node)<-[:{CLASS_VERSION_REL_TYPE}]-(prior_root_node)
-            WHERE rel.href=$class_data.prior_version AND (rel:{VERSION_TO_CLASS_REL_TYPE} OR rel:{VERSION_TO_DATASET_REL_TYPE})
-            CALL apoc.do.when($uid<>prior_root_node.uid,
-                'WITH $new_instance AS new_instance, $prior_instance_node AS prior_instance_node MERGE (new_instance)<-[rep:REPLACED_BY]-(prior_instance_node) SET rep.catalogue=$catalogue, rep.version_number=$prefixed_version_number RETURN rep',
-                '',
-                {{prior_instance_node: prior_instance_node, new_instance: new_instance, catalogue: $class_data.catalogue, prefixed_version_number: $prefixed_version_number}}
-            )
-            YIELD value AS result
-            RETURN result
-        """,
-        uid=_class["uid"],
-        effective_date=version_data["effective_date"],
-        class_data=_class,
+            WITH row, instance
+        """
+        + _build_class_instance_links_query(version_data),
+        rows,
         version_href=version_data["href"],
-        prefixed_version_number=prefixed_version_number,
-        user_initials=USER_INITIALS,
+        prefixed_version_number=_prettify_version_number(
+            version_data["version_number"]
+        ),
     )
 
-    if version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
-        link_dataset_with_class(tx, _class, prefixed_version_number)
 
-
-def use_existing_class_instance(tx, version_data, _class, reusable_instance_id):
-    model_value_label = ""
-    model_to_class_rel_type = ""
-    version_to_model_rel_type = ""
-    version_to_class_rel_type = ""
-    prefixed_version_number = _prettify_version_number(version_data["version_number"])
-    if version_data["data_model_type"] == DataModelType.FOUNDATIONAL.value:
-        model_value_label = DATA_MODEL_VALUE_LABEL
-        model_to_class_rel_type = CATALOGUE_TO_CLASS_ROOT_REL_TYPE
-        version_to_model_rel_type = VERSION_TO_DATA_MODEL_REL_TYPE
-        version_to_class_rel_type = VERSION_TO_CLASS_REL_TYPE
-    elif version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
-        model_value_label = DATA_MODEL_IG_VALUE_LABEL
-        model_to_class_rel_type = CATALOGUE_TO_DATASET_ROOT_REL_TYPE
-        version_to_model_rel_type = VERSION_TO_DATA_MODEL_IG_REL_TYPE
-        version_to_class_rel_type = VERSION_TO_DATASET_REL_TYPE
-    tx.run(
-        f"""
+def use_existing_class_instances(tx, version_data, rows):
+    _run_for_each_row(
+        tx,
+        """
             MATCH (instance)
-            WHERE id(instance)=$reusable_instance_id
-            MATCH (dmv:DataModelVersion {{href: $version_href}})-[{version_to_model_rel_type}]->(model_value:{model_value_label})
-            MERGE (dmv)-[contains_class:{version_to_class_rel_type}]->(instance)
-            SET contains_class.href=$class_data.href
-            MERGE (model_value)-[has_class:{model_to_class_rel_type}]->(instance)
-            ON CREATE SET has_class.ordinal = $class_data.ordinal
-
-            WITH instance
-            MATCH ()-[rel]->(prior_instance_node)<-[:{CLASS_VERSION_REL_TYPE}]-(prior_root_node)
-            WHERE rel.href=$class_data.prior_version AND (rel:{VERSION_TO_CLASS_REL_TYPE} OR rel:{VERSION_TO_DATASET_REL_TYPE})
-            CALL apoc.do.when($uid<>prior_root_node.uid,
-                'WITH $instance AS instance, $prior_instance_node AS prior_instance_node MERGE (instance)<-[rep:REPLACED_BY]-(prior_instance_node) SET rep.catalogue=$catalogue, rep.version_number=$prefixed_version_number RETURN rep',
-                '',
-                {{prior_instance_node: prior_instance_node, instance: instance, catalogue: $class_data.catalogue, prefixed_version_number: $prefixed_version_number}}
-            )
-            YIELD value AS result
-            RETURN result
-        """,
-        uid=_class["uid"],
-        reusable_instance_id=reusable_instance_id,
-        class_data=_class,
+            WHERE id(instance)=row.instance_id
+        """
+        + _build_class_instance_links_query(version_data),
+        rows,
         version_href=version_data["href"],
-        prefixed_version_number=prefixed_version_number,
+        prefixed_version_number=_prettify_version_number(
+            version_data["version_number"]
+        ),
     )
 
-    if version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
-        link_dataset_with_class(tx, _class, prefixed_version_number)
-
 
-def create_initial_scenario_instance(tx, version_data, scenario, dataset_href):
-    prefixed_version_number = _prettify_version_number(version_data["version_number"])
+def _build_scenario_instance_links_query(version_data):
     class_value_label = ""
-    scenario_root_label = SCENARIO_ROOT_LABEL
-    scenario_value_label = SCENARIO_VALUE_LABEL
     class_to_scenario_rel_type = CLASS_TO_SCENARIO_REL_TYPE
     version_to_class_rel_type = ""
     version_to_scenario_rel_type = VERSION_TO_SCENARIO_REL_TYPE
@@ -1007,102 +1007,53 @@ def create_initial_scenario_instance(tx, version_data, scenario, dataset_href):
         class_value_label = DATASET_VALUE_LABEL
         version_to_class_rel_type = VERSION_TO_DATASET_REL_TYPE
 
-    tx.run(
-        f"""
-            MATCH (root:{scenario_root_label}{{uid: $uid}})
-            CREATE (instance:{scenario_value_label})
-            SET
-               instance.label = $scenario_data.label
-            CREATE (root)-[:{SCENARIO_VERSION_REL_TYPE}]->(instance)
-
-            WITH instance
-            MATCH (dmv:DataModelVersion {{href: $version_href}})-[rel:{version_to_class_rel_type}]->(class_value:{class_value_label})
-                WHERE rel.href=$dataset_href
-            MERGE (dmv)-[contains_scenario:{version_to_scenario_rel_type} {{href: $scenario_data.href}}]->(instance)
-            MERGE (class_value)-[has_scenario:{class_to_scenario_rel_type}]->(instance)
-            SET contains_scenario.href=$scenario_data.href, has_scenario.ordinal = $scenario_data.ordinal, has_scenario.version_number = $prefixed_version_number
-        """,
-        uid=scenario["uid"],
-        effective_date=version_data["effective_date"],
-        prefixed_version_number=prefixed_version_number,
-        scenario_data=scenario,
-        version_href=version_data["href"],
-        dataset_href=dataset_href,
-        user_initials=USER_INITIALS,
-    )
+    return f"""
+        MATCH (dmv:DataModelVersion {{href: $version_href}})-[rel:{version_to_class_rel_type}]->(class_value:{class_value_label})
+            WHERE rel.href=row.dataset_href
+        MERGE (dmv)-[:{version_to_scenario_rel_type} {{href: row.scenario_data.href}}]->(instance)
+        CREATE (class_value)-[has_scenario:{class_to_scenario_rel_type}]->(instance)
+        SET has_scenario.ordinal = row.scenario_data.ordinal, has_scenario.version_number = $prefixed_version_number
+    """
 
 
-def create_new_scenario_instance(tx, version_data, scenario, dataset_href):
-    prefixed_version_number = _prettify_version_number(version_data["version_number"])
-    class_value_label = ""
+def create_scenario_instances(tx, version_data, rows):
+    scenario_root_label = SCENARIO_ROOT_LABEL
     scenario_value_label = SCENARIO_VALUE_LABEL
-    class_to_scenario_rel_type = CLASS_TO_SCENARIO_REL_TYPE
-    version_to_class_rel_type = ""
-    version_to_scenario_rel_type = VERSION_TO_SCENARIO_REL_TYPE
-    if version_data["data_model_type"] == DataModelType.FOUNDATIONAL.value:
-        class_value_label = DATASET_CLASS_VALUE_LABEL
-        version_to_class_rel_type = VERSION_TO_CLASS_REL_TYPE
-    elif version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
-        class_value_label = DATASET_VALUE_LABEL
-        version_to_class_rel_type = VERSION_TO_DATASET_REL_TYPE
 
-    tx.run(
+    _run_for_each_row(
+        tx,
         f"""
-        MATCH (root{{uid: $uid}})
-        CREATE (new_instance: {scenario_value_label})
-        SET
-            new_instance.label = $scenario_data.label
-        CREATE (root)-[:{SCENARIO_VERSION_REL_TYPE}]->(new_instance)
+            MATCH (root:{scenario_root_label}{{uid: row.uid}})
+            CREATE (instance:{scenario_value_label})
+            SET
+               instance.label = row.scenario_data.label,
+               instance.content_hash = row.content_hash
+            CREATE (root)-[:{SCENARIO_VERSION_REL_TYPE}]->(instance)
 
-        WITH new_instance
-        MATCH (dmv:DataModelVersion {{href: $version_href}})-[rel:{version_to_class_rel_type}]->(class_value:{class_value_label})
-            WHERE rel.href=$dataset_href
-        MERGE (dmv)-[contains_scenario:{version_to_scenario_rel_type} {{href: $scenario_data.href}}]->(new_instance)
-        CREATE (class_value)-[has_scenario:{class_to_scenario_rel_type}]->(new_instance)
-        SET contains_scenario.href=$scenario_data.href, has_scenario.ordinal = $scenario_data.ordinal, has_scenario.version_number = $prefixed_version_number
-        """,
-        uid=scenario["uid"],
-        effective_date=version_data["effective_date"],
-        prefixed_version_number=prefixed_version_number,
-        scenario_data=scenario,
+            WITH row, instance
+        """
+        + _build_scenario_instance_links_query(version_data),
+        rows,
         version_href=version_data["href"],
-        dataset_href=dataset_href,
-        user_initials=USER_INITIALS,
+        prefixed_version_number=_prettify_version_number(
+            version_data["version_number"]
+        ),
     )
 
 
-def use_existing_scenario_instance(
-    tx, version_data, scenario, dataset_href, reusable_instance_id
-):
-    prefixed_version_number = _prettify_version_number(version_data["version_number"])
-    class_value_label = ""
-    class_to_scenario_rel_type = CLASS_TO_SCENARIO_REL_TYPE
-    version_to_class_rel_type = ""
-    version_to_scenario_rel_type = VERSION_TO_SCENARIO_REL_TYPE
-    if version_data["data_model_type"] == DataModelType.FOUNDATIONAL.value:
-        class_value_label = DATASET_CLASS_VALUE_LABEL
-        version_to_class_rel_type = VERSION_TO_CLASS_REL_TYPE
-    elif version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
-        class_value_label = DATASET_VALUE_LABEL
-        version_to_class_rel_type = VERSION_TO_DATASET_REL_TYPE
-
-    tx.run(
-        f"""
+def use_existing_scenario_instances(tx, version_data, rows):
+    _run_for_each_row(
+        tx,
+        """
         MATCH (instance)
-        WHERE id(instance)=$reusable_instance_id
-        MATCH (dmv:DataModelVersion {{href: $version_href}})-[rel:{version_to_class_rel_type}]->(class_value:{class_value_label})
-            WHERE rel.href=$dataset_href
-        MERGE (dmv)-[:{version_to_scenario_rel_type} {{href: $scenario_data.href}}]->(instance)
-        CREATE (class_value)-[has_scenario:{class_to_scenario_rel_type}]->(instance)
-        SET has_scenario.ordinal = $scenario_data.ordinal, has_scenario.version_number = $prefixed_version_number
-        """,
-        uid=scenario["uid"],
-        reusable_instance_id=reusable_instance_id,
-        effective_date=version_data["effective_date"],
-        prefixed_version_number=prefixed_version_number,
-        scenario_data=scenario,
+        WHERE id(instance)=row.instance_id
+        """
+        + _build_scenario_instance_links_query(version_data),
+        rows,
         version_href=version_data["href"],
-        dataset_href=dataset_href,
+        prefixed_version_number=_prettify_version_number(
+            version_data["version_number"]
+        ),
     )
 
 
@@ -1142,11 +1093,11 @@ def build_variable_instance_query(
     create = f"""
             CREATE ({instance_node_variable_name}:{variable_value_label})
             SET
-               {instance_node_variable_name}.title = $variable_data.title,
-               {instance_node_variable_name}.label = $variable_data.label,
-               {instance_node_variable_name}.simple_datatype = $variable_data.simple_datatype
+               {instance_node_variable_name}.title = row.variable_data.title,
+               {instance_node_variable_name}.label = row.variable_data.label,
+               {instance_node_variable_name}.simple_datatype = row.variable_data.simple_datatype
     """
-    with_clause = f" WITH {instance_node_variable_name} "
+    with_clause = f" WITH row, {instance_node_variable_name} "
 
     versioning = f"""
         , root
@@ -1156,17 +1107,17 @@ def build_variable_instance_query(
     variable_parents = ""
 
     codelists = """
-        UNWIND $variable_data.codelists AS codelist
+        UNWIND row.variable_data.codelists AS codelist
         MATCH (c:CTCodelistRoot {uid: codelist})
     """
 
     prior_version = f"""
         MATCH ()-[rel]->(prior_instance_node)<-[:{VARIABLE_VERSION_REL_TYPE}]-(prior_root_node)
-        WHERE rel.href=$variable_data.prior_version AND (rel:{VERSION_TO_VARIABLE_CLASS_REL_TYPE} OR rel:{VERSION_TO_DATASET_VARIABLE_REL_TYPE})
-        CALL apoc.do.when($uid<>prior_root_node.uid,
+        WHERE rel.href=row.variable_data.prior_version AND (rel:{VERSION_TO_VARIABLE_CLASS_REL_TYPE} OR rel:{VERSION_TO_DATASET_VARIABLE_REL_TYPE})
+        CALL apoc.do.when(row.uid<>prior_root_node.uid,
             'WITH ${instance_node_variable_name} AS {instance_node_variable_name}, $prior_instance_node AS prior_instance_node MERGE ({instance_node_variable_name})<-[rep:REPLACED_BY]-(prior_instance_node) SET rep.catalogue=$catalogue, rep.version_number=$prefixed_version_number RETURN rep',
             '',
-            {{prior_instance_node: prior_instance_node, {instance_node_variable_name}: {instance_node_variable_name}, catalogue: $variable_data.catalogue, prefixed_version_number: $prefixed_version_number}}
+            {{prior_instance_node: prior_instance_node, {instance_node_variable_name}: {instance_node_variable_name}, catalogue: row.variable_data.catalogue, prefixed_version_number: $prefixed_version_number}}
         )
         YIELD value AS result
         RETURN result
@@ -1174,29 +1125,30 @@ def build_variable_instance_query(
 
     if parent_type == "class":
         create += f""",
-                {instance_node_variable_name}.description = $variable_data.description,
-                {instance_node_variable_name}.role = $variable_data.role,
-                {instance_node_variable_name}.notes = $variable_data.notes,
-                {instance_node_variable_name}.variable_c_code = $variable_data.variable_c_code,
-                {instance_node_variable_name}.usage_restrictions = $variable_data.usage_restrictions,
-                {instance_node_variable_name}.examples = $variable_data.examples,
-                {instance_node_variable_name}.value_list = $variable_data.value_list,
-                {instance_node_variable_name}.described_value_domain = $variable_data.described_value_domain,
-                {instance_node_variable_name}.role_description = $variable_data.role_description,
-                {instance_node_variable_name}.implementation_notes = $variable_data.implementation_notes,
-                {instance_node_variable_name}.mapping_instructions = $variable_data.mapping_instructions,
-                {instance_node_variable_name}.prompt = $variable_data.prompt,
-                {instance_node_variable_name}.question_text = $variable_data.question_text,
-                {instance_node_variable_name}.completion_instructions = $variable_data.completion_instructions,
-                {instance_node_variable_name}.core = $variable_data.core
+                {instance_node_variable_name}.description = row.variable_data.description,
+                {instance_node_variable_name}.role = row.variable_data.role,
+                {instance_node_variable_name}.notes = row.variable_data.notes,
+                {instance_node_variable_name}.variable_c_code = row.variable_data.variable_c_code,
+                {instance_node_variable_name}.usage_restrictions = row.variable_data.usage_restrictions,
+                {instance_node_variable_name}.examples = row.variable_data.examples,
+                {instance_node_variable_name}.value_list = row.variable_data.value_list,
+                {instance_node_variable_name}.described_value_domain = row.variable_data.described_value_domain,
+                {instance_node_variable_name}.role_description = row.variable_data.role_description,
+                {instance_node_variable_name}.implementation_notes = row.variable_data.implementation_notes,
+                {instance_node_variable_name}.mapping_instructions = row.variable_data.mapping_instructions,
+                {instance_node_variable_name}.prompt = row.variable_data.prompt,
+                {instance_node_variable_name}.question_text = row.variable_data.question_text,
+                {instance_node_variable_name}.completion_instructions = row.variable_data.completion_instructions,
+                {instance_node_variable_name}.core = row.variable_data.core,
+                {instance_node_variable_name}.content_hash = row.content_hash
         """
 
         variable_parents = f"""
             MATCH (dmv:DataModelVersion {{href: $version_href}})-[rel:{version_to_class_rel_type}]->(class_value:{class_value_label})
-                WHERE rel.href=$parent_href
-            MERGE (dmv)-[:{version_to_variable_rel_type} {{href: $variable_data.href}}]->({instance_node_variable_name})
+                WHERE rel.href=row.parent_href
+            MERGE (dmv)-[:{version_to_variable_rel_type} {{href: row.variable_data.href}}]->({instance_node_variable_name})
             MERGE (class_value)-[has_variable:{class_to_variable_rel_type} {{
-                ordinal: $variable_data.ordinal,
+                ordinal: row.variable_data.ordinal,
                 version_number: $prefixed_version_number
             }}]->({instance_node_variable_name})
         """
@@ -1210,31 +1162,32 @@ def build_variable_instance_query(
         create += f"""
             CREATE ({scenario_value_variable_name}:{scenario_variable_value_label})
             SET
-                {scenario_value_variable_name}.description = $variable_data.description,
-                {scenario_value_variable_name}.role = $variable_data.role,
-                {scenario_value_variable_name}.notes = $variable_data.notes,
-                {scenario_value_variable_name}.variable_c_code = $variable_data.variable_c_code,
-                {scenario_value_variable_name}.usage_restrictions = $variable_data.usage_restrictions,
-                {scenario_value_variable_name}.examples = $variable_data.examples,
-                {scenario_value_variable_name}.value_list = $variable_data.value_list,
-                {scenario_value_variable_name}.described_value_domain = $variable_data.described_value_domain,
-                {scenario_value_variable_name}.role_description = $variable_data.role_description,
-                {scenario_value_variable_name}.implementation_notes = $variable_data.implementation_notes,
-                {scenario_value_variable_name}.mapping_instructions = $variable_data.mapping_instructions,
-                {scenario_value_variable_name}.prompt = $variable_data.prompt,
-                {scenario_value_variable_name}.question_text = $variable_data.question_text,
-                {scenario_value_variable_name}.completion_instructions = $variable_data.completion_instructions,
-                {scenario_value_variable_name}.core = $variable_data.core
+                {scenario_value_variable_name}.description = row.variable_data.description,
+                {scenario_value_variable_name}.role = row.variable_data.role,
+                {scenario_value_variable_name}.notes = row.variable_data.notes,
+                {scenario_value_variable_name}.variable_c_code = row.variable_data.variable_c_code,
+                {scenario_value_variable_name}.usage_restrictions = row.variable_data.usage_restrictions,
+                {scenario_value_variable_name}.examples = row.variable_data.examples,
+                {scenario_value_variable_name}.value_list = row.variable_data.value_list,
+                {scenario_value_variable_name}.described_value_domain = row.variable_data.described_value_domain,
+                {scenario_value_variable_name}.role_description = row.variable_data.role_description,
+                {scenario_value_variable_name}.implementation_notes = row.variable_data.implementation_notes,
+                {scenario_value_variable_name}.mapping_instructions = row.variable_data.mapping_instructions,
+                {scenario_value_variable_name}.prompt = row.variable_data.prompt,
+                {scenario_value_variable_name}.question_text = row.variable_data.question_text,
+                {scenario_value_variable_name}.completion_instructions = row.variable_data.completion_instructions,
+                {scenario_value_variable_name}.core = row.variable_data.core,
+                {scenario_value_variable_name}.content_hash = row.content_hash
             CREATE ({instance_node_variable_name})-[var_sc_rel:{variable_value_to_scenario_variable_value_rel_type}]->({scenario_value_variable_name})
             SET var_sc_rel.version_number = $prefixed_version_number
         """
 
         variable_parents = f"""
             MATCH (dmv:DataModelVersion {{href: $version_href}})-[rel:{version_to_scenario_rel_type}]->(scenario_value:{scenario_value_label})
-                WHERE rel.href=$parent_href
-            MERGE (dmv)-[:{version_to_variable_rel_type} {{href: $variable_data.href}}]->({instance_node_variable_name})
+                WHERE rel.href=row.parent_href
+            MERGE (dmv)-[:{version_to_variable_rel_type} {{href: row.variable_data.href}}]->({instance_node_variable_name})
             MERGE (scenario_value)-[has_variable:{scenario_to_variable_rel_type} {{
-                ordinal: $variable_data.ordinal,
+                ordinal: row.variable_data.ordinal,
                 version_number: $prefixed_version_number
             }}]->({instance_node_variable_name})
             MERGE (dmv)-[contains_scenario_variable:{version_to_scenario_variable_rel_type}]->({scenario_value_variable_name})
@@ -1257,10 +1210,7 @@ def build_variable_instance_query(
     return full_query
 
 
-def create_initial_variable_instance(
-    tx, version_data, variable, parent_href, parent_type, value_list_mappings
-):
-    prefixed_version_number = _prettify_version_number(version_data["version_number"])
+def create_variable_instances(tx, version_data, parent_type, rows):
     variable_root_label = ""
     if version_data["data_model_type"] == DataModelType.FOUNDATIONAL.value:
         variable_root_label = VARIABLE_CLASS_ROOT_LABEL
@@ -1268,8 +1218,8 @@ def create_initial_variable_instance(
         variable_root_label = DATASET_VARIABLE_ROOT_LABEL
 
     initial_part = f"""
-        MATCH (root:{variable_root_label}{{uid: $uid}})
-        WITH root
+        MATCH (root:{variable_root_label}{{uid: row.uid}})
+        WITH row, root
     """
 
     full_query = initial_part + build_variable_instance_query(
@@ -1278,76 +1228,21 @@ def create_initial_variable_instance(
         version_data=version_data,
     )
 
-    tx.run(
-        full_query,
-        uid=variable["uid"],
-        effective_date=version_data["effective_date"],
-        prefixed_version_number=prefixed_version_number,
-        variable_data=variable,
-        version_href=version_data["href"],
-        parent_href=parent_href,
-        user_initials=USER_INITIALS,
-    )
-
-    if "value_list" in variable:
-        link_variable_with_value_terms(
-            tx,
-            version_data=version_data,
-            variable=variable,
-            parent_href=parent_href,
-            value_list_mappings=value_list_mappings,
-        )
-
-
-def create_new_variable_instance(
-    tx, version_data, variable, parent_href, parent_type, value_list_mappings
-):
-    prefixed_version_number = _prettify_version_number(version_data["version_number"])
-    variable_root_label = ""
-    if version_data["data_model_type"] == DataModelType.FOUNDATIONAL.value:
-        variable_root_label = VARIABLE_CLASS_ROOT_LABEL
-    elif version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
-        variable_root_label = DATASET_VARIABLE_ROOT_LABEL
-
-    initial_part = f"""
-        MATCH (root:{variable_root_label}{{uid: $uid}})
-        WITH root
-    """
-
-    full_query = initial_part + build_variable_instance_query(
-        instance_node_variable_name="new_value",
-        parent_type=parent_type,
-        version_data=version_data,
-    )
-    tx.run(
+    _run_for_each_row(
+        tx,
         full_query,
-        uid=variable["uid"],
-        effective_date=version_data["effective_date"],
-        prefixed_version_number=prefixed_version_number,
-        variable_data=variable,
+        rows,
+        prefixed_version_number=_prettify_version_number(
+            version_data["version_number"]
+        ),
         version_href=version_data["href"],
-        parent_href=parent_href,
-        user_initials=USER_INITIALS,
     )
 
-    if "value_list" in variable:
-        link_variable_with_value_terms(
-            tx,
-            version_data=version_data,
-            variable=variable,
-            parent_href=parent_href,
-            value_list_mappings=value_list_mappings,
-        )
-
-
-def use_existing_variable_instance(
-    tx, version_data, variable, parent_href, instance_node_id, parent_type
-):
-    prefixed_version_number = _prettify_version_number(version_data["version_number"])
 
+def use_existing_variable_instances(tx, version_data, parent_type, rows):
     initial_part = """
         MATCH (instance)
-        WHERE id(instance)=$instance_node_id
+        WHERE id(instance)=row.instance_id
     """
 
     full_query = initial_part + build_variable_instance_query(
@@ -1357,15 +1252,14 @@ def use_existing_variable_instance(
         version_data=version_data,
     )
 
-    tx.run(
+    _run_for_each_row(
+        tx,
         full_query,
-        uid=variable["uid"],
-        instance_node_id=instance_node_id,
-        effective_date=version_data["effective_date"],
-        prefixed_version_number=prefixed_version_number,
-        variable_data=variable,
+        rows,
+        prefixed_version_number=_prettify_version_number(
+            version_data["version_number"]
+        ),
         version_href=version_data["href"],
-        parent_href=parent_href,
     )
 
 
@@ -1381,42 +1275,54 @@ def link_ig_with_data_model(tx, version_data):
     )
 
 
-def link_dataset_with_class(tx, _class, prefixed_version_number):
-    if "implements_class" in _class:
-        tx.run(
-            f"""
-                MATCH (:DataModelVersion)-[rel:{VERSION_TO_DATASET_REL_TYPE}]->(dataset_instance:DatasetInstance)
-                WHERE rel.href=$class_href
-                MATCH (:DataModelVersion)-[implemented_rel:{VERSION_TO_CLASS_REL_TYPE}]->(class_instance:DatasetClassInstance)
-                WHERE implemented_rel.href=$implements_class_href
-                MERGE (dataset_instance)-[:IMPLEMENTS_DATASET_CLASS {{
-                    catalogue: $catalogue,
-                    version_number: $prefixed_version_number
-                }}]->(class_instance)
-            """,
-            class_href=_class["href"],
-            implements_class_href=_class["implements_class"],
-            catalogue=_class["catalogue"],
-            prefixed_version_number=prefixed_version_number,
-        )
+def link_datasets_with_classes(tx, classes, prefixed_version_number):
+    _run_for_each_row(
+        tx,
+        f"""
+            MATCH (:DataModelVersion)-[rel:{VERSION_TO_DATASET_REL_TYPE}]->(dataset_instance:DatasetInstance)
+            WHERE rel.href=row.class_href
+            MATCH (:DataModelVersion)-[implemented_rel:{VERSION_TO_CLASS_REL_TYPE}]->(class_instance:DatasetClassInstance)
+            WHERE implemented_rel.href=row.implements_class_href
+            MERGE (dataset_instance)-[:IMPLEMENTS_DATASET_CLASS {{
+                catalogue: row.catalogue,
+                version_number: $prefixed_version_number
+            }}]->(class_instance)
+        """,
+        [
+            {
+                "class_href": _class["href"],
+                "implements_class_href": _class["implements_class"],
+                "catalogue": _class["catalogue"],
+            }
+            for _class in classes
+            if "implements_class" in _class
+        ],
+        prefixed_version_number=prefixed_version_number,
+    )
 
 
-def link_class_with_subclasses(tx, _class, subclasses, prefixed_version_number):
-    tx.run(
+def link_classes_with_subclasses(tx, classes, prefixed_version_number):
+    _run_for_each_row(
+        tx,
         f"""
-            UNWIND $subclasses AS subclass_href
+            UNWIND row.subclasses AS subclass_href
             MATCH (:DataModelVersion)-[rel]->(class_value)
-            WHERE rel.href=$class_href AND type(rel) IN ["{VERSION_TO_CLASS_REL_TYPE}", "{VERSION_TO_DATASET_REL_TYPE}"]
+            WHERE rel.href=row.class_href AND type(rel) IN ["{VERSION_TO_CLASS_REL_TYPE}", "{VERSION_TO_DATASET_REL_TYPE}"]
             MATCH (:DataModelVersion)-[rel_sub:{VERSION_TO_CLASS_REL_TYPE}]->(subclass_value)
             WHERE rel_sub.href=subclass_href AND type(rel_sub) IN ["{VERSION_TO_CLASS_REL_TYPE}", "{VERSION_TO_DATASET_REL_TYPE}"]
             MERGE (class_value)<-[:HAS_PARENT_CLASS {{
-                catalogue: $catalogue,
+                catalogue: row.catalogue,
                 version_number: $prefixed_version_number
             }}]-(subclass_value)
         """,
-        class_href=_class["href"],
-        subclasses=subclasses,
-        catalogue=_class["catalogue"],
+        [
+            {
+                "class_href": _class["href"],
+                "subclasses": _class.get("subclasses", []),
+                "catalogue": _class["catalogue"],
+            }
+            for _class in classes
+        ],
         prefixed_version_number=prefixed_version_number,
     )
 
@@ -1494,12 +1400,20 @@ def terms_name_codelist_mapping(tx, term_name):
     return terms_data
 
 
+def _get_terms_data(tx, term_name, terms_by_value):
+    # The terms don't change during the import, so they are looked up once for each value
+    if term_name not in terms_by_value:
+        terms_by_value[term_name] = terms_name_codelist_mapping(tx, term_name)
+    return terms_by_value[term_name]
+
+
 def link_variable_with_value_terms(
     tx,
     version_data: dict,
     variable: dict,
     parent_href: str,
     value_list_mappings: "dict[str, ValueListMapping]",
+    terms_by_value: dict,
 ):
     previous_codelist_uid = None
     match_variable_clause = f"""
@@ -1508,7 +1422,7 @@ def link_variable_with_value_terms(
     """
     create_relationship_clause = "MERGE (variable_instance)-[:REFERENCES_TERM]->(term)"
     for _value in variable["value_list"]:
-        terms_data = terms_name_codelist_mapping(tx, _value)
+        terms_data = _get_terms_data(tx, _value, terms_by_value)
 
         # If there is only one CCode, then link the variable with it
         if len(terms_data) == 1:
@@ -1533,7 +1447,7 @@ def link_variable_with_value_terms(
                     _value = "UNKNOWN"
 
                     # Re-run the terms query for the replacement
-                    terms_data = terms_name_codelist_mapping(tx, _value)
+                    terms_data = _get_terms_data(tx, _value, terms_by_value)
 
                 # Link variable with terms
                 # Find the term which belongs to the same codelist as the previous hit
@@ -1649,22 +1563,30 @@ def link_variable_with_value_terms(
                     )
 
 
-def create_qualify_variable_relationships(tx, source_variable, prefixed_version_number):
-    tx.run(
+def create_qualify_variable_relationships(
+    tx, source_variables, prefixed_version_number
+):
+    _run_for_each_row(
+        tx,
         f"""
-            UNWIND $targets_href AS target_href
+            UNWIND row.targets_href AS target_href
             MATCH ()-[source_rel:{VERSION_TO_VARIABLE_CLASS_REL_TYPE}]->(source_variable_value)
-            WHERE source_rel.href=$source_href
+            WHERE source_rel.href=row.source_href
             MATCH ()-[target_rel:{VERSION_TO_VARIABLE_CLASS_REL_TYPE}]->(target_variable_value)
             WHERE target_rel.href=target_href
                 MERGE (source_variable_value)-[:QUALIFIES_VARIABLE{{
-                    catalogue: $catalogue,
+                    catalogue: row.catalogue,
                     version_number: $prefixed_version_number
                 }}]->(target_variable_value)
         """,
-        source_href=source_variable["href"],
-        targets_href=source_variable["qualifies_variables"],
-        catalogue=source_variable["catalogue"],
+        [
+            {
+                "source_href": source_variable["href"],
+                "targets_href": source_variable["qualifies_variables"],
+                "catalogue": source_variable["catalogue"],
+            }
+            for source_variable in source_variables
+        ],
         prefixed_version_number=prefixed_version_number,
     )
 
@@ -1,15 +1,21 @@
 from os import environ
 from mdr_standards_import.scripts.import_scripts.cdisc_ct.import_into_mdr_db import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_WORKERS,
     import_from_cdisc_db_into_mdr,
 )
 from mdr_standards_import.scripts.utils import (
     get_cdisc_neo4j_driver,
     get_mdr_neo4j_driver,
+    string_to_boolean,
 )
 
 
 CDISC_IMPORT_DATABASE = environ.get("NEO4J_CDISC_IMPORT_DATABASE", "cdisc")
 MDR_DATABASE = environ.get("NEO4J_MDR_DATABASE", "neo4j")
+CT_IMPORT_BATCH_SIZE = int(environ.get("CT_IMPORT_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+CT_IMPORT_MAX_WORKERS = int(environ.get("CT_IMPORT_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+CT_IMPORT_DRY_RUN = string_to_boolean(environ.get("CT_IMPORT_DRY_RUN", "false"))
 
 
 def wrapper_import_cdisc_ct_from_cdisc_db_into_mdr(
@@ -30,6 +36,9 @@ def wrapper_import_cdisc_ct_from_cdisc_db_into_mdr(
         mdr_neo4j_driver,
         MDR_DATABASE,
         user_initials,
+        batch_size=CT_IMPORT_BATCH_SIZE,
+        max_workers=CT_IMPORT_MAX_WORKERS,
+        dry_run=CT_IMPORT_DRY_RUN,
     )
 
     mdr_neo4j_driver.close()
@@ -0,0 +1,224 @@
+import pytest
+
+from mdr_standards_import.scripts.import_scripts.cdisc_ct.import_into_mdr_db import (
+    plan_attribute_updates,
+    plan_has_term_and_had_term_updates,
+)
+
+EFFECTIVE_DATE = "2023-03-31"
+
+
+def codelist(concept_id, name="Codelist"):
+    return {
+        "concept_id": concept_id,
+        "name": name,
+        "submission_value": concept_id,
+        "preferred_term": name,
+        "definition": f"{name} definition",
+        "extensible": True,
+        "synonyms": [],
+    }
+
+
+def term(uid, preferred_term="Term"):
+    return {
+        "uid": uid,
+        "concept_id": uid,
+        "code_submission_value": uid,
+        "name_submission_value": uid,
+        "preferred_term": preferred_term,
+        "definition": f"{preferred_term} definition",
+        "synonyms": [],
+    }
+
+
+def codelist_data(codelist_value, terms):
+    return {
+        "codelist": codelist_value,
+        "packages": ["SDTM CT 2023-03-31"],
+        "terms_data": [
+            {"term": term_value, "packages": ["SDTM CT 2023-03-31"]}
+            for term_value in terms
+        ],
+    }
+
+
+def term_uids(rows):
+    return [row["term"]["uid"] for row in rows]
+
+
+class TestPlanAttributeUpdates:
+    def test__plan_attribute_updates__new_term_in_two_codelists__written_in_two_rounds(
+        self,
+    ):
+        # given
+        codelists_data = [
+            codelist_data(codelist("C1"), [term("T1"), term("T2")]),
+            codelist_data(codelist("C2"), [term("T1")]),
+        ]
+
+        # when
+        plan = plan_attribute_updates(codelists_data, {}, {}, EFFECTIVE_DATE)
+
+        # then
+        assert [row["codelist"]["concept_id"] for row in plan["codelists"]["new"]] == [
+            "C1",
+            "C2",
+        ]
+        assert len(plan["term_rounds"]) == 2
+        assert term_uids(plan["term_rounds"][0]["new"]) == ["T1", "T2"]
+        assert plan["term_rounds"][0]["new"][0]["name"] == "Term"
+        # the second codelist relates to the term created in the first round
+        assert term_uids(plan["term_rounds"][1]["existing"]) == ["T1"]
+        assert not plan["term_rounds"][1]["new"]
+        assert plan["summary"]["new_codelists"] == 2
+        assert plan["summary"]["new_terms"] == 2
+        assert plan["summary"]["unchanged_terms"] == 1
+
+    def test__plan_attribute_updates__updated_term_compared_with_planned_value(self):
+        # given
+        codelists_data = [
+            codelist_data(codelist("C1"), [term("T1", "Updated")]),
+            codelist_data(codelist("C2"), [term("T1", "Updated")]),
+            codelist_data(codelist("C3"), [term("T1", "Updated again")]),
+        ]
+        existing_codelists = {
+            concept_id: {
+                "cl_attributes_value": codelist(concept_id),
+                "cl_attributes_value_for_date": None,
+            }
+            for concept_id in ("C1", "C2", "C3")
+        }
+        existing_terms = {
+            "T1": {
+                "t_attributes_value": term("T1"),
+                "t_attributes_value_for_date": None,
+            }
+        }
+
+        # when
+        plan = plan_attribute_updates(
+            codelists_data, existing_codelists, existing_terms, EFFECTIVE_DATE
+        )
+
+        # then
+        assert len(plan["codelists"]["existing"]) == 3
+        assert [
+            (term_uids(term_round["updated"]), term_uids(term_round["existing"]))
+            for term_round in plan["term_rounds"]
+        ] == [(["T1"], []), ([], ["T1"]), (["T1"], [])]
+        assert plan["summary"]["updated_terms"] == 2
+        assert plan["summary"]["unchanged_terms"] == 1
+        assert plan["summary"]["unchanged_codelists"] == 3
+
+    def test__plan_attribute_updates__updated_codelist(self):
+        # given
+        codelists_data = [codelist_data(codelist("C1", "Renamed"), [])]
+        existing_codelists = {
+            "C1": {
+                "cl_attributes_value": codelist("C1"),
+                "cl_attributes_value_for_date": None,
+            }
+        }
+
+        # when
+        plan = plan_attribute_updates(
+            codelists_data, existing_codelists, {}, EFFECTIVE_DATE
+        )
+
+        # then
+        assert [
+            row["codelist"]["concept_id"] for row in plan["codelists"]["updated"]
+        ] == ["C1"]
+        assert plan["summary"]["updated_codelists"] == 1
+        assert not plan["term_rounds"]
+
+    def test__plan_attribute_updates__term_version_for_date__not_written(self):
+        # given
+        codelists_data = [codelist_data(codelist("C1"), [term("T1")])]
+        existing_codelists = {
+            "C1": {
+                "cl_attributes_value": codelist("C1"),
+                "cl_attributes_value_for_date": codelist("C1"),
+            }
+        }
+        existing_terms = {
+            "T1": {
+                "t_attributes_value": term("T1", "Later"),
+                "t_attributes_value_for_date": term("T1"),
+            }
+        }
+
+        # when
+        plan = plan_attribute_updates(
+            codelists_data, existing_codelists, existing_terms, EFFECTIVE_DATE
+        )
+
+        # then
+        assert not plan["term_rounds"]
+        assert plan["summary"]["unchanged_terms"] == 1
+        assert plan["summary"]["unchanged_codelists"] == 1
+
+    def test__plan_attribute_updates__changed_term_version_for_date__error(self):
+        # given
+        codelists_data = [codelist_data(codelist("C1"), [term("T1", "Changed")])]
+        existing_terms = {
+            "T1": {
+                "t_attributes_value": term("T1"),
+                "t_attributes_value_for_date": term("T1"),
+            }
+        }
+
+        # when, then
+        with pytest.raises(RuntimeError):
+            plan_attribute_updates(codelists_data, {}, existing_terms, EFFECTIVE_DATE)
+
+
+class TestPlanHasTermAndHadTermUpdates:
+    def test__plan_has_term_and_had_term_updates__terms_added_and_deactivated(self):
+        # given
+        codelists_data = [
+            codelist_data(codelist("C1"), [term("T1"), term("T2"), term("T4")]),
+            codelist_data(codelist("C2"), [term("T1")]),
+        ]
+        codelist_terms = {
+            "C1": {"HAS_TERM": ["T1", "T3"], "HAD_TERM": ["T4"]},
+        }
+
+        # when
+        plan = plan_has_term_and_had_term_updates(codelists_data, codelist_terms)
+
+        # then
+        assert plan["terms_to_deactivate"] == [{"codelist_uid": "C1", "term_uid": "T3"}]
+        # a term the codelist had before is not related to it again
+        assert plan["terms_to_add"] == [
+            {"codelist_uid": "C1", "term_uid": "T2"},
+            {"codelist_uid": "C2", "term_uid": "T1"},
+        ]
+        assert plan["added_terms"] == 2
+        assert plan["removed_terms"] == 1
+
+    def test__plan_has_term_and_had_term_updates__unchanged_terms(self):
+        # given
+        codelists_data = [codelist_data(codelist("C1"), [term("T1"), term("T2")])]
+        codelist_terms = {"C1": {"HAS_TERM": ["T1", "T2"]}}
+
+        # when
+        plan = plan_has_term_and_had_term_updates(codelists_data, codelist_terms)
+
+        # then
+        assert not plan["terms_to_deactivate"]
+        assert not plan["terms_to_add"]
+        assert plan["unchanged_terms"] == 2
+
+    def test__plan_has_term_and_had_term_updates__term_listed_twice__added_once(
+        self,
+    ):
+        # given
+        codelists_data = [codelist_data(codelist("C1"), [term("T1"), term("T1")])]
+
+        # when
+        plan = plan_has_term_and_had_term_updates(codelists_data, {})
+
+        # then
+        assert plan["terms_to_add"] == [{"codelist_uid": "C1", "term_uid": "T1"}]
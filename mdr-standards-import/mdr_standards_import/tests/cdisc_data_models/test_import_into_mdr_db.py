@@ -0,0 +1,139 @@
+from mdr_standards_import.scripts.import_scripts.cdisc_data_models.import_into_mdr_db import (
+    CLASS_CONTENT_PROPERTIES,
+    VARIABLE_CONTENT_PROPERTIES,
+    _get_instance_hashes,
+    _merge_instances,
+    content_hash,
+)
+
+INSTANCES_QUERY = "MATCH (instance) RETURN instance"
+
+
+class FakeResult(list):
+    def consume(self):
+        return None
+
+
+class FakeTransaction:
+    """Returns the given records for INSTANCES_QUERY, and keeps the rows sent by the other queries."""
+
+    def __init__(self, records):
+        self.records = records
+        self.updates = []
+
+    def run(self, query, **parameters):
+        if query == INSTANCES_QUERY:
+            return FakeResult(self.records)
+        self.updates.extend(parameters.get("rows", []))
+        return FakeResult()
+
+
+def variable(**properties):
+    return {
+        "title": "Study Identifier",
+        "label": "Study Identifier",
+        "description": "Unique identifier for a study.",
+        "role": "Identifier",
+        "notes": None,
+        "variable_c_code": "C83082",
+        "usage_restrictions": None,
+        "examples": None,
+        **properties,
+    }
+
+
+class TestContentHash:
+    def test__content_hash__equal_content__same_hash(self):
+        # given
+        properties = variable()
+        # the properties that are not part of the content don't change the hash
+        same_content = {**variable(), "uid": "STUDYID", "ordinal": 2}
+
+        # when, then
+        assert content_hash(properties, VARIABLE_CONTENT_PROPERTIES) == content_hash(
+            same_content, VARIABLE_CONTENT_PROPERTIES
+        )
+
+    def test__content_hash__changed_field__different_hash(self):
+        # given
+        properties = variable()
+
+        # when, then
+        for name in VARIABLE_CONTENT_PROPERTIES:
+            changed_content = variable(**{name: "changed"})
+            assert content_hash(
+                properties, VARIABLE_CONTENT_PROPERTIES
+            ) != content_hash(changed_content, VARIABLE_CONTENT_PROPERTIES)
+        # a missing property is not the same as an empty one
+        assert content_hash(
+            {"title": "", "label": "Label"}, CLASS_CONTENT_PROPERTIES
+        ) != content_hash({"label": "Label"}, CLASS_CONTENT_PROPERTIES)
+
+    def test__get_instance_hashes__missing_hash__backfilled(self):
+        # given
+        stored_hash = content_hash({"label": "Stored"}, CLASS_CONTENT_PROPERTIES)
+        tx = FakeTransaction(
+            [
+                {
+                    "uid": "DM",
+                    "id": 1,
+                    "content_hash": stored_hash,
+                    "properties": None,
+                    "hashed_id": None,
+                },
+                {
+                    "uid": "DM",
+                    "id": 2,
+                    "content_hash": None,
+                    "properties": {"label": "Imported before"},
+                    "hashed_id": 20,
+                },
+            ]
+        )
+
+        # when
+        instance_hashes = _get_instance_hashes(
+            tx, INSTANCES_QUERY, CLASS_CONTENT_PROPERTIES
+        )
+
+        # then
+        missing_hash = content_hash(
+            {"label": "Imported before"}, CLASS_CONTENT_PROPERTIES
+        )
+        assert instance_hashes == {"DM": {stored_hash: 1, missing_hash: 2}}
+        assert tx.updates == [{"id": 20, "content_hash": missing_hash}]
+
+    def test__merge_instances__changes_detected_by_hash(self):
+        # given
+        unchanged = {
+            "uid": "DM",
+            "content_hash": content_hash({"label": "Demo"}, ("label",)),
+        }
+        updated = {
+            "uid": "AE",
+            "content_hash": content_hash({"label": "New"}, ("label",)),
+        }
+        new = {
+            "uid": "VS",
+            "content_hash": content_hash({"label": "Vitals"}, ("label",)),
+        }
+        existing_hashes = {
+            "DM": {unchanged["content_hash"]: 1},
+            "AE": {content_hash({"label": "Old"}, ("label",)): 2},
+        }
+        created = []
+        reused = []
+
+        # when
+        rows_to_create, counts = _merge_instances(
+            None,
+            [unchanged, updated, new],
+            lambda tx, uids: {uid: existing_hashes.get(uid, {}) for uid in uids},
+            lambda tx, rows: created.extend(rows),
+            lambda tx, rows: reused.extend(rows),
+        )
+
+        # then
+        assert rows_to_create == created == [updated, new]
+        assert reused == [{**unchanged, "instance_id": 1}]
+        assert counts == (1, 1, 1)
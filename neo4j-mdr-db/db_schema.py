@@ -79,6 +79,7 @@ INDEXES = [
     ("CTTermAttributesValue", "code_submission_value"),
     ("CTTermAttributesValue", "name_submission_value"),
     ("StudyField", "field_name"),
+    ("StudyAction", "date"),
     ("DataModelVersion", "uid"),
     ("ActivityGrouping", "uid"),
     ("ActivityValidGroup", "uid"),
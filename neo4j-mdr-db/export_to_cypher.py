@@ -1,31 +1,93 @@
 from neo4j import GraphDatabase
 from os import environ
+import gzip
+import json
+import time
 
 DATABASE = environ.get("NEO4J_MDR_DATABASE")
 HOST = environ.get("NEO4J_MDR_HOST")
 PORT = environ.get("NEO4J_MDR_BOLT_PORT")
 USER = environ.get("NEO4J_MDR_AUTH_USER")
 PASS =  environ.get("NEO4J_MDR_AUTH_PASSWORD")
+# Compression of the dump file: none, gzip or zstd (requires the zstandard package)
+COMPRESSION = environ.get("DUMP_COMPRESSION", "none").lower()
+
+COMPRESSION_EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
 
 uri = "neo4j://{}:{}".format(HOST, PORT)
 driver = GraphDatabase.driver(uri, auth=(USER, PASS))
 
-print("Dumping database contents as cypher statements")
-def get_data(tx):
+
+def open_dump_file(filename):
+    if COMPRESSION == "gzip":
+        return gzip.open(filename, "wt", encoding="utf-8")
+    if COMPRESSION == "zstd":
+        import zstandard
+
+        return zstandard.open(filename, "wt", encoding="utf-8")
+    return open(filename, "w", encoding="utf-8")
+
+
+def get_counts(tx):
+    # The counts come from the count store, without scanning the graph
+    stats = tx.run("CALL apoc.meta.stats() YIELD nodeCount, relCount, labels, relTypesCount RETURN *").single()
+    return {
+        "nodes": stats["nodeCount"],
+        "relationships": stats["relCount"],
+        "nodes_by_label": dict(sorted(stats["labels"].items())),
+        "relationships_by_type": dict(sorted(stats["relTypesCount"].items())),
+    }
+
+
+def write_data(tx, filename):
+    # The batches of statements are written as they are streamed, the dump is never held in memory.
+    # The file is opened here so that a retried transaction starts the file over.
     result = tx.run("CALL apoc.export.cypher.all(null, {streamStatements: true, batchSize: 1000, format: 'cypher-shell', saveIndexNames: true, saveConstraintNames: true, multipleRelationshipsWithType: true})")
-    return result.data()
-
-with driver.session(database=DATABASE) as session:
-    print(f"Connecting to database '{DATABASE}' on host: {HOST}")
-    nbr_nodes = session.read_transaction(lambda tx: tx.run("MATCH (n) RETURN count(n) as nbr_nodes").single().get("nbr_nodes"))
-    nbr_rels = session.read_transaction(lambda tx: tx.run("MATCH ()-[r]-() RETURN count(r) as nbr_rels").single().get("nbr_rels"))
-    print(f"Database contains {nbr_nodes} nodes and {nbr_rels} relationships")
-    print("Requesting data")
-    data = session.read_transaction(get_data)
-    print(f"Saving data to 'dump-{DATABASE}.cypher'")
-    with open(f"dump-{DATABASE}.cypher", "w") as f:
-        for chunk in data:
-            f.write(chunk['cypherStatements'])
-
-driver.close()
-print("Done!")
+    nbr_batches = 0
+    nbr_chars = 0
+    start_time = time.time()
+    with open_dump_file(filename) as f:
+        for record in result:
+            statements = record["cypherStatements"]
+            f.write(statements)
+            nbr_batches += 1
+            nbr_chars += len(statements)
+            elapsed_time = max(time.time() - start_time, 1e-6)
+            print(f"Batches written: {nbr_batches}, {nbr_chars/1024/1024:.1f} MB, {nbr_chars/1024/1024/elapsed_time:.1f} MB/s", end="\r")
+    print()
+    return nbr_batches, nbr_chars, time.time() - start_time
+
+
+if __name__ == "__main__":
+    if COMPRESSION not in COMPRESSION_EXTENSIONS:
+        raise ValueError(f"Unknown DUMP_COMPRESSION '{COMPRESSION}', expected one of {', '.join(COMPRESSION_EXTENSIONS)}")
+    filename = f"dump-{DATABASE}.cypher{COMPRESSION_EXTENSIONS[COMPRESSION]}"
+    manifest_filename = f"dump-{DATABASE}.manifest.json"
+
+    print("Dumping database contents as cypher statements")
+    with driver.session(database=DATABASE) as session:
+        print(f"Connecting to database '{DATABASE}' on host: {HOST}")
+        counts = session.read_transaction(get_counts)
+        print(f"Database contains {counts['nodes']} nodes and {counts['relationships']} relationships")
+        print(f"Saving data to '{filename}'")
+        nbr_batches, nbr_chars, elapsed_time = session.read_transaction(write_data, filename)
+    print(f"Wrote {nbr_batches} batches, {nbr_chars/1024/1024:.1f} MB of statements in {elapsed_time:.1f} seconds")
+    print(f"Throughput: {counts['nodes']/max(elapsed_time, 1e-6):.0f} nodes/s, {nbr_chars/1024/1024/max(elapsed_time, 1e-6):.1f} MB/s")
+
+    print(f"Saving node and relationship counts to '{manifest_filename}'")
+    with open(manifest_filename, "w") as f:
+        json.dump(
+            {
+                "database": DATABASE,
+                "dump_file": filename,
+                "compression": COMPRESSION,
+                "exported_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "statement_batches": nbr_batches,
+                **counts,
+            },
+            f,
+            indent=2,
+        )
+
+    driver.close()
+    print("Done!")
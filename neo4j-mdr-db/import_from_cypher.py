@@ -1,5 +1,8 @@
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
 from neo4j import GraphDatabase
 from os import environ
+import gzip
+import json
 import os
 import sys
 
@@ -8,23 +11,50 @@ HOST = environ.get("NEO4J_MDR_HOST")
 PORT = environ.get("NEO4J_MDR_BOLT_PORT")
 USER = environ.get("NEO4J_MDR_AUTH_USER")
 PASS =  environ.get("NEO4J_MDR_AUTH_PASSWORD")
+# Number of sessions writing node and relationship batches at the same time
+WORKERS = int(environ.get("IMPORT_WORKERS", "4"))
 
 uri = "neo4j://{}:{}".format(HOST, PORT)
 driver = GraphDatabase.driver(uri, auth=(USER, PASS))
 
+# Kinds of transactions, the node batches and the relationship batches run concurrently.
+# Any other transaction (schema, cleanup) runs alone, once all the previous ones are done.
+NODES = "nodes"
+RELATIONSHIPS = "relationships"
+OTHER = "other"
+
+UNWIND_PREFIX = "UNWIND ["
+UNWIND_SUFFIX = "] AS row\n"
+
+
 def run_queries(tx, queries):
     for q in queries:
         tx.run(q)
 
+def open_dump(filename):
+    # Binary mode, so that the checkpoint offsets are byte offsets
+    if filename.endswith(".gz"):
+        return gzip.open(filename, "rb")
+    if filename.endswith(".zst"):
+        import zstandard
+
+        return zstandard.open(filename, "rb")
+    return open(filename, "rb")
+
+def readline(file):
+    return file.readline().decode("utf-8")
+
 def build_query_until_semicolon(file, firstline=None):
     if firstline is None:
-        query = file.readline()
+        query = readline(file)
     else:
         query = firstline
     if not query:
         return
     while not query.endswith(";\n"):
-        line = file.readline()
+        line = readline(file)
+        if not line:
+            raise ValueError("Unexpected end of file in query")
         if line.startswith(":"):
             raise ValueError(f"Unexpected control code {line} in query")
         query = query + line
@@ -34,7 +64,7 @@ def build_query_until_semicolon(file, firstline=None):
 def build_transaction_until_commit(file):
     queries = []
     while True:
-        line = file.readline()
+        line = readline(file)
         if line.startswith(":commit"):
             return queries
         query = build_query_until_semicolon(file, line)
@@ -44,7 +74,7 @@ def build_transaction_until_commit(file):
         queries.append(query)
 
 def next_transaction(file):
-    line = file.readline()
+    line = readline(file)
     if line.startswith(":begin"):
         queries = build_transaction_until_commit(file)
     else:
@@ -54,6 +84,150 @@ def next_transaction(file):
         queries = [query]
     return queries
 
+def combine_unwind_queries(queries):
+    """
+    Combines the consecutive `UNWIND [...] AS row` queries of a transaction that share the same body
+    into one query unwinding all their rows.
+
+    The rows are Cypher literals that may contain function calls such as `datetime(...)`,
+    so they are kept as written rather than being sent as parameters.
+    """
+    combined = []
+    previous_body = None
+    for query in queries:
+        rows, separator, body = query.rpartition(UNWIND_SUFFIX)
+        if not query.startswith(UNWIND_PREFIX) or not separator:
+            combined.append(query)
+            previous_body = None
+            continue
+        rows = rows[len(UNWIND_PREFIX):]
+        if body == previous_body:
+            combined[-1][0].append(rows)
+        else:
+            combined.append(([rows], body))
+            previous_body = body
+    return [
+        query if isinstance(query, str) else f"{UNWIND_PREFIX}{', '.join(query[0])}{UNWIND_SUFFIX}{query[1]}"
+        for query in combined
+    ]
+
+def transaction_kind(queries):
+    if all(query.startswith(UNWIND_PREFIX) for query in queries):
+        if all("CREATE (start)-[" in query for query in queries):
+            return RELATIONSHIPS
+        if all("CREATE (n:" in query for query in queries):
+            return NODES
+    return OTHER
+
+def read_transactions(file, offset):
+    """Yields the start offset, the end offset and the queries of each transaction from the given offset."""
+    file.seek(offset)
+    while True:
+        start = file.tell()
+        queries = next_transaction(file)
+        if len(queries) == 0:
+            return
+        yield start, file.tell(), queries
+
+def execute_transaction(queries):
+    with driver.session(database=DATABASE) as session:
+        session.write_transaction(run_queries, queries)
+
+
+class Checkpoint:
+    """
+    Records which transactions of the file have been committed, to resume an interrupted import.
+
+    The offset is the end of the transactions committed without gap from the start of the file,
+    the transactions committed after it by other sessions are listed by start offset.
+    """
+
+    def __init__(self, filename, file_size):
+        self.path = f"{filename}.checkpoint"
+        self.file_size = file_size
+        self.offset = 0
+        self.committed = {}
+        if os.path.isfile(self.path):
+            with open(self.path) as f:
+                state = json.load(f)
+            if state.get("file_size") == file_size:
+                self.offset = state["offset"]
+                self.committed = {int(start): end for start, end in state["committed"].items()}
+            else:
+                print(f"Ignoring checkpoint '{self.path}' of a different file")
+
+    def commit(self, start, end):
+        self.committed[start] = end
+        # Moves the offset over the transactions committed without gap
+        while self.offset in self.committed:
+            self.offset = self.committed.pop(self.offset)
+        self.save()
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"file_size": self.file_size, "offset": self.offset, "committed": self.committed},
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+
+def import_file(file, checkpoint, compressed):
+    nbr_tx = 0
+    running = {}
+    running_kind = None
+
+    def wait_for(return_when):
+        nonlocal nbr_tx
+        done, _ = wait(running, return_when=return_when)
+        error = None
+        for future in done:
+            start, end = running.pop(future)
+            if future.exception() is None:
+                checkpoint.commit(start, end)
+                nbr_tx += 1
+            elif error is None:
+                error = future.exception()
+        if error is not None:
+            # Records what the other sessions commit before stopping, so that the import resumes after it
+            if running:
+                wait(running)
+                for future, (start, end) in running.items():
+                    if future.exception() is None:
+                        checkpoint.commit(start, end)
+                running.clear()
+            raise error
+        if compressed:
+            # The offsets are in the uncompressed data, the size of which is unknown
+            print(f"Progress: {checkpoint.offset/1024/1024:.1f} MB, transactions executed: {nbr_tx}", end="\r")
+        else:
+            print(f"Progress: {checkpoint.offset/checkpoint.file_size:.1%}, transactions executed: {nbr_tx}", end="\r")
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        for start, end, queries in read_transactions(file, checkpoint.offset):
+            if start in checkpoint.committed:
+                # Committed by a previous run
+                continue
+            kind = transaction_kind(queries)
+            # The relationships are created once all their nodes are,
+            # and the schema and cleanup statements run alone
+            if running and (kind != running_kind or kind == OTHER):
+                wait_for(ALL_COMPLETED)
+            # Bounds the number of transactions read ahead
+            while len(running) >= 2 * WORKERS:
+                wait_for(FIRST_COMPLETED)
+            if kind != OTHER:
+                queries = combine_unwind_queries(queries)
+            running[executor.submit(execute_transaction, queries)] = (start, end)
+            running_kind = kind
+        if running:
+            wait_for(ALL_COMPLETED)
+
 
 if __name__ == "__main__":
     try:
@@ -64,20 +238,16 @@ if __name__ == "__main__":
     file_stats = os.stat(filename)
     file_size = file_stats.st_size
     print(f"Importing from file '{filename}', size: {file_size/1024/1024:.1f} MB")
+    checkpoint = Checkpoint(filename, file_size)
+    if checkpoint.offset > 0 or checkpoint.committed:
+        print(f"Resuming from checkpoint '{checkpoint.path}'")
     with driver.session(database="system") as session:
         print(f"Creating database '{DATABASE}'")
         querystring = "CREATE DATABASE `{}` IF NOT EXISTS".format(DATABASE)
         session.write_transaction(run_queries, [querystring])
-    with driver.session(database=DATABASE) as session:
 
-        with open(filename, 'r') as file:
-            nbr_tx = 0
-            while True:
-                queries = next_transaction(file)
-                if len(queries) == 0:
-                    break
-                session.write_transaction(run_queries, queries)
-                nbr_tx += 1
-                print(f"Progress: {file.tell()/file_size:.1%}, transactions executed: {nbr_tx}", end="\r")
+    with open_dump(filename) as file:
+        import_file(file, checkpoint, compressed=filename.endswith((".gz", ".zst")))
+    checkpoint.remove()
     driver.close()
     print("\nDone!")
@@ -1,9 +1,11 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from os import environ
 import os
 import logging
 import sys
 import json
+import threading
 
 OUTPUT_DIR = environ.get("OUTPUT_DIR", "./output")
 LOG_LEVEL = environ.get("LOG_LEVEL", "INFO")
@@ -11,6 +13,12 @@ LOG_LEVEL = environ.get("LOG_LEVEL", "INFO")
 INCLUDE_STUDY_NUMBERS = environ.get("INCLUDE_STUDY_NUMBERS", "")
 EXCLUDE_STUDY_NUMBERS = environ.get("EXCLUDE_STUDY_NUMBERS", "")
 
+# Number of concurrent requests to the api
+MAX_WORKERS = int(environ.get("MAX_WORKERS", "8"))
+# Skip the studies that haven't changed since the previous export to the same OUTPUT_DIR
+INCREMENTAL = environ.get("INCREMENTAL", "false").lower() in ("true", "1", "yes")
+MANIFEST_FILENAME = "export-manifest.json"
+
 DEFAULT_QUERY_PARAMS = {
     "page_size": 0,
     "page_number": 1,
@@ -33,6 +41,13 @@ class StudyExporter:
         self.api_base_url = self._read_env("API_BASE_URL")
         api_headers = {"Accept": "application/json"}
         self.api_headers = self._authenticate(api_headers)
+        # Shared by the concurrent requests, with one pooled connection per worker
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.verify_connection()
 
     def _read_env(self, varname):
@@ -105,7 +120,7 @@ class StudyExporter:
                 if key not in params:
                     params[key] = value
 
-        response = requests.get(
+        response = self.session.get(
             self.api_base_url + path, params=params, headers=self.api_headers
         )
         if response.ok:
@@ -154,9 +169,12 @@ class StudyExporter:
     def save_formatted_json(self, data, dir, filename):
         filename = filename.replace("/", ".")
         path = os.path.join(dir, filename)
-        with open(path, "w") as f:
+        # Write to a temporary file first, an interrupted export never leaves a truncated file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
             self.log.info(f"Saving to file: {path}")
             f.write(json.dumps(data, indent=2, sort_keys=True))
+        os.replace(tmp_path, path)
 
     def filter_studies(self, studies):
         include_numbers = [
@@ -188,6 +206,52 @@ class StudyExporter:
         return studies_copy
 
 
+class ExportManifest:
+    """
+    Versions of the studies exported to OUTPUT_DIR, used by the incremental export to skip unchanged studies.
+
+    A study is only recorded once all its files are written, so an interrupted export resumes
+    with the studies that were not completely exported.
+    Draft studies are always exported, the version timestamp of a draft doesn't change when its selections change.
+    """
+
+    def __init__(self, api, dir):
+        self.api = api
+        self.dir = dir
+        self.lock = threading.Lock()
+        path = os.path.join(dir, MANIFEST_FILENAME)
+        self.studies = {}
+        if os.path.isfile(path):
+            with open(path) as f:
+                self.studies = json.load(f).get("studies", {})
+
+    @staticmethod
+    def study_version(study):
+        version_metadata = study["current_metadata"].get("version_metadata") or {}
+        if version_metadata.get("study_status") in (None, "DRAFT"):
+            return None
+        return {
+            "study_status": version_metadata.get("study_status"),
+            "version_number": version_metadata.get("version_number"),
+            "version_timestamp": version_metadata.get("version_timestamp"),
+        }
+
+    def is_unchanged(self, study):
+        version = self.study_version(study)
+        return version is not None and self.studies.get(study["uid"]) == version
+
+    def record(self, study):
+        version = self.study_version(study)
+        with self.lock:
+            if version is None:
+                self.studies.pop(study["uid"], None)
+            else:
+                self.studies[study["uid"]] = version
+            self.api.save_formatted_json(
+                {"studies": self.studies}, self.dir, MANIFEST_FILENAME
+            )
+
+
 study_optional_fields = [
     "current_metadata.study_description",
     "current_metadata.identification_metadata",
@@ -366,12 +430,91 @@ dictionaries = [
 ]
 
 
+def export_endpoint(api, ep, params=None, page_size=None, filename=None):
+    if filename is None:
+        filename = f"{ep}.json"
+    # Small dataset, no need to split into pages.
+    if page_size is None:
+        data = api.get_from_api(f"/{ep}", params=params)
+    # Large dataset, split request into pages.
+    else:
+        data = api.get_from_api_paged(f"/{ep}", params=params, page_size=page_size)
+    api.save_formatted_json(data, OUTPUT_DIR, filename)
+    return data
+
+
+def export_study(api, study, fields, manifest):
+    uid = study["uid"]
+    if INCREMENTAL and manifest.is_unchanged(study):
+        api.log.info(f"Skipping unchanged study uid: {uid}")
+        return
+
+    # Study metadata
+    api.log.info(f"Export metadata for study uid: {uid}")
+    data = api.get_from_api(f"/studies/{uid}?fields={fields}")
+    api.save_formatted_json(data, OUTPUT_DIR, f"studies/{uid}.json")
+    complete = data is not None
+
+    # Study design
+    api.log.info(f"Export study design for study uid: {uid}")
+    for ep in study_design_endpoints:
+        study_ep = ep.format(study_uid=uid)
+        data = export_endpoint(api, study_ep)
+        complete = complete and data is not None
+
+    # A failed request is retried by the next export
+    if complete:
+        manifest.record(study)
+
+
+def export_concepts(api, cpt):
+    ep = cpt["endpoint"]
+    concept_name = ep.rsplit("/", 1)[1]
+    api.log.info(f"Export concept: {concept_name}")
+    export_endpoint(api, ep, params=cpt["parameters"], page_size=cpt["page_size"])
+
+
+def export_activity_data(api, cpt):
+    ep = cpt["endpoint"]
+    api.log.info(f"Export activity data: {ep}")
+    export_endpoint(api, ep, params=cpt["parameters"], page_size=cpt["page_size"])
+
+
+def export_sponsor_extension(api, ext):
+    ep = ext["endpoint"]
+    params = ext["parameters"]
+    codelist_name = params["codelist_name"]
+    api.log.info(f"Export sponsor extensions to {codelist_name} codelist")
+    export_endpoint(
+        api,
+        ep,
+        params=params,
+        page_size=ext["page_size"],
+        filename=f"{ep}.{codelist_name}.json",
+    )
+
+
+def export_dictionary(api, d):
+    api.log.info(f"Export dictionary: {d}")
+    uid = api.get_dictionary_uid(d)
+    if uid is None:
+        api.log.error(f"Could not find dictionary: {d}")
+        return
+    params = {"codelist_uid": uid}
+    data = api.get_from_api("/dictionaries/terms", params=params)
+    api.save_formatted_json(data, OUTPUT_DIR, f"dictionaries.{d}.json")
+
+
+def export_all(executor, function, api, items, *args):
+    # Exports the items concurrently, waits for all of them and raises the first error, if any
+    for future in [executor.submit(function, api, item, *args) for item in items]:
+        future.result()
+
+
 def run_export():
-    try:
-        os.mkdir("output")
-    except FileExistsError:
-        pass
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     api = StudyExporter()
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
 
     # Clinical programmes
     api.log.info("=== Export clinical programmes ===")
@@ -396,106 +539,40 @@ def run_export():
     study_uids = [s["uid"] for s in studies]
     api.log.info(f"Found studies {study_uids}")
 
-    # Study metadata
-    api.log.info("=== Export study metadata ===")
+    # Study metadata and design
+    api.log.info("=== Export study metadata and design ===")
     # Include all optional fields
     # , --> %2C
     # + --> %2B
     fields = "%2C".join(["%2B" + f for f in study_optional_fields])
-    for uid in study_uids:
-        api.log.info(f"Export metadata for study uid: {uid}")
-        study = api.get_from_api(f"/studies/{uid}?fields={fields}")
-        api.save_formatted_json(study, OUTPUT_DIR, f"studies/{uid}.json")
-
-    # Study design
-    api.log.info("=== Export study design ===")
-    for uid in study_uids:
-        api.log.info(f"Export study design for study uid: {uid}")
-        for ep in study_design_endpoints:
-            study_ep = ep.format(study_uid=uid)
-            data = api.get_from_api(f"/{study_ep}")
-            api.save_formatted_json(data, OUTPUT_DIR, f"{study_ep}.json")
+    manifest = ExportManifest(api, OUTPUT_DIR)
+    export_all(executor, export_study, api, studies, fields, manifest)
 
     # Templates
     api.log.info("=== Export syntax templates ===")
-    for ep in template_endpoints:
-        data = api.get_from_api(f"/{ep}")
-        api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
+    export_all(executor, export_endpoint, api, template_endpoints)
 
     # Templates pre-instances
     api.log.info("=== Export syntax pre-instances ===")
-    for ep in syntax_pre_instance_endpoints:
-        data = api.get_from_api(f"/{ep}")
-        api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
+    export_all(executor, export_endpoint, api, syntax_pre_instance_endpoints)
 
     # Sponsor extensions to CT packages
     api.log.info("=== Export sponsor extensions ===")
-    for ext in sponsor_ct_extensions:
-        ep = ext["endpoint"]
-        params = ext["parameters"]
-        page_size = ext["page_size"]
-        codelist_name = params["codelist_name"]
-        api.log.info(f"Export sponsor extensions to {codelist_name} codelist")
-
-        # Small dataset, no need to split into pages.
-        if page_size is None:
-            data = api.get_from_api(f"/{ep}", params=params)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.{codelist_name}.json")
-
-        # Large dataset, split request into pages.
-        else:
-            data = api.get_from_api_paged(f"/{ep}", params=params, page_size=page_size)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.{codelist_name}.json")
+    export_all(executor, export_sponsor_extension, api, sponsor_ct_extensions)
 
     # Concepts
     api.log.info("=== Export concepts ===")
-    for cpt in concept_endpoints:
-        ep = cpt["endpoint"]
-        params = cpt["parameters"]
-        page_size = cpt["page_size"]
-        concept_name = ep.rsplit("/", 1)[1]
-        api.log.info(f"Export concept: {concept_name}")
-
-        # Small dataset, no need to split into pages.
-        if page_size is None:
-            data = api.get_from_api(f"/{ep}", params=params)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
-
-        # Large dataset, split request into pages.
-        else:
-            data = api.get_from_api_paged(f"/{ep}", params=params, page_size=page_size)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
+    export_all(executor, export_concepts, api, concept_endpoints)
 
     # Activity items etc
     api.log.info("=== Export activity items, classes etc ===")
-    for cpt in activity_endpoints:
-        ep = cpt["endpoint"]
-        params = cpt["parameters"]
-        page_size = cpt["page_size"]
-        api.log.info(f"Export activity data: {ep}")
-
-        # Small dataset, no need to split into pages.
-        if page_size is None:
-            data = api.get_from_api(f"/{ep}", params=params)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
-
-        # Large dataset, split request into pages.
-        else:
-            data = api.get_from_api_paged(f"/{ep}", params=params, page_size=page_size)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
+    export_all(executor, export_activity_data, api, activity_endpoints)
 
     # Dictionaries
     api.log.info("=== Export dictionaries ===")
-    for d in dictionaries:
-        api.log.info(f"Export dictionary: {d}")
-        uid = api.get_dictionary_uid(d)
-        if uid is None:
-            api.log.error(f"Could not find dictionary: {d}")
-            continue
-        params = {"codelist_uid": uid}
-        data = api.get_from_api("/dictionaries/terms", params=params)
-        api.save_formatted_json(data, OUTPUT_DIR, f"dictionaries.{d}.json")
+    export_all(executor, export_dictionary, api, dictionaries)
 
+    executor.shutdown()
 
     # All done
     api.log.info(f"=== Export completed successfully ===")
@@ -0,0 +1,40 @@
+"""
+Order of the importers run by run_import.py.
+
+Each importer lists the importers that must be done before it can start,
+the independent importers run at the same time.
+"""
+
+IMPORT_STAGE_DEPENDENCIES = {
+    # Migrate the libraries (SNOMED etc)
+    "dictionaries": [],
+    # General configuration
+    "configuration": [],
+    # Import standard codelist terms, part 1
+    "standard_codelist_terms_1": ["dictionaries"],
+    # Import standard codelist terms, part 2
+    "standard_codelist_terms_2": ["standard_codelist_terms_1"],
+    # Import unit definitions, they refer to the unit subset terms of part 2
+    "units": ["standard_codelist_terms_1", "standard_codelist_terms_2"],
+    "activities": ["standard_codelist_terms_2", "units"],
+    # Import sponsor models
+    "sponsor_models": ["activities"],
+    # Finish up sponsor library
+    "standard_codelist_finish": ["activities"],
+    # Import compounds
+    "compounds": ["units", "activities", "standard_codelist_finish"],
+    # Import crfs
+    "crfs": ["activities"],
+    # Import mock data
+    "mockdata": [
+        "configuration",
+        "sponsor_models",
+        "standard_codelist_finish",
+        "compounds",
+        "crfs",
+    ],
+    # Import mock data from json
+    "mockdata_json": ["mockdata"],
+    # Import E2E specific data from json
+    "mockdata_e2e": ["mockdata_json"],
+}
@@ -1,8 +1,6 @@
 import asyncio
 import csv
 
-import aiohttp
-
 from .functions.caselessdict import CaselessDict
 from .functions.parsers import map_boolean
 from .functions.utils import load_env
@@ -1367,9 +1365,7 @@ class Activities(BaseImporter):
             "MDR_MIGRATION_ACTIVITY_ITEM_CLASSES"
         )
 
-        timeout = aiohttp.ClientTimeout(None)
-        conn = aiohttp.TCPConnector(limit=4, force_close=True)
-        async with aiohttp.ClientSession(timeout=timeout, connector=conn) as session:
+        async with self.client_session() as session:
             await self.handle_activity_groups(mdr_migration_activity_instances, session)
             await self.handle_activity_subgroups(
                 mdr_migration_activity_instances, session
@@ -4,8 +4,6 @@ import json
 import os
 from collections import defaultdict
 
-import aiohttp
-
 from .functions.utils import load_env
 from .utils.importer import BaseImporter, open_file_async
 from .utils.metrics import Metrics
@@ -451,9 +449,7 @@ class SponsorModels(BaseImporter):
         await asyncio.gather(*api_tasks)
 
     async def async_run(self):
-        timeout = aiohttp.ClientTimeout(None)
-        conn = aiohttp.TCPConnector(limit=4, force_close=True)
-        async with aiohttp.ClientSession(timeout=timeout, connector=conn) as session:
+        async with self.client_session() as session:
             await self.handle_activity_instance_class_relations(
                 MDR_MIGRATION_ACTIVITY_INSTANCE_CLASS_MODEL_RELS,
                 session,
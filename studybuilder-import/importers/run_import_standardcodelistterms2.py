@@ -2,8 +2,6 @@ import asyncio
 import csv
 import sys
 
-import aiohttp
-
 from .functions.utils import create_logger, load_env
 from .utils.api_bindings import CODELIST_ELEMENT_TYPE, CODELIST_EPOCH_TYPE
 from .utils.importer import BaseImporter, open_file_async
@@ -167,9 +165,7 @@ class StandardCodelistTerms2(BaseImporter):
         # we have to get all codelists when sponsor one will be migrated
         # otherwise sponsor defined terms won't know to which codelist they should connect
         code_lists_uids = self.api.get_code_lists_uids()
-        timeout = aiohttp.ClientTimeout(None)
-        conn = aiohttp.TCPConnector(limit=4, force_close=True)
-        async with aiohttp.ClientSession(timeout=timeout, connector=conn) as session:
+        async with self.client_session() as session:
             await self.migrate_term(
                 MDR_MIGRATION_VISIT_SUB_LABEL,
                 codelist_name="Visit Sub Label",
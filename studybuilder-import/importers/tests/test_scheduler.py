@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ..import_stages import IMPORT_STAGE_DEPENDENCIES
+from ..utils.metrics import Metrics
+from ..utils.scheduler import ImportScheduler, ImportStage
+
+
+def test_stages_run_after_their_dependencies():
+    started = []
+    lock = threading.Lock()
+
+    def stage(name, result=None):
+        def run(results):
+            # The importers run their async steps on the event loop of the thread
+            asyncio.get_event_loop().run_until_complete(asyncio.sleep(0))
+            with lock:
+                started.append((name, sorted(results)))
+            return result
+
+        return run
+
+    metrics = Metrics()
+    results = ImportScheduler(
+        [
+            ImportStage("c", stage("c", "cache"), depends_on=["a", "b"]),
+            ImportStage("a", stage("a")),
+            ImportStage("b", stage("b"), depends_on=["a"]),
+            ImportStage("d", lambda results: results["c"], depends_on=["c"]),
+        ],
+        metrics,
+    ).run()
+
+    assert [name for name, _ in started] == ["a", "b", "c"]
+    assert dict(started)["c"] == ["a", "b"]
+    assert results["d"] == "cache"
+    assert sorted(metrics.durations) == ["a", "b", "c", "d", "total"]
+
+
+def test_independent_stages_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    ImportScheduler(
+        [
+            ImportStage("a", lambda results: barrier.wait()),
+            ImportStage("b", lambda results: barrier.wait()),
+        ],
+        Metrics(),
+        max_workers=2,
+    ).run()
+
+
+def test_failed_stage_stops_the_import():
+    def fail(results):
+        raise RuntimeError("failed")
+
+    ran = []
+    with pytest.raises(RuntimeError):
+        ImportScheduler(
+            [
+                ImportStage("a", fail),
+                ImportStage("b", lambda results: ran.append("b"), depends_on=["a"]),
+            ],
+            Metrics(),
+        ).run()
+    assert not ran
+
+
+def test_invalid_dependencies():
+    with pytest.raises(ValueError):
+        ImportScheduler(
+            [ImportStage("a", lambda results: None, depends_on=["b"])], Metrics()
+        )
+    with pytest.raises(ValueError):
+        ImportScheduler(
+            [
+                ImportStage("a", lambda results: None, depends_on=["b"]),
+                ImportStage("b", lambda results: None, depends_on=["a"]),
+            ],
+            Metrics(),
+        )
+
+
+def test_units_are_imported_after_the_unit_subset_terms():
+    events = []
+    lock = threading.Lock()
+
+    def stage(name):
+        def run(results):
+            with lock:
+                events.append(("start", name))
+            # Long enough for the stages started at the same time to start
+            time.sleep(0.05)
+            with lock:
+                events.append(("end", name))
+
+        return run
+
+    ImportScheduler(
+        [
+            ImportStage(name, stage(name), depends_on=depends_on)
+            for name, depends_on in IMPORT_STAGE_DEPENDENCIES.items()
+        ],
+        Metrics(),
+        max_workers=len(IMPORT_STAGE_DEPENDENCIES),
+    ).run()
+
+    # The unit subset terms are created by the standard codelist terms, part 2
+    assert events.index(("end", "standard_codelist_terms_2")) < events.index(
+        ("start", "units")
+    )
@@ -0,0 +1,123 @@
+import json
+import sqlite3
+
+from ..utils.metrics import Metrics
+from ..utils.term_snapshot import TermSnapshot
+
+
+class _Api:
+    def __init__(self):
+        self.package_date = "2023-12-15"
+        self.terms = {
+            "/ct/terms/attributes": [
+                {"term_uid": "T2", "start_date": "2024-01-02"},
+                {"term_uid": "T1", "start_date": "2024-01-01"},
+            ],
+            "/ct/terms/names": [{"term_uid": "T1", "start_date": "2024-01-01"}],
+        }
+        self.calls = []
+
+    def get_all_from_api(self, path, params=None):
+        self.calls.append((path, params))
+        if path == "/ct/packages":
+            return [
+                {"effective_date": "2023-06-30"},
+                {"effective_date": self.package_date},
+            ]
+        items = self.terms[path]
+        if params is not None:
+            since = json.loads(params["filters"])["start_date"]["v"][0]
+            items = [item for item in items if item["start_date"] >= since]
+        return items
+
+
+def test_snapshot_is_refreshed_incrementally(tmp_path):
+    api = _Api()
+    metrics = Metrics()
+
+    term_lists = TermSnapshot(str(tmp_path), "http://api", metrics).load(api)
+    assert [item["term_uid"] for item in term_lists["/ct/terms/attributes"]] == [
+        "T1",
+        "T2",
+    ]
+    assert all(params is None for _, params in api.calls)
+
+    api.terms["/ct/terms/attributes"].append(
+        {"term_uid": "T0", "start_date": "2024-02-01"}
+    )
+    api.terms["/ct/terms/attributes"][1]["start_date"] = "2024-02-01"
+    api.terms["/ct/terms/attributes"][1]["name"] = "changed"
+    api.calls = []
+    term_lists = TermSnapshot(str(tmp_path), "http://api", metrics).load(api)
+    assert term_lists["/ct/terms/attributes"] == [
+        {"term_uid": "T0", "start_date": "2024-02-01"},
+        {"term_uid": "T1", "start_date": "2024-02-01", "name": "changed"},
+        {"term_uid": "T2", "start_date": "2024-01-02"},
+    ]
+    assert term_lists["/ct/terms/names"] == api.terms["/ct/terms/names"]
+    # The names are always fetched in full
+    assert [params is None for path, params in api.calls] == [True, True, False]
+    assert metrics.metrics["/ct/terms/names-SnapshotHit"] == 0
+    assert metrics.metrics["/ct/terms/attributes-SnapshotMiss"] == 2 + 3
+
+
+def test_snapshot_is_rebuilt_for_new_packages(tmp_path):
+    api = _Api()
+    TermSnapshot(str(tmp_path), "http://api", Metrics()).load(api)
+
+    api.package_date = "2024-03-29"
+    api.terms["/ct/terms/attributes"] = [{"term_uid": "T3", "start_date": "2023-01-01"}]
+    api.calls = []
+    term_lists = TermSnapshot(str(tmp_path), "http://api", Metrics()).load(api)
+    assert term_lists["/ct/terms/attributes"] == api.terms["/ct/terms/attributes"]
+    assert all(params is None for _, params in api.calls)
+
+
+def test_snapshot_is_not_locked_while_fetching(tmp_path):
+    api = _Api()
+    snapshot = TermSnapshot(str(tmp_path), "http://api", Metrics())
+    get_all_from_api = api.get_all_from_api
+
+    def write_while_fetching(path, params=None):
+        if path == "/ct/terms/names":
+            # Another importer refreshing the same snapshot, without waiting for the lock
+            connection = sqlite3.connect(snapshot.path, timeout=0)
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('other', '1')"
+                )
+            connection.close()
+        return get_all_from_api(path, params)
+
+    api.get_all_from_api = write_while_fetching
+    term_lists = snapshot.load(api)
+    assert term_lists["/ct/terms/names"] == api.terms["/ct/terms/names"]
+
+
+def test_snapshot_is_refreshed_for_codelist_membership_changes(tmp_path):
+    api = _Api()
+    for items in api.terms.values():
+        for item in items:
+            item["codelists"] = [{"codelist_uid": "C1", "order": 1}]
+    metrics = Metrics()
+    TermSnapshot(str(tmp_path), "http://api", metrics).load(api)
+
+    # Adding a term to a codelist doesn't create a new term version
+    for items in api.terms.values():
+        for item in items:
+            if item["term_uid"] == "T1":
+                item["codelists"].append({"codelist_uid": "C2", "order": 3})
+    api.calls = []
+    term_lists = TermSnapshot(str(tmp_path), "http://api", metrics).load(api)
+    assert all(params is None for _, params in api.calls)
+    assert term_lists["/ct/terms/attributes"][0]["codelists"] == [
+        {"codelist_uid": "C1", "order": 1},
+        {"codelist_uid": "C2", "order": 3},
+    ]
+    assert term_lists["/ct/terms/names"][0]["codelists"][1]["codelist_uid"] == "C2"
+    assert metrics.metrics["TermCache-MembershipChanged"] == 1
+
+    # Unchanged membership, the attributes are refreshed incrementally again
+    api.calls = []
+    TermSnapshot(str(tmp_path), "http://api", metrics).load(api)
+    assert [params is None for _, params in api.calls] == [True, True, False]
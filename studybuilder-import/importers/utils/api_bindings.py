@@ -102,14 +102,17 @@ def get_error_message(response):
 # ---------------------------------------------------------------
 #
 class ApiBinding:
-    def __init__(self, api_base_url, api_headers, metrics, logger=None):
+    def __init__(
+        self, api_base_url, api_headers, metrics, logger=None, concurrency=4
+    ):
         self.api_headers = api_headers
         self.api_base_url = api_base_url
         if metrics is None:
             self.metrics = Metrics()
         else:
             self.metrics = metrics
-        self.sem = asyncio.Semaphore(8)
+        # Maximum number of concurrent async requests
+        self.sem = asyncio.Semaphore(concurrency)
         if logger is not None:
             self.log = logger
         else:
@@ -11,6 +11,7 @@ from ..functions.caselessdict import CaselessDict
 from ..functions.utils import create_logger, load_env
 from .api_bindings import ApiBinding
 from .metrics import Metrics
+from .term_snapshot import TermSnapshot
 
 logger = logging.getLogger("legacy_mdr_migrations - utils")
 
@@ -23,12 +24,26 @@ API_HEADERS = {"Accept": "application/json", "User-Agent": "test"}
 # ---------------------------------------------------------------
 #
 API_BASE_URL = load_env("API_BASE_URL")
+# Maximum number of concurrent requests of each importer
+API_CONCURRENCY = int(load_env("API_CONCURRENCY", "4"))
+# Directory of the on-disk snapshots of the term lists, an empty value disables them
+TERM_SNAPSHOT_DIR = load_env("MDR_MIGRATION_TERM_SNAPSHOT_DIR", ".term_snapshots")
 
 
 class TermCache:
     def __init__(self, api):
         self.api = api
-        self.all_terms_attributes = self.api.get_all_from_api("/ct/terms/attributes")
+        if TERM_SNAPSHOT_DIR:
+            term_lists = TermSnapshot(
+                TERM_SNAPSHOT_DIR, self.api.api_base_url, self.api.metrics
+            ).load(self.api)
+            self.all_terms_attributes = term_lists["/ct/terms/attributes"]
+            self.all_term_names = term_lists["/ct/terms/names"]
+        else:
+            self.all_terms_attributes = self.api.get_all_from_api(
+                "/ct/terms/attributes"
+            )
+            self.all_term_names = self.api.get_all_from_api("/ct/terms/names")
         self.all_terms_name_submission_values = CaselessDict(
             self.api.get_all_identifiers(
                 self.all_terms_attributes,
@@ -43,7 +58,6 @@ class TermCache:
                 value="term_uid",
             )
         )
-        self.all_term_names = self.api.get_all_from_api("/ct/terms/names")
         self.all_term_name_values = CaselessDict(
             self.api.get_all_identifiers_multiple(
                 self.all_term_names,
@@ -109,7 +123,13 @@ class BaseImporter:
             self.metrics = metrics_inst
         if api is None:
             headers = self._authenticate(API_HEADERS)
-            self.api = ApiBinding(API_BASE_URL, headers, self.metrics, logger=self.log)
+            self.api = ApiBinding(
+                API_BASE_URL,
+                headers,
+                self.metrics,
+                logger=self.log,
+                concurrency=API_CONCURRENCY,
+            )
         else:
             self.api = api
 
@@ -172,6 +192,12 @@ class BaseImporter:
     def run(self):
         pass
 
+    def client_session(self) -> aiohttp.ClientSession:
+        """Session shared by the async steps of the importer, limited to API_CONCURRENCY connections"""
+        timeout = aiohttp.ClientTimeout(None)
+        conn = aiohttp.TCPConnector(limit=API_CONCURRENCY, force_close=True)
+        return aiohttp.ClientSession(timeout=timeout, connector=conn)
+
     def prepare(self):
         pass
 
@@ -1,11 +1,16 @@
 import re
+import threading
 
 
 class Metrics:
     metrics: dict
+    durations: dict
 
     def __init__(self):
         self.metrics = dict()
+        self.durations = dict()
+        # The importers may run concurrently and share the same metrics
+        self._lock = threading.Lock()
 
     def simplify_path(self, path: str):
         parts = path.rsplit("--", 1)
@@ -21,7 +26,12 @@ class Metrics:
 
     def icrement(self, key: str, increment: int = 1):
         key = self.simplify_path(key)
-        self.metrics[key] = self.metrics.get(key, 0) + increment
+        with self._lock:
+            self.metrics[key] = self.metrics.get(key, 0) + increment
+
+    def add_duration(self, key: str, seconds: float):
+        with self._lock:
+            self.durations[key] = self.durations.get(key, 0) + seconds
 
     def print(self, sort_by_number=False):
         print("----------------------------------------")
@@ -48,3 +58,12 @@ class Metrics:
         for kv in data:
             print("{}:{}".format(kv[0], kv[1]))
         print("----------------------------------------")
+
+    def print_durations(self):
+        data = sorted(self.durations.items(), key=lambda x: x[1], reverse=True)
+        print("----------------------------------------")
+        print("Wall time per stage, in seconds")
+        print("----------------------------------------")
+        for kv in data:
+            print("{}:{:.1f}".format(kv[0], kv[1]))
+        print("----------------------------------------")
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any
+
+from .metrics import Metrics
+
+logger = logging.getLogger("legacy_mdr_migrations - scheduler")
+
+
+class ImportStage:
+    """
+    One step of the import, run once all the stages it depends on are done.
+
+    The run function is called with the results of the previous stages, by stage name,
+    and returns the result of this stage, for example the term cache built by the activities.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[dict[str, Any]], Any],
+        depends_on: Iterable[str] = (),
+    ):
+        self.name = name
+        self.run = run
+        self.depends_on = tuple(depends_on)
+
+
+class ImportScheduler:
+    """
+    Runs the import stages concurrently, each stage starting as soon as its dependencies are done.
+
+    Each stage runs in a worker thread with its own event loop,
+    so that the importers running their async steps with `asyncio.get_event_loop()` work unchanged.
+    The wall time of each stage is reported to the metrics.
+    If a stage fails, no other stage is started and the error is raised once the running stages are done.
+    """
+
+    def __init__(
+        self, stages: list[ImportStage], metrics: Metrics, max_workers: int = 4
+    ):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicated import stage '{stage.name}'")
+            self.stages[stage.name] = stage
+        for stage in stages:
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(
+                        f"Import stage '{stage.name}' depends on unknown stage '{dependency}'"
+                    )
+        self._check_for_cycles()
+        self.metrics = metrics
+        self.max_workers = max_workers
+
+    def _check_for_cycles(self):
+        done = set()
+        remaining = dict(self.stages)
+        while remaining:
+            ready = [
+                name
+                for name, stage in remaining.items()
+                if all(dependency in done for dependency in stage.depends_on)
+            ]
+            if not ready:
+                raise ValueError(
+                    f"Import stages with circular dependencies: {', '.join(remaining)}"
+                )
+            for name in ready:
+                done.add(name)
+                del remaining[name]
+
+    def _run_stage(self, stage: ImportStage, results: dict[str, Any]):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        logger.info("Starting import stage '%s'", stage.name)
+        start_time = time.monotonic()
+        try:
+            return stage.run(results)
+        finally:
+            elapsed_time = time.monotonic() - start_time
+            self.metrics.add_duration(stage.name, elapsed_time)
+            logger.info(
+                "Import stage '%s' done in %.1f seconds", stage.name, elapsed_time
+            )
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    def run(self) -> dict[str, Any]:
+        """Runs all the stages and returns their results, by stage name."""
+        results = {}
+        pending = dict(self.stages)
+        running = {}
+        error = None
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if error is None:
+                    for name, stage in list(pending.items()):
+                        if all(
+                            dependency in results for dependency in stage.depends_on
+                        ):
+                            del pending[name]
+                            # The stage gets a copy, the results are only updated by this thread
+                            future = executor.submit(
+                                self._run_stage, stage, dict(results)
+                            )
+                            running[future] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as exc:  # pylint: disable=broad-except
+                        logger.error("Import stage '%s' failed: %s", name, exc)
+                        if error is None:
+                            error = exc
+        self.metrics.add_duration("total", time.monotonic() - start_time)
+        if error is not None:
+            raise error
+        return results
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+
+from .metrics import Metrics
+
+logger = logging.getLogger("legacy_mdr_migrations - term_snapshot")
+
+# Increment when the layout of the snapshot changes, older snapshots are then rebuilt
+SNAPSHOT_VERSION = 1
+
+TERM_NAMES = "/ct/terms/names"
+TERM_ATTRIBUTES = "/ct/terms/attributes"
+# The names are refreshed first, they give the codelists of all the terms
+TERM_LISTS = (TERM_NAMES, TERM_ATTRIBUTES)
+
+# Seconds to wait for another importer writing the same snapshot
+SNAPSHOT_LOCK_TIMEOUT = 600
+
+
+class TermSnapshot:
+    """
+    On-disk snapshot of the CT term lists used to build the TermCache, in a SQLite file.
+
+    There is one snapshot per API base URL. It is rebuilt when a newer CT package has been imported,
+    otherwise only the attributes with a version started since the most recent one in the snapshot are fetched.
+    A retired term gets a new version like any other change, deleted draft terms are only dropped on rebuild.
+
+    Adding a term to a codelist or removing it doesn't create a new term version. The names, which are
+    the smaller list, are therefore always fetched in full, and the attributes are fetched in full as well
+    when the codelists of the terms differ from the ones the snapshot was refreshed with.
+    """
+
+    def __init__(self, directory: str, api_base_url: str, metrics: Metrics):
+        url_hash = hashlib.sha256(api_base_url.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(directory, f"terms_{url_hash}.sqlite")
+        self.api_base_url = api_base_url
+        self.metrics = metrics
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=SNAPSHOT_LOCK_TIMEOUT)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                list TEXT,
+                term_uid TEXT,
+                start_date TEXT,
+                item TEXT,
+                PRIMARY KEY (list, term_uid)
+            )
+            """
+        )
+        return connection
+
+    @staticmethod
+    def _get_meta(connection: sqlite3.Connection) -> dict:
+        return dict(connection.execute("SELECT key, value FROM meta"))
+
+    @staticmethod
+    def _latest_package_date(api) -> str:
+        packages = api.get_all_from_api("/ct/packages") or []
+        return max(
+            (package.get("effective_date") or "" for package in packages), default=""
+        )
+
+    @staticmethod
+    def _membership_hash(items: list) -> str:
+        """Returns a hash of the codelists of the given terms, with the order of the terms in them."""
+        membership = sorted(
+            [
+                item["term_uid"],
+                sorted(
+                    json.dumps(codelist, sort_keys=True)
+                    for codelist in item.get("codelists") or []
+                ),
+            ]
+            for item in items
+        )
+        return hashlib.sha256(json.dumps(membership).encode("utf-8")).hexdigest()
+
+    def _fetch(self, api, path: str, since: str | None) -> tuple[list | None, bool]:
+        """Returns the items of the given list changed since the given start date, or all items."""
+        if since is not None:
+            items = api.get_all_from_api(
+                path,
+                params={
+                    "filters": json.dumps({"start_date": {"v": [since], "op": "ge"}})
+                },
+            )
+            if items is not None:
+                return items, True
+            logger.warning("Failed to fetch the changes of %s, fetching all", path)
+        return api.get_all_from_api(path), False
+
+    def load(self, api) -> dict[str, list]:
+        """
+        Refreshes the snapshot from the API and returns the items of each term list, by path.
+
+        Several importers may load the same snapshot at the same time,
+        the changes are committed before each API call so that the others are not locked out meanwhile.
+        """
+        package_date = self._latest_package_date(api)
+        connection = self._connect()
+        try:
+            meta = self._get_meta(connection)
+            if (
+                meta.get("version") != str(SNAPSHOT_VERSION)
+                or meta.get("package_date") != package_date
+            ):
+                if meta:
+                    logger.info(
+                        "Term snapshot %s is outdated, rebuilding it", self.path
+                    )
+                    self.metrics.icrement("TermCache-SnapshotRebuild")
+                connection.execute("DELETE FROM items")
+                connection.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [
+                        ("version", str(SNAPSHOT_VERSION)),
+                        ("package_date", package_date),
+                        ("api_base_url", self.api_base_url),
+                    ],
+                )
+                connection.commit()
+
+            items_by_list = {}
+            membership_hash = None
+            for path in TERM_LISTS:
+                since, nbr_stored = connection.execute(
+                    "SELECT max(start_date), count(*) FROM items WHERE list=?", (path,)
+                ).fetchone()
+                if path == TERM_NAMES:
+                    since = None
+                elif membership_hash != meta.get("membership_hash"):
+                    if since is not None:
+                        logger.info(
+                            "Codelist membership changed, fetching all of %s", path
+                        )
+                        self.metrics.icrement("TermCache-MembershipChanged")
+                    since = None
+                items, incremental = self._fetch(api, path, since)
+                if items is None:
+                    # The API is not answering, the importer fails the same way as without the snapshot
+                    items_by_list[path] = None
+                    continue
+                if not incremental:
+                    connection.execute("DELETE FROM items WHERE list=?", (path,))
+                    nbr_stored = 0
+                connection.executemany(
+                    "INSERT OR REPLACE INTO items (list, term_uid, start_date, item) VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            path,
+                            item["term_uid"],
+                            item.get("start_date"),
+                            json.dumps(item),
+                        )
+                        for item in items
+                    ],
+                )
+                # The API lists the terms sorted by uid
+                items_by_list[path] = [
+                    json.loads(row[0])
+                    for row in connection.execute(
+                        "SELECT item FROM items WHERE list=? ORDER BY term_uid", (path,)
+                    )
+                ]
+                nbr_reused = len(items_by_list[path]) - len(
+                    {item["term_uid"] for item in items}
+                )
+                self.metrics.icrement(f"{path}-SnapshotHit", max(nbr_reused, 0))
+                self.metrics.icrement(f"{path}-SnapshotMiss", len(items))
+                logger.info(
+                    "Term snapshot %s: %s items, %s reused out of %s stored, %s fetched",
+                    path,
+                    len(items_by_list[path]),
+                    max(nbr_reused, 0),
+                    nbr_stored,
+                    len(items),
+                )
+                if path == TERM_NAMES:
+                    membership_hash = self._membership_hash(items_by_list[path])
+                elif membership_hash is not None:
+                    # The attributes are now up to date with this membership
+                    connection.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('membership_hash', ?)",
+                        (membership_hash,),
+                    )
+                connection.commit()
+        finally:
+            connection.close()
+        return items_by_list
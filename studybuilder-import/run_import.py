@@ -1,3 +1,5 @@
+from importers.functions.utils import load_env
+from importers.import_stages import IMPORT_STAGE_DEPENDENCIES
 from importers.run_import_activities import Activities
 from importers.run_import_compounds import Compounds
 from importers.run_import_config import Configuration
@@ -12,66 +14,72 @@ from importers.run_import_standardcodelistterms1 import StandardCodelistTerms1
 from importers.run_import_standardcodelistterms2 import StandardCodelistTerms2
 from importers.run_import_unitdefinitions import Units
 from importers.utils.metrics import Metrics
+from importers.utils.scheduler import ImportScheduler, ImportStage
 
+# Maximum number of importers running at the same time
+IMPORT_MAX_WORKERS = int(load_env("IMPORT_MAX_WORKERS", "4"))
 
-def main():
-    metr = Metrics()
-
-    # Migrate the libraries (SNOMED etc)
-    dictmigrator = Dictionaries(metrics_inst=metr)
-    dictmigrator.run()
-
-    # General configuration
-    config = Configuration(metrics_inst=metr)
-    config.run()
-
-    # Import standard codelist terms, part 1
-    standardterms1 = StandardCodelistTerms1(metrics_inst=metr)
-    standardterms1.run()
-
-    # Import standard codelist terms, part 2
-    standardterms2 = StandardCodelistTerms2(metrics_inst=metr)
-    standardterms2.run()
 
-    # Import unit definitions
-    units = Units(metrics_inst=metr)
-    units.run()
+def run_importer(importer_class, metr, cache=None):
+    if cache is None:
+        importer = importer_class(metrics_inst=metr)
+    else:
+        importer = importer_class(metrics_inst=metr, cache=cache)
+    importer.run()
+    return importer
 
-    activities = Activities(metrics_inst=metr)
-    activities.run()
-    cache = activities.get_cache()
 
-    # Import sponsor models
-    sponsor_models = SponsorModels(metrics_inst=metr, cache=cache)
-    sponsor_models.run()
+def import_activities(metr):
+    activities = run_importer(Activities, metr)
+    # The term cache is shared by all the following importers
+    return activities.get_cache()
 
-    # Finish up sponsor library
-    finishing = StandardCodelistFinish(metrics_inst=metr, cache=cache)
-    finishing.run()
 
-    # Import compounds
-    compounds = Compounds(metrics_inst=metr, cache=cache)
-    compounds.run()
-
-    # Import crfs
-    crfs = Crfs(metrics_inst=metr, cache=cache)
-    crfs.run()
-
-    # Import mock data
-    mockdata = Mockdata(metrics_inst=metr, cache=cache)
-    mockdata.run()
-
-    # Import mock data from json
-    mockdatajson = MockdataJson(metrics_inst=metr, cache=cache)
-    mockdatajson.run()
+def main():
+    metr = Metrics()
 
-    # Import E2E specific data from json
-    mockdatae2e = MockdataJsonE2E(metrics_inst=metr, cache=cache)
-    mockdatae2e.run()
+    # The term cache built by the activities is shared by the following importers
+    importers = {
+        "dictionaries": lambda results: run_importer(Dictionaries, metr),
+        "configuration": lambda results: run_importer(Configuration, metr),
+        "standard_codelist_terms_1": lambda results: run_importer(
+            StandardCodelistTerms1, metr
+        ),
+        "standard_codelist_terms_2": lambda results: run_importer(
+            StandardCodelistTerms2, metr
+        ),
+        "units": lambda results: run_importer(Units, metr),
+        "activities": lambda results: import_activities(metr),
+        "sponsor_models": lambda results: run_importer(
+            SponsorModels, metr, cache=results["activities"]
+        ),
+        "standard_codelist_finish": lambda results: run_importer(
+            StandardCodelistFinish, metr, cache=results["activities"]
+        ),
+        "compounds": lambda results: run_importer(
+            Compounds, metr, cache=results["activities"]
+        ),
+        "crfs": lambda results: run_importer(Crfs, metr, cache=results["activities"]),
+        "mockdata": lambda results: run_importer(
+            Mockdata, metr, cache=results["activities"]
+        ),
+        "mockdata_json": lambda results: run_importer(
+            MockdataJson, metr, cache=results["activities"]
+        ),
+        "mockdata_e2e": lambda results: run_importer(
+            MockdataJsonE2E, metr, cache=results["activities"]
+        ),
+    }
+    stages = [
+        ImportStage(name, run, depends_on=IMPORT_STAGE_DEPENDENCIES[name])
+        for name, run in importers.items()
+    ]
+    ImportScheduler(stages, metr, max_workers=IMPORT_MAX_WORKERS).run()
 
     # Display metrics
     metr.print_sorted_by_key()
     metr.print_sorted_by_value()
+    metr.print_durations()
 
 
 if __name__ == "__main__":